@@ -8,7 +8,11 @@ from .jwt_handler import (
     create_refresh_token,
     verify_token,
     decode_token,
-    get_user_id_from_token
+    get_user_id_from_token,
+    get_jwt_settings,
+    is_token_revoked,
+    revoke_token,
+    revoke_token_family
 )
 
 from .password import (
@@ -16,6 +20,12 @@ from .password import (
     verify_password
 )
 
+from .google_jwks import (
+    GoogleTokenError,
+    get_google_verifier,
+    verify_google_id_token
+)
+
 from .dependencies import (
     CurrentUser,
     get_current_user,
@@ -30,8 +40,15 @@ __all__ = [
     "verify_token",
     "decode_token",
     "get_user_id_from_token",
+    "get_jwt_settings",
+    "is_token_revoked",
+    "revoke_token",
+    "revoke_token_family",
     "hash_password",
     "verify_password",
+    "GoogleTokenError",
+    "get_google_verifier",
+    "verify_google_id_token",
     "CurrentUser",
     "get_current_user",
     "get_current_user_optional",
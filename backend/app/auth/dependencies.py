@@ -142,6 +142,9 @@ def get_current_user(
 def require_trust_level(min_level: int):
     """
     Dependency factory for requiring minimum trust level.
+    The level is maintained in users.trust_level (app/services/trust.py) and
+    comes with the user row get_current_user already loads, so the check
+    costs no extra query.
     
     Usage:
         @router.post("/admin/action")
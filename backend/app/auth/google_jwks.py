@@ -0,0 +1,293 @@
+# auth/google_jwks.py - Google ID Token Verification
+"""
+Provolution Gamification - Google ID Token Verifier
+Verifies Google ID tokens locally against Google's JWKS.
+
+- Public keys are cached for the lifetime Google announces via
+  `Cache-Control: max-age` (minus `Age`), so logins normally need no
+  network round trip at all.
+- Shortly before the keys expire they are refreshed in a background
+  thread while the cached set keeps serving requests; an unknown `kid`
+  (key rotation) forces a refresh, at most once per MIN_FORCED_REFRESH.
+- If Google cannot be reached, the expired key set is used until the next
+  successful refresh; without usable keys the token is rejected with
+  GoogleTokenError.
+- Blocking fetches are serialized: concurrent logins on a cold or expired
+  cache wait for one download instead of each starting their own.
+- Where the keys come from is pluggable: `HTTPKeySource` (default),
+  `FileKeySource` (GOOGLE_JWKS_PATH, e.g. a local stand-in key set for
+  offline tests) or `StaticKeySource`.
+
+Signatures and claims are checked by PyJWT (`pyjwt[crypto]`); this module
+only manages the key set.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Protocol
+import json
+import os
+import re
+import threading
+import time
+import urllib.request
+
+import jwt
+
+
+GOOGLE_CLIENT_ID = os.environ.get(
+    'GOOGLE_CLIENT_ID',
+    '249276087645-8db6c2913bgsv3p0p4c7njde3j5kvr6c.apps.googleusercontent.com'
+)
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+DEFAULT_MAX_AGE = 3600        # seconds, if the response has no max-age
+REFRESH_AHEAD = 0.8           # refresh in background after 80% of max-age
+MIN_FORCED_REFRESH = 60       # seconds between refreshes for unknown kids
+CLOCK_SKEW = 60               # seconds of leeway for exp/iat
+FETCH_TIMEOUT = 5             # seconds
+
+
+class GoogleTokenError(ValueError):
+    """Token is malformed, not signed by Google or has invalid claims."""
+
+
+# ============================================
+# KEY SOURCES
+# ============================================
+
+@dataclass
+class KeySet:
+    """JWKS document plus how long it may be cached (seconds)."""
+    jwks: dict
+    max_age: int = DEFAULT_MAX_AGE
+
+
+class KeySource(Protocol):
+    def fetch(self) -> KeySet: ...
+
+
+def parse_max_age(cache_control: Optional[str], age: Optional[str] = None) -> int:
+    """Remaining lifetime from Cache-Control max-age and the Age header."""
+    match = re.search(r"max-age=(\d+)", cache_control or "")
+    max_age = int(match.group(1)) if match else DEFAULT_MAX_AGE
+    try:
+        max_age -= int(age or 0)
+    except ValueError:
+        pass
+    return max(0, max_age)
+
+
+class HTTPKeySource:
+    """Fetches the JWKS from Google (or another URL)."""
+
+    def __init__(self, url: str = GOOGLE_JWKS_URL, timeout: float = FETCH_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self) -> KeySet:
+        with urllib.request.urlopen(self.url, timeout=self.timeout) as response:
+            jwks = json.loads(response.read())
+            max_age = parse_max_age(
+                response.headers.get("Cache-Control"),
+                response.headers.get("Age")
+            )
+        return KeySet(jwks, max_age)
+
+
+class FileKeySource:
+    """Reads a JWKS document from disk (offline / tests)."""
+
+    def __init__(self, path, max_age: int = DEFAULT_MAX_AGE):
+        self.path = Path(path)
+        self.max_age = max_age
+
+    def fetch(self) -> KeySet:
+        return KeySet(json.loads(self.path.read_text(encoding="utf-8")), self.max_age)
+
+
+class StaticKeySource:
+    """Serves a fixed JWKS document (tests)."""
+
+    def __init__(self, jwks: dict, max_age: int = DEFAULT_MAX_AGE):
+        self.key_set = KeySet(jwks, max_age)
+
+    def fetch(self) -> KeySet:
+        return self.key_set
+
+
+# ============================================
+# KEYS
+# ============================================
+
+def parse_keys(jwks: dict) -> dict[str, Any]:
+    """RSA public keys of a JWKS document by kid; unusable entries are skipped."""
+    keys = {}
+    for jwk in jwks.get("keys", []):
+        if jwk.get("kty") != "RSA" or not jwk.get("kid"):
+            continue
+        try:
+            keys[jwk["kid"]] = jwt.PyJWK(jwk, algorithm="RS256").key
+        except (jwt.PyJWKError, jwt.InvalidKeyError, ValueError) as e:
+            print(f"[Google] Skipping unusable key {jwk['kid']}: {e}")
+    return keys
+
+
+# ============================================
+# VERIFIER
+# ============================================
+
+class GoogleTokenVerifier:
+    """Verifies Google ID tokens with a cached, self-refreshing key set."""
+
+    def __init__(self, audience: str = GOOGLE_CLIENT_ID, source: KeySource = None,
+                 issuers: tuple = GOOGLE_ISSUERS):
+        self.audience = audience
+        self.issuers = issuers
+        self.source = source or HTTPKeySource()
+        self._keys: dict[str, Any] = {}
+        self._fetched_at = 0.0
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._refreshing = False
+
+    def set_key_source(self, source: KeySource) -> None:
+        """Swap the key source and drop cached keys."""
+        with self._lock:
+            self.source = source
+            self._keys = {}
+            self._fetched_at = self._expires_at = 0.0
+
+    # ---------- key cache ----------
+
+    def refresh(self) -> None:
+        """Fetch the key set now (blocking)."""
+        key_set = self.source.fetch()
+        keys = parse_keys(key_set.jwks)
+        now = time.monotonic()
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = now
+            self._expires_at = now + key_set.max_age
+
+    def _refresh_once(self, fetched_at: float) -> None:
+        """refresh(), unless another thread has done so since fetched_at."""
+        with self._fetch_lock:
+            with self._lock:
+                if self._fetched_at != fetched_at:
+                    return
+            self.refresh()
+
+    def _refresh_in_background(self) -> None:
+        def run():
+            try:
+                with self._fetch_lock:
+                    self.refresh()
+            except Exception as e:
+                print(f"[Google] Background key refresh failed: {e}")
+            finally:
+                self._refreshing = False
+
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=run, name="google-jwks-refresh", daemon=True).start()
+
+    def get_key(self, kid: str) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            keys, fetched_at, expires_at = self._keys, self._fetched_at, self._expires_at
+
+        if now >= expires_at:
+            try:
+                self._refresh_once(fetched_at)
+            except Exception as e:
+                if not keys:
+                    raise GoogleTokenError(f"Google signing keys unavailable: {e}") from e
+                # Keep serving the expired copy rather than locking everyone
+                # out, and retry at most once per MIN_FORCED_REFRESH
+                print(f"[Google] Key refresh failed, using cached keys: {e}")
+                with self._lock:
+                    self._fetched_at = now
+                    self._expires_at = now + MIN_FORCED_REFRESH
+        else:
+            if now >= fetched_at + (expires_at - fetched_at) * REFRESH_AHEAD:
+                self._refresh_in_background()
+            if kid not in keys and now - fetched_at >= MIN_FORCED_REFRESH:
+                # Google rotated its keys before our copy expired
+                try:
+                    self._refresh_once(fetched_at)
+                except Exception as e:
+                    print(f"[Google] Key refresh for unknown kid failed: {e}")
+                    with self._lock:
+                        self._fetched_at = now
+                    raise GoogleTokenError(f"Google signing keys unavailable: {e}") from e
+
+        with self._lock:
+            key = self._keys.get(kid)
+        if key is None:
+            raise GoogleTokenError("Unknown signing key")
+        return key
+
+    # ---------- verification ----------
+
+    def verify(self, token: str) -> dict:
+        """Verify signature and claims; returns the token payload."""
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError as e:
+            raise GoogleTokenError("Invalid token format") from e
+        if header.get("alg") != "RS256":
+            raise GoogleTokenError("Unsupported token algorithm")
+
+        key = self.get_key(header.get("kid", ""))
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=self.audience,
+                issuer=list(self.issuers),
+                leeway=CLOCK_SKEW,
+                options={"require": ["exp", "iss", "aud", "sub"]}
+            )
+        except jwt.ExpiredSignatureError as e:
+            raise GoogleTokenError("Token expired") from e
+        except jwt.InvalidTokenError as e:
+            raise GoogleTokenError(f"Invalid token: {e}") from e
+
+
+# Singleton verifier instance
+_verifier: Optional[GoogleTokenVerifier] = None
+_verifier_lock = threading.Lock()
+
+
+def get_google_verifier() -> GoogleTokenVerifier:
+    """Get or create the shared verifier (GOOGLE_JWKS_PATH selects a local key set)."""
+    global _verifier
+    with _verifier_lock:
+        if _verifier is None:
+            jwks_path = os.environ.get('GOOGLE_JWKS_PATH')
+            source = FileKeySource(jwks_path) if jwks_path else HTTPKeySource()
+            _verifier = GoogleTokenVerifier(source=source)
+        return _verifier
+
+
+def verify_google_id_token(credential: str) -> dict:
+    """
+    Verify a Google ID token and return the user info.
+
+    Raises:
+        GoogleTokenError: Token is invalid
+    """
+    idinfo = get_google_verifier().verify(credential)
+    return {
+        'google_id': idinfo['sub'],
+        'email': idinfo.get('email'),
+        'name': idinfo.get('name', ''),
+        'picture': idinfo.get('picture', ''),
+        'email_verified': idinfo.get('email_verified') in (True, 'true')
+    }
@@ -1,6 +1,11 @@
 # auth/jwt_handler.py - JWT Token Management
 """
 Provolution Gamification - JWT Authentication Handler
+
+Tokens are signed with the persisted key set (see signing_keys.py) and
+carry a `jti`; refresh tokens also carry a family ID (`fam`) that stays the
+same across rotations, so a replayed refresh token can revoke the whole
+chain (see revocation.py).
 """
 
 from datetime import datetime, timedelta, timezone
@@ -9,11 +14,13 @@ import jwt
 import secrets
 from pydantic import BaseModel
 
+from .revocation import revocation_list
+from .signing_keys import key_ring
+
 
-# Configuration - In production, use environment variables!
+# Configuration
 class JWTSettings(BaseModel):
     """JWT configuration settings."""
-    secret_key: str = secrets.token_hex(32)  # Generate new key on startup
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 24  # 24 hours
     refresh_token_expire_days: int = 30
@@ -31,6 +38,12 @@ def get_jwt_settings() -> JWTSettings:
     return _settings
 
 
+def _encode(payload: dict) -> str:
+    settings = get_jwt_settings()
+    key = key_ring.signing_key()
+    return jwt.encode(payload, key.key, algorithm=settings.algorithm, headers={"kid": key.kid})
+
+
 def create_access_token(user_id: int, username: str) -> str:
     """
     Create a new JWT access token.
@@ -53,18 +66,20 @@ def create_access_token(user_id: int, username: str) -> str:
         "username": username,
         "exp": expire,
         "iat": datetime.now(timezone.utc),
+        "jti": secrets.token_urlsafe(12),
         "type": "access"
     }
     
-    return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
+    return _encode(payload)
 
 
-def create_refresh_token(user_id: int) -> str:
+def create_refresh_token(user_id: int, family: Optional[str] = None) -> str:
     """
     Create a new JWT refresh token.
     
     Args:
         user_id: Database user ID
+        family: Family ID of the token being rotated (new family if None)
         
     Returns:
         Encoded JWT refresh token string
@@ -79,15 +94,17 @@ def create_refresh_token(user_id: int) -> str:
         "sub": str(user_id),
         "exp": expire,
         "iat": datetime.now(timezone.utc),
+        "jti": secrets.token_urlsafe(12),
+        "fam": family or secrets.token_urlsafe(12),
         "type": "refresh"
     }
     
-    return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
+    return _encode(payload)
 
 
 def decode_token(token: str) -> dict:
     """
-    Decode and validate a JWT token.
+    Decode and validate a JWT token (signature and expiry, not revocation).
     
     Args:
         token: JWT token string
@@ -101,31 +118,58 @@ def decode_token(token: str) -> dict:
     """
     settings = get_jwt_settings()
     
+    kid = jwt.get_unverified_header(token).get("kid")
+    key = key_ring.verification_key(kid) if kid else None
+    if key is None:
+        raise jwt.InvalidTokenError("Unknown signing key")
+    
     payload = jwt.decode(
         token,
-        settings.secret_key,
+        key.key,
         algorithms=[settings.algorithm]
     )
     
     return payload
 
 
-def verify_token(token: str) -> Optional[dict]:
+def is_token_revoked(payload: dict) -> bool:
+    """Check the token's jti (and refresh family) against the revocation list."""
+    return revocation_list.is_revoked(payload.get("jti"), payload.get("fam"))
+
+
+def revoke_token(payload: dict, conn=None) -> bool:
+    """Revoke a decoded token until it expires. False if already revoked."""
+    return revocation_list.revoke(payload["jti"], payload["exp"], conn)
+
+
+def revoke_token_family(payload: dict, conn=None) -> bool:
+    """Revoke every refresh token of the payload's family (logout, reuse)."""
+    # Later rotations of the family may live longer than this token
+    expires_at = datetime.now(timezone.utc) + timedelta(days=get_jwt_settings().refresh_token_expire_days)
+    return revocation_list.revoke(payload["fam"], expires_at.timestamp(), conn)
+
+
+def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
     """
     Verify a token and return payload if valid.
     
     Args:
         token: JWT token string
+        token_type: Expected "type" claim ("access" or "refresh")
         
     Returns:
-        Payload dict if valid, None if invalid
+        Payload dict if valid, None if invalid, expired or revoked
     """
     try:
-        return decode_token(token)
+        payload = decode_token(token)
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    
+    if payload.get("type") != token_type or is_token_revoked(payload):
+        return None
+    return payload
 
 
 def get_user_id_from_token(token: str) -> Optional[int]:
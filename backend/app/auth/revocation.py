@@ -0,0 +1,142 @@
+# auth/revocation.py - Token Revocation List
+"""
+Provolution Gamification - Token Revocation
+
+Revoked token IDs (`jti`, or a refresh token family) are stored in the
+`revoked_tokens` table until the token would have expired anyway. Each
+worker mirrors the table in a Bloom filter, so the check on every
+authenticated request is a few hash lookups in memory:
+
+- not in the filter → definitely not revoked (the common case)
+- in the filter → confirmed with a primary-key lookup (revoked tokens
+  and the rare false positive)
+
+New revocations from other workers are picked up incrementally via
+rowid at most every SYNC_INTERVAL seconds. Expired rows are pruned and
+the filter is rebuilt every REBUILD_INTERVAL seconds or when it fills up.
+"""
+
+from typing import Iterable
+import hashlib
+import math
+import threading
+import time
+
+from ..database import get_db
+
+
+SYNC_INTERVAL = 1.0            # seconds
+REBUILD_INTERVAL = 3600.0      # seconds
+MIN_CAPACITY = 10000
+FALSE_POSITIVE_RATE = 0.001
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float = FALSE_POSITIVE_RATE):
+        self.capacity = capacity
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationList:
+    """Bloom-filtered view of the revoked_tokens table."""
+
+    def __init__(self):
+        self._filter = BloomFilter(MIN_CAPACITY)
+        self._last_rowid = 0
+        self._synced_at = 0.0
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def _rebuild(self) -> None:
+        now = int(time.time())
+        with get_db() as conn:
+            conn.execute("DELETE FROM revoked_tokens WHERE expires_at < ?", (now,))
+            rows = conn.execute("SELECT rowid, jti FROM revoked_tokens").fetchall()
+
+        bloom = BloomFilter(max(MIN_CAPACITY, len(rows) * 2))
+        for row in rows:
+            bloom.add(row['jti'])
+        self._filter = bloom
+        self._last_rowid = max((r['rowid'] for r in rows), default=self._last_rowid)
+        self._built_at = self._synced_at = time.monotonic()
+
+    def _sync(self) -> None:
+        with get_db() as conn:
+            rows = conn.execute(
+                "SELECT rowid, jti FROM revoked_tokens WHERE rowid > ? ORDER BY rowid",
+                (self._last_rowid,)
+            ).fetchall()
+        for row in rows:
+            self._filter.add(row['jti'])
+            self._last_rowid = row['rowid']
+        self._synced_at = time.monotonic()
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._synced_at < SYNC_INTERVAL:
+            return
+        with self._lock:
+            if now - self._synced_at < SYNC_INTERVAL:
+                return
+            if now - self._built_at >= REBUILD_INTERVAL or self._filter.count >= self._filter.capacity:
+                self._rebuild()
+            else:
+                self._sync()
+
+    def is_revoked(self, *token_ids: str) -> bool:
+        """True if any of the IDs (jti, family) has been revoked."""
+        self._refresh()
+        candidates = [t for t in token_ids if t and t in self._filter]
+        if not candidates:
+            return False
+        placeholders = ", ".join("?" for _ in candidates)
+        with get_db() as conn:
+            row = conn.execute(
+                f"SELECT 1 FROM revoked_tokens WHERE jti IN ({placeholders}) LIMIT 1",
+                candidates
+            ).fetchone()
+        return row is not None
+
+    def revoke(self, token_id: str, expires_at: int, conn=None) -> bool:
+        """
+        Revoke a token ID until expires_at (unix time).
+        Returns False if it was already revoked.
+        """
+        def insert(c) -> bool:
+            cursor = c.execute(
+                "INSERT OR IGNORE INTO revoked_tokens (jti, expires_at) VALUES (?, ?)",
+                (token_id, int(expires_at))
+            )
+            return cursor.rowcount == 1
+
+        if conn is not None:
+            inserted = insert(conn)
+        else:
+            with get_db() as c:
+                inserted = insert(c)
+        # Visible in this worker right away; the rowid sync adds it again (harmless)
+        with self._lock:
+            self._filter.add(token_id)
+        return inserted
+
+
+revocation_list = RevocationList()
@@ -0,0 +1,162 @@
+# auth/signing_keys.py - Persisted JWT Signing Keys
+"""
+Provolution Gamification - JWT Signing Key Set
+
+HS256 keys live in the `signing_keys` table, so every worker and every
+restart signs and verifies with the same keys. Each token carries the key
+ID (`kid`) in its header.
+
+- The newest key signs. Once it is older than KEY_ROTATION_DAYS a new one
+  is created (only one worker wins the insert).
+- Retired keys keep verifying until every token they signed has expired
+  (KEY_ROTATION_DAYS + KEY_VERIFY_GRACE_DAYS), then they are deleted.
+- The stored secret is combined with the JWT_SECRET environment variable
+  (HMAC), so a copy of the database alone is not enough to forge tokens.
+  Without JWT_SECRET the app refuses to start in production (RENDER) and
+  warns in development.
+- Workers cache the key set for KEY_CACHE_TTL seconds and reload early
+  when a token names an unknown kid.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+import hashlib
+import hmac
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+from ..database import get_db
+
+
+KEY_ROTATION_DAYS = 30
+KEY_VERIFY_GRACE_DAYS = 31     # >= longest token lifetime (refresh tokens)
+KEY_CACHE_TTL = 60.0           # seconds
+MIN_RELOAD_INTERVAL = 5.0      # seconds between reloads for unknown kids
+
+_DAY = 86400
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    key: bytes
+    created_at: int
+
+
+def _pepper() -> bytes:
+    return os.environ.get("JWT_SECRET", "").encode("utf-8")
+
+
+def check_pepper() -> None:
+    """Fail in production, warn in development when JWT_SECRET is not set."""
+    if os.environ.get("JWT_SECRET"):
+        return
+    if os.environ.get("RENDER"):
+        raise RuntimeError("JWT_SECRET is not set; tokens could be forged from a copy of the database")
+    print("[WARN] JWT_SECRET is not set - signing keys depend on the database alone (development only)")
+
+
+def _derive(secret: str) -> bytes:
+    return hmac.new(_pepper(), secret.encode("utf-8"), hashlib.sha256).digest()
+
+
+class KeyRing:
+    """In-process view of the signing_keys table."""
+
+    def __init__(self):
+        self._keys: dict[str, SigningKey] = {}
+        self._current: Optional[SigningKey] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _select(conn) -> list:
+        return conn.execute(
+            "SELECT kid, secret, created_at FROM signing_keys ORDER BY created_at"
+        ).fetchall()
+
+    def _rotate_due(self, conn, now: int, rotate_before: int) -> list:
+        # Only one worker's insert goes through, the others see its key
+        conn.execute(
+            """
+            INSERT INTO signing_keys (kid, secret, created_at)
+            SELECT ?, ?, ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM signing_keys WHERE created_at > ?
+            )
+            """,
+            (secrets.token_hex(8), secrets.token_hex(32), now, rotate_before)
+        )
+        conn.execute(
+            "DELETE FROM signing_keys WHERE created_at < ?",
+            (now - (KEY_ROTATION_DAYS + KEY_VERIFY_GRACE_DAYS) * _DAY,)
+        )
+        return self._select(conn)
+
+    def _load(self, rotate: bool = True) -> None:
+        now = int(time.time())
+        rotate_before = now - KEY_ROTATION_DAYS * _DAY
+        with get_db() as conn:
+            rows = self._select(conn)
+            if rotate and (not rows or rows[-1]['created_at'] <= rotate_before):
+                try:
+                    rows = self._rotate_due(conn, now, rotate_before)
+                except sqlite3.OperationalError as e:
+                    # Database busy: keep signing with the previous key for now
+                    if not rows:
+                        raise
+                    conn.rollback()
+                    print(f"[Auth] Signing key rotation postponed: {e}")
+
+        keys = {
+            r['kid']: SigningKey(r['kid'], _derive(r['secret']), r['created_at'])
+            for r in rows
+        }
+        with self._lock:
+            self._keys = keys
+            self._current = keys[rows[-1]['kid']] if rows else None
+            self._loaded_at = time.monotonic()
+
+    def _ensure_fresh(self) -> None:
+        if time.monotonic() - self._loaded_at >= KEY_CACHE_TTL or self._current is None:
+            self._load()
+
+    def signing_key(self) -> SigningKey:
+        """Key for new tokens."""
+        self._ensure_fresh()
+        return self._current
+
+    def verification_key(self, kid: str) -> Optional[SigningKey]:
+        """Key for a token's kid, None if unknown or retired."""
+        self._ensure_fresh()
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._loaded_at >= MIN_RELOAD_INTERVAL:
+            # Another worker may have rotated in the meantime
+            self._load(rotate=False)
+            key = self._keys.get(kid)
+        return key
+
+    def rotate(self) -> SigningKey:
+        """Create a new signing key now; older keys keep verifying until they expire."""
+        with get_db() as conn:
+            conn.execute(
+                "INSERT INTO signing_keys (kid, secret, created_at) VALUES (?, ?, ?)",
+                (secrets.token_hex(8), secrets.token_hex(32), int(time.time()))
+            )
+        self._load()
+        return self._current
+
+    def load(self) -> None:
+        """Check JWT_SECRET and load (and if due, create) the key set, on startup."""
+        check_pepper()
+        self._load()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = 0.0
+
+
+key_ring = KeyRing()
@@ -0,0 +1,362 @@
+# cache.py - HTTP Response Caching
+"""
+Provolution Gamification - HTTP Response Cache
+ETag / Cache-Control handling for public, rarely changing endpoints.
+
+Versioned resources (challenges, leaderboards, badges) derive their strong
+ETag from a counter in the `content_versions` table, which write paths bump
+inside their own transaction via `bump_content_version`. Because the ETag is
+known before the endpoint runs, a matching `If-None-Match` is answered with
+304 without touching the router at all, and repeated requests are served
+from an in-process store. Static resources (footprint factors/averages) are
+hashed once per process.
+
+When a version changes, concurrent requests for the same response are
+coalesced (app/singleflight.py): one renders it, the others wait for that
+result, or get the previous body if it is younger than the policy's
+stale_while_revalidate window.
+
+Per-user data (GET /users/me/dashboard, /leaderboards/friends) is versioned
+by `users.cache_version`, which write paths bump via `bump_user_version`. The column arrives with the
+user row that authentication loads anyway, so checking it costs no query.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional
+import hashlib
+import re
+import threading
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .auth.jwt_handler import get_user_id_from_token
+from .database import get_db
+from .singleflight import SingleFlight
+
+
+# Resources tracked in content_versions
+RESOURCE_CHALLENGES = "challenges"
+RESOURCE_LEADERBOARDS = "leaderboards"
+RESOURCE_BADGES = "badges"
+
+# How long a worker trusts its copy of content_versions (seconds).
+# Bumps made by this worker are visible as soon as they are committed.
+VERSION_CACHE_TTL = 1.0
+
+# Upper bound for stored response bodies per worker
+MAX_CACHED_RESPONSES = 512
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Caching rules for a group of GET endpoints."""
+    pattern: str
+    resource: Optional[str]  # None = static content, ETag from body hash
+    max_age: int
+    stale_while_revalidate: int
+    daily: bool = False  # content also changes with the calendar day
+
+    def matches(self, path: str) -> bool:
+        return re.fullmatch(self.pattern, path) is not None
+
+
+CACHE_POLICIES = [
+    CachePolicy(r"/v1/badges", RESOURCE_BADGES, max_age=300, stale_while_revalidate=3600),
+    CachePolicy(r"/v1/challenges", RESOURCE_CHALLENGES, max_age=60, stale_while_revalidate=300),
+    CachePolicy(r"/v1/challenges/[^/]+", RESOURCE_CHALLENGES, max_age=60, stale_while_revalidate=300),
+    CachePolicy(r"/v1/footprint/(factors|averages)", None, max_age=86400, stale_while_revalidate=604800),
+    # Not the live streams: they never end, so they must not be buffered.
+    # Not /friends: it also depends on the viewer's follows (user_etag)
+    CachePolicy(r"/v1/leaderboards/(?!friends$|(.+/)?stream$).+", RESOURCE_LEADERBOARDS, max_age=30, stale_while_revalidate=120, daily=True),
+]
+
+
+# ============================================
+# CONTENT VERSIONS
+# ============================================
+
+_versions: dict[str, int] = {}
+_versions_loaded_at = 0.0
+_versions_lock = threading.Lock()
+
+
+def bump_content_version(conn, *resources: str) -> None:
+    """
+    Mark resources as changed. Call inside the write transaction so the
+    new version becomes visible together with the data. This worker's copy
+    is updated after get_db commits; a rolled back bump never reaches it.
+    """
+    for resource in resources:
+        row = conn.execute(
+            """
+            INSERT INTO content_versions (resource, version, updated_at)
+            VALUES (?, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT(resource) DO UPDATE SET
+                version = version + 1,
+                updated_at = CURRENT_TIMESTAMP
+            RETURNING version
+            """,
+            (resource,)
+        ).fetchone()
+        after_commit = getattr(conn, "after_commit", None)
+        if after_commit is not None:
+            after_commit.append(lambda r=resource, v=row['version']: _note_version(r, v))
+
+
+def _note_version(resource: str, version: int) -> None:
+    """Take over a committed version unless a newer one is already known."""
+    with _versions_lock:
+        if version > _versions.get(resource, 0):
+            _versions[resource] = version
+
+
+def bump_user_version(conn, *user_ids: int) -> None:
+    """
+    Mark per-user cached data (dashboard) of these users as changed.
+    Call inside the write transaction.
+    """
+    conn.executemany(
+        "UPDATE users SET cache_version = cache_version + 1 WHERE id = ?",
+        [(user_id,) for user_id in user_ids]
+    )
+
+
+def read_content_version(conn, resource: str) -> int:
+    """
+    Committed version of a resource straight from the table, bypassing
+    this worker's copy. For callers that compare it with a version they
+    read from the table themselves (live leaderboards).
+    """
+    row = conn.execute(
+        "SELECT version FROM content_versions WHERE resource = ?",
+        (resource,)
+    ).fetchone()
+    return row['version'] if row else 0
+
+
+def get_content_version(resource: str) -> int:
+    """Current version of a resource (0 if never bumped)."""
+    global _versions_loaded_at
+
+    now = time.monotonic()
+    with _versions_lock:
+        if now - _versions_loaded_at < VERSION_CACHE_TTL:
+            return _versions.get(resource, 0)
+
+    with get_db() as conn:
+        rows = conn.execute("SELECT resource, version FROM content_versions").fetchall()
+
+    with _versions_lock:
+        _versions.clear()
+        _versions.update({r['resource']: r['version'] for r in rows})
+        _versions_loaded_at = now
+        return _versions.get(resource, 0)
+
+
+# ============================================
+# RESPONSE STORE
+# ============================================
+
+@dataclass
+class CachedResponse:
+    etag: str
+    body: bytes
+    media_type: str
+    stored_at: float = field(default_factory=time.monotonic)
+
+
+class ResponseStore:
+    """Small thread-safe LRU of response bodies keyed by request identity."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_RESPONSES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+response_store = ResponseStore()
+
+
+# ============================================
+# MIDDLEWARE
+# ============================================
+
+def _viewer_key(request: Request) -> Optional[int]:
+    """User ID from the bearer token, None for anonymous requests."""
+    auth = request.headers.get("authorization", "")
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return get_user_id_from_token(token.strip())
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return etag in candidates
+
+
+def _make_etag(*parts) -> str:
+    digest = hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def user_etag(user: dict, *resources: str, daily: bool = False, variant: str = "") -> str:
+    """
+    Strong ETag for a user's own data: the user's cache_version plus the
+    versions of shared resources the response also shows. `variant`
+    separates responses of one endpoint (e.g. its query parameters).
+    """
+    return _make_etag(
+        "user",
+        user['id'],
+        user.get('cache_version') or 0,
+        *(f"{r}={get_content_version(r)}" for r in resources),
+        date.today().isoformat() if daily else "",
+        variant,
+    )
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Adds ETag, Cache-Control and Vary headers to cacheable GET endpoints
+    and answers conditional requests with 304 Not Modified.
+
+    Responses for authenticated callers contain per-user fields
+    (user_status, my_rank), so they are keyed per user and marked private.
+    """
+
+    def __init__(self, app, policies: list[CachePolicy] = None, store: ResponseStore = None):
+        super().__init__(app)
+        self.policies = policies if policies is not None else CACHE_POLICIES
+        self.store = store or response_store
+        self.flights = SingleFlight()
+
+    def _policy_for(self, request: Request) -> Optional[CachePolicy]:
+        if request.method not in ("GET", "HEAD"):
+            return None
+        path = request.url.path
+        for policy in self.policies:
+            if policy.matches(path):
+                return policy
+        return None
+
+    def _cache_headers(self, policy: CachePolicy, etag: str, viewer: Optional[int]) -> dict:
+        if viewer is None:
+            cache_control = (
+                f"public, max-age={policy.max_age}, "
+                f"stale-while-revalidate={policy.stale_while_revalidate}"
+            )
+        else:
+            cache_control = "private, no-cache"
+        return {
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Vary": "Authorization",
+        }
+
+    async def dispatch(self, request: Request, call_next):
+        policy = self._policy_for(request)
+        if policy is None:
+            return await call_next(request)
+
+        viewer = _viewer_key(request)
+        key = "|".join((
+            request.url.path,
+            str(sorted(request.query_params.multi_items())),
+            str(viewer or "anon"),
+        ))
+        if_none_match = request.headers.get("if-none-match")
+
+        # Versioned content: the ETag is known before running the endpoint
+        etag = None
+        stale = None
+        if policy.resource is not None:
+            etag = _make_etag(
+                key,
+                policy.resource,
+                get_content_version(policy.resource),
+                date.today().isoformat() if policy.daily else "",
+            )
+            cached = self.store.get(key)
+            if cached is not None and cached.etag != etag:
+                stale, cached = cached, None
+        else:
+            cached = self.store.get(key)
+            if cached is not None:
+                etag = cached.etag
+
+        if etag is not None and _etag_matches(if_none_match, etag):
+            return Response(
+                status_code=304,
+                headers=self._cache_headers(policy, etag, viewer)
+            )
+
+        if cached is not None:
+            return self._stored_response(cached, policy, viewer)
+
+        # One request renders this version, concurrent ones wait for it or,
+        # within the stale-while-revalidate window, get the previous body
+        flight = (key, etag)
+        if (stale is not None and self.flights.in_flight(flight)
+                and time.monotonic() - stale.stored_at <= policy.stale_while_revalidate):
+            return self._stored_response(stale, policy, viewer)
+
+        result, shared = await self.flights.do_async(
+            flight, lambda: self._render(request, call_next, key, etag)
+        )
+        if isinstance(result, CachedResponse):
+            return self._stored_response(result, policy, viewer)
+        if shared:
+            # Not a cacheable 200 (its body went to the leader): render our own
+            return await call_next(request)
+        return result
+
+    async def _render(self, request: Request, call_next, key: str, etag: Optional[str]):
+        """Run the endpoint and store a 200 body; other responses are returned as-is."""
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        if etag is None:
+            etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+        media_type = response.headers.get("content-type", "application/json")
+        entry = CachedResponse(etag=etag, body=body, media_type=media_type)
+        self.store.put(key, entry)
+        return entry
+
+    def _stored_response(self, entry: CachedResponse, policy: CachePolicy,
+                         viewer: Optional[int]) -> Response:
+        return Response(
+            content=entry.body,
+            media_type=entry.media_type,
+            headers=self._cache_headers(policy, entry.etag, viewer)
+        )
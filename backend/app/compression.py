@@ -0,0 +1,306 @@
+# compression.py - Response Compression Middleware
+"""
+Provolution Gamification - Response Compression
+gzip / brotli compression with content negotiation and a size threshold.
+
+- The encoding is negotiated from Accept-Encoding (q-values, `*`), brotli
+  preferred when the optional `brotli` package is installed.
+- Bodies below `minimum_size` and non-text content types are sent as-is.
+- Responses with a strong ETag (see app/cache.py) are compressed once per
+  (ETag, encoding) and served pre-compressed afterwards, which covers
+  static payloads like /v1/footprint/factors.
+- Bodies sent in several chunks (e.g. everything behind a
+  BaseHTTPMiddleware) are buffered up to `max_buffer_size` and compressed
+  as a whole; event streams and larger bodies pass through untouched.
+- Bytes in/out are counted per route (GET /health/compression).
+"""
+
+from collections import OrderedDict
+from typing import Optional
+import gzip
+import threading
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # Optional dependency, see requirements.txt
+    brotli = None
+
+
+DEFAULT_MINIMUM_SIZE = 500  # bytes
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+MAX_BUFFER_SIZE = 4 * 1024 * 1024  # bytes
+MAX_PRECOMPRESSED = 256
+MAX_STATS_ROUTES = 200
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "text/",
+)
+
+# Never buffered: chunks must reach the client as they are produced
+STREAMING_TYPES = (
+    "text/event-stream",
+)
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Encodings this server can produce, in order of preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best supported encoding for an Accept-Encoding header.
+    Returns None if the client accepts none of them.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in supported_encodings():
+        q = qualities.get(encoding, qualities.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    return any(content_type.startswith(t) for t in COMPRESSIBLE_TYPES)
+
+
+def _is_streaming(content_type: str) -> bool:
+    content_type = content_type.lower()
+    return any(content_type.startswith(t) for t in STREAMING_TYPES)
+
+
+def _strip_encoding_suffix(etag: str) -> str:
+    for encoding in ("br", "gzip"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def _with_encoding_suffix(etag: str, encoding: str) -> str:
+    # A compressed representation needs its own strong ETag
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+# ============================================
+# STATISTICS
+# ============================================
+
+class CompressionStats:
+    """Per-route byte counters (thread-safe, bounded)."""
+
+    def __init__(self, max_routes: int = MAX_STATS_ROUTES):
+        self.max_routes = max_routes
+        self._routes: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, original: int, sent: int, encoding: Optional[str]) -> None:
+        with self._lock:
+            if route not in self._routes and len(self._routes) >= self.max_routes:
+                route = "(other)"
+            entry = self._routes.setdefault(route, {
+                "responses": 0,
+                "compressed": 0,
+                "bytes_original": 0,
+                "bytes_sent": 0,
+            })
+            entry["responses"] += 1
+            entry["compressed"] += 1 if encoding else 0
+            entry["bytes_original"] += original
+            entry["bytes_sent"] += sent
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = {k: dict(v) for k, v in self._routes.items()}
+        for entry in routes.values():
+            saved = entry["bytes_original"] - entry["bytes_sent"]
+            entry["bytes_saved"] = saved
+            entry["saved_percent"] = (
+                round(saved / entry["bytes_original"] * 100, 1)
+                if entry["bytes_original"] else 0.0
+            )
+        return dict(sorted(routes.items(), key=lambda kv: -kv[1]["bytes_saved"]))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+compression_stats = CompressionStats()
+
+
+# ============================================
+# MIDDLEWARE
+# ============================================
+
+class CompressionMiddleware:
+    """Pure ASGI middleware (buffers chunked bodies, not event streams)."""
+
+    def __init__(self, app, minimum_size: int = DEFAULT_MINIMUM_SIZE, stats: CompressionStats = None,
+                 max_buffer_size: int = MAX_BUFFER_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.max_buffer_size = max_buffer_size
+        self.stats = stats or compression_stats
+        self._precompressed: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_precompressed(self, etag: str, encoding: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._precompressed.get((etag, encoding))
+            if body is not None:
+                self._precompressed.move_to_end((etag, encoding))
+            return body
+
+    def _put_precompressed(self, etag: str, encoding: str, body: bytes) -> None:
+        with self._lock:
+            self._precompressed[(etag, encoding)] = body
+            while len(self._precompressed) > MAX_PRECOMPRESSED:
+                self._precompressed.popitem(last=False)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+
+        # Clients revalidate with the suffixed ETag they received
+        if_none_match = request_headers.get("if-none-match")
+        revalidated_encoding = None
+        if if_none_match:
+            tags = [t.strip() for t in if_none_match.split(",")]
+            for tag in tags:
+                if _strip_encoding_suffix(tag) != tag:
+                    revalidated_encoding = tag.rsplit("-", 1)[1].rstrip('"')
+                    break
+            stripped = ", ".join(_strip_encoding_suffix(t) for t in tags)
+            raw = [(k, v) for k, v in scope["headers"] if k != b"if-none-match"]
+            raw.append((b"if-none-match", stripped.encode("latin-1")))
+            scope = dict(scope, headers=raw)
+
+        route = scope.get("path", "")
+        start_message = None
+        passthrough = False
+        chunks: list[bytes] = []
+        buffered = 0
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough, buffered
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+
+            if message.get("more_body", False):
+                content_type = headers.get("content-type", "")
+                if (
+                    _is_streaming(content_type)
+                    or not _is_compressible(content_type)
+                    or buffered + len(body) > self.max_buffer_size
+                ):
+                    # Forward unchanged from here on, including what was buffered
+                    passthrough = True
+                    await send(start_message)
+                    if chunks:
+                        await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": True})
+                        chunks.clear()
+                    await send(message)
+                    return
+                chunks.append(body)
+                buffered += len(body)
+                return
+
+            if chunks:
+                chunks.append(body)
+                body = b"".join(chunks)
+                chunks.clear()
+                message = {"type": "http.response.body", "body": body, "more_body": False}
+
+            content_type = headers.get("content-type", "")
+            compressible = _is_compressible(content_type)
+            if compressible or start_message["status"] == 304:
+                headers.add_vary_header("Accept-Encoding")
+
+            use_encoding = encoding
+            if (
+                use_encoding is None
+                or not compressible
+                or start_message["status"] != 200
+                or "content-encoding" in headers
+                or len(body) < self.minimum_size
+            ):
+                use_encoding = None
+
+            etag = headers.get("etag")
+            if start_message["status"] == 304 and etag and revalidated_encoding:
+                headers["etag"] = _with_encoding_suffix(etag, revalidated_encoding)
+
+            if use_encoding is None:
+                if start_message["status"] == 200:
+                    self.stats.record(route, len(body), len(body), None)
+                await send(start_message)
+                await send(message)
+                return
+
+            strong_etag = etag if etag and not etag.startswith("W/") else None
+            compressed = None
+            if strong_etag:
+                compressed = self._get_precompressed(strong_etag, use_encoding)
+            if compressed is None:
+                compressed = compress(body, use_encoding)
+                if strong_etag:
+                    self._put_precompressed(strong_etag, use_encoding, compressed)
+
+            self.stats.record(route, len(body), len(compressed), use_encoding)
+
+            headers["content-encoding"] = use_encoding
+            headers["content-length"] = str(len(compressed))
+            if strong_etag:
+                headers["etag"] = _with_encoding_suffix(strong_etag, use_encoding)
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+        await self.app(scope, receive, send_wrapper)
@@ -8,7 +8,7 @@ Cloud-ready for Render.com deployment
 import sqlite3
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator, Optional
+from typing import Callable, Generator, Optional
 import os
 
 # Database path - use environment variable or default
@@ -26,6 +26,14 @@ def get_db_path() -> Path:
 DB_PATH = get_db_path()
 
 
+class Connection(sqlite3.Connection):
+    """SQLite connection that runs after_commit callbacks once get_db has committed."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.after_commit: list[Callable[[], None]] = []
+
+
 def dict_factory(cursor: sqlite3.Cursor, row: tuple) -> dict:
     """Convert SQLite rows to dictionaries."""
     fields = [column[0] for column in cursor.description]
@@ -43,6 +51,7 @@ def ensure_database_exists():
 def initialize_database():
     """Create database schema if not exists."""
     import json
+    from .services.regions import seed_regions
     
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
@@ -62,6 +71,7 @@ def initialize_database():
             total_xp INTEGER DEFAULT 0,
             level INTEGER DEFAULT 1,
             trust_level INTEGER DEFAULT 1,
+            trust_level_pinned INTEGER NOT NULL DEFAULT 0,
             streak_days INTEGER DEFAULT 0,
             streak_last_activity DATE,
             region VARCHAR(50),
@@ -72,7 +82,13 @@ def initialize_database():
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             last_login TIMESTAMP,
             referral_code VARCHAR(20) UNIQUE,
-            referred_by INTEGER REFERENCES users(id)
+            referred_by INTEGER REFERENCES users(id),
+            cache_version INTEGER NOT NULL DEFAULT 0,
+            challenges_completed INTEGER NOT NULL DEFAULT 0,
+            badges_earned INTEGER NOT NULL DEFAULT 0,
+            referrals_count INTEGER NOT NULL DEFAULT 0,
+            total_co2_saved_kg REAL DEFAULT 0,
+            region_id VARCHAR(2) REFERENCES regions(id)
         )
     ''')
     
@@ -117,7 +133,8 @@ def initialize_database():
             verification_status VARCHAR(20) DEFAULT 'pending',
             verified_at TIMESTAMP,
             verified_by INTEGER REFERENCES users(id),
-            xp_earned INTEGER DEFAULT 0
+            xp_earned INTEGER DEFAULT 0,
+            log_bitmap BLOB
         )
     ''')
     
@@ -131,6 +148,7 @@ def initialize_database():
             proof_type VARCHAR(50),
             proof_url VARCHAR(500),
             proof_data TEXT,
+            idempotency_key VARCHAR(64),
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
@@ -190,7 +208,9 @@ def initialize_database():
             team_id INTEGER REFERENCES teams(id) ON DELETE CASCADE,
             user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
             role VARCHAR(20) DEFAULT 'member',
-            joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            xp_contributed INTEGER NOT NULL DEFAULT 0,
+            co2_contributed REAL NOT NULL DEFAULT 0
         )
     ''')
     
@@ -316,11 +336,163 @@ def initialize_database():
         )
     ''')
     
+    # HTTP cache versions (see app/cache.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS content_versions (
+            resource VARCHAR(50) PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # JWT signing keys and revoked tokens (see app/auth/signing_keys.py, revocation.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS signing_keys (
+            kid VARCHAR(32) PRIMARY KEY,
+            secret TEXT NOT NULL,
+            created_at INTEGER NOT NULL
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS revoked_tokens (
+            jti VARCHAR(64) PRIMARY KEY,
+            expires_at INTEGER NOT NULL,
+            revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Regions and regional leaderboard aggregates (see app/services/regions.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS regions (
+            id VARCHAR(2) PRIMARY KEY,
+            name VARCHAR(50) UNIQUE NOT NULL
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS region_postal_codes (
+            prefix VARCHAR(5) PRIMARY KEY,
+            region_id VARCHAR(2) NOT NULL REFERENCES regions(id)
+        ) WITHOUT ROWID
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS region_user_scores (
+            region_id VARCHAR(2) NOT NULL REFERENCES regions(id),
+            period VARCHAR(7) NOT NULL,
+            user_id INTEGER NOT NULL REFERENCES users(id),
+            score REAL NOT NULL DEFAULT 0,
+            completions INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (region_id, period, user_id)
+        ) WITHOUT ROWID
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS region_scores (
+            region_id VARCHAR(2) NOT NULL REFERENCES regions(id),
+            period VARCHAR(7) NOT NULL,
+            total_co2_kg REAL NOT NULL DEFAULT 0,
+            participants INTEGER NOT NULL DEFAULT 0,
+            completions INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (region_id, period)
+        ) WITHOUT ROWID
+    ''')
+    
+    # Per-period, per-metric leaderboard scores (see app/services/leaderboard_scores.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS leaderboard_scores (
+            kind VARCHAR(10) NOT NULL,
+            period_key VARCHAR(20) NOT NULL,
+            scope VARCHAR(10) NOT NULL,
+            metric VARCHAR(20) NOT NULL,
+            user_id INTEGER NOT NULL REFERENCES users(id),
+            score REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (kind, period_key, scope, metric, user_id)
+        ) WITHOUT ROWID
+    ''')
+    
+    # Frozen leaderboards of finished weeks and seasons
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS leaderboard_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind VARCHAR(10) NOT NULL,
+            period_key VARCHAR(20) NOT NULL,
+            metric VARCHAR(20) NOT NULL DEFAULT 'co2_kg',
+            start_date DATE NOT NULL,
+            end_date DATE NOT NULL,
+            participants INTEGER NOT NULL DEFAULT 0,
+            total_score REAL NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (kind, period_key, metric)
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS leaderboard_snapshot_entries (
+            snapshot_id INTEGER NOT NULL REFERENCES leaderboard_snapshots(id) ON DELETE CASCADE,
+            rank INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            score REAL NOT NULL,
+            PRIMARY KEY (snapshot_id, rank, user_id)
+        ) WITHOUT ROWID
+    ''')
+    
+    # Follow graph (see app/services/follows.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS follows (
+            follower_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            followee_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (follower_id, followee_id),
+            CHECK (follower_id != followee_id)
+        ) WITHOUT ROWID
+    ''')
+    
+    # Referral tree as closure table (see app/services/referrals.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS referral_paths (
+            ancestor_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            depth INTEGER NOT NULL,
+            descendant_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            PRIMARY KEY (ancestor_id, depth, descendant_id)
+        ) WITHOUT ROWID
+    ''')
+    
+    # Spot-check review queue (see app/services/verification.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS verification_queue (
+            user_challenge_id INTEGER PRIMARY KEY REFERENCES user_challenges(id) ON DELETE CASCADE,
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            challenge_id VARCHAR(10) NOT NULL REFERENCES challenges(id),
+            region_id VARCHAR(2) REFERENCES regions(id),
+            enqueued_at TIMESTAMP NOT NULL,
+            available_at TIMESTAMP NOT NULL,
+            lease_owner INTEGER REFERENCES users(id),
+            claims INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    
     # Indexes
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_total_xp ON users(total_xp DESC)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_region ON users(region)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_referred_by ON users(referred_by)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_region_id ON users(region_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_region_user_scores_rank ON region_user_scores(region_id, period, score DESC)')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_teams_name ON teams(name COLLATE NOCASE)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_teams_total_xp ON teams(total_xp DESC)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_teams_total_co2 ON teams(total_co2_saved DESC)')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_team_members_user ON team_members(user_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_team_members_team ON team_members(team_id, xp_contributed DESC)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_leaderboard_scores_rank ON leaderboard_scores(kind, period_key, scope, metric, score DESC)')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_snapshot_entries_user ON leaderboard_snapshot_entries(snapshot_id, user_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_follows_followee ON follows(followee_id, created_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_referral_paths_descendant ON referral_paths(descendant_id, depth)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_verification_queue_available ON verification_queue(available_at)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_challenges_user ON user_challenges(user_id)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_challenges_status ON user_challenges(status)')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_challenges_completed ON user_challenges(completed_at) WHERE status = 'completed'")
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_challenge_logs_day ON challenge_logs(user_challenge_id, log_date)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_xp_transactions_user ON xp_transactions(user_id)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_footprint_user ON user_footprint(user_id)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_footprint_history_user ON footprint_history(user_id)')
@@ -361,6 +533,8 @@ def initialize_database():
         ''', emission_factors)
         print(f"[DB] Inserted {len(emission_factors)} emission factors")
     
+    seed_regions(conn)
+    
     # Insert default badges
     badges = [
         ('klimaheld_in_spe', 'Klimaheld in spe', 'Profil vervollständigt', '🌱', 'bronze', 'onboarding'),
@@ -446,11 +620,13 @@ def get_db() -> Generator[sqlite3.Connection, None, None]:
     ensure_database_exists()
     conn = None
     try:
-        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, factory=Connection)
         conn.row_factory = dict_factory
         conn.execute("PRAGMA foreign_keys = ON")
         yield conn
         conn.commit()
+        for callback in conn.after_commit:
+            callback()
     except sqlite3.Error as e:
         if conn:
             conn.rollback()
@@ -0,0 +1,185 @@
+# live.py - Live Leaderboard Updates
+"""
+Provolution Gamification - Live Leaderboards (Server-Sent Events)
+Pushes rank changes of open leaderboards instead of clients re-fetching them.
+
+- One `LiveBoard` per (board, metric, region) with any number of
+  subscribers. A change is computed once per board - one top-N read and
+  one diff against the previous state - and the encoded event is handed to
+  every subscriber queue as the same bytes.
+- Changes are detected from the `leaderboards` content version (see
+  app/cache.py), read from the table like the version stored with each
+  board's state. Completions in this worker call `notify()` after their
+  commit to wake the hub at once; changes from other workers are picked up
+  by the poll every POLL_INTERVAL seconds.
+- After an update the hub waits COALESCE_INTERVAL seconds, so a burst of
+  completions becomes a single delta.
+- Subscribers whose queue is full are dropped; their EventSource
+  reconnects and starts again from a snapshot.
+
+Events: `snapshot` (full ranking, on connect and when the period rolls
+over) and `delta` (entries that entered or changed rank/score, user IDs
+that left the top N). Comment lines keep idle connections open.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import AsyncIterator, Callable, Optional
+import asyncio
+
+from .cache import RESOURCE_LEADERBOARDS, read_content_version
+from .database import get_db
+from .models import LeaderboardChange, LeaderboardDelta, LeaderboardSnapshot
+from .responses import dumps
+
+
+POLL_INTERVAL = 1.0  # seconds
+COALESCE_INTERVAL = 1.0  # seconds
+HEARTBEAT_INTERVAL = 15.0  # seconds
+SUBSCRIBER_QUEUE_SIZE = 32
+
+KEEPALIVE = b": keepalive\n\n"
+
+
+def encode_event(event: str, data: bytes, event_id: Optional[int] = None) -> bytes:
+    """One SSE message (data is compact JSON, so it is a single line)."""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\n".encode("utf-8") + b"data: " + data + b"\n\n"
+
+
+def diff_rankings(previous: LeaderboardSnapshot, current: LeaderboardSnapshot) -> LeaderboardDelta:
+    """Entries that are new or moved/changed score, and users no longer ranked."""
+    before = {e.user.id: e for e in previous.rankings}
+    changes = []
+    for entry in current.rankings:
+        old = before.pop(entry.user.id, None)
+        if old is None or old.rank != entry.rank or old.score != entry.score:
+            changes.append(LeaderboardChange(
+                rank=entry.rank,
+                user=entry.user,
+                score=entry.score,
+                previous_rank=old.rank if old else None
+            ))
+    return LeaderboardDelta(version=current.version, changes=changes, removed=list(before))
+
+
+@dataclass
+class LiveBoard:
+    """A leaderboard with its subscribers and last computed state."""
+    compute: Callable[[], LeaderboardSnapshot]  # blocking, runs in a thread
+    state: Optional[LeaderboardSnapshot] = None
+    snapshot_event: bytes = b""
+    computed_on: Optional[date] = None
+    subscribers: set = field(default_factory=set)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    async def refresh(self) -> None:
+        """Recompute once and fan the resulting event out to all subscribers."""
+        async with self.lock:
+            state = await asyncio.to_thread(self.compute)
+            previous, self.state = self.state, state
+            self.computed_on = date.today()
+            self.snapshot_event = encode_event("snapshot", dumps(state), state.version)
+            if previous is None:
+                return
+            if previous.period != state.period:
+                event = self.snapshot_event
+            else:
+                delta = diff_rankings(previous, state)
+                if not delta.changes and not delta.removed:
+                    return
+                event = encode_event("delta", dumps(delta), state.version)
+            for queue in list(self.subscribers):
+                self._deliver(queue, event)
+
+    def _deliver(self, queue: asyncio.Queue, event: bytes) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow: end the stream, the client resyncs from a snapshot
+            self.subscribers.discard(queue)
+            queue.get_nowait()
+            queue.put_nowait(None)
+
+
+def _leaderboards_version() -> int:
+    # From the table like the boards' own state.version: this worker's
+    # cached copy can lag behind and would trigger extra recomputes
+    with get_db() as conn:
+        return read_content_version(conn, RESOURCE_LEADERBOARDS)
+
+
+class LiveLeaderboards:
+    """Per-process hub of live boards, driven by one background task."""
+
+    def __init__(self):
+        self._boards: dict[tuple, LiveBoard] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        """A leaderboard changed (call after commit; safe from any thread)."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def subscriber_count(self) -> int:
+        return sum(len(b.subscribers) for b in self._boards.values())
+
+    async def stream(self, key: tuple,
+                     compute: Callable[[], LeaderboardSnapshot]) -> AsyncIterator[bytes]:
+        """SSE byte stream for one subscriber of the board `key`."""
+        board = self._boards.setdefault(key, LiveBoard(compute))
+        queue: asyncio.Queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        board.subscribers.add(queue)
+        self._ensure_running()
+        try:
+            if board.state is None:
+                await board.refresh()
+            yield board.snapshot_event
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield KEEPALIVE
+                    continue
+                if event is None:
+                    return
+                yield event
+        finally:
+            board.subscribers.discard(queue)
+            if not board.subscribers and self._boards.get(key) is board:
+                del self._boards[key]
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = self._loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._boards:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            version = await asyncio.to_thread(_leaderboards_version)
+            today = date.today()
+            stale = [
+                board for board in list(self._boards.values())
+                if board.state is not None
+                and (board.state.version != version or board.computed_on != today)
+            ]
+            for board in stale:
+                try:
+                    await board.refresh()
+                except Exception as e:
+                    print(f"[Live] Leaderboard refresh failed, retrying: {e}")
+            if stale:
+                await asyncio.sleep(COALESCE_INTERVAL)
+
+
+live_leaderboards = LiveLeaderboards()
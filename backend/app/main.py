@@ -19,14 +19,21 @@ from contextlib import asynccontextmanager
 import time
 import os
 
+from .auth.signing_keys import key_ring
 from .database import check_database_health
+from .cache import ResponseCacheMiddleware
+from .compression import CompressionMiddleware, compression_stats
+from .ratelimit import RateLimitMiddleware
+from .responses import FastJSONResponse
 from .routers import (
     auth_router,
     users_router,
     challenges_router,
     leaderboards_router,
     badges_router,
-    rewards_router
+    rewards_router,
+    teams_router,
+    verification_router
 )
 from .routers.footprint import router as footprint_router
 from .routers.google_auth import router as google_auth_router
@@ -44,6 +51,7 @@ Engage users in climate action through challenges, badges, and rewards.
 - **Challenges**: Join and complete climate-action challenges
 - **Progress Tracking**: Log daily activities and track progress  
 - **Leaderboards**: Compete with others in CO₂ savings
+- **Teams**: Collect XP and CO₂ savings together
 - **Badges**: Earn badges for achievements
 - **Hardware Rewards**: Redeem XP for eco-friendly hardware
 - **CO₂ Footprint Calculator**: Calculate your personal carbon footprint
@@ -70,6 +78,9 @@ async def lifespan(app: FastAPI):
     else:
         print(f"[WARN] Database issue: {health.get('error', 'unknown')}")
     
+    # Load (or create) the JWT signing keys before the first request
+    key_ring.load()
+    
     yield
     
     # Shutdown
@@ -82,12 +93,30 @@ app = FastAPI(
     description=API_DESCRIPTION,
     version=API_VERSION,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json"
 )
 
 
+# HTTP response cache (ETag / Cache-Control) - registered before CORS so
+# that 304s and cached bodies still pass through the CORS middleware
+app.add_middleware(ResponseCacheMiddleware)
+
+# gzip/brotli compression - wraps the cache so cached bodies are served
+# pre-compressed; bodies below the threshold are sent uncompressed
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get('COMPRESSION_MIN_SIZE', 500))
+)
+
+
+# Rate limiting - outside cache and compression so rejected requests cost
+# one bucket update, inside CORS so browsers can read the 429
+app.add_middleware(RateLimitMiddleware)
+
+
 # CORS middleware - configured for local dev and production
 app.add_middleware(
     CORSMiddleware,
@@ -153,6 +182,8 @@ app.include_router(challenges_router, prefix="/v1")
 app.include_router(leaderboards_router, prefix="/v1")
 app.include_router(badges_router, prefix="/v1")
 app.include_router(rewards_router, prefix="/v1")
+app.include_router(teams_router, prefix="/v1")
+app.include_router(verification_router, prefix="/v1")
 app.include_router(footprint_router, prefix="/v1")
 app.include_router(google_auth_router, prefix="/v1")
 
@@ -186,6 +217,16 @@ def health_check():
     }
 
 
+@app.get("/health/compression", tags=["Status"])
+def compression_report():
+    """
+    Bytes saved by response compression per route since process start.
+    """
+    return {
+        "routes": compression_stats.snapshot()
+    }
+
+
 # API info endpoint
 @app.get("/v1", tags=["Status"])
 def api_v1_info():
@@ -6,12 +6,18 @@ Provolution Gamification - Model Exports
 from .user import (
     UserRegisterRequest,
     UserLoginRequest,
+    RefreshTokenRequest,
     UserUpdateRequest,
     UserResponse,
     UserBriefResponse,
     UserStats,
     AuthResponse,
-    RegisterResponse
+    RegisterResponse,
+    TokenRefreshResponse,
+    FollowResponse,
+    FollowListResponse,
+    ReferralLevel,
+    ReferralReachResponse
 )
 
 from .challenge import (
@@ -30,7 +36,13 @@ from .challenge import (
     ChallengeJoinResponse,
     DailyLogRequest,
     DailyLogResponse,
+    BatchLogEntry,
+    BatchLogRequest,
+    BatchLogResult,
+    BatchChallengeProgress,
+    BatchLogResponse,
     ChallengeProgressResponse,
+    ChallengeCalendarResponse,
     UserChallengeStatus,
     DailyLog,
     ProgressInfo,
@@ -41,7 +53,16 @@ from .leaderboard import (
     LeaderboardPeriod,
     LeaderboardEntry,
     LeaderboardResponse,
-    MyRank
+    LeaderboardSnapshot,
+    LeaderboardChange,
+    LeaderboardDelta,
+    MyRank,
+    RegionInfo,
+    RegionSummary,
+    RegionsSummaryResponse,
+    SeasonInfo,
+    SeasonListResponse,
+    SeasonLeaderboardResponse
 )
 
 from .badge import (
@@ -52,6 +73,13 @@ from .badge import (
     AllBadgesResponse
 )
 
+from .dashboard import (
+    DashboardChallenge,
+    DashboardBadges,
+    DashboardRanks,
+    DashboardResponse
+)
+
 from .reward import (
     HardwarePackage,
     HardwarePackagesResponse,
@@ -61,16 +89,46 @@ from .reward import (
     RedemptionInfo
 )
 
+from .team import (
+    TeamCreateRequest,
+    TeamUpdateRequest,
+    TeamInfo,
+    TeamMember,
+    TeamResponse,
+    TeamLeaveResponse,
+    TeamBrief,
+    TeamLeaderboardEntry,
+    TeamLeaderboardResponse
+)
+
+from .verification import (
+    SpotCheckOutcome,
+    SpotCheckClaimRequest,
+    SpotCheckItem,
+    SpotCheckClaimResponse,
+    SpotCheckDecision,
+    SpotCheckDecisionRequest,
+    SpotCheckDecisionResult,
+    SpotCheckDecisionResponse,
+    VerificationQueueStats
+)
+
 __all__ = [
     # User
     "UserRegisterRequest",
     "UserLoginRequest", 
+    "RefreshTokenRequest",
     "UserUpdateRequest",
     "UserResponse",
     "UserBriefResponse",
     "UserStats",
     "AuthResponse",
     "RegisterResponse",
+    "TokenRefreshResponse",
+    "FollowResponse",
+    "FollowListResponse",
+    "ReferralLevel",
+    "ReferralReachResponse",
     # Challenge
     "ChallengeCategory",
     "ChallengeDifficulty",
@@ -87,7 +145,13 @@ __all__ = [
     "ChallengeJoinResponse",
     "DailyLogRequest",
     "DailyLogResponse",
+    "BatchLogEntry",
+    "BatchLogRequest",
+    "BatchLogResult",
+    "BatchChallengeProgress",
+    "BatchLogResponse",
     "ChallengeProgressResponse",
+    "ChallengeCalendarResponse",
     "UserChallengeStatus",
     "DailyLog",
     "ProgressInfo",
@@ -96,13 +160,27 @@ __all__ = [
     "LeaderboardPeriod",
     "LeaderboardEntry",
     "LeaderboardResponse",
+    "LeaderboardSnapshot",
+    "LeaderboardChange",
+    "LeaderboardDelta",
     "MyRank",
+    "RegionInfo",
+    "RegionSummary",
+    "RegionsSummaryResponse",
+    "SeasonInfo",
+    "SeasonListResponse",
+    "SeasonLeaderboardResponse",
     # Badge
     "Badge",
     "EarnedBadge",
     "NextBadge",
     "MyBadgesResponse",
     "AllBadgesResponse",
+    # Dashboard
+    "DashboardChallenge",
+    "DashboardBadges",
+    "DashboardRanks",
+    "DashboardResponse",
     # Reward
     "HardwarePackage",
     "HardwarePackagesResponse",
@@ -110,4 +188,24 @@ __all__ = [
     "RedeemRequest",
     "RedeemResponse",
     "RedemptionInfo",
+    # Team
+    "TeamCreateRequest",
+    "TeamUpdateRequest",
+    "TeamInfo",
+    "TeamMember",
+    "TeamResponse",
+    "TeamLeaveResponse",
+    "TeamBrief",
+    "TeamLeaderboardEntry",
+    "TeamLeaderboardResponse",
+    # Verification
+    "SpotCheckOutcome",
+    "SpotCheckClaimRequest",
+    "SpotCheckItem",
+    "SpotCheckClaimResponse",
+    "SpotCheckDecision",
+    "SpotCheckDecisionRequest",
+    "SpotCheckDecisionResult",
+    "SpotCheckDecisionResponse",
+    "VerificationQueueStats",
 ]
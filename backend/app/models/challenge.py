@@ -29,6 +29,7 @@ class ChallengeStatus(str, Enum):
     ACTIVE = "active"
     COMPLETED = "completed"
     ABANDONED = "abandoned"
+    REJECTED = "rejected"  # completion rejected by a spot check
 
 
 class VerificationMethod(str, Enum):
@@ -80,6 +81,21 @@ class DailyLogRequest(BaseModel):
     notes: Optional[str] = Field(None, max_length=500)
     proof_type: Optional[str] = None  # photo, api, none
     proof_url: Optional[str] = None
+    # Client-chosen ID; resending the same log with it is answered like the original
+    idempotency_key: Optional[str] = Field(None, max_length=64)
+
+
+MAX_BATCH_LOG_ENTRIES = 500
+
+
+class BatchLogEntry(DailyLogRequest):
+    """One day for one challenge in a batch."""
+    challenge_id: str
+
+
+class BatchLogRequest(BaseModel):
+    """Request model for logging many days at once (offline clients)."""
+    entries: List[BatchLogEntry] = Field(..., min_length=1, max_length=MAX_BATCH_LOG_ENTRIES)
 
 
 # Response models
@@ -161,6 +177,35 @@ class DailyLogResponse(BaseModel):
     progress: ProgressInfo
     xp_earned: int = 0
     streak: StreakInfo
+    replayed: bool = False  # True if answered from an earlier request (idempotency_key)
+
+
+class BatchLogResult(BaseModel):
+    """Outcome of one batch entry, in request order."""
+    challenge_id: str
+    log_date: date
+    logged: bool
+    error: Optional[str] = None  # NOT_FOUND, ALREADY_LOGGED, INVALID_LOG_DATE, CHALLENGE_COMPLETED
+    replayed: bool = False
+
+
+class BatchChallengeProgress(BaseModel):
+    """Progress of a challenge touched by the batch."""
+    challenge_id: str
+    days_completed: int
+    days_remaining: int
+    progress_percent: int
+    completed: bool = False
+    xp_earned: int = 0
+
+
+class BatchLogResponse(BaseModel):
+    """Response when logging a batch of days."""
+    success: bool
+    logged: int
+    results: List[BatchLogResult]
+    challenges: List[BatchChallengeProgress]
+    xp_earned: int = 0
 
 
 class ChallengeProgressResponse(BaseModel):
@@ -171,5 +216,23 @@ class ChallengeProgressResponse(BaseModel):
     days_completed: int
     days_remaining: int
     progress_percent: int
+    current_streak: int = 0
+    longest_streak: int = 0
     logs: List[DailyLog]
     verification_status: str = "pending"
+
+
+class ChallengeCalendarResponse(BaseModel):
+    """
+    Completed days of a participation as a bitmap: bit i (byte i // 8,
+    bit i % 8) = start_date + i days, base64-encoded.
+    """
+    challenge_id: str
+    status: ChallengeStatus
+    start_date: date
+    duration_days: int
+    days_completed: int
+    current_streak: int
+    longest_streak: int
+    completed_today: bool
+    bitmap: str
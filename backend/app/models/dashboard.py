@@ -0,0 +1,50 @@
+# models/dashboard.py - Dashboard Pydantic Models
+"""
+Provolution Gamification - Dashboard Models
+Everything the app shows on page load, in one response.
+"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+from .user import UserResponse
+from .badge import EarnedBadge, NextBadge
+from .leaderboard import MyRank
+from .footprint import FootprintSummary
+
+
+class DashboardChallenge(BaseModel):
+    """Active challenge with today's log state."""
+    challenge_id: str
+    name: str
+    category: Optional[str] = None
+    started_at: datetime
+    duration_days: int
+    days_completed: int = 0
+    progress_percent: int = 0
+    logged_today: bool = False
+
+
+class DashboardBadges(BaseModel):
+    """Most recent badges plus the next milestone."""
+    recent: List[EarnedBadge]
+    total_earned: int
+    next_badge: Optional[NextBadge] = None
+
+
+class DashboardRanks(BaseModel):
+    """Own position in the weekly and monthly leaderboards."""
+    weekly: MyRank
+    monthly: MyRank
+
+
+class DashboardResponse(BaseModel):
+    """Response for GET /users/me/dashboard."""
+    success: bool = True
+    profile: UserResponse
+    active_challenges: List[DashboardChallenge]
+    badges: DashboardBadges
+    footprint: Optional[FootprintSummary] = None
+    ranks: DashboardRanks
+    generated_at: datetime
@@ -5,7 +5,7 @@ Provolution Gamification - Leaderboard Models
 
 from pydantic import BaseModel
 from typing import List, Optional
-from datetime import date
+from datetime import date, datetime
 from .user import UserBriefResponse
 
 
@@ -31,8 +31,76 @@ class MyRank(BaseModel):
     users_below: int
 
 
+class RegionInfo(BaseModel):
+    """A region (Bundesland)."""
+    id: str
+    name: str
+
+
 class LeaderboardResponse(BaseModel):
     """Full leaderboard response."""
     period: LeaderboardPeriod
+    metric: str = "co2_kg"  # co2_kg, xp, challenges
     rankings: List[LeaderboardEntry]
     my_rank: Optional[MyRank] = None
+    region: Optional[RegionInfo] = None
+
+
+class LeaderboardSnapshot(LeaderboardResponse):
+    """Full ranking sent as the `snapshot` event of a live stream."""
+    version: int
+
+
+class LeaderboardChange(BaseModel):
+    """An entry that entered the ranking or changed rank or score."""
+    rank: int
+    user: UserBriefResponse
+    score: float
+    previous_rank: Optional[int] = None  # None = new in the top N
+
+
+class LeaderboardDelta(BaseModel):
+    """`delta` event of a live stream: changes since the previous event."""
+    version: int
+    changes: List[LeaderboardChange]
+    removed: List[int]  # user IDs that left the top N
+
+
+class RegionSummary(BaseModel):
+    """Aggregated CO2 savings of one region in the period."""
+    rank: int
+    region: RegionInfo
+    total_co2_kg: float
+    participants: int
+    completions: int
+
+
+class RegionsSummaryResponse(BaseModel):
+    """All regions ranked by CO2 saved."""
+    period: LeaderboardPeriod
+    regions: List[RegionSummary]
+    my_region: Optional[str] = None
+
+
+class SeasonInfo(BaseModel):
+    """A 3-month season."""
+    id: str  # e.g. 2026-herbst
+    name: str
+    theme: str
+    start: date
+    end: date
+    status: str  # active, closed (frozen), pending (ended, not frozen yet)
+    participants: Optional[int] = None
+    total_co2_kg: Optional[float] = None
+    frozen_at: Optional[datetime] = None
+
+
+class SeasonListResponse(BaseModel):
+    """Current season plus all frozen seasons, newest first."""
+    current: SeasonInfo
+    seasons: List[SeasonInfo]
+
+
+class SeasonLeaderboardResponse(LeaderboardResponse):
+    """Leaderboard of one season (live while active, frozen afterwards)."""
+    season: SeasonInfo
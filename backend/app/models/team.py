@@ -0,0 +1,81 @@
+# models/team.py - Team Pydantic Models
+"""
+Provolution Gamification - Team Models
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from .user import UserBriefResponse
+from .leaderboard import MyRank
+
+
+class TeamCreateRequest(BaseModel):
+    """Request model for creating a team."""
+    name: str = Field(..., min_length=3, max_length=50)
+    description: Optional[str] = Field(None, max_length=500)
+
+
+class TeamUpdateRequest(BaseModel):
+    """Request model for team updates (captain only)."""
+    name: Optional[str] = Field(None, min_length=3, max_length=50)
+    description: Optional[str] = Field(None, max_length=500)
+
+
+class TeamInfo(BaseModel):
+    """Team with its maintained totals."""
+    id: int
+    name: str
+    description: Optional[str] = None
+    total_xp: int = 0
+    total_co2_saved: float = 0
+    member_count: int = 0
+    created_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
+class TeamMember(BaseModel):
+    """A team member and what they contributed since joining."""
+    user: UserBriefResponse
+    role: str = "member"  # captain, member
+    joined_at: Optional[datetime] = None
+    xp_contributed: int = 0
+    co2_contributed: float = 0
+
+
+class TeamResponse(BaseModel):
+    """Team details with its top contributors."""
+    success: bool = True
+    team: TeamInfo
+    members: List[TeamMember]
+    my_role: Optional[str] = None
+
+
+class TeamLeaveResponse(BaseModel):
+    """Response when leaving a team."""
+    success: bool
+    team_id: int
+    team_dissolved: bool = False
+    message: str
+
+
+class TeamBrief(BaseModel):
+    """Brief team info for leaderboards."""
+    id: int
+    name: str
+    member_count: int
+
+
+class TeamLeaderboardEntry(BaseModel):
+    """Single entry in the team leaderboard."""
+    rank: int
+    team: TeamBrief
+    score: float
+    metric: str = "xp"  # xp, co2_kg
+
+
+class TeamLeaderboardResponse(BaseModel):
+    """Team leaderboard response."""
+    metric: str
+    rankings: List[TeamLeaderboardEntry]
+    my_team: Optional[MyRank] = None
@@ -5,7 +5,7 @@ Request/Response schemas for user-related endpoints
 """
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 import re
 
@@ -43,6 +43,11 @@ class UserLoginRequest(BaseModel):
     password: str
 
 
+class RefreshTokenRequest(BaseModel):
+    """Request model for token refresh and logout."""
+    refresh_token: str
+
+
 class UserUpdateRequest(BaseModel):
     """Request model for profile updates."""
     display_name: Optional[str] = Field(None, max_length=50)
@@ -96,6 +101,7 @@ class AuthResponse(BaseModel):
     """Response model for authentication endpoints."""
     success: bool
     token: str
+    refresh_token: Optional[str] = None
     user: UserResponse
     message: Optional[str] = None
 
@@ -105,3 +111,49 @@ class RegisterResponse(BaseModel):
     success: bool
     user: dict
     token: str
+    refresh_token: Optional[str] = None
+
+
+class TokenRefreshResponse(BaseModel):
+    """Response model for token refresh (both tokens are rotated)."""
+    success: bool
+    token: str
+    refresh_token: str
+    expires_in: int
+
+
+class FollowResponse(BaseModel):
+    """Response to following or unfollowing a user."""
+    success: bool = True
+    user_id: int
+    following: bool
+    followers_count: int
+    message: str
+
+
+class FollowListResponse(BaseModel):
+    """A page of the users you follow or who follow you (newest first)."""
+    users: List[UserBriefResponse]
+    total: int
+    offset: int
+    limit: int
+
+
+class ReferralLevel(BaseModel):
+    """Users referred at one level of someone's referral tree (1 = directly)."""
+    depth: int
+    users: int
+    co2_saved_kg: float
+
+
+class ReferralReachResponse(BaseModel):
+    """A user's referral network and the CO2 it saved."""
+    user_id: int
+    direct: int
+    indirect: int
+    total: int
+    levels: List[ReferralLevel]
+    own_co2_saved_kg: float
+    network_co2_saved_kg: float
+    impact_multiplier: Optional[float] = None  # (own + network) / own, None without own savings
+    max_depth: int
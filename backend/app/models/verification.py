@@ -0,0 +1,77 @@
+# models/verification.py - Spot-Check Pydantic Models
+"""
+Provolution Gamification - Verification Models
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from enum import Enum
+from .user import UserBriefResponse
+
+
+MAX_SPOT_CHECK_DECISIONS = 100
+
+
+class SpotCheckOutcome(str, Enum):
+    ACCEPT = "accept"
+    REJECT = "reject"
+
+
+class SpotCheckClaimRequest(BaseModel):
+    """Request model for claiming a batch of spot checks."""
+    limit: int = Field(10, ge=1, le=50)
+    lease_seconds: int = Field(600, ge=60, le=3600)
+
+
+class SpotCheckItem(BaseModel):
+    """A completion drawn for review, leased to the reviewer."""
+    user_challenge_id: int
+    challenge_id: str
+    challenge_name: str
+    verification_method: Optional[str] = None
+    user: UserBriefResponse
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    days_completed: int = 0
+    proofs: List[str] = []
+    enqueued_at: datetime
+    lease_expires_at: datetime
+
+
+class SpotCheckClaimResponse(BaseModel):
+    """Claimed spot checks; decide them before the lease expires."""
+    items: List[SpotCheckItem]
+
+
+class SpotCheckDecision(BaseModel):
+    """Outcome for one claimed spot check."""
+    user_challenge_id: int
+    outcome: SpotCheckOutcome
+
+
+class SpotCheckDecisionRequest(BaseModel):
+    """Request model for deciding claimed spot checks in one transaction."""
+    decisions: List[SpotCheckDecision] = Field(..., min_length=1, max_length=MAX_SPOT_CHECK_DECISIONS)
+
+
+class SpotCheckDecisionResult(BaseModel):
+    """Whether one decision was applied, in request order."""
+    user_challenge_id: int
+    applied: bool
+    error: Optional[str] = None  # NOT_CLAIMED (no valid lease of yours)
+
+
+class SpotCheckDecisionResponse(BaseModel):
+    """Response when deciding spot checks."""
+    success: bool
+    accepted: int
+    rejected: int
+    xp_reverted: int = 0
+    results: List[SpotCheckDecisionResult]
+
+
+class VerificationQueueStats(BaseModel):
+    """Size of the review queue."""
+    queued: int
+    claimable: int
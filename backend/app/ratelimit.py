@@ -0,0 +1,309 @@
+# ratelimit.py - Rate Limiting Middleware
+"""
+Provolution Gamification - Rate Limiting
+Token buckets per route group and caller, checked before the request
+reaches any router (no database, bcrypt or JSON work for rejected calls).
+
+- Callers are identified by the user ID of a valid bearer token (signature
+  check only) or else by client IP; `/auth/*` is always limited per IP.
+  Behind proxies the IP is the X-Forwarded-For entry added by the outermost
+  trusted proxy (`RATE_LIMIT_TRUSTED_PROXIES` hops from the right); entries
+  further left are client-supplied and ignored.
+- Token check and bucket update can block (SQLite, key ring reload), so
+  they run in a worker thread, not on the event loop.
+- Buckets live in a small SQLite file outside the main database (default
+  in /dev/shm, i.e. RAM), so all uvicorn workers on a host share them.
+  Each check is one atomic upsert; `RATE_LIMIT_BACKEND=memory` keeps them
+  per process instead.
+- Rejected calls get 429 with `Retry-After`; all limited responses carry
+  `X-RateLimit-Limit` / `X-RateLimit-Remaining`.
+- If the bucket store fails, requests are let through.
+- `RATE_LIMIT_ENABLED=0` disables the middleware (load tests).
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+import math
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+
+import anyio
+import jwt
+from starlette.datastructures import Headers
+
+from .auth.jwt_handler import decode_token
+from .responses import FastJSONResponse
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """`limit` requests per `period` seconds (burst up to `limit`)."""
+    name: str
+    pattern: str
+    methods: tuple[str, ...]
+    limit: int
+    period: int = 60
+    per_user: bool = True  # False = always per client IP
+
+    def matches(self, method: str, path: str) -> bool:
+        return method in self.methods and re.fullmatch(self.pattern, path) is not None
+
+
+_WRITE = ("POST", "PUT", "PATCH", "DELETE")
+
+# First match wins (see API_SPECIFICATION.md, "Rate Limits")
+RATE_LIMITS = [
+    RateLimit("auth-login", r"/v1/auth/login", ("POST",), limit=10, per_user=False),
+    RateLimit("auth", r"/v1/auth/.+", ("POST",), limit=10, per_user=False),
+    RateLimit("challenge-log", r"/v1/challenges/[^/]+/log", ("POST",), limit=30),
+    RateLimit("challenge-log-batch", r"/v1/challenges/logs:batch", ("POST",), limit=10),
+    RateLimit("footprint-calculate", r"/v1/footprint/calculate", ("POST",), limit=20),
+    RateLimit("leaderboard-stream", r"/v1/leaderboards/(.+/)?stream", ("GET",), limit=10),
+    RateLimit("leaderboards", r"/v1/leaderboards/.+", ("GET",), limit=20),
+    RateLimit("write", r"/v1/.+", _WRITE, limit=30),
+    RateLimit("read", r"/v1/.*", ("GET", "HEAD"), limit=100),
+]
+
+PRUNE_INTERVAL = 300.0  # seconds
+MAX_MEMORY_BUCKETS = 100000
+CHECK_THREADS = 8  # concurrent bucket checks, separate from the endpoint thread pool
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    remaining: int
+    retry_after: float = 0.0
+
+
+# ============================================
+# BUCKET STORES
+# ============================================
+
+def _default_store_path() -> Path:
+    shm = Path("/dev/shm")
+    base = shm if shm.is_dir() and os.access(shm, os.W_OK) else Path(tempfile.gettempdir())
+    return base / "provolution_ratelimit.db"
+
+
+class SQLiteBucketStore:
+    """Token buckets in a SQLite file shared by all workers on the host."""
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.environ.get("RATE_LIMIT_DB_PATH") or _default_store_path())
+        self._local = threading.local()
+        self._pruned_at = 0.0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                ) WITHOUT ROWID
+                """
+            )
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, key: str, limit: int, period: int) -> Decision:
+        now = time.time()
+        rate = limit / period
+        conn = self._conn()
+        # Refill and take one token in one statement; the WHERE skips the
+        # update (and RETURNING) when the bucket is empty
+        row = conn.execute(
+            """
+            INSERT INTO rate_limit_buckets (key, tokens, updated_at)
+            VALUES (:key, :limit - 1, :now)
+            ON CONFLICT(key) DO UPDATE SET
+                tokens = MIN(:limit, tokens + (:now - updated_at) * :rate) - 1,
+                updated_at = :now
+            WHERE MIN(:limit, tokens + (:now - updated_at) * :rate) >= 1
+            RETURNING tokens
+            """,
+            {"key": key, "limit": limit, "now": now, "rate": rate}
+        ).fetchone()
+
+        if now - self._pruned_at >= PRUNE_INTERVAL:
+            self._prune(conn, now)
+
+        if row is not None:
+            return Decision(True, int(row[0]))
+        tokens, updated_at = conn.execute(
+            "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)
+        ).fetchone()
+        available = min(limit, tokens + (now - updated_at) * rate)
+        return Decision(False, 0, (1 - available) / rate)
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        # A bucket untouched for the longest period is full again anyway
+        self._pruned_at = now
+        longest = max(rule.period for rule in RATE_LIMITS)
+        conn.execute("DELETE FROM rate_limit_buckets WHERE updated_at < ?", (now - longest,))
+
+
+class MemoryBucketStore:
+    """Token buckets in this process only."""
+
+    def __init__(self, max_buckets: int = MAX_MEMORY_BUCKETS):
+        self.max_buckets = max_buckets
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, limit: int, period: int) -> Decision:
+        now = time.time()
+        rate = limit / period
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (limit, now))
+            tokens = min(limit, tokens + (now - updated_at) * rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return Decision(False, 0, (1 - tokens) / rate)
+            if key not in self._buckets and len(self._buckets) >= self.max_buckets:
+                self._buckets.clear()
+            self._buckets[key] = (tokens - 1, now)
+            return Decision(True, int(tokens - 1))
+
+
+def create_bucket_store():
+    if os.environ.get("RATE_LIMIT_BACKEND", "sqlite").lower() == "memory":
+        return MemoryBucketStore()
+    return SQLiteBucketStore()
+
+
+# ============================================
+# MIDDLEWARE
+# ============================================
+
+def _trust_forwarded() -> bool:
+    # Render terminates TLS in a proxy that sets X-Forwarded-For
+    default = "1" if os.environ.get("RENDER") else "0"
+    return os.environ.get("RATE_LIMIT_TRUST_FORWARDED", default) == "1"
+
+
+def _trusted_proxies() -> int:
+    # Proxies in front of the app that each append one X-Forwarded-For entry
+    return max(1, int(os.environ.get("RATE_LIMIT_TRUSTED_PROXIES", "1")))
+
+
+def _forwarded_client_ip(forwarded: str, trusted_proxies: int = 1) -> Optional[str]:
+    """
+    Client IP from X-Forwarded-For behind `trusted_proxies` proxies: the
+    entry the outermost of them appended. None if the header is shorter.
+    """
+    entries = [e.strip() for e in forwarded.split(",")]
+    if len(entries) < trusted_proxies or not entries[-trusted_proxies]:
+        return None
+    return entries[-trusted_proxies]
+
+
+def _rejection(rule: RateLimit, decision: Decision) -> FastJSONResponse:
+    retry_after = max(1, math.ceil(decision.retry_after))
+    return FastJSONResponse(
+        status_code=429,
+        content={
+            "success": False,
+            "error": {
+                "code": "RATE_LIMITED",
+                "message": f"Zu viele Anfragen. Bitte in {retry_after} Sekunden erneut versuchen."
+            }
+        },
+        headers={
+            "Retry-After": str(retry_after),
+            "X-RateLimit-Limit": str(rule.limit),
+            "X-RateLimit-Remaining": "0",
+        }
+    )
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware, see module docstring."""
+
+    def __init__(self, app, rules: list[RateLimit] = None, store=None, enabled: bool = None):
+        self.app = app
+        self.rules = rules if rules is not None else RATE_LIMITS
+        self.store = store or create_bucket_store()
+        if enabled is None:
+            enabled = os.environ.get("RATE_LIMIT_ENABLED", "1") != "0"
+        self.enabled = enabled
+        self.trust_forwarded = _trust_forwarded()
+        self.trusted_proxies = _trusted_proxies()
+        self._limiter = None
+
+    def _rule_for(self, method: str, path: str) -> Optional[RateLimit]:
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule
+        return None
+
+    def _client_ip(self, scope, headers: Headers) -> str:
+        if self.trust_forwarded:
+            forwarded = headers.get("x-forwarded-for")
+            if forwarded:
+                ip = _forwarded_client_ip(forwarded, self.trusted_proxies)
+                if ip:
+                    return ip
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _identity(self, rule: RateLimit, scope, headers: Headers) -> str:
+        if rule.per_user:
+            scheme, _, token = headers.get("authorization", "").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    return f"user:{int(decode_token(token.strip())['sub'])}"
+                except (jwt.InvalidTokenError, KeyError, ValueError):
+                    pass
+        return f"ip:{self._client_ip(scope, headers)}"
+
+    def _check(self, rule: RateLimit, scope, headers: Headers) -> Decision:
+        key = f"{rule.name}|{self._identity(rule, scope, headers)}"
+        return self.store.acquire(key, rule.limit, rule.period)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        rule = self._rule_for(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(CHECK_THREADS)
+        try:
+            decision = await anyio.to_thread.run_sync(
+                self._check, rule, scope, headers, limiter=self._limiter
+            )
+        except sqlite3.Error as e:
+            print(f"[RateLimit] Bucket store unavailable, request not limited: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        if not decision.allowed:
+            await _rejection(rule, decision)(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-ratelimit-limit", str(rule.limit).encode("latin-1")),
+                    (b"x-ratelimit-remaining", str(decision.remaining).encode("latin-1")),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
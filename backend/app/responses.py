@@ -0,0 +1,55 @@
+# responses.py - Fast JSON Responses
+"""
+Provolution Gamification - Fast JSON Response Class
+
+FastJSONResponse renders Pydantic models straight to JSON bytes via
+pydantic-core and everything else via orjson (stdlib json as fallback).
+
+Endpoints that build their response model themselves can return
+`FastJSONResponse(model)` directly: FastAPI then skips the second
+`response_model` validation pass and jsonable_encoder, while the
+`response_model=` declaration still documents the schema in OpenAPI.
+"""
+
+from typing import Any
+import json
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, see requirements.txt
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder for values nested inside plain dicts/lists."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to compact UTF-8 JSON bytes."""
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response using pydantic-core / orjson for rendering."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
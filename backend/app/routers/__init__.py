@@ -9,6 +9,8 @@ from .challenges import router as challenges_router
 from .leaderboards import router as leaderboards_router
 from .badges import router as badges_router
 from .rewards import router as rewards_router
+from .teams import router as teams_router
+from .verification import router as verification_router
 
 __all__ = [
     "auth_router",
@@ -16,5 +18,7 @@ __all__ = [
     "challenges_router",
     "leaderboards_router",
     "badges_router",
-    "rewards_router"
+    "rewards_router",
+    "teams_router",
+    "verification_router"
 ]
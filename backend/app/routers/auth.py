@@ -4,97 +4,61 @@ Provolution Gamification - Authentication Endpoints
 POST /auth/register - User registration
 POST /auth/login - User login
 POST /auth/google - Google OAuth login
+POST /auth/refresh - Rotate refresh token, issue new access token
+POST /auth/logout - Revoke access token and refresh token family
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import BaseModel
+from typing import Optional
 from datetime import datetime
-import secrets
-import string
-import os
+import jwt
 
 from ..models import (
     UserRegisterRequest,
     UserLoginRequest,
+    RefreshTokenRequest,
     AuthResponse,
     RegisterResponse,
-    UserResponse,
-    UserStats
+    TokenRefreshResponse,
+    UserResponse
 )
-from ..auth import hash_password, verify_password, create_access_token
+from ..auth import (
+    hash_password,
+    verify_password,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    get_jwt_settings,
+    is_token_revoked,
+    revoke_token,
+    revoke_token_family,
+    security
+)
+from ..auth.google_jwks import GoogleTokenError, verify_google_id_token
+from ..cache import bump_content_version, bump_user_version, RESOURCE_LEADERBOARDS
 from ..database import get_db
+from ..services.leaderboard_scores import REFERRAL_XP, record_scores
+from ..services.referrals import record_referral_paths
+from ..services.regions import resolve_region
+from ..services.teams import record_team_contribution
+from ..services.trust import update_trust_level
+from ..services.user_accounts import assign_referral_code, upsert_google_user
+from ..services.user_stats import record_referral, stats_for_user
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-# Google OAuth
-GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID', '249276087645-8db6c2913bgsv3p0p4c7njde3j5kvr6c.apps.googleusercontent.com')
-
 
 class GoogleAuthRequest(BaseModel):
     credential: str
 
 
-def generate_referral_code(length: int = 8) -> str:
-    """Generate a unique referral code."""
-    chars = string.ascii_uppercase + string.digits
-    return ''.join(secrets.choice(chars) for _ in range(length))
-
-
 def verify_google_token(credential: str) -> dict:
     """Verify Google ID token and return user info."""
     try:
-        from google.oauth2 import id_token
-        from google.auth.transport import requests
-        
-        idinfo = id_token.verify_oauth2_token(
-            credential, 
-            requests.Request(), 
-            GOOGLE_CLIENT_ID
-        )
-        
-        return {
-            'google_id': idinfo['sub'],
-            'email': idinfo['email'],
-            'name': idinfo.get('name', ''),
-            'picture': idinfo.get('picture', ''),
-            'email_verified': idinfo.get('email_verified', False)
-        }
-    except ImportError:
-        # Fallback: decode JWT manually (less secure but works without google-auth)
-        import json
-        import base64
-        
-        parts = credential.split('.')
-        if len(parts) != 3:
-            raise ValueError("Invalid token format")
-        
-        # Decode payload (middle part)
-        payload = parts[1]
-        # Add padding if needed
-        padding = 4 - len(payload) % 4
-        if padding != 4:
-            payload += '=' * padding
-        
-        decoded = base64.urlsafe_b64decode(payload)
-        idinfo = json.loads(decoded)
-        
-        # Verify audience
-        if idinfo.get('aud') != GOOGLE_CLIENT_ID:
-            raise ValueError("Invalid audience")
-        
-        # Check expiration
-        import time
-        if idinfo.get('exp', 0) < time.time():
-            raise ValueError("Token expired")
-        
-        return {
-            'google_id': idinfo['sub'],
-            'email': idinfo['email'],
-            'name': idinfo.get('name', ''),
-            'picture': idinfo.get('picture', ''),
-            'email_verified': idinfo.get('email_verified', False)
-        }
-    except Exception as e:
+        return verify_google_id_token(credential)
+    except GoogleTokenError as e:
         raise ValueError(f"Token verification failed: {str(e)}")
 
 
@@ -121,119 +85,73 @@ def google_auth(request: GoogleAuthRequest):
             }
         )
     
-    with get_db() as conn:
-        # Check if user exists by google_id
-        user = conn.execute(
-            "SELECT * FROM users WHERE google_id = ?",
-            (google_info['google_id'],)
-        ).fetchone()
-        
-        is_new_user = False
-        
-        if not user:
-            # Check if email exists (link accounts)
-            user = conn.execute(
-                "SELECT * FROM users WHERE email = ?",
-                (google_info['email'],)
-            ).fetchone()
-            
-            if user:
-                # Link Google to existing account
-                conn.execute(
-                    "UPDATE users SET google_id = ? WHERE id = ?",
-                    (google_info['google_id'], user['id'])
-                )
-            else:
-                # Create new user
-                is_new_user = True
-                
-                # Generate username from email
-                base_username = google_info['email'].split('@')[0].lower()
-                base_username = ''.join(c for c in base_username if c.isalnum() or c == '_')[:20]
-                username = base_username
-                
-                # Ensure unique username
-                counter = 1
-                while conn.execute(
-                    "SELECT id FROM users WHERE username = ?",
-                    (username,)
-                ).fetchone():
-                    username = f"{base_username}{counter}"
-                    counter += 1
-                
-                # Generate referral code
-                referral_code = generate_referral_code()
-                while conn.execute(
-                    "SELECT id FROM users WHERE referral_code = ?",
-                    (referral_code,)
-                ).fetchone():
-                    referral_code = generate_referral_code()
-                
-                now = datetime.utcnow().isoformat()
-                cursor = conn.execute(
-                    """
-                    INSERT INTO users (
-                        username, email, password_hash, display_name,
-                        google_id, avatar_emoji, referral_code,
-                        created_at, last_active
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        username,
-                        google_info['email'],
-                        '',  # No password for Google users
-                        google_info['name'] or username,
-                        google_info['google_id'],
-                        '🌱',
-                        referral_code,
-                        now,
-                        now
-                    )
-                )
-                
-                # Fetch the new user
-                user = conn.execute(
-                    "SELECT * FROM users WHERE id = ?",
-                    (cursor.lastrowid,)
-                ).fetchone()
-        
-        # Update last_active
-        conn.execute(
-            "UPDATE users SET last_active = ? WHERE id = ?",
-            (datetime.utcnow().isoformat(), user['id'])
+    if not google_info.get('email'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "EMAIL_REQUIRED",
+                    "message": "Google hat keine E-Mail-Adresse übermittelt"
+                }
+            }
         )
-        
-        # Create token
-        token = create_access_token(user['id'], user['username'])
-        
-        # Get user stats
-        stats = UserStats(
-            challenges_completed=0,
-            total_co2_saved_kg=user.get('total_co2_saved_kg', 0) or 0,
-            badges_earned=0,
-            referrals_count=0
+    
+    with get_db() as conn:
+        # Find, link or create the user (one upsert, plus one update for new users)
+        user, is_new_user = upsert_google_user(conn, google_info)
+    
+    if user is None and not google_info['email_verified']:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "EMAIL_NOT_VERIFIED",
+                    "message": "Die E-Mail-Adresse gehört zu einem bestehenden Konto und ist bei Google nicht verifiziert"
+                }
+            }
         )
-        
-        user_response = UserResponse(
-            id=user['id'],
-            username=user['username'],
-            display_name=user.get('display_name'),
-            avatar_emoji=user.get('avatar_emoji', '🌱'),
-            total_xp=user.get('total_xp', 0),
-            level=user.get('level', 1),
-            trust_level=user.get('trust_level', 1),
-            streak_days=user.get('streak_days', 0),
-            region=user.get('region'),
-            referral_code=user.get('referral_code'),
-            stats=stats
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "GOOGLE_ACCOUNT_MISMATCH",
+                    "message": "Das Konto dieser E-Mail-Adresse ist mit einem anderen Google-Konto verknüpft"
+                }
+            }
         )
-        
-        return {
-            "success": True,
-            "token": token,
-            "user": user_response,
-            "is_new_user": is_new_user
-        }
+    
+    # Create tokens (outside the write transaction, key rotation may write)
+    token = create_access_token(user['id'], user['username'])
+    refresh_token = create_refresh_token(user['id'])
+    
+    # Get user stats
+    stats = stats_for_user(user)
+    
+    user_response = UserResponse(
+        id=user['id'],
+        username=user['username'],
+        display_name=user.get('display_name'),
+        avatar_emoji=user.get('avatar_emoji', '🌱'),
+        total_xp=user.get('total_xp', 0),
+        level=user.get('level', 1),
+        trust_level=user.get('trust_level', 1),
+        streak_days=user.get('streak_days', 0),
+        region=user.get('region'),
+        referral_code=user.get('referral_code'),
+        stats=stats
+    )
+    
+    return {
+        "success": True,
+        "token": token,
+        "refresh_token": refresh_token,
+        "user": user_response,
+        "is_new_user": is_new_user
+    }
 
 
 @router.post("/register", response_model=RegisterResponse)
@@ -286,14 +204,6 @@ def register(request: UserRegisterRequest):
         # Hash password
         password_hash = hash_password(request.password)
         
-        # Generate referral code
-        referral_code = generate_referral_code()
-        while conn.execute(
-            "SELECT id FROM users WHERE referral_code = ?",
-            (referral_code,)
-        ).fetchone():
-            referral_code = generate_referral_code()
-        
         # Process referrer if code provided
         referrer_id = None
         if request.referral_code:
@@ -304,13 +214,16 @@ def register(request: UserRegisterRequest):
             if referrer:
                 referrer_id = referrer['id']
         
+        # Normalize region (postal code wins), unknown regions stay free text
+        region = resolve_region(request.region, request.postal_code)
+        
         # Insert new user
         now = datetime.utcnow().isoformat()
         cursor = conn.execute(
             """
             INSERT INTO users (
                 username, email, password_hash, display_name,
-                region, postal_code, referral_code, referred_by,
+                region, region_id, postal_code, referred_by,
                 created_at, last_active
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
@@ -319,39 +232,50 @@ def register(request: UserRegisterRequest):
                 request.email,
                 password_hash,
                 request.display_name or request.username,
-                request.region,
+                region.name if region else request.region,
+                region.id if region else None,
                 request.postal_code,
-                referral_code,
                 referrer_id,
                 now,
                 now
             )
         )
         user_id = cursor.lastrowid
+        referral_code = assign_referral_code(conn, user_id)
         
         # Award referral bonus to referrer
         if referrer_id:
-            conn.execute(
+            referrer = conn.execute(
                 """
                 UPDATE users 
-                SET total_xp = total_xp + 100
+                SET total_xp = total_xp + ?
                 WHERE id = ?
+                RETURNING region_id
                 """,
-                (referrer_id,)
-            )
-        
-        # Create JWT token
-        token = create_access_token(user_id, request.username.lower())
-        
-        return RegisterResponse(
-            success=True,
-            user={
-                "id": user_id,
-                "username": request.username.lower(),
-                "referral_code": referral_code
-            },
-            token=token
-        )
+                (REFERRAL_XP, referrer_id)
+            ).fetchone()
+            record_referral(conn, referrer_id)
+            record_referral_paths(conn, user_id, referrer_id)
+            update_trust_level(conn, referrer_id)
+            record_team_contribution(conn, referrer_id, xp=REFERRAL_XP)
+            record_scores(conn, referrer_id, referrer['region_id'], xp=REFERRAL_XP)
+            bump_content_version(conn, RESOURCE_LEADERBOARDS)
+            bump_user_version(conn, referrer_id)
+    
+    # Create JWT tokens (outside the write transaction, key rotation may write)
+    token = create_access_token(user_id, request.username.lower())
+    refresh_token = create_refresh_token(user_id)
+    
+    return RegisterResponse(
+        success=True,
+        user={
+            "id": user_id,
+            "username": request.username.lower(),
+            "referral_code": referral_code
+        },
+        token=token,
+        refresh_token=refresh_token
+    )
 
 
 @router.post("/login", response_model=AuthResponse)
@@ -408,46 +332,18 @@ def login(request: UserLoginRequest):
                 }
             )
         
+        # Create tokens (before the first write, key rotation may write)
+        token = create_access_token(user['id'], user['username'])
+        refresh_token = create_refresh_token(user['id'])
+        
         # Update last_active
         conn.execute(
             "UPDATE users SET last_active = ? WHERE id = ?",
             (datetime.utcnow().isoformat(), user['id'])
         )
         
-        # Create token
-        token = create_access_token(user['id'], user['username'])
-        
-        # Get user stats
-        stats = UserStats(
-            challenges_completed=0,
-            total_co2_saved_kg=user.get('total_co2_saved_kg', 0) or 0,
-            badges_earned=0,
-            referrals_count=0
-        )
-        
-        # Count completed challenges
-        completed = conn.execute(
-            """
-            SELECT COUNT(*) as count FROM user_challenges 
-            WHERE user_id = ? AND status = 'completed'
-            """,
-            (user['id'],)
-        ).fetchone()
-        stats.challenges_completed = completed['count'] if completed else 0
-        
-        # Count badges
-        badges = conn.execute(
-            "SELECT COUNT(*) as count FROM user_badges WHERE user_id = ?",
-            (user['id'],)
-        ).fetchone()
-        stats.badges_earned = badges['count'] if badges else 0
-        
-        # Count referrals
-        referrals = conn.execute(
-            "SELECT COUNT(*) as count FROM users WHERE referred_by = ?",
-            (user['id'],)
-        ).fetchone()
-        stats.referrals_count = referrals['count'] if referrals else 0
+        # Get user stats (maintained columns, see services/user_stats.py)
+        stats = stats_for_user(user)
         
         user_response = UserResponse(
             id=user['id'],
@@ -466,5 +362,97 @@ def login(request: UserLoginRequest):
         return AuthResponse(
             success=True,
             token=token,
+            refresh_token=refresh_token,
             user=user_response
         )
+
+
+def _token_error(code: str, message: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail={
+            "success": False,
+            "error": {
+                "code": code,
+                "message": message
+            }
+        }
+    )
+
+
+@router.post("/refresh", response_model=TokenRefreshResponse)
+def refresh(request: RefreshTokenRequest):
+    """
+    Exchange a refresh token for a new access token.
+    
+    - Refresh tokens are single-use: the presented token is revoked and a
+      new one of the same family is returned
+    - Presenting an already used refresh token (replay) revokes the whole
+      family, so a stolen token is useless once either party refreshes
+    """
+    try:
+        payload = decode_token(request.refresh_token)
+    except jwt.InvalidTokenError:
+        raise _token_error("INVALID_TOKEN", "Refresh-Token ungültig oder abgelaufen")
+    
+    if payload.get("type") != "refresh" or not payload.get("jti") or not payload.get("fam"):
+        raise _token_error("INVALID_TOKEN", "Kein Refresh-Token")
+    
+    if is_token_revoked({"fam": payload["fam"]}):
+        raise _token_error("TOKEN_REVOKED", "Sitzung wurde beendet. Bitte erneut anmelden.")
+    
+    with get_db() as conn:
+        # INSERT OR IGNORE decides atomically which request uses the token
+        reused = not revoke_token(payload, conn)
+        if reused:
+            revoke_token_family(payload, conn)
+            user = None
+        else:
+            user = conn.execute(
+                "SELECT id, username FROM users WHERE id = ?",
+                (int(payload["sub"]),)
+            ).fetchone()
+    
+    if reused:
+        raise _token_error("TOKEN_REUSED", "Refresh-Token wurde bereits verwendet. Bitte erneut anmelden.")
+    if not user:
+        raise _token_error("UNAUTHORIZED", "User nicht gefunden")
+    
+    return TokenRefreshResponse(
+        success=True,
+        token=create_access_token(user['id'], user['username']),
+        refresh_token=create_refresh_token(user['id'], family=payload["fam"]),
+        expires_in=get_jwt_settings().access_token_expire_minutes * 60
+    )
+
+
+@router.post("/logout")
+def logout(
+    request: Optional[RefreshTokenRequest] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+):
+    """
+    End the session.
+    
+    - Revokes the bearer access token
+    - Revokes the refresh token's family (all rotations of this login)
+    - Invalid or expired tokens are ignored, logout always succeeds
+    """
+    payloads = []
+    for token in (credentials.credentials if credentials else None,
+                  request.refresh_token if request else None):
+        if not token:
+            continue
+        try:
+            payloads.append(decode_token(token))
+        except jwt.InvalidTokenError:
+            continue
+    
+    with get_db() as conn:
+        for payload in payloads:
+            if payload.get("jti"):
+                revoke_token(payload, conn)
+            if payload.get("type") == "refresh" and payload.get("fam"):
+                revoke_token_family(payload, conn)
+    
+    return {"success": True}
@@ -18,9 +18,31 @@ from ..models import (
 )
 from ..auth import CurrentUser, get_current_user
 from ..database import get_db
+from ..responses import FastJSONResponse
 
 router = APIRouter(prefix="/badges", tags=["Badges"])
 
+# CO2 milestone badges
+CO2_MILESTONES = [
+    (100, "100kg_club", "100kg Club", "🌍", "100 kg CO₂ vermieden"),
+    (500, "500kg_champion", "500kg Champion", "🏆", "500 kg CO₂ vermieden"),
+    (1000, "tonne_titan", "Tonnen-Titan", "💎", "1 Tonne CO₂ vermieden"),
+]
+
+
+def next_co2_badge(user_co2: float) -> Optional[NextBadge]:
+    """Next CO2 milestone badge and progress towards it (simplified)."""
+    for threshold, badge_id, name, icon, requirement in CO2_MILESTONES:
+        if user_co2 < threshold:
+            return NextBadge(
+                id=badge_id,
+                name=name,
+                icon=icon,
+                progress=round(user_co2 / threshold, 2),
+                requirement=requirement
+            )
+    return None
+
 
 @router.get("", response_model=AllBadgesResponse)
 def list_all_badges():
@@ -45,10 +67,10 @@ def list_all_badges():
             for b in badges_data
         ]
         
-        return AllBadgesResponse(
+        return FastJSONResponse(AllBadgesResponse(
             badges=badges,
             total=len(badges)
-        )
+        ))
 
 
 @router.get("/my", response_model=MyBadgesResponse)
@@ -81,27 +103,7 @@ def get_my_badges(current_user: CurrentUser = Depends(get_current_user)):
         ]
         
         # Determine next badge (simplified - based on CO2 milestones)
-        next_badge = None
-        user_co2 = current_user.data.get('total_co2_saved_kg', 0)
-        
-        # CO2 milestone badges
-        milestones = [
-            (100, "100kg_club", "100kg Club", "🌍", "100 kg CO₂ vermieden"),
-            (500, "500kg_champion", "500kg Champion", "🏆", "500 kg CO₂ vermieden"),
-            (1000, "tonne_titan", "Tonnen-Titan", "💎", "1 Tonne CO₂ vermieden"),
-        ]
-        
-        for threshold, badge_id, name, icon, requirement in milestones:
-            if user_co2 < threshold:
-                progress = user_co2 / threshold
-                next_badge = NextBadge(
-                    id=badge_id,
-                    name=name,
-                    icon=icon,
-                    progress=round(progress, 2),
-                    requirement=requirement
-                )
-                break
+        next_badge = next_co2_badge(current_user.data.get('total_co2_saved_kg', 0))
         
         return MyBadgesResponse(
             badges=badges,
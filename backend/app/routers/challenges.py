@@ -5,11 +5,14 @@ GET /challenges - List all challenges
 GET /challenges/{id} - Get challenge details  
 POST /challenges/{id}/join - Join a challenge
 POST /challenges/{id}/log - Log daily progress
+POST /challenges/logs:batch - Log many days across challenges
 GET /challenges/{id}/progress - Get user's progress
+GET /challenges/{id}/calendar - Completed days as a bitmap
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from datetime import datetime, date
+import base64
 from typing import Optional
 
 from ..models import (
@@ -22,7 +25,12 @@ from ..models import (
     ChallengeJoinResponse,
     DailyLogRequest,
     DailyLogResponse,
+    BatchLogRequest,
+    BatchLogResult,
+    BatchChallengeProgress,
+    BatchLogResponse,
     ChallengeProgressResponse,
+    ChallengeCalendarResponse,
     UserChallengeStatus,
     BadgeInfo,
     ImpactInfo,
@@ -33,10 +41,42 @@ from ..models import (
     StreakInfo
 )
 from ..auth import CurrentUser, get_current_user, get_current_user_optional
+from ..cache import (
+    bump_content_version,
+    bump_user_version,
+    get_content_version,
+    RESOURCE_CHALLENGES,
+    RESOURCE_LEADERBOARDS
+)
 from ..database import get_db
+from ..live import live_leaderboards
+from ..responses import FastJSONResponse
+from ..singleflight import SingleFlight
+from ..services.progress_calendar import (
+    count_days,
+    current_streak,
+    day_index,
+    log_day,
+    is_set,
+    load_bitmaps,
+    longest_streak,
+    set_days,
+    start_date
+)
+from ..services.trust import spot_check_rate, update_trust_level
+from ..services.user_stats import record_challenge_completed
+from ..services.verification import (
+    VERIFICATION_SPOT_CHECK,
+    enqueue_spot_check,
+    verification_status_for
+)
 
 router = APIRouter(prefix="/challenges", tags=["Challenges"])
 
+# Per-challenge participant stats; responses for logged-in viewers are
+# cached per user, so the stats query itself is coalesced across viewers
+challenge_stats_flights = SingleFlight()
+
 
 @router.get("", response_model=ChallengeListResponse)
 def list_challenges(
@@ -135,12 +175,13 @@ def list_challenges(
                 user_status=user_status
             ))
         
-        return ChallengeListResponse(
+        # Already validated on construction - skip response_model re-validation
+        return FastJSONResponse(ChallengeListResponse(
             challenges=challenges,
             total=total,
             offset=offset,
             limit=limit
-        )
+        ))
 
 
 @router.get("/{challenge_id}", response_model=ChallengeDetail)
@@ -167,17 +208,20 @@ def get_challenge(
                 }
             )
         
-        # Get stats
-        stats_data = conn.execute(
-            """
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) as active,
-                SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed
-            FROM user_challenges WHERE challenge_id = ?
-            """,
-            (challenge_id,)
-        ).fetchone()
+        # Get stats (counted once for all concurrent viewers of this version)
+        stats_data, _ = challenge_stats_flights.do(
+            (challenge_id, get_content_version(RESOURCE_CHALLENGES)),
+            lambda: conn.execute(
+                """
+                SELECT 
+                    COUNT(*) as total,
+                    SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) as active,
+                    SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed
+                FROM user_challenges WHERE challenge_id = ?
+                """,
+                (challenge_id,)
+            ).fetchone()
+        )
         
         completion_rate = 0.0
         if stats_data and stats_data['total'] > 0:
@@ -195,7 +239,7 @@ def get_challenge(
         if c.get('verification_options'):
             verification_options = [v.strip() for v in c['verification_options'].split(',')]
         
-        return ChallengeDetail(
+        return FastJSONResponse(ChallengeDetail(
             id=c['id'],
             name=c['name'],
             name_emoji=c.get('name_emoji') or f"🎯 {c['name']}",
@@ -228,7 +272,7 @@ def get_challenge(
                 participants_completed=stats_data['completed'] if stats_data else 0,
                 completion_rate=round(completion_rate, 2)
             )
-        )
+        ))
 
 
 @router.post("/{challenge_id}/join", response_model=ChallengeJoinResponse)
@@ -286,11 +330,13 @@ def join_challenge(
         cursor = conn.execute(
             """
             INSERT INTO user_challenges (
-                user_id, challenge_id, status, started_at, progress_percent
-            ) VALUES (?, ?, 'active', ?, 0)
+                user_id, challenge_id, status, started_at, progress_percent, log_bitmap
+            ) VALUES (?, ?, 'active', ?, 0, X'')
             """,
             (current_user.id, challenge_id, now)
         )
+        bump_content_version(conn, RESOURCE_CHALLENGES)
+        bump_user_version(conn, current_user.id)
         
         return ChallengeJoinResponse(
             success=True,
@@ -312,19 +358,32 @@ def log_daily_progress(
     request: DailyLogRequest,
     current_user: CurrentUser = Depends(get_current_user)
 ):
-    """Log daily progress for a challenge."""
+    """
+    Log daily progress for a challenge.
+    One log per day: the insert is an upsert on (user_challenge_id, log_date).
+    A repeated request with the same idempotency_key gets the original log
+    back (replayed=true) instead of 409, even if that log completed the challenge.
+    """
     with get_db() as conn:
-        # Get user challenge
+        # Get user challenge (the active one, else the latest for replays)
         uc = conn.execute(
             """
-            SELECT uc.*, c.duration_days, c.xp_reward, c.name
+            SELECT uc.*, c.duration_days, c.xp_reward, c.spot_check_rate, c.name
             FROM user_challenges uc
             JOIN challenges c ON c.id = uc.challenge_id
-            WHERE uc.user_id = ? AND uc.challenge_id = ? AND uc.status = 'active'
+            WHERE uc.user_id = ? AND uc.challenge_id = ?
+            ORDER BY uc.status = 'active' DESC, uc.id DESC
+            LIMIT 1
             """,
             (current_user.id, challenge_id)
         ).fetchone()
         
+        if uc and uc['status'] != 'active':
+            replay = _find_replay(conn, uc['id'], request)
+            if replay:
+                return _replay_response(conn, current_user.id, uc, replay)
+            uc = None
+        
         if not uc:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -337,34 +396,28 @@ def log_daily_progress(
                 }
             )
         
-        # Check if already logged today
-        existing_log = conn.execute(
-            """
-            SELECT id FROM challenge_logs 
-            WHERE user_challenge_id = ? AND log_date = ?
-            """,
-            (uc['id'], request.log_date.isoformat())
-        ).fetchone()
-        
-        if existing_log:
+        day = log_day(uc['started_at'], request.log_date, uc['duration_days'])
+        if day is None:
             raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
+                status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
                     "success": False,
                     "error": {
-                        "code": "ALREADY_LOGGED",
-                        "message": "Heute wurde bereits geloggt"
+                        "code": "INVALID_LOG_DATE",
+                        "message": "Das Datum liegt außerhalb der Challenge oder in der Zukunft"
                     }
                 }
             )
         
-        # Insert log
-        cursor = conn.execute(
+        # Insert log, unless the day is already logged
+        inserted = conn.execute(
             """
             INSERT INTO challenge_logs (
                 user_challenge_id, log_date, completed, notes, 
-                proof_type, proof_url, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                proof_type, proof_url, idempotency_key, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_challenge_id, log_date) DO NOTHING
+            RETURNING id
             """,
             (
                 uc['id'],
@@ -373,50 +426,48 @@ def log_daily_progress(
                 request.notes,
                 request.proof_type,
                 request.proof_url,
+                request.idempotency_key,
                 datetime.utcnow().isoformat()
             )
-        )
-        
-        # Count completed days
-        completed_days = conn.execute(
-            """
-            SELECT COUNT(*) as count FROM challenge_logs 
-            WHERE user_challenge_id = ? AND completed = 1
-            """,
-            (uc['id'],)
-        ).fetchone()['count']
-        
-        days_remaining = uc['duration_days'] - completed_days
-        progress_percent = int((completed_days / uc['duration_days']) * 100)
+        ).fetchone()
         
-        # Update user_challenge progress
-        conn.execute(
-            """
-            UPDATE user_challenges 
-            SET progress_percent = ?, days_completed = ?
-            WHERE id = ?
-            """,
-            (progress_percent, completed_days, uc['id'])
-        )
+        if not inserted:
+            replay = _find_replay(conn, uc['id'], request)
+            if replay:
+                return _replay_response(conn, current_user.id, uc, replay)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "success": False,
+                    "error": {
+                        "code": "ALREADY_LOGGED",
+                        "message": "Heute wurde bereits geloggt"
+                    }
+                }
+            )
         
-        # Check if challenge completed
-        xp_earned = 0
-        if completed_days >= uc['duration_days']:
-            conn.execute(
+        # Advance progress and calendar (no recount of the log set)
+        completed_days = uc['days_completed'] or 0
+        if request.completed:
+            bitmap = load_bitmaps(conn, [uc['id']])[uc['id']]
+            completed_days = conn.execute(
                 """
                 UPDATE user_challenges 
-                SET status = 'completed', completed_at = ?
+                SET days_completed = COALESCE(days_completed, 0) + 1,
+                    progress_percent = MIN(100, (COALESCE(days_completed, 0) + 1) * 100 / ?),
+                    log_bitmap = ?
                 WHERE id = ?
+                RETURNING days_completed
                 """,
-                (datetime.utcnow().isoformat(), uc['id'])
-            )
-            
-            # Award XP
-            xp_earned = uc['xp_reward']
-            conn.execute(
-                "UPDATE users SET total_xp = total_xp + ? WHERE id = ?",
-                (xp_earned, current_user.id)
-            )
+                (uc['duration_days'], set_days(bitmap, [day]), uc['id'])
+            ).fetchone()['days_completed']
+        bump_user_version(conn, current_user.id)
+        
+        # Check if challenge completed
+        xp_earned = 0
+        if completed_days >= uc['duration_days']:
+            xp_earned = _complete_user_challenge(conn, current_user, uc)
+            bump_content_version(conn, RESOURCE_CHALLENGES, RESOURCE_LEADERBOARDS)
         
         # Update streak (simplified)
         user = conn.execute(
@@ -425,79 +476,231 @@ def log_daily_progress(
         ).fetchone()
         current_streak = user['streak_days'] if user else 0
         
-        return DailyLogResponse(
+        response = DailyLogResponse(
             success=True,
             log=DailyLog(
-                id=cursor.lastrowid,
+                id=inserted['id'],
                 log_date=request.log_date,
                 completed=request.completed,
                 notes=request.notes,
                 proof_url=request.proof_url
             ),
-            progress=ProgressInfo(
-                days_completed=completed_days,
-                days_remaining=max(0, days_remaining),
-                progress_percent=min(100, progress_percent)
-            ),
+            progress=_progress_info(completed_days, uc['duration_days']),
             xp_earned=xp_earned,
             streak=StreakInfo(
                 current=current_streak + 1 if request.completed else current_streak,
                 bonus_at_30_days=500
             )
         )
+    
+    if completed_days >= uc['duration_days']:
+        # Committed: push the new ranks to live leaderboard streams
+        live_leaderboards.notify()
+    return response
 
 
-@router.get("/{challenge_id}/progress", response_model=ChallengeProgressResponse)
-def get_challenge_progress(
-    challenge_id: str,
+@router.post("/logs:batch", response_model=BatchLogResponse)
+def log_daily_progress_batch(
+    request: BatchLogRequest,
     current_user: CurrentUser = Depends(get_current_user)
 ):
-    """Get user's progress on a specific challenge."""
+    """
+    Log many days across challenges at once (offline clients catching up).
+    
+    Entries are checked against one prefetch of the user's challenges and
+    their existing logs, read under the write lock so concurrent logs cannot
+    slip in before the insert. Invalid entries are skipped and reported per entry;
+    the rest is inserted with one executemany (upsert, see
+    log_daily_progress). Entries resent with the idempotency_key of a stored
+    log count as logged (replayed). Progress is advanced incrementally and
+    completions (XP, stats) run once per challenge.
+    """
+    entries = request.entries
+    now = datetime.utcnow().isoformat()
+    today = date.today()
+    
     with get_db() as conn:
-        uc = conn.execute(
-            """
-            SELECT uc.*, c.duration_days
-            FROM user_challenges uc
-            JOIN challenges c ON c.id = uc.challenge_id
-            WHERE uc.user_id = ? AND uc.challenge_id = ?
-            """,
-            (current_user.id, challenge_id)
-        ).fetchone()
+        # Take the write lock before the prefetch: a log written in between
+        # would otherwise be counted here although the upsert skips it
+        conn.execute("BEGIN IMMEDIATE")
+
+        # Per challenge the active participation, else the latest (replays)
+        user_challenges = {
+            row['challenge_id']: row
+            for row in conn.execute(
+                """
+                SELECT uc.id, uc.challenge_id, uc.status, uc.started_at, uc.days_completed,
+                       c.duration_days, c.xp_reward, c.spot_check_rate
+                FROM user_challenges uc
+                JOIN challenges c ON c.id = uc.challenge_id
+                WHERE uc.user_id = ?
+                ORDER BY uc.status = 'active', uc.id
+                """,
+                (current_user.id,)
+            ).fetchall()
+        }
         
-        if not uc:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={
-                    "success": False,
-                    "error": {
-                        "code": "NOT_FOUND",
-                        "message": "Du nimmst nicht an dieser Challenge teil"
-                    }
-                }
+        uc_ids = [
+            user_challenges[cid]['id']
+            for cid in {e.challenge_id for e in entries} if cid in user_challenges
+        ]
+        existing = {}
+        if uc_ids:
+            placeholders = ", ".join("?" for _ in uc_ids)
+            dates = [e.log_date for e in entries]
+            existing = {
+                (row['user_challenge_id'], row['log_date']): row['idempotency_key']
+                for row in conn.execute(
+                    f"""
+                    SELECT user_challenge_id, log_date, idempotency_key FROM challenge_logs
+                    WHERE user_challenge_id IN ({placeholders}) AND log_date BETWEEN ? AND ?
+                    """,
+                    (*uc_ids, min(dates).isoformat(), max(dates).isoformat())
+                ).fetchall()
+            }
+        
+        days_completed = {cid: uc['days_completed'] or 0 for cid, uc in user_challenges.items()}
+        new_days: dict[str, list[int]] = {}
+        results: list[Optional[BatchLogResult]] = [None] * len(entries)
+        rows = []
+        # Oldest day first, so a challenge stops taking days once it is complete
+        for i in sorted(range(len(entries)), key=lambda i: entries[i].log_date):
+            entry = entries[i]
+            uc = user_challenges.get(entry.challenge_id)
+            key = (uc['id'], entry.log_date.isoformat()) if uc else None
+            error = None
+            replayed = False
+            if uc is None:
+                error = "NOT_FOUND"
+            elif key in existing:
+                replayed = entry.idempotency_key is not None and existing[key] == entry.idempotency_key
+                error = None if replayed else "ALREADY_LOGGED"
+            elif uc['status'] != 'active':
+                error = "NOT_FOUND"
+            elif log_day(uc['started_at'], entry.log_date, uc['duration_days'], today) is None:
+                error = "INVALID_LOG_DATE"
+            elif days_completed[entry.challenge_id] >= uc['duration_days']:
+                error = "CHALLENGE_COMPLETED"
+            results[i] = BatchLogResult(
+                challenge_id=entry.challenge_id,
+                log_date=entry.log_date,
+                logged=error is None,
+                error=error,
+                replayed=replayed
             )
+            if error or replayed:
+                continue
+            
+            existing[key] = entry.idempotency_key
+            if entry.completed:
+                days_completed[entry.challenge_id] += 1
+                new_days.setdefault(entry.challenge_id, []).append(
+                    day_index(uc['started_at'], entry.log_date)
+                )
+            rows.append((
+                uc['id'], key[1], entry.completed, entry.notes,
+                entry.proof_type, entry.proof_url, entry.idempotency_key, now
+            ))
         
-        # Get all logs
-        logs_data = conn.execute(
+        conn.executemany(
             """
-            SELECT * FROM challenge_logs 
-            WHERE user_challenge_id = ?
-            ORDER BY log_date DESC
+            INSERT INTO challenge_logs (
+                user_challenge_id, log_date, completed, notes,
+                proof_type, proof_url, idempotency_key, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_challenge_id, log_date) DO NOTHING
             """,
-            (uc['id'],)
-        ).fetchall()
+            rows
+        )
         
-        logs = [
-            DailyLog(
-                id=log['id'],
-                log_date=date.fromisoformat(log['log_date']),
-                completed=log['completed'],
-                notes=log.get('notes'),
-                proof_url=log.get('proof_url')
-            )
-            for log in logs_data
-        ]
+        # Progress, calendar and completions, once per touched challenge
+        touched = sorted({r.challenge_id for r in results if r.logged and not r.replayed})
+        bitmaps = load_bitmaps(conn, [user_challenges[cid]['id'] for cid in new_days])
+        progress = []
+        updates = []
+        xp_total = 0
+        for cid in touched:
+            uc = user_challenges[cid]
+            if cid in new_days:
+                added = len(new_days[cid])
+                bitmap = set_days(bitmaps[uc['id']], new_days[cid])
+                updates.append((added, added, uc['duration_days'], bitmap, uc['id']))
+            
+            xp_earned = 0
+            if days_completed[cid] >= uc['duration_days']:
+                xp_earned = _complete_user_challenge(conn, current_user, uc)
+                xp_total += xp_earned
+            progress.append(BatchChallengeProgress(
+                challenge_id=cid,
+                completed=days_completed[cid] >= uc['duration_days'],
+                xp_earned=xp_earned,
+                **_progress_info(days_completed[cid], uc['duration_days']).model_dump()
+            ))
         
-        days_completed = sum(1 for log in logs if log.completed)
+        conn.executemany(
+            """
+            UPDATE user_challenges 
+            SET days_completed = COALESCE(days_completed, 0) + ?,
+                progress_percent = MIN(100, (COALESCE(days_completed, 0) + ?) * 100 / ?),
+                log_bitmap = ?
+            WHERE id = ?
+            """,
+            updates
+        )
+        if rows:
+            bump_user_version(conn, current_user.id)
+        if any(p.completed for p in progress):
+            bump_content_version(conn, RESOURCE_CHALLENGES, RESOURCE_LEADERBOARDS)
+    
+    if any(p.completed for p in progress):
+        live_leaderboards.notify()
+    return BatchLogResponse(
+        success=True,
+        logged=len(rows),
+        results=results,
+        challenges=progress,
+        xp_earned=xp_total
+    )
+
+
+@router.get("/{challenge_id}/progress", response_model=ChallengeProgressResponse)
+def get_challenge_progress(
+    challenge_id: str,
+    include_logs: bool = Query(True, description="Einzelne Logs mitliefern"),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Get user's progress on a specific challenge.
+    Counts and streaks come from the calendar bitmap; the log rows are
+    only read when include_logs is set.
+    """
+    with get_db() as conn:
+        uc = _get_participation(conn, current_user.id, challenge_id)
+        bitmap = load_bitmaps(conn, [uc['id']])[uc['id']]
+        
+        logs = []
+        if include_logs:
+            logs_data = conn.execute(
+                """
+                SELECT * FROM challenge_logs 
+                WHERE user_challenge_id = ?
+                ORDER BY log_date DESC
+                """,
+                (uc['id'],)
+            ).fetchall()
+            
+            logs = [
+                DailyLog(
+                    id=log['id'],
+                    log_date=date.fromisoformat(log['log_date']),
+                    completed=log['completed'],
+                    notes=log.get('notes'),
+                    proof_url=log.get('proof_url')
+                )
+                for log in logs_data
+            ]
+        
+        days_completed = count_days(bitmap)
         days_remaining = max(0, uc['duration_days'] - days_completed)
         
         return ChallengeProgressResponse(
@@ -507,6 +710,152 @@ def get_challenge_progress(
             days_completed=days_completed,
             days_remaining=days_remaining,
             progress_percent=uc['progress_percent'],
+            current_streak=current_streak(bitmap, day_index(uc['started_at'], date.today())),
+            longest_streak=longest_streak(bitmap),
             logs=logs,
             verification_status=uc.get('verification_status', 'pending')
         )
+
+
+@router.get("/{challenge_id}/calendar", response_model=ChallengeCalendarResponse)
+def get_challenge_calendar(
+    challenge_id: str,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Completed days as a bitmap (one bit per day since the start), for
+    calendar rendering on the client. Answered from user_challenges only.
+    """
+    with get_db() as conn:
+        uc = _get_participation(conn, current_user.id, challenge_id)
+        bitmap = load_bitmaps(conn, [uc['id']])[uc['id']]
+    
+    today = day_index(uc['started_at'], date.today())
+    return ChallengeCalendarResponse(
+        challenge_id=challenge_id,
+        status=uc['status'],
+        start_date=start_date(uc['started_at']),
+        duration_days=uc['duration_days'],
+        days_completed=count_days(bitmap),
+        current_streak=current_streak(bitmap, today),
+        longest_streak=longest_streak(bitmap),
+        completed_today=is_set(bitmap, today),
+        bitmap=base64.b64encode(bitmap).decode("ascii")
+    )
+
+
+# ============================================
+# HELPER FUNCTIONS
+# ============================================
+
+def _progress_info(days_completed: int, duration_days: int) -> ProgressInfo:
+    return ProgressInfo(
+        days_completed=days_completed,
+        days_remaining=max(0, duration_days - days_completed),
+        progress_percent=min(100, int(days_completed / duration_days * 100))
+    )
+
+
+def _complete_user_challenge(conn, user: CurrentUser, uc: dict) -> int:
+    """
+    Mark an active user challenge completed, count it and award its XP.
+    The completion is either verified right away or drawn for a spot check
+    (challenges.spot_check_rate scaled by the user's trust level) and queued
+    for review. Returns the XP (0 if it was not active anymore).
+    """
+    user_id = user.id
+    now = datetime.utcnow()
+    verification_status = verification_status_for(
+        uc['id'], spot_check_rate(uc['spot_check_rate'], user.trust_level)
+    )
+    cursor = conn.execute(
+        """
+        UPDATE user_challenges 
+        SET status = 'completed', completed_at = ?, xp_earned = ?,
+            verification_status = ?,
+            verified_at = CASE WHEN ? = 'verified' THEN ? END
+        WHERE id = ? AND status = 'active'
+        """,
+        (now.isoformat(), uc['xp_reward'], verification_status,
+         verification_status, now.isoformat(), uc['id'])
+    )
+    if cursor.rowcount == 0:
+        return 0
+    if verification_status == VERIFICATION_SPOT_CHECK:
+        enqueue_spot_check(conn, uc['id'], user_id, uc['challenge_id'], now)
+    record_challenge_completed(conn, user_id, uc['challenge_id'], uc['xp_reward'])
+    update_trust_level(conn, user_id)
+    
+    # Award XP
+    conn.execute(
+        "UPDATE users SET total_xp = total_xp + ? WHERE id = ?",
+        (uc['xp_reward'], user_id)
+    )
+    return uc['xp_reward']
+
+
+def _find_replay(conn, user_challenge_id: int, request: DailyLogRequest) -> Optional[dict]:
+    """The stored log of an earlier request with the same idempotency_key."""
+    if not request.idempotency_key:
+        return None
+    return conn.execute(
+        """
+        SELECT id, log_date, completed, notes, proof_url FROM challenge_logs
+        WHERE user_challenge_id = ? AND log_date = ? AND idempotency_key = ?
+        """,
+        (user_challenge_id, request.log_date.isoformat(), request.idempotency_key)
+    ).fetchone()
+
+
+def _replay_response(conn, user_id: int, uc: dict, log: dict) -> DailyLogResponse:
+    """Answer a resent log from the stored state; XP is only reported once."""
+    user = conn.execute(
+        "SELECT streak_days FROM users WHERE id = ?",
+        (user_id,)
+    ).fetchone()
+    current_streak = user['streak_days'] if user else 0
+    
+    return DailyLogResponse(
+        success=True,
+        log=DailyLog(
+            id=log['id'],
+            log_date=date.fromisoformat(log['log_date']),
+            completed=log['completed'],
+            notes=log.get('notes'),
+            proof_url=log.get('proof_url')
+        ),
+        progress=_progress_info(uc['days_completed'] or 0, uc['duration_days']),
+        streak=StreakInfo(
+            current=current_streak + 1 if log['completed'] else current_streak,
+            bonus_at_30_days=500
+        ),
+        replayed=True
+    )
+
+
+def _get_participation(conn, user_id: int, challenge_id: str) -> dict:
+    """The user's participation (active one first), 404 if none."""
+    uc = conn.execute(
+        """
+        SELECT uc.*, c.duration_days
+        FROM user_challenges uc
+        JOIN challenges c ON c.id = uc.challenge_id
+        WHERE uc.user_id = ? AND uc.challenge_id = ?
+        ORDER BY uc.status = 'active' DESC, uc.id DESC
+        LIMIT 1
+        """,
+        (user_id, challenge_id)
+    ).fetchone()
+    
+    if not uc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": "Du nimmst nicht an dieser Challenge teil"
+                }
+            }
+        )
+    return uc
@@ -9,11 +9,19 @@ from datetime import datetime
 from typing import Optional
 
 from ..database import get_db
+from ..cache import (
+    bump_content_version,
+    bump_user_version,
+    RESOURCE_CHALLENGES,
+    RESOURCE_LEADERBOARDS
+)
 from ..auth import get_current_user, CurrentUser
 from ..models.footprint import (
     FootprintInput, FootprintResult, FootprintSummary
 )
 from ..services.footprint_calculator import calculator
+from ..services.trust import update_trust_level
+from ..services.user_stats import record_badges_earned, record_challenge_completed
 
 router = APIRouter(prefix="/footprint", tags=["Footprint"])
 
@@ -191,6 +199,7 @@ def calculate_and_save_footprint(
         
         # 5. Challenge ON-1 automatisch abschließen
         _complete_onboarding_challenge(conn, user_id)
+        bump_user_version(conn, user_id)
         
         conn.commit()
     
@@ -220,26 +229,7 @@ def get_my_footprint(
             detail="Noch kein CO₂-Fußabdruck berechnet. Nutze POST /footprint/me"
         )
     
-    # Größte Kategorie ermitteln
-    categories = {
-        'Wohnen': row['co2_housing_kg'] or 0,
-        'Mobilität': row['co2_mobility_kg'] or 0,
-        'Ernährung': row['co2_nutrition_kg'] or 0,
-        'Konsum': row['co2_consumption_kg'] or 0,
-    }
-    main_category = max(categories, key=categories.get)
-    
-    total = row['co2_total_kg_year'] or 0
-    vs_germany = round((total - 10800) / 10800 * 100, 1)
-    sec_score = calculator._calc_sec_score(total)
-    
-    return FootprintSummary(
-        total_co2_kg_year=total,
-        main_category=main_category,
-        vs_germany_percent=vs_germany,
-        last_calculated=row['last_calculated'],
-        sec_score=sec_score
-    )
+    return calculator.summarize(row)
 
 
 @router.get("/me/history")
@@ -317,6 +307,8 @@ def _complete_onboarding_challenge(conn, user_id: int):
                 xp_earned = 50
             WHERE id = ?
         """, (now, now, challenge['id']))
+        record_challenge_completed(conn, user_id, 'ON-1', xp=50)
+        update_trust_level(conn, user_id)
         
         # XP gutschreiben
         conn.execute("""
@@ -329,6 +321,7 @@ def _complete_onboarding_challenge(conn, user_id: int):
             "UPDATE users SET total_xp = total_xp + 50, updated_at = ? WHERE id = ?",
             (now, user_id)
         )
+        bump_content_version(conn, RESOURCE_CHALLENGES, RESOURCE_LEADERBOARDS)
         
         # Badge vergeben
         existing_badge = conn.execute(
@@ -341,3 +334,4 @@ def _complete_onboarding_challenge(conn, user_id: int):
                 INSERT INTO user_badges (user_id, badge_id, challenge_id)
                 VALUES (?, 'klimaheld_in_spe', 'ON-1')
             """, (user_id,))
+            record_badges_earned(conn, user_id)
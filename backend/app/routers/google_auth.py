@@ -5,21 +5,15 @@ Google OAuth Authentication for Provolution Gamification
 
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
-from datetime import datetime, timedelta
 import os
-import secrets
-import jwt
 
+from ..auth import create_access_token, create_refresh_token
+from ..auth.google_jwks import GoogleTokenError, verify_google_id_token
 from ..database import get_db
+from ..services.user_accounts import upsert_google_user
 
 router = APIRouter(prefix="/auth/google", tags=["Google Auth"])
 
-# Config
-JWT_SECRET = os.environ.get("JWT_SECRET", "provolution-dev-secret-change-in-production")
-JWT_ALGORITHM = "HS256"
-JWT_EXPIRATION_HOURS = 24 * 7  # 1 week
-
-
 class GoogleTokenRequest(BaseModel):
     """Request body for Google token verification."""
     credential: str  # Google ID token from frontend
@@ -28,76 +22,24 @@ class GoogleTokenRequest(BaseModel):
 class GoogleAuthResponse(BaseModel):
     """Response after successful Google auth."""
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
     user: dict
 
 
-def create_jwt_token(user_id: int, email: str) -> str:
-    """Create JWT token for authenticated user."""
-    expiration = datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
-    payload = {
-        "sub": str(user_id),
-        "email": email,
-        "exp": expiration,
-        "iat": datetime.utcnow()
-    }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
-
-
 def verify_google_token(credential: str) -> dict:
     """
-    Verify Google ID token.
-    In production, this should properly validate the token with Google.
-    For now, we decode it without verification for development.
+    Verify Google ID token against Google's (cached) public keys.
     """
     try:
-        # Decode JWT without verification (for development)
-        # In production, use google.oauth2.id_token.verify_oauth2_token
-        import base64
-        import json
-        
-        # Google ID tokens are JWTs - decode the payload
-        parts = credential.split('.')
-        if len(parts) != 3:
-            raise ValueError("Invalid token format")
-        
-        # Decode payload (middle part)
-        payload = parts[1]
-        # Add padding if needed
-        padding = 4 - len(payload) % 4
-        if padding != 4:
-            payload += '=' * padding
-        
-        decoded = base64.urlsafe_b64decode(payload)
-        data = json.loads(decoded)
-        
-        # Extract user info
-        return {
-            "google_id": data.get("sub"),
-            "email": data.get("email"),
-            "name": data.get("name"),
-            "picture": data.get("picture"),
-            "email_verified": data.get("email_verified", False)
-        }
-    except Exception as e:
+        return verify_google_id_token(credential)
+    except GoogleTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid Google token: {str(e)}"
         )
 
 
-def generate_username(email: str, name: str = None) -> str:
-    """Generate unique username from email/name."""
-    if name:
-        base = name.lower().replace(' ', '_')[:15]
-    else:
-        base = email.split('@')[0][:15]
-    
-    # Add random suffix
-    suffix = secrets.token_hex(3)
-    return f"{base}_{suffix}"
-
-
 @router.post("/callback", response_model=GoogleAuthResponse)
 def google_auth_callback(request: GoogleTokenRequest):
     """
@@ -113,77 +55,25 @@ def google_auth_callback(request: GoogleTokenRequest):
             detail="Email not provided by Google"
         )
     
-    google_id = google_user["google_id"]
-    email = google_user["email"]
-    name = google_user.get("name", "")
-    picture = google_user.get("picture", "")
-    
-    now = datetime.utcnow().isoformat()
-    
     with get_db() as conn:
-        # Check if user exists by Google ID
-        existing = conn.execute(
-            "SELECT * FROM users WHERE google_id = ?",
-            (google_id,)
-        ).fetchone()
-        
-        if existing:
-            # Update last login
-            conn.execute(
-                "UPDATE users SET last_login = ?, updated_at = ? WHERE id = ?",
-                (now, now, existing['id'])
-            )
-            user = existing
-        else:
-            # Check if email already exists (local account)
-            email_exists = conn.execute(
-                "SELECT * FROM users WHERE email = ?",
-                (email,)
-            ).fetchone()
-            
-            if email_exists:
-                # Link Google to existing account
-                conn.execute("""
-                    UPDATE users SET 
-                        google_id = ?,
-                        auth_provider = 'google',
-                        avatar_url = COALESCE(avatar_url, ?),
-                        last_login = ?,
-                        updated_at = ?
-                    WHERE id = ?
-                """, (google_id, picture, now, now, email_exists['id']))
-                user = email_exists
-            else:
-                # Create new user
-                username = generate_username(email, name)
-                referral_code = secrets.token_hex(6).upper()
-                
-                cursor = conn.execute("""
-                    INSERT INTO users (
-                        username, email, google_id, auth_provider,
-                        display_name, avatar_url, referral_code,
-                        created_at, updated_at, last_login
-                    ) VALUES (?, ?, ?, 'google', ?, ?, ?, ?, ?, ?)
-                """, (
-                    username, email, google_id,
-                    name or username, picture, referral_code,
-                    now, now, now
-                ))
-                
-                user_id = cursor.lastrowid
-                user = conn.execute(
-                    "SELECT * FROM users WHERE id = ?",
-                    (user_id,)
-                ).fetchone()
-        
-        conn.commit()
+        # Find, link or create the user (one upsert, plus one update for new users)
+        user, _ = upsert_google_user(conn, google_user)
+    
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Email belongs to an existing account that is not verified by Google "
+                   "or linked to another Google account"
+        )
     
-    # Create JWT token
-    token = create_jwt_token(user['id'], user['email'])
+    # Same tokens as /auth/login (persisted signing keys, refreshable)
+    token = create_access_token(user['id'], user['username'])
+    refresh_token = create_refresh_token(user['id'])
     
     # Return response
     return GoogleAuthResponse(
         access_token=token,
+        refresh_token=refresh_token,
         user={
             "id": user['id'],
             "username": user['username'],
@@ -4,93 +4,144 @@ Provolution Gamification - Leaderboard Endpoints
 GET /leaderboards/weekly - Weekly ranking
 GET /leaderboards/monthly - Monthly ranking
 GET /leaderboards/regional/{region} - Regional ranking
+GET /leaderboards/regions - All regions summary
+GET /leaderboards/teams - Team ranking
+GET /leaderboards/friends - You and the users you follow
+GET /leaderboards/weekly/around-me - Entries around the caller
+GET /leaderboards/monthly/around-me - Entries around the caller
+GET /leaderboards/regional/{region}/around-me - Entries around the caller
+GET /leaderboards/weekly/stream - Live weekly ranking (Server-Sent Events)
+GET /leaderboards/monthly/stream - Live monthly ranking (Server-Sent Events)
+GET /leaderboards/regional/{region}/stream - Live regional ranking (Server-Sent Events)
+GET /leaderboards/weekly/{week} - Ranking of a past week (frozen)
+GET /leaderboards/seasons - Current and past seasons
+GET /leaderboards/seasons/{season} - Season ranking
+
+User rankings take ?metric=co2_kg|xp|challenges.
 """
 
-from fastapi import APIRouter, Depends, Query
-from datetime import datetime, date, timedelta
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import Response, StreamingResponse
+from datetime import datetime, date
+from typing import Callable, Optional
 
 from ..models import (
     LeaderboardResponse,
+    LeaderboardSnapshot,
     LeaderboardPeriod,
     LeaderboardEntry,
     MyRank,
+    RegionInfo,
+    RegionSummary,
+    RegionsSummaryResponse,
+    SeasonInfo,
+    SeasonListResponse,
+    SeasonLeaderboardResponse,
+    TeamBrief,
+    TeamLeaderboardEntry,
+    TeamLeaderboardResponse,
     UserBriefResponse
 )
 from ..auth import CurrentUser, get_current_user, get_current_user_optional
+from ..cache import (
+    RESOURCE_LEADERBOARDS,
+    CachedResponse,
+    ResponseStore,
+    get_content_version,
+    read_content_version,
+    user_etag,
+)
 from ..database import get_db
+from ..live import live_leaderboards
+from ..responses import FastJSONResponse, dumps
+from ..singleflight import SingleFlight
+from ..services.follows import friend_rankings
+from ..services.leaderboard_scores import METRICS, METRIC_CO2, SCOPE_ALL, find_snapshot
+from ..services.regions import Region, region_for_name
+from ..services.seasons import (
+    KIND_SEASON,
+    Period,
+    Season,
+    month_for,
+    season_by_key,
+    season_for,
+    week_by_key,
+    week_for
+)
+from ..services.teams import TEAM_METRICS, team_of_user
 
 router = APIRouter(prefix="/leaderboards", tags=["Leaderboards"])
 
 
-def _get_week_dates() -> tuple[date, date]:
-    """Get start and end of current week (Monday to Sunday)."""
-    today = date.today()
-    start = today - timedelta(days=today.weekday())
-    end = start + timedelta(days=6)
-    return start, end
+# co2_kg, xp or challenges (see app/services/leaderboard_scores.py)
+METRIC_QUERY = Query(METRIC_CO2, pattern=f"^({'|'.join(METRICS)})$")
 
+# Entries pushed by the live streams
+LIVE_LIMIT = 50
 
-def _get_month_dates() -> tuple[date, date]:
-    """Get start and end of current month."""
-    today = date.today()
-    start = today.replace(day=1)
-    # End of month
-    if today.month == 12:
-        end = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
-    else:
-        end = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
-    return start, end
+ranking_flights = SingleFlight()
+
+# Friend boards are cached per user (see get_friends_leaderboard)
+MAX_CACHED_FRIEND_BOARDS = 1024
+friends_store = ResponseStore(MAX_CACHED_FRIEND_BOARDS)
 
 
 def _build_leaderboard(
     conn,
-    start_date: date,
-    end_date: date,
+    period: Period,
+    metric: str,
     limit: int,
     current_user_id: Optional[int],
-    region: Optional[str] = None
+    region: Optional[Region] = None,
+    version: Optional[int] = None
 ) -> LeaderboardResponse:
-    """Build leaderboard response with rankings and user position."""
+    """
+    Rankings and user position from the score index: the top `limit` rows
+    of (period, scope, metric) on idx_leaderboard_scores_rank.
     
-    # Base query - sum CO2 from completed challenges in period
-    region_filter = ""
-    params = [start_date.isoformat(), end_date.isoformat()]
+    The rankings are the same for every caller, so concurrent requests for
+    the same board and leaderboards `version` share one read (only my_rank
+    is per user).
+    """
+    key = (period.kind, period.key, region.id if region else SCOPE_ALL, metric)
+    if version is None:
+        version = get_content_version(RESOURCE_LEADERBOARDS)
     
-    if region:
-        region_filter = "AND u.region = ?"
-        params.append(region)
-    
-    params.append(limit)
+    rankings, _ = ranking_flights.do(
+        (*key, limit, version),
+        lambda: _top_rankings(conn, key, limit)
+    )
     
-    # Get top users by CO2 saved in period
+    return LeaderboardResponse(
+        period=LeaderboardPeriod(start=period.start, end=period.end),
+        metric=metric,
+        rankings=rankings,
+        my_rank=_my_rank(conn, key, current_user_id) if current_user_id else None,
+        region=RegionInfo(id=region.id, name=region.name) if region else None
+    )
+
+
+def _top_rankings(conn, key: tuple, limit: int) -> list[LeaderboardEntry]:
     rankings_data = conn.execute(
-        f"""
+        """
         SELECT 
             u.id,
             u.username,
             u.display_name,
             u.avatar_emoji,
-            COALESCE(SUM(c.co2_impact_kg_year), 0) as score
-        FROM users u
-        LEFT JOIN user_challenges uc ON uc.user_id = u.id
-        LEFT JOIN challenges c ON c.id = uc.challenge_id
-        WHERE (
-            uc.completed_at IS NULL 
-            OR (uc.completed_at >= ? AND uc.completed_at <= ?)
-        )
-        {region_filter}
-        GROUP BY u.id
-        HAVING score > 0
-        ORDER BY score DESC
+            s.score
+        FROM leaderboard_scores s
+        JOIN users u ON u.id = s.user_id
+        WHERE s.kind = ? AND s.period_key = ? AND s.scope = ? AND s.metric = ?
+          AND s.score > 0
+        ORDER BY s.score DESC, s.user_id
         LIMIT ?
         """,
-        tuple(params)
+        (*key, limit)
     ).fetchall()
     
-    rankings = []
-    for i, r in enumerate(rankings_data, 1):
-        rankings.append(LeaderboardEntry(
+    return [
+        LeaderboardEntry(
             rank=i,
             user=UserBriefResponse(
                 id=r['id'],
@@ -99,124 +150,715 @@ def _build_leaderboard(
                 avatar_emoji=r.get('avatar_emoji', '🌱')
             ),
             score=r['score'],
-            metric="co2_kg"
-        ))
-    
-    # Get current user's rank if authenticated
-    my_rank = None
-    if current_user_id:
-        # Find user's position
-        user_score_result = conn.execute(
-            """
-            SELECT COALESCE(SUM(c.co2_impact_kg), 0) as score
-            FROM user_challenges uc
-            JOIN challenges c ON c.id = uc.challenge_id
-            WHERE uc.user_id = ?
-            AND (uc.completed_at >= ? AND uc.completed_at <= ?)
-            """,
-            (current_user_id, start_date.isoformat(), end_date.isoformat())
-        ).fetchone()
-        
-        user_score = user_score_result['score'] if user_score_result else 0
-        
-        # Count users above and below
-        above = conn.execute(
-            f"""
-            SELECT COUNT(DISTINCT u.id) as count
-            FROM users u
-            LEFT JOIN user_challenges uc ON uc.user_id = u.id
-            LEFT JOIN challenges c ON c.id = uc.challenge_id
-            WHERE (uc.completed_at >= ? AND uc.completed_at <= ?)
-            {region_filter}
-            GROUP BY u.id
-            HAVING SUM(c.co2_impact_kg) > ?
-            """,
-            (*params[:-1], user_score)
-        ).fetchall()
-        
-        users_above = len(above)
-        
-        below = conn.execute(
-            f"""
-            SELECT COUNT(DISTINCT u.id) as count
-            FROM users u
-            LEFT JOIN user_challenges uc ON uc.user_id = u.id  
-            LEFT JOIN challenges c ON c.id = uc.challenge_id
-            WHERE (uc.completed_at >= ? AND uc.completed_at <= ?)
-            {region_filter}
-            GROUP BY u.id
-            HAVING SUM(c.co2_impact_kg) < ? AND SUM(c.co2_impact_kg) > 0
-            """,
-            (*params[:-1], user_score)
-        ).fetchall()
-        
-        users_below = len(below)
-        
-        my_rank = MyRank(
-            rank=users_above + 1,
-            score=user_score,
-            users_above=users_above,
-            users_below=users_below
+            metric=key[3]
         )
+        for i, r in enumerate(rankings_data, 1)
+    ]
+
+
+def _my_rank(conn, key: tuple, user_id: int) -> MyRank:
+    """
+    Position of the user for a (kind, period_key, scope, metric) key: one
+    primary key lookup and two range counts on idx_leaderboard_scores_rank.
+    Ranks are positions as in the top-N rankings (score, then user id), so
+    tied users get consecutive ranks; users without a score rank after
+    everyone who has one.
+    """
+    row = conn.execute(
+        """
+        SELECT score FROM leaderboard_scores
+        WHERE kind = ? AND period_key = ? AND scope = ? AND metric = ? AND user_id = ?
+        """,
+        (*key, user_id)
+    ).fetchone()
+    user_score = row['score'] if row else 0
+    
+    counts = conn.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM leaderboard_scores
+             WHERE kind = :kind AND period_key = :period_key AND scope = :scope
+               AND metric = :metric AND score > 0
+               AND (score > :score OR (score = :score AND user_id < :user_id))) as above,
+            (SELECT COUNT(*) FROM leaderboard_scores
+             WHERE kind = :kind AND period_key = :period_key AND scope = :scope
+               AND metric = :metric AND score > 0
+               AND (score < :score OR (score = :score AND user_id > :user_id))) as below
+        """,
+        {
+            "kind": key[0],
+            "period_key": key[1],
+            "scope": key[2],
+            "metric": key[3],
+            "score": user_score,
+            "user_id": user_id
+        }
+    ).fetchone()
+    
+    return MyRank(
+        rank=counts['above'] + 1,
+        score=user_score,
+        users_above=counts['above'],
+        users_below=counts['below']
+    )
+
+
+def _build_around_me(
+    conn,
+    period: Period,
+    metric: str,
+    radius: int,
+    current_user: CurrentUser,
+    region: Optional[Region] = None
+) -> LeaderboardResponse:
+    """
+    The caller and up to `radius` entries on either side. Each side is one
+    range seek on idx_leaderboard_scores_rank starting at the caller's
+    (score, user_id), read away from it; ranks are positions as in the
+    top-N rankings and my_rank (score, then user id).
+    """
+    key = (period.kind, period.key, region.id if region else SCOPE_ALL, metric)
+    my_rank = _my_rank(conn, key, current_user.id)
+    params = {
+        "kind": key[0],
+        "period_key": key[1],
+        "scope": key[2],
+        "metric": key[3],
+        "score": my_rank.score,
+        "user_id": current_user.id,
+        "radius": radius
+    }
+    
+    above = conn.execute(
+        """
+        SELECT u.id, u.username, u.display_name, u.avatar_emoji, s.score
+        FROM leaderboard_scores s
+        JOIN users u ON u.id = s.user_id
+        WHERE s.kind = :kind AND s.period_key = :period_key AND s.scope = :scope
+          AND s.metric = :metric AND s.score >= :score AND s.score > 0
+          AND NOT (s.score = :score AND s.user_id >= :user_id)
+        ORDER BY s.score, s.user_id DESC
+        LIMIT :radius
+        """,
+        params
+    ).fetchall()
+    below = conn.execute(
+        """
+        SELECT u.id, u.username, u.display_name, u.avatar_emoji, s.score
+        FROM leaderboard_scores s
+        JOIN users u ON u.id = s.user_id
+        WHERE s.kind = :kind AND s.period_key = :period_key AND s.scope = :scope
+          AND s.metric = :metric AND s.score <= :score AND s.score > 0
+          AND NOT (s.score = :score AND s.user_id <= :user_id)
+        ORDER BY s.score DESC, s.user_id
+        LIMIT :radius
+        """,
+        params
+    ).fetchall()
+    
+    me = []
+    if my_rank.score > 0:
+        user = current_user.data
+        me.append({
+            'id': user['id'],
+            'username': user['username'],
+            'display_name': user.get('display_name'),
+            'avatar_emoji': user.get('avatar_emoji'),
+            'score': my_rank.score
+        })
+    window = [*reversed(above), *me, *below]
+    first_rank = my_rank.rank - len(above)
     
     return LeaderboardResponse(
-        period=LeaderboardPeriod(start=start_date, end=end_date),
-        rankings=rankings,
-        my_rank=my_rank
+        period=LeaderboardPeriod(start=period.start, end=period.end),
+        metric=metric,
+        rankings=[
+            LeaderboardEntry(
+                rank=first_rank + i,
+                user=UserBriefResponse(
+                    id=r['id'],
+                    username=r['username'],
+                    display_name=r.get('display_name'),
+                    avatar_emoji=r.get('avatar_emoji') or '🌱'
+                ),
+                score=r['score'],
+                metric=metric
+            )
+            for i, r in enumerate(window)
+        ],
+        my_rank=my_rank,
+        region=RegionInfo(id=region.id, name=region.name) if region else None
     )
 
 
 @router.get("/weekly", response_model=LeaderboardResponse)
 def get_weekly_leaderboard(
     limit: int = Query(10, ge=1, le=100),
+    metric: str = METRIC_QUERY,
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional)
+):
+    """Get weekly leaderboard by CO2 saved, XP earned or challenges completed."""
+    with get_db() as conn:
+        return FastJSONResponse(_build_leaderboard(
+            conn,
+            week_for(date.today()),
+            metric,
+            limit,
+            current_user.id if current_user else None
+        ))
+
+
+@router.get("/weekly/around-me", response_model=LeaderboardResponse)
+def get_weekly_around_me(
+    radius: int = Query(5, ge=1, le=50),
+    metric: str = METRIC_QUERY,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """The `radius` users ranked directly above and below you this week."""
+    with get_db() as conn:
+        return FastJSONResponse(_build_around_me(
+            conn,
+            week_for(date.today()),
+            metric,
+            radius,
+            current_user
+        ))
+
+
+@router.get("/monthly/around-me", response_model=LeaderboardResponse)
+def get_monthly_around_me(
+    radius: int = Query(5, ge=1, le=50),
+    metric: str = METRIC_QUERY,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """The `radius` users ranked directly above and below you this month."""
+    with get_db() as conn:
+        return FastJSONResponse(_build_around_me(
+            conn,
+            month_for(date.today()),
+            metric,
+            radius,
+            current_user
+        ))
+
+
+@router.get("/weekly/stream", response_class=StreamingResponse)
+async def stream_weekly_leaderboard(metric: str = METRIC_QUERY):
+    """
+    Live top 50 of the current week as Server-Sent Events: a `snapshot`
+    event on connect, then `delta` events as challenges are completed.
+    """
+    return _live_stream(("week", metric), week_for, metric)
+
+
+@router.get("/monthly/stream", response_class=StreamingResponse)
+async def stream_monthly_leaderboard(metric: str = METRIC_QUERY):
+    """Live top 50 of the current month as Server-Sent Events (see /weekly/stream)."""
+    return _live_stream(("month", metric), month_for, metric)
+
+
+@router.get("/weekly/{week}", response_model=LeaderboardResponse)
+def get_past_weekly_leaderboard(
+    week: str,
+    limit: int = Query(10, ge=1, le=100),
+    metric: str = METRIC_QUERY,
     current_user: Optional[CurrentUser] = Depends(get_current_user_optional)
 ):
-    """Get weekly CO2 savings leaderboard."""
-    start, end = _get_week_dates()
+    """
+    Get the leaderboard of a given ISO week (e.g. 2026-W41).
+    
+    Past weeks are served from their frozen snapshot; the current week is
+    computed live like /weekly.
+    """
+    period = week_by_key(week)
+    today = date.today()
+    if period and period.start <= today <= period.end:
+        return get_weekly_leaderboard(limit, metric, current_user)
     
     with get_db() as conn:
-        return _build_leaderboard(
+        snapshot = find_snapshot(conn, period, metric) if period and period.end < today else None
+        if not snapshot:
+            _raise_period_not_found("Für diese Woche gibt es keine Rangliste")
+        return FastJSONResponse(_build_snapshot_leaderboard(
             conn,
-            start,
-            end,
+            snapshot,
             limit,
             current_user.id if current_user else None
-        )
+        ))
 
 
 @router.get("/monthly", response_model=LeaderboardResponse)
 def get_monthly_leaderboard(
     limit: int = Query(10, ge=1, le=100),
+    metric: str = METRIC_QUERY,
     current_user: Optional[CurrentUser] = Depends(get_current_user_optional)
 ):
-    """Get monthly CO2 savings leaderboard."""
-    start, end = _get_month_dates()
-    
+    """Get monthly leaderboard by CO2 saved, XP earned or challenges completed."""
     with get_db() as conn:
-        return _build_leaderboard(
+        return FastJSONResponse(_build_leaderboard(
             conn,
-            start,
-            end,
+            month_for(date.today()),
+            metric,
             limit,
             current_user.id if current_user else None
-        )
+        ))
 
 
 @router.get("/regional/{region}", response_model=LeaderboardResponse)
 def get_regional_leaderboard(
     region: str,
     limit: int = Query(10, ge=1, le=100),
+    metric: str = METRIC_QUERY,
     current_user: Optional[CurrentUser] = Depends(get_current_user_optional)
 ):
-    """Get regional CO2 savings leaderboard."""
-    start, end = _get_month_dates()  # Monthly for regional
+    """
+    Get regional leaderboard for the current month.
     
+    `region` is a Bundesland name, its code (BY, DE-BY) or a common variant
+    (NRW). Served from the region's own scores, so it does not scan users
+    outside the region.
+    """
+    resolved = _resolve_region(region)
     with get_db() as conn:
-        return _build_leaderboard(
+        return FastJSONResponse(_build_leaderboard(
             conn,
-            start,
-            end,
+            month_for(date.today()),  # Monthly for regional
+            metric,
             limit,
             current_user.id if current_user else None,
-            region=region
+            region=resolved
+        ))
+
+
+@router.get("/regional/{region}/around-me", response_model=LeaderboardResponse)
+def get_regional_around_me(
+    region: str,
+    radius: int = Query(5, ge=1, le=50),
+    metric: str = METRIC_QUERY,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """The `radius` users ranked directly above and below you in a region this month."""
+    resolved = _resolve_region(region)
+    with get_db() as conn:
+        return FastJSONResponse(_build_around_me(
+            conn,
+            month_for(date.today()),
+            metric,
+            radius,
+            current_user,
+            region=resolved
+        ))
+
+
+@router.get("/regional/{region}/stream", response_class=StreamingResponse)
+async def stream_regional_leaderboard(region: str, metric: str = METRIC_QUERY):
+    """Live top 50 of a region this month as Server-Sent Events (see /weekly/stream)."""
+    resolved = _resolve_region(region)
+    return _live_stream(("region", resolved.id, metric), month_for, metric, resolved)
+
+
+@router.get("/regions", response_model=RegionsSummaryResponse)
+def get_regions_summary(
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional)
+):
+    """All regions ranked by CO2 saved this month, one aggregate row each."""
+    month = month_for(date.today())
+    
+    with get_db() as conn:
+        rows = conn.execute(
+            """
+            SELECT
+                r.id,
+                r.name,
+                COALESCE(s.total_co2_kg, 0) as total_co2_kg,
+                COALESCE(s.participants, 0) as participants,
+                COALESCE(s.completions, 0) as completions
+            FROM regions r
+            LEFT JOIN region_scores s ON s.region_id = r.id AND s.period = ?
+            ORDER BY total_co2_kg DESC, r.name
+            """,
+            (month.key,)
+        ).fetchall()
+    
+    return FastJSONResponse(RegionsSummaryResponse(
+        period=LeaderboardPeriod(start=month.start, end=month.end),
+        regions=[
+            RegionSummary(
+                rank=i,
+                region=RegionInfo(id=r['id'], name=r['name']),
+                total_co2_kg=round(r['total_co2_kg'], 2),
+                participants=r['participants'],
+                completions=r['completions']
+            )
+            for i, r in enumerate(rows, 1)
+        ],
+        my_region=current_user.data.get('region_id') if current_user else None
+    ))
+
+
+@router.get("/friends", response_model=LeaderboardResponse)
+def get_friends_leaderboard(
+    request: Request,
+    period: str = Query("weekly", pattern="^(weekly|monthly)$"),
+    metric: str = METRIC_QUERY,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    You and everyone you follow, ranked by this week's or month's score
+    (friends without a score are listed with 0).
+    
+    Reads the friend set once and looks up each friend's score in the
+    score index, so the cost grows with your friends, not with the number
+    of participants.
+    
+    Cached per user: the ETag combines the user's cache_version (bumped on
+    follow/unfollow) with the leaderboards version and the date, so a
+    follow only invalidates the follower's own friend boards.
+    """
+    etag = user_etag(current_user.data, RESOURCE_LEADERBOARDS, daily=True,
+                     variant=f"friends:{period}:{metric}")
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    cache_key = f"{current_user.id}|{period}|{metric}"
+    cached = friends_store.get(cache_key)
+    if cached is None or cached.etag != etag:
+        body = dumps(_friends_leaderboard(current_user.id, period, metric))
+        cached = CachedResponse(etag=etag, body=body, media_type="application/json")
+        friends_store.put(cache_key, cached)
+    
+    return Response(content=cached.body, media_type=cached.media_type, headers=headers)
+
+
+def _friends_leaderboard(user_id: int, period: str, metric: str) -> LeaderboardResponse:
+    """Friend board of a user from the score index (uncached)."""
+    current = week_for(date.today()) if period == "weekly" else month_for(date.today())
+    
+    with get_db() as conn:
+        rows = friend_rankings(conn, user_id, current, metric)
+    
+    # Positions (score, then user id), as on the public boards
+    position = next(i for i, r in enumerate(rows) if r['id'] == user_id)
+    my_score = rows[position]['score']
+    
+    return LeaderboardResponse(
+        period=LeaderboardPeriod(start=current.start, end=current.end),
+        metric=metric,
+        rankings=[
+            LeaderboardEntry(
+                rank=i,
+                user=UserBriefResponse(
+                    id=r['id'],
+                    username=r['username'],
+                    display_name=r.get('display_name'),
+                    avatar_emoji=r.get('avatar_emoji', '🌱')
+                ),
+                score=r['score'],
+                metric=metric
+            )
+            for i, r in enumerate(rows, 1)
+        ],
+        my_rank=MyRank(
+            rank=position + 1,
+            score=my_score,
+            users_above=position,
+            users_below=sum(1 for r in rows[position + 1:] if r['score'] > 0)
+        )
+    )
+
+
+@router.get("/teams", response_model=TeamLeaderboardResponse)
+def get_team_leaderboard(
+    metric: str = Query("xp", pattern="^(xp|co2_kg)$"),
+    limit: int = Query(10, ge=1, le=100),
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional)
+):
+    """
+    Get team ranking by total XP or CO2 saved.
+    
+    Reads the maintained team totals, so the cost does not depend on how
+    many members a team has.
+    """
+    column = TEAM_METRICS[metric]
+    
+    with get_db() as conn:
+        rankings_data = conn.execute(
+            f"""
+            SELECT id, name, member_count, {column} as score
+            FROM teams
+            ORDER BY {column} DESC, id
+            LIMIT ?
+            """,
+            (limit,)
+        ).fetchall()
+        
+        my_team = None
+        membership = team_of_user(conn, current_user.id) if current_user else None
+        if membership:
+            team_score = conn.execute(
+                f"SELECT {column} as score FROM teams WHERE id = ?",
+                (membership['team_id'],)
+            ).fetchone()['score']
+            # Positions: ties ordered by team id, as in the rankings
+            counts = conn.execute(
+                f"""
+                SELECT
+                    (SELECT COUNT(*) FROM teams
+                     WHERE {column} > :score OR ({column} = :score AND id < :team_id)) as above,
+                    (SELECT COUNT(*) FROM teams
+                     WHERE {column} < :score OR ({column} = :score AND id > :team_id)) as below
+                """,
+                {"score": team_score, "team_id": membership['team_id']}
+            ).fetchone()
+            my_team = MyRank(
+                rank=counts['above'] + 1,
+                score=team_score,
+                users_above=counts['above'],
+                users_below=counts['below']
+            )
+    
+    return FastJSONResponse(TeamLeaderboardResponse(
+        metric=metric,
+        rankings=[
+            TeamLeaderboardEntry(
+                rank=i,
+                team=TeamBrief(id=r['id'], name=r['name'], member_count=r['member_count']),
+                score=r['score'],
+                metric=metric
+            )
+            for i, r in enumerate(rankings_data, 1)
+        ],
+        my_team=my_team
+    ))
+
+
+@router.get("/seasons", response_model=SeasonListResponse)
+def list_seasons():
+    """The current season and all frozen seasons, newest first."""
+    current = season_for(date.today())
+    
+    with get_db() as conn:
+        snapshots = conn.execute(
+            """
+            SELECT * FROM leaderboard_snapshots
+            WHERE kind = ? AND metric = ?
+            ORDER BY start_date DESC
+            """,
+            (KIND_SEASON, METRIC_CO2)
+        ).fetchall()
+    
+    return FastJSONResponse(SeasonListResponse(
+        current=_season_info(current, None),
+        seasons=[_season_info(season_by_key(s['period_key']), s) for s in snapshots]
+    ))
+
+
+@router.get("/seasons/{season}", response_model=SeasonLeaderboardResponse)
+def get_season_leaderboard(
+    season: str,
+    limit: int = Query(10, ge=1, le=100),
+    metric: str = METRIC_QUERY,
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional)
+):
+    """
+    Get the leaderboard of a season (e.g. 2026-herbst, or `current`).
+    
+    The running season is computed live; finished seasons are served from
+    their frozen snapshot.
+    """
+    today = date.today()
+    period = season_for(today) if season == "current" else season_by_key(season)
+    if not period or period.start > today:
+        _raise_period_not_found("Saison nicht gefunden")
+    
+    with get_db() as conn:
+        if period.end >= today:
+            leaderboard = _build_leaderboard(
+                conn,
+                period,
+                metric,
+                limit,
+                current_user.id if current_user else None
+            )
+            co2_snapshot = None
+        else:
+            snapshot = find_snapshot(conn, period, metric)
+            if not snapshot:
+                _raise_period_not_found("Die Saison ist noch nicht abgeschlossen")
+            leaderboard = _build_snapshot_leaderboard(
+                conn,
+                snapshot,
+                limit,
+                current_user.id if current_user else None
+            )
+            # Season totals are reported in CO2 whatever the ranking metric
+            co2_snapshot = snapshot if metric == METRIC_CO2 else find_snapshot(conn, period, METRIC_CO2)
+    
+    return FastJSONResponse(SeasonLeaderboardResponse(
+        **leaderboard.model_dump(),
+        season=_season_info(period, co2_snapshot)
+    ))
+
+
+def _build_snapshot_leaderboard(
+    conn,
+    snapshot: dict,
+    limit: int,
+    current_user_id: Optional[int]
+) -> LeaderboardResponse:
+    """Rankings and user position from a frozen snapshot, no aggregation."""
+    rankings_data = conn.execute(
+        """
+        SELECT 
+            e.rank,
+            e.score,
+            u.id,
+            u.username,
+            u.display_name,
+            u.avatar_emoji
+        FROM leaderboard_snapshot_entries e
+        JOIN users u ON u.id = e.user_id
+        WHERE e.snapshot_id = ?
+        ORDER BY e.rank, e.user_id
+        LIMIT ?
+        """,
+        (snapshot['id'], limit)
+    ).fetchall()
+    
+    rankings = [
+        LeaderboardEntry(
+            rank=r['rank'],
+            user=UserBriefResponse(
+                id=r['id'],
+                username=r['username'],
+                display_name=r.get('display_name'),
+                avatar_emoji=r.get('avatar_emoji', '🌱')
+            ),
+            score=r['score'],
+            metric=snapshot['metric']
         )
+        for r in rankings_data
+    ]
+    
+    my_rank = None
+    if current_user_id:
+        mine = conn.execute(
+            """
+            SELECT rank, score FROM leaderboard_snapshot_entries
+            WHERE snapshot_id = ? AND user_id = ?
+            """,
+            (snapshot['id'], current_user_id)
+        ).fetchone()
+        if mine:
+            # Positions (ROW_NUMBER), as in the live rankings
+            users_below = conn.execute(
+                """
+                SELECT COUNT(*) as count FROM leaderboard_snapshot_entries
+                WHERE snapshot_id = ? AND rank > ?
+                """,
+                (snapshot['id'], mine['rank'])
+            ).fetchone()['count']
+            my_rank = MyRank(
+                rank=mine['rank'],
+                score=mine['score'],
+                users_above=mine['rank'] - 1,
+                users_below=users_below
+            )
+        else:
+            my_rank = MyRank(
+                rank=snapshot['participants'] + 1,
+                score=0,
+                users_above=snapshot['participants'],
+                users_below=0
+            )
+    
+    return LeaderboardResponse(
+        period=LeaderboardPeriod(
+            start=date.fromisoformat(snapshot['start_date']),
+            end=date.fromisoformat(snapshot['end_date'])
+        ),
+        metric=snapshot['metric'],
+        rankings=rankings,
+        my_rank=my_rank
+    )
+
+
+def _season_info(season: Season, snapshot: Optional[dict]) -> SeasonInfo:
+    if snapshot:
+        state = "closed"
+    elif season.end >= date.today():
+        state = "active"
+    else:
+        state = "pending"
+    return SeasonInfo(
+        id=season.key,
+        name=season.name,
+        theme=season.theme,
+        start=season.start,
+        end=season.end,
+        status=state,
+        participants=snapshot['participants'] if snapshot else None,
+        total_co2_kg=round(snapshot['total_score'], 2) if snapshot else None,
+        frozen_at=snapshot['created_at'] if snapshot else None
+    )
+
+
+def _live_stream(
+    key: tuple,
+    period_for: Callable[[date], Period],
+    metric: str,
+    region: Optional[Region] = None
+) -> StreamingResponse:
+    """
+    Subscribe to the shared live board `key` (app/live.py). The board is
+    computed once per change for all subscribers, so it carries no my_rank;
+    clients fetch /around-me for their own position.
+    """
+    def compute() -> LeaderboardSnapshot:
+        with get_db() as conn:
+            # Read the version first: a change committed after it only
+            # makes the next poll recompute once more.
+            version = read_content_version(conn, RESOURCE_LEADERBOARDS)
+            board = _build_leaderboard(
+                conn, period_for(date.today()), metric, LIVE_LIMIT, None,
+                region=region, version=version
+            )
+        return LeaderboardSnapshot(**board.model_dump(), version=version)
+
+    return StreamingResponse(
+        live_leaderboards.stream(key, compute),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _resolve_region(region: str) -> Region:
+    resolved = region_for_name(region)
+    if not resolved:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": "Region nicht gefunden"
+                }
+            }
+        )
+    return resolved
+
+
+def _raise_period_not_found(message: str) -> None:
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail={
+            "success": False,
+            "error": {
+                "code": "NOT_FOUND",
+                "message": message
+            }
+        }
+    )
@@ -16,6 +16,7 @@ from ..models import (
     RedemptionInfo
 )
 from ..auth import CurrentUser, get_current_user
+from ..cache import bump_user_version
 from ..database import get_db
 
 router = APIRouter(prefix="/rewards", tags=["Rewards"])
@@ -154,6 +155,7 @@ def redeem_package(
             "UPDATE users SET total_xp = total_xp - ? WHERE id = ?",
             (xp_required, current_user.id)
         )
+        bump_user_version(conn, current_user.id)
         
         # Decrease stock
         conn.execute(
@@ -0,0 +1,322 @@
+# routers/teams.py - Team Router
+"""
+Provolution Gamification - Team Endpoints
+POST /teams - Create a team
+GET /teams/{id} - Team details and top contributors
+PUT /teams/{id} - Update name/description (captain)
+DELETE /teams/{id} - Dissolve the team (captain)
+POST /teams/{id}/join - Join a team
+POST /teams/{id}/leave - Leave a team
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime
+from typing import Optional
+import sqlite3
+
+from ..models import (
+    TeamCreateRequest,
+    TeamUpdateRequest,
+    TeamInfo,
+    TeamMember,
+    TeamResponse,
+    TeamLeaveResponse,
+    UserBriefResponse
+)
+from ..auth import CurrentUser, get_current_user, get_current_user_optional
+from ..cache import bump_content_version, RESOURCE_LEADERBOARDS
+from ..database import get_db
+from ..services.teams import (
+    ROLE_CAPTAIN,
+    add_member,
+    remove_member,
+    team_of_user
+)
+
+router = APIRouter(prefix="/teams", tags=["Teams"])
+
+DEFAULT_MEMBER_LIMIT = 20
+
+
+@router.post("", response_model=TeamResponse)
+def create_team(
+    request: TeamCreateRequest,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Create a team. The creator becomes its captain.
+    Each user can be in one team at a time.
+    """
+    with get_db() as conn:
+        team = conn.execute(
+            """
+            INSERT INTO teams (name, description, total_xp, total_co2_saved,
+                               member_count, created_by, created_at)
+            VALUES (?, ?, 0, 0, 0, ?, ?)
+            ON CONFLICT DO NOTHING
+            RETURNING id
+            """,
+            (request.name.strip(), request.description, current_user.id,
+             datetime.utcnow().isoformat())
+        ).fetchone()
+        if not team:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "success": False,
+                    "error": {
+                        "code": "TEAM_NAME_TAKEN",
+                        "message": "Dieser Teamname ist bereits vergeben"
+                    }
+                }
+            )
+
+        if not add_member(conn, team['id'], current_user.id, ROLE_CAPTAIN):
+            _raise_already_in_team()
+        bump_content_version(conn, RESOURCE_LEADERBOARDS)
+
+        return _team_response(conn, team['id'], current_user.id, DEFAULT_MEMBER_LIMIT)
+
+
+@router.get("/{team_id}", response_model=TeamResponse)
+def get_team(
+    team_id: int,
+    limit: int = Query(DEFAULT_MEMBER_LIMIT, ge=1, le=100),
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional)
+):
+    """Get team totals and its top contributors by XP."""
+    with get_db() as conn:
+        return _team_response(
+            conn, team_id, current_user.id if current_user else None, limit
+        )
+
+
+@router.put("/{team_id}", response_model=TeamResponse)
+def update_team(
+    team_id: int,
+    request: TeamUpdateRequest,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Update team name or description. Captain only."""
+    with get_db() as conn:
+        _require_captain(conn, team_id, current_user.id)
+
+        updates = []
+        params = []
+
+        if request.name is not None:
+            updates.append("name = ?")
+            params.append(request.name.strip())
+
+        if request.description is not None:
+            updates.append("description = ?")
+            params.append(request.description)
+
+        if updates:
+            params.append(team_id)
+            try:
+                conn.execute(
+                    f"UPDATE teams SET {', '.join(updates)} WHERE id = ?",
+                    tuple(params)
+                )
+            except sqlite3.IntegrityError:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail={
+                        "success": False,
+                        "error": {
+                            "code": "TEAM_NAME_TAKEN",
+                            "message": "Dieser Teamname ist bereits vergeben"
+                        }
+                    }
+                )
+            # Team names appear in the team leaderboard
+            bump_content_version(conn, RESOURCE_LEADERBOARDS)
+
+        return _team_response(conn, team_id, current_user.id, DEFAULT_MEMBER_LIMIT)
+
+
+@router.delete("/{team_id}", response_model=TeamLeaveResponse)
+def delete_team(
+    team_id: int,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Dissolve the team and remove all members. Captain only."""
+    with get_db() as conn:
+        _require_captain(conn, team_id, current_user.id)
+
+        # team_members go with it (ON DELETE CASCADE)
+        conn.execute("DELETE FROM teams WHERE id = ?", (team_id,))
+        bump_content_version(conn, RESOURCE_LEADERBOARDS)
+
+        return TeamLeaveResponse(
+            success=True,
+            team_id=team_id,
+            team_dissolved=True,
+            message="Team aufgelöst"
+        )
+
+
+@router.post("/{team_id}/join", response_model=TeamResponse)
+def join_team(
+    team_id: int,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Join a team. XP and CO₂ saved from now on count towards the team
+    totals.
+    """
+    with get_db() as conn:
+        if not add_member(conn, team_id, current_user.id):
+            if not conn.execute("SELECT id FROM teams WHERE id = ?", (team_id,)).fetchone():
+                _raise_team_not_found()
+            _raise_already_in_team()
+        bump_content_version(conn, RESOURCE_LEADERBOARDS)
+
+        return _team_response(conn, team_id, current_user.id, DEFAULT_MEMBER_LIMIT)
+
+
+@router.post("/{team_id}/leave", response_model=TeamLeaveResponse)
+def leave_team(
+    team_id: int,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Leave a team. Your contributions are removed from the team totals; if
+    the captain leaves, the longest-standing member takes over, and the last
+    member leaving dissolves the team.
+    """
+    with get_db() as conn:
+        member = remove_member(conn, team_id, current_user.id)
+        if not member:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={
+                    "success": False,
+                    "error": {
+                        "code": "NOT_FOUND",
+                        "message": "Du bist nicht Mitglied dieses Teams"
+                    }
+                }
+            )
+        dissolved = not conn.execute(
+            "SELECT id FROM teams WHERE id = ?", (team_id,)
+        ).fetchone()
+        bump_content_version(conn, RESOURCE_LEADERBOARDS)
+
+        return TeamLeaveResponse(
+            success=True,
+            team_id=team_id,
+            team_dissolved=dissolved,
+            message="Team aufgelöst" if dissolved else "Du hast das Team verlassen"
+        )
+
+
+# ============================================
+# HELPER FUNCTIONS
+# ============================================
+
+def _team_response(conn, team_id: int, user_id: Optional[int], limit: int) -> TeamResponse:
+    """Team row plus its top `limit` members (idx_team_members_team)."""
+    team = conn.execute("SELECT * FROM teams WHERE id = ?", (team_id,)).fetchone()
+    if not team:
+        _raise_team_not_found()
+
+    members_data = conn.execute(
+        """
+        SELECT
+            u.id,
+            u.username,
+            u.display_name,
+            u.avatar_emoji,
+            tm.role,
+            tm.joined_at,
+            tm.xp_contributed,
+            tm.co2_contributed
+        FROM team_members tm
+        JOIN users u ON u.id = tm.user_id
+        WHERE tm.team_id = ?
+        ORDER BY tm.xp_contributed DESC
+        LIMIT ?
+        """,
+        (team_id, limit)
+    ).fetchall()
+
+    my_role = None
+    if user_id:
+        membership = team_of_user(conn, user_id)
+        if membership and membership['team_id'] == team_id:
+            my_role = membership['role']
+
+    return TeamResponse(
+        team=TeamInfo(
+            id=team['id'],
+            name=team['name'],
+            description=team.get('description'),
+            total_xp=team.get('total_xp') or 0,
+            total_co2_saved=team.get('total_co2_saved') or 0,
+            member_count=team.get('member_count') or 0,
+            created_by=team.get('created_by'),
+            created_at=team.get('created_at')
+        ),
+        members=[
+            TeamMember(
+                user=UserBriefResponse(
+                    id=m['id'],
+                    username=m['username'],
+                    display_name=m.get('display_name'),
+                    avatar_emoji=m.get('avatar_emoji', '🌱')
+                ),
+                role=m['role'],
+                joined_at=m.get('joined_at'),
+                xp_contributed=m['xp_contributed'],
+                co2_contributed=m['co2_contributed']
+            )
+            for m in members_data
+        ],
+        my_role=my_role
+    )
+
+
+def _require_captain(conn, team_id: int, user_id: int) -> None:
+    membership = team_of_user(conn, user_id)
+    if membership and membership['team_id'] == team_id and membership['role'] == ROLE_CAPTAIN:
+        return
+    if not conn.execute("SELECT id FROM teams WHERE id = ?", (team_id,)).fetchone():
+        _raise_team_not_found()
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail={
+            "success": False,
+            "error": {
+                "code": "FORBIDDEN",
+                "message": "Nur der Team-Captain darf das Team ändern"
+            }
+        }
+    )
+
+
+def _raise_team_not_found() -> None:
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail={
+            "success": False,
+            "error": {
+                "code": "NOT_FOUND",
+                "message": "Team nicht gefunden"
+            }
+        }
+    )
+
+
+def _raise_already_in_team() -> None:
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "success": False,
+            "error": {
+                "code": "ALREADY_IN_TEAM",
+                "message": "Du bist bereits in einem Team. Verlasse es zuerst."
+            }
+        }
+    )
@@ -3,17 +3,77 @@
 Provolution Gamification - User Endpoints
 GET /users/me - Get own profile
 PUT /users/me - Update profile
+GET /users/me/dashboard - Everything the app shows on page load
 GET /users/{id}/stats - Get user stats
+POST /users/{id}/follow - Follow a user
+DELETE /users/{id}/follow - Unfollow a user
+GET /users/me/following - Users you follow
+GET /users/me/followers - Users who follow you
+GET /users/me/referrals - Your referral network and its CO2 impact
+GET /users/{id}/referrals - A user's referral network
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 
-from ..models import UserResponse, UserUpdateRequest, UserStats
+from ..models import (
+    UserResponse,
+    UserUpdateRequest,
+    EarnedBadge,
+    MyRank,
+    DashboardChallenge,
+    DashboardBadges,
+    DashboardRanks,
+    DashboardResponse,
+    FollowResponse,
+    FollowListResponse,
+    ReferralLevel,
+    ReferralReachResponse,
+    UserBriefResponse
+)
 from ..auth import CurrentUser, get_current_user
+from ..cache import (
+    bump_content_version,
+    bump_user_version,
+    user_etag,
+    ResponseStore,
+    CachedResponse,
+    RESOURCE_BADGES,
+    RESOURCE_CHALLENGES,
+    RESOURCE_LEADERBOARDS
+)
 from ..database import get_db
+from ..responses import dumps
+from ..singleflight import SingleFlight
+from ..services.follows import MAX_FOLLOWING, follow, followers_count, following_count, unfollow
+from ..services.footprint_calculator import calculator
+from ..services.leaderboard_scores import METRIC_CO2, SCOPE_ALL
+from ..services.referrals import MAX_REFERRAL_DEPTH, referral_levels
+from ..services.seasons import month_for, week_for
+from ..services.user_stats import stats_for_user
+from .badges import next_co2_badge
+from .leaderboards import _my_rank
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# Dashboard: the independent queries run on their own connections in
+# parallel; rendered responses are kept per user until an ETag input changes
+DASHBOARD_QUERY_WORKERS = 8
+DASHBOARD_RECENT_BADGES = 5
+MAX_CACHED_DASHBOARDS = 1024
+
+# Shared content shown on the dashboard (names, ranks)
+DASHBOARD_RESOURCES = (RESOURCE_CHALLENGES, RESOURCE_BADGES, RESOURCE_LEADERBOARDS)
+
+_dashboard_executor = ThreadPoolExecutor(
+    max_workers=DASHBOARD_QUERY_WORKERS,
+    thread_name_prefix="dashboard"
+)
+dashboard_store = ResponseStore(MAX_CACHED_DASHBOARDS)
+dashboard_flights = SingleFlight()
+
 
 @router.get("/me", response_model=UserResponse)
 def get_my_profile(current_user: CurrentUser = Depends(get_current_user)):
@@ -40,7 +100,7 @@ def get_my_profile(current_user: CurrentUser = Depends(get_current_user)):
             )
         
         # Get stats
-        stats = _get_user_stats(conn, current_user.id)
+        stats = stats_for_user(user)
         
         return UserResponse(
             id=user['id'],
@@ -93,11 +153,51 @@ def update_my_profile(
             f"UPDATE users SET {', '.join(updates)} WHERE id = ?",
             tuple(params)
         )
+        # Display name / avatar appear in leaderboard entries
+        bump_content_version(conn, RESOURCE_LEADERBOARDS)
+        bump_user_version(conn, current_user.id)
         
         # Return updated profile
         return get_my_profile(current_user)
 
 
+@router.get("/me/dashboard", response_model=DashboardResponse)
+def get_my_dashboard(
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Profile, stats, active challenges, badges, footprint and leaderboard
+    ranks in one response.
+    
+    - Five queries, run concurrently (the user row comes with authentication)
+    - ETag from the user's cache_version plus the challenge/badge/leaderboard
+      versions and the date; If-None-Match answers 304, repeated calls are
+      served from memory until something the dashboard shows changes
+    - Concurrent calls for the same ETag (app start, retries) share one build
+    """
+    etag = user_etag(current_user.data, *DASHBOARD_RESOURCES, daily=True)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    cache_key = str(current_user.id)
+    cached = dashboard_store.get(cache_key)
+    if cached is None or cached.etag != etag:
+        def build() -> CachedResponse:
+            body = dumps(_build_dashboard(current_user))
+            entry = CachedResponse(etag=etag, body=body, media_type="application/json")
+            dashboard_store.put(cache_key, entry)
+            return entry
+        
+        # No stale copy here: right after a write the user expects to see it
+        cached, _ = dashboard_flights.do(etag, build)
+    
+    return Response(content=cached.body, media_type=cached.media_type, headers=headers)
+
+
 @router.get("/{user_id}/stats")
 def get_user_stats(user_id: int, current_user: CurrentUser = Depends(get_current_user)):
     """
@@ -106,7 +206,11 @@ def get_user_stats(user_id: int, current_user: CurrentUser = Depends(get_current
     """
     with get_db() as conn:
         user = conn.execute(
-            "SELECT id, username, display_name, avatar_emoji FROM users WHERE id = ?",
+            """
+            SELECT id, username, display_name, avatar_emoji,
+                   challenges_completed, badges_earned, referrals_count, total_co2_saved_kg
+            FROM users WHERE id = ?
+            """,
             (user_id,)
         ).fetchone()
         
@@ -122,7 +226,7 @@ def get_user_stats(user_id: int, current_user: CurrentUser = Depends(get_current
                 }
             )
         
-        stats = _get_user_stats(conn, user_id)
+        stats = stats_for_user(user)
         
         return {
             "user": {
@@ -135,40 +239,320 @@ def get_user_stats(user_id: int, current_user: CurrentUser = Depends(get_current
         }
 
 
-def _get_user_stats(conn, user_id: int) -> UserStats:
-    """Helper to calculate user statistics."""
-    # Get user's CO2 savings
-    user = conn.execute(
-        "SELECT total_co2_saved_kg FROM users WHERE id = ?",
-        (user_id,)
-    ).fetchone()
+@router.get("/me/referrals", response_model=ReferralReachResponse)
+def get_my_referrals(
+    max_depth: int = Query(MAX_REFERRAL_DEPTH, ge=1, le=MAX_REFERRAL_DEPTH),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Your referral network: users you referred directly and those they
+    referred in turn, per level, with the CO2 they saved.
+    """
+    return get_user_referrals(current_user.id, max_depth, current_user)
+
+
+@router.get("/{user_id}/referrals", response_model=ReferralReachResponse)
+def get_user_referrals(
+    user_id: int,
+    max_depth: int = Query(MAX_REFERRAL_DEPTH, ge=1, le=MAX_REFERRAL_DEPTH),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Referral network of a user up to max_depth levels, read from the
+    referral_paths closure table (one index range, no tree walk).
+    impact_multiplier is (own + network CO2) / own CO2.
+    """
+    with get_db() as conn:
+        user = conn.execute(
+            "SELECT id, total_co2_saved_kg FROM users WHERE id = ?",
+            (user_id,)
+        ).fetchone()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={
+                    "success": False,
+                    "error": {
+                        "code": "NOT_FOUND",
+                        "message": "User nicht gefunden"
+                    }
+                }
+            )
+        levels = [ReferralLevel(**row) for row in referral_levels(conn, user_id, max_depth)]
     
-    total_co2 = user.get('total_co2_saved_kg', 0) if user else 0
+    direct = sum(level.users for level in levels if level.depth == 1)
+    total = sum(level.users for level in levels)
+    own = round(user['total_co2_saved_kg'] or 0, 2)
+    network = round(sum(level.co2_saved_kg for level in levels), 2)
+    return ReferralReachResponse(
+        user_id=user_id,
+        direct=direct,
+        indirect=total - direct,
+        total=total,
+        levels=levels,
+        own_co2_saved_kg=own,
+        network_co2_saved_kg=network,
+        impact_multiplier=round((own + network) / own, 2) if own > 0 else None,
+        max_depth=max_depth
+    )
+
+
+@router.post("/{user_id}/follow", response_model=FollowResponse)
+def follow_user(user_id: int, current_user: CurrentUser = Depends(get_current_user)):
+    """
+    Follow a user. Everyone you follow shows up in your friend leaderboards
+    (/leaderboards/friends). Following someone twice is a no-op.
+    """
+    if user_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "CANNOT_FOLLOW_SELF",
+                    "message": "Du kannst dir nicht selbst folgen"
+                }
+            }
+        )
     
-    # Count completed challenges
-    completed = conn.execute(
-        """
-        SELECT COUNT(*) as count FROM user_challenges 
-        WHERE user_id = ? AND status = 'completed'
-        """,
+    with get_db() as conn:
+        user = _get_follow_target(conn, user_id)
+        created = follow(conn, current_user.id, user_id)
+        if created is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "success": False,
+                    "error": {
+                        "code": "FOLLOW_LIMIT",
+                        "message": f"Du kannst höchstens {MAX_FOLLOWING} Accounts folgen"
+                    }
+                }
+            )
+        if created:
+            # Only the follower's friend leaderboards change
+            bump_user_version(conn, current_user.id)
+        
+        return FollowResponse(
+            user_id=user_id,
+            following=True,
+            followers_count=followers_count(conn, user_id),
+            message=f"Du folgst jetzt {user.get('display_name') or user['username']}"
+        )
+
+
+@router.delete("/{user_id}/follow", response_model=FollowResponse)
+def unfollow_user(user_id: int, current_user: CurrentUser = Depends(get_current_user)):
+    """Stop following a user. Unfollowing someone you don't follow is a no-op."""
+    with get_db() as conn:
+        user = _get_follow_target(conn, user_id)
+        if unfollow(conn, current_user.id, user_id):
+            bump_user_version(conn, current_user.id)
+        
+        return FollowResponse(
+            user_id=user_id,
+            following=False,
+            followers_count=followers_count(conn, user_id),
+            message=f"Du folgst {user.get('display_name') or user['username']} nicht mehr"
+        )
+
+
+@router.get("/me/following", response_model=FollowListResponse)
+def list_following(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Users you follow, most recently followed first."""
+    with get_db() as conn:
+        return FollowListResponse(
+            users=_follow_page(conn, "follower_id", "followee_id", current_user.id, limit, offset),
+            total=following_count(conn, current_user.id),
+            offset=offset,
+            limit=limit
+        )
+
+
+@router.get("/me/followers", response_model=FollowListResponse)
+def list_followers(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Users who follow you, newest first (read in order from idx_follows_followee)."""
+    with get_db() as conn:
+        return FollowListResponse(
+            users=_follow_page(conn, "followee_id", "follower_id", current_user.id, limit, offset),
+            total=followers_count(conn, current_user.id),
+            offset=offset,
+            limit=limit
+        )
+
+
+def _get_follow_target(conn, user_id: int) -> dict:
+    user = conn.execute(
+        "SELECT id, username, display_name FROM users WHERE id = ?",
         (user_id,)
     ).fetchone()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": "User nicht gefunden"
+                }
+            }
+        )
+    return user
+
+
+def _follow_page(conn, user_column: str, other_column: str, user_id: int,
+                 limit: int, offset: int) -> list[UserBriefResponse]:
+    """One page of one side of the follow graph, newest first."""
+    rows = conn.execute(
+        f"""
+        SELECT u.id, u.username, u.display_name, u.avatar_emoji
+        FROM follows f
+        JOIN users u ON u.id = f.{other_column}
+        WHERE f.{user_column} = ?
+        ORDER BY f.created_at DESC, f.{other_column} DESC
+        LIMIT ? OFFSET ?
+        """,
+        (user_id, limit, offset)
+    ).fetchall()
+    return [
+        UserBriefResponse(
+            id=r['id'],
+            username=r['username'],
+            display_name=r.get('display_name'),
+            avatar_emoji=r.get('avatar_emoji', '🌱')
+        )
+        for r in rows
+    ]
+
+
+# ============================================
+# DASHBOARD QUERIES
+# ============================================
+
+def _build_dashboard(current_user: CurrentUser) -> DashboardResponse:
+    """Run the dashboard queries concurrently and assemble the response."""
+    user = current_user.data
+    challenges = _dashboard_executor.submit(_dashboard_challenges, current_user.id)
+    badges = _dashboard_executor.submit(_dashboard_badges, current_user.id)
+    footprint = _dashboard_executor.submit(_dashboard_footprint, current_user.id)
+    ranks = _dashboard_executor.submit(_dashboard_ranks, current_user.id)
     
-    # Count badges
-    badges = conn.execute(
-        "SELECT COUNT(*) as count FROM user_badges WHERE user_id = ?",
-        (user_id,)
-    ).fetchone()
+    stats = stats_for_user(user)
+    weekly, monthly = ranks.result()
+    return DashboardResponse(
+        profile=UserResponse(
+            id=user['id'],
+            username=user['username'],
+            display_name=user.get('display_name'),
+            avatar_emoji=user.get('avatar_emoji', '🌱'),
+            total_xp=user.get('total_xp', 0),
+            level=user.get('level', 1),
+            trust_level=user.get('trust_level', 1),
+            streak_days=user.get('streak_days', 0),
+            region=user.get('region'),
+            referral_code=user.get('referral_code'),
+            stats=stats
+        ),
+        active_challenges=challenges.result(),
+        badges=DashboardBadges(
+            recent=badges.result(),
+            total_earned=stats.badges_earned,
+            next_badge=next_co2_badge(user.get('total_co2_saved_kg') or 0)
+        ),
+        footprint=footprint.result(),
+        ranks=DashboardRanks(weekly=weekly, monthly=monthly),
+        generated_at=datetime.utcnow()
+    )
+
+
+def _dashboard_challenges(user_id: int) -> list[DashboardChallenge]:
+    with get_db() as conn:
+        rows = conn.execute(
+            """
+            SELECT
+                uc.challenge_id, uc.started_at, uc.days_completed, uc.progress_percent,
+                c.name, c.category, c.duration_days,
+                EXISTS (
+                    SELECT 1 FROM challenge_logs cl
+                    WHERE cl.user_challenge_id = uc.id AND cl.log_date = ?
+                ) AS logged_today
+            FROM user_challenges uc
+            JOIN challenges c ON c.id = uc.challenge_id
+            WHERE uc.user_id = ? AND uc.status = 'active'
+            ORDER BY uc.started_at DESC
+            """,
+            (date.today().isoformat(), user_id)
+        ).fetchall()
     
-    # Count referrals
-    referrals = conn.execute(
-        "SELECT COUNT(*) as count FROM users WHERE referred_by = ?",
-        (user_id,)
-    ).fetchone()
+    return [
+        DashboardChallenge(
+            challenge_id=r['challenge_id'],
+            name=r['name'],
+            category=r.get('category'),
+            started_at=datetime.fromisoformat(r['started_at']),
+            duration_days=r['duration_days'],
+            days_completed=r.get('days_completed') or 0,
+            progress_percent=r.get('progress_percent') or 0,
+            logged_today=bool(r['logged_today'])
+        )
+        for r in rows
+    ]
+
+
+def _dashboard_badges(user_id: int) -> list[EarnedBadge]:
+    with get_db() as conn:
+        rows = conn.execute(
+            """
+            SELECT b.*, ub.earned_at, ub.challenge_id
+            FROM user_badges ub
+            JOIN badges b ON b.id = ub.badge_id
+            WHERE ub.user_id = ?
+            ORDER BY ub.earned_at DESC
+            LIMIT ?
+            """,
+            (user_id, DASHBOARD_RECENT_BADGES)
+        ).fetchall()
     
-    return UserStats(
-        challenges_completed=completed['count'] if completed else 0,
-        total_co2_saved_kg=total_co2 or 0,
-        badges_earned=badges['count'] if badges else 0,
-        referrals_count=referrals['count'] if referrals else 0
-    )
+    return [
+        EarnedBadge(
+            id=b['id'],
+            name=b['name'],
+            icon=b['icon'],
+            tier=b.get('tier', 'bronze'),
+            description=b.get('description'),
+            earned_at=datetime.fromisoformat(b['earned_at']),
+            challenge_id=b.get('challenge_id')
+        )
+        for b in rows
+    ]
+
+
+def _dashboard_footprint(user_id: int):
+    with get_db() as conn:
+        row = conn.execute(
+            """
+            SELECT co2_total_kg_year, co2_housing_kg, co2_mobility_kg,
+                   co2_nutrition_kg, co2_consumption_kg, last_calculated
+            FROM user_footprint WHERE user_id = ?
+            """,
+            (user_id,)
+        ).fetchone()
+    return calculator.summarize(row) if row else None
+
+
+def _dashboard_ranks(user_id: int) -> tuple[MyRank, MyRank]:
+    """Weekly and monthly CO2 my_rank as in /leaderboards (score index reads)."""
+    today = date.today()
+    with get_db() as conn:
+        return tuple(
+            _my_rank(conn, (period.kind, period.key, SCOPE_ALL, METRIC_CO2), user_id)
+            for period in (week_for(today), month_for(today))
+        )
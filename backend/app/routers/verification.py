@@ -0,0 +1,112 @@
+# routers/verification.py - Spot-Check Review Router
+"""
+Provolution Gamification - Verification Endpoints
+GET /verification/queue - Size of the review queue
+POST /verification/claims - Lease a batch of spot checks
+POST /verification/decisions - Accept or reject claimed spot checks
+
+All endpoints require trust level REVIEWER_TRUST_LEVEL.
+"""
+
+from fastapi import APIRouter, Depends
+
+from ..models import (
+    SpotCheckOutcome,
+    SpotCheckClaimRequest,
+    SpotCheckItem,
+    SpotCheckClaimResponse,
+    SpotCheckDecisionRequest,
+    SpotCheckDecisionResult,
+    SpotCheckDecisionResponse,
+    UserBriefResponse,
+    VerificationQueueStats
+)
+from ..auth import CurrentUser, require_trust_level
+from ..cache import (
+    bump_content_version,
+    bump_user_version,
+    RESOURCE_CHALLENGES,
+    RESOURCE_LEADERBOARDS
+)
+from ..database import get_db
+from ..live import live_leaderboards
+from ..services.verification import claim_spot_checks, decide_spot_checks, queue_stats
+
+router = APIRouter(prefix="/verification", tags=["Verification"])
+
+REVIEWER_TRUST_LEVEL = 3
+
+
+@router.get("/queue", response_model=VerificationQueueStats)
+def get_queue(current_user: CurrentUser = Depends(require_trust_level(REVIEWER_TRUST_LEVEL))):
+    """Spot checks waiting for review, and how many of them are free to claim."""
+    with get_db() as conn:
+        return VerificationQueueStats(**queue_stats(conn))
+
+
+@router.post("/claims", response_model=SpotCheckClaimResponse)
+def claim(
+    request: SpotCheckClaimRequest,
+    current_user: CurrentUser = Depends(require_trust_level(REVIEWER_TRUST_LEVEL))
+):
+    """
+    Lease up to `limit` of the oldest free spot checks for `lease_seconds`.
+    Nobody else gets them until the lease expires; undecided ones then go
+    back to the queue. Your own completions are never handed to you.
+    """
+    with get_db() as conn:
+        items = claim_spot_checks(conn, current_user.id, request.limit, request.lease_seconds)
+    
+    return SpotCheckClaimResponse(items=[
+        SpotCheckItem(
+            user=UserBriefResponse(
+                id=item['user_id'],
+                username=item['username'],
+                display_name=item.get('display_name'),
+                avatar_emoji=item.get('avatar_emoji') or '🌱'
+            ),
+            **{k: v for k, v in item.items()
+               if k not in ('user_id', 'username', 'display_name', 'avatar_emoji')}
+        )
+        for item in items
+    ])
+
+
+@router.post("/decisions", response_model=SpotCheckDecisionResponse)
+def decide(
+    request: SpotCheckDecisionRequest,
+    current_user: CurrentUser = Depends(require_trust_level(REVIEWER_TRUST_LEVEL))
+):
+    """
+    Apply accept/reject outcomes for claimed spot checks in one transaction.
+    Only entries you hold a valid lease on are applied (others: NOT_CLAIMED).
+    A rejected completion is taken back: status 'rejected', and its XP,
+    stats, team/region totals and leaderboard scores are reverted.
+    """
+    decisions = {
+        d.user_challenge_id: d.outcome == SpotCheckOutcome.ACCEPT
+        for d in request.decisions
+    }
+    with get_db() as conn:
+        applied, reverted = decide_spot_checks(conn, current_user.id, decisions)
+        for user_id in {row['user_id'] for row in reverted}:
+            bump_user_version(conn, user_id)
+        if reverted:
+            bump_content_version(conn, RESOURCE_CHALLENGES, RESOURCE_LEADERBOARDS)
+    
+    if reverted:
+        live_leaderboards.notify()
+    return SpotCheckDecisionResponse(
+        success=True,
+        accepted=sum(1 for uc_id in applied if decisions[uc_id]),
+        rejected=sum(1 for uc_id in applied if not decisions[uc_id]),
+        xp_reverted=sum(row['xp'] for row in reverted),
+        results=[
+            SpotCheckDecisionResult(
+                user_challenge_id=d.user_challenge_id,
+                applied=d.user_challenge_id in applied,
+                error=None if d.user_challenge_id in applied else "NOT_CLAIMED"
+            )
+            for d in request.decisions
+        ]
+    )
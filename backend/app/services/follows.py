@@ -0,0 +1,106 @@
+# services/follows.py
+"""
+Provolution Follows
+Gerichteter Follow-Graph in follows(follower_id, followee_id). Die Freunde
+eines Users sind die Accounts, denen er folgt.
+
+- Beide Richtungen sind Index-Bereiche: der Primärschlüssel liefert, wem
+  jemand folgt, idx_follows_followee (followee_id, created_at), wer ihm
+  folgt. Auch bei Accounts mit Tausenden Followern wird nie die Tabelle
+  gelesen, Zählen ist ein Bereichs-COUNT auf demselben Index
+- follow / unfollow sind idempotent (ON CONFLICT DO NOTHING bzw. DELETE)
+- Jeder User folgt höchstens MAX_FOLLOWING Accounts; das Limit steht im
+  INSERT, damit gleichzeitige Follows es nicht überschreiten
+
+Freundes-Ranglisten (friend_rankings) lesen die Freundesmenge einmal als
+PK-Bereich und holen je Freund den Score aus leaderboard_scores per
+Primärschlüssel. Die Kosten hängen nur von der Zahl der Freunde ab, nicht
+von der Zahl der Teilnehmer der Periode.
+"""
+
+from typing import Optional
+import sqlite3
+
+from .leaderboard_scores import SCOPE_ALL
+from .seasons import Period
+
+
+MAX_FOLLOWING = 1000
+
+
+def follow(conn: sqlite3.Connection, follower_id: int, followee_id: int) -> Optional[bool]:
+    """
+    Legt die Beziehung an. True wenn neu, False wenn sie schon bestand,
+    None wenn das Limit MAX_FOLLOWING erreicht ist.
+    """
+    # Limit im INSERT selbst: Zählen und Einfügen sind eine Schreib-Anweisung,
+    # zwei gleichzeitige Follows können das Limit nicht gemeinsam überschreiten
+    row = conn.execute(
+        """
+        INSERT INTO follows (follower_id, followee_id)
+        SELECT :follower_id, :followee_id
+        WHERE (SELECT COUNT(*) FROM follows WHERE follower_id = :follower_id) < :limit
+        ON CONFLICT DO NOTHING
+        RETURNING follower_id
+        """,
+        {"follower_id": follower_id, "followee_id": followee_id, "limit": MAX_FOLLOWING}
+    ).fetchone()
+    if row is not None:
+        return True
+    exists = conn.execute(
+        "SELECT 1 FROM follows WHERE follower_id = ? AND followee_id = ?",
+        (follower_id, followee_id)
+    ).fetchone()
+    return False if exists else None
+
+
+def unfollow(conn: sqlite3.Connection, follower_id: int, followee_id: int) -> bool:
+    """Entfernt die Beziehung. False, wenn es sie nicht gab."""
+    row = conn.execute(
+        "DELETE FROM follows WHERE follower_id = ? AND followee_id = ? RETURNING follower_id",
+        (follower_id, followee_id)
+    ).fetchone()
+    return row is not None
+
+
+def following_count(conn: sqlite3.Connection, user_id: int) -> int:
+    return conn.execute(
+        "SELECT COUNT(*) AS n FROM follows WHERE follower_id = ?", (user_id,)
+    ).fetchone()['n']
+
+
+def followers_count(conn: sqlite3.Connection, user_id: int) -> int:
+    return conn.execute(
+        "SELECT COUNT(*) AS n FROM follows WHERE followee_id = ?", (user_id,)
+    ).fetchone()['n']
+
+
+def friend_rankings(conn: sqlite3.Connection, user_id: int,
+                    period: Period, metric: str) -> list[dict]:
+    """
+    Der User und alle, denen er folgt, mit ihrem Score der Periode (0 ohne
+    Score), absteigend nach Score, bei Gleichstand nach User-ID.
+    """
+    return conn.execute(
+        """
+        WITH circle(user_id) AS (
+            SELECT followee_id FROM follows WHERE follower_id = :user_id
+            UNION ALL
+            SELECT :user_id
+        )
+        SELECT
+            u.id,
+            u.username,
+            u.display_name,
+            u.avatar_emoji,
+            COALESCE(s.score, 0) AS score
+        FROM circle c
+        JOIN users u ON u.id = c.user_id
+        LEFT JOIN leaderboard_scores s
+            ON s.kind = :kind AND s.period_key = :period_key AND s.scope = :scope
+           AND s.metric = :metric AND s.user_id = c.user_id
+        ORDER BY score DESC, u.id
+        """,
+        {"user_id": user_id, "kind": period.kind, "period_key": period.key,
+         "scope": SCOPE_ALL, "metric": metric}
+    ).fetchall()
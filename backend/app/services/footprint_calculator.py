@@ -8,7 +8,7 @@ from datetime import datetime
 from typing import Optional
 from ..models.footprint import (
     FootprintInput, FootprintResult, FootprintBreakdown,
-    FootprintComparison, FootprintRecommendation
+    FootprintComparison, FootprintRecommendation, FootprintSummary
 )
 
 
@@ -127,6 +127,26 @@ class FootprintCalculator:
             profile_complete=True,
         )
     
+    def summarize(self, row: dict) -> FootprintSummary:
+        """Kurzfassung eines gespeicherten Footprints (user_footprint-Zeile)"""
+        # Größte Kategorie ermitteln
+        categories = {
+            'Wohnen': row['co2_housing_kg'] or 0,
+            'Mobilität': row['co2_mobility_kg'] or 0,
+            'Ernährung': row['co2_nutrition_kg'] or 0,
+            'Konsum': row['co2_consumption_kg'] or 0,
+        }
+        main_category = max(categories, key=categories.get)
+        
+        total = row['co2_total_kg_year'] or 0
+        return FootprintSummary(
+            total_co2_kg_year=total,
+            main_category=main_category,
+            vs_germany_percent=round((total - 10800) / 10800 * 100, 1),
+            last_calculated=row['last_calculated'],
+            sec_score=self._calc_sec_score(total)
+        )
+    
     def _calc_housing(self, h) -> float:
         """Berechnet CO₂ für Wohnen/Energie"""
         co2 = 0.0
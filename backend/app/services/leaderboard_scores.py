@@ -0,0 +1,215 @@
+# services/leaderboard_scores.py
+"""
+Provolution Leaderboard Scores
+Score-Index je (Periode, Bereich, Metrik, User) in leaderboard_scores, bei
+jedem Ereignis fortgeschrieben. Jede Rangliste ist damit ein Top-N-Lesen
+auf idx_leaderboard_scores_rank statt einer eigenen Aggregation über
+user_challenges.
+
+- Metriken: co2_kg (CO₂-Einsparung abgeschlossener Challenges), xp
+  (verdiente XP: Challenges, Onboarding, Empfehlungen) und challenges
+  (Anzahl Abschlüsse)
+- Perioden: Woche, Monat und Saison (Schlüssel siehe seasons.py)
+- Bereich (scope): "all" für die globalen Ranglisten, Regions-Kürzel für
+  die regionalen (nur Monate)
+- record_scores läuft in derselben Transaktion wie das Ereignis (über
+  user_stats.record_challenge_completed bzw. die Empfehlungs-XP);
+  rebuild_leaderboard_scores baut die Tabelle aus user_challenges und den
+  Empfehlungen neu auf (Migration, Bulk-Load)
+
+Abgelaufene Perioden ändern sich nicht mehr: snapshot_period friert ihre
+Endstände je Metrik in einem INSERT … SELECT (ROW_NUMBER() über den Score-Index)
+in leaderboard_snapshot_entries ein, close_leaderboard_periods.py tut das
+für alle abgelaufenen Wochen und Saisons ohne Snapshot (periods_to_close).
+Historische Ranglisten werden nur noch aus den Snapshots gelesen.
+"""
+
+from datetime import date, datetime
+from typing import Iterator, Optional
+import sqlite3
+
+from .seasons import (
+    KIND_MONTH,
+    KIND_SEASON,
+    KIND_WEEK,
+    Period,
+    month_for,
+    next_period,
+    season_for,
+    week_for
+)
+
+
+METRIC_CO2 = "co2_kg"
+METRIC_XP = "xp"
+METRIC_CHALLENGES = "challenges"
+METRICS = (METRIC_CO2, METRIC_XP, METRIC_CHALLENGES)
+
+SCOPE_ALL = "all"
+
+REFERRAL_XP = 100
+
+# Periodenschlüssel in SQL, für den Neuaufbau aus einer Spalte `day`
+# (YYYY-MM-DD); müssen week_for / month_for / season_for entsprechen.
+# Die ISO-Woche ist die des Donnerstags derselben Woche.
+_WEEK_KEY_SQL = """
+    strftime('%Y', date(day, 'weekday 0', '-3 days')) || '-W' ||
+    printf('%02d', (CAST(strftime('%j', date(day, 'weekday 0', '-3 days')) AS INTEGER) - 1) / 7 + 1)
+"""
+_MONTH_KEY_SQL = "substr(day, 1, 7)"
+_SEASON_KEY_SQL = """
+    CASE
+        WHEN CAST(substr(day, 6, 2) AS INTEGER) < 3
+            THEN (CAST(substr(day, 1, 4) AS INTEGER) - 1) || '-winter'
+        WHEN CAST(substr(day, 6, 2) AS INTEGER) < 6 THEN substr(day, 1, 4) || '-fruehling'
+        WHEN CAST(substr(day, 6, 2) AS INTEGER) < 9 THEN substr(day, 1, 4) || '-sommer'
+        WHEN CAST(substr(day, 6, 2) AS INTEGER) < 12 THEN substr(day, 1, 4) || '-herbst'
+        ELSE substr(day, 1, 4) || '-winter'
+    END
+"""
+
+
+def record_scores(conn: sqlite3.Connection, user_id: int, region_id: Optional[str],
+                  co2_kg: float = 0, xp: int = 0, challenges: int = 0,
+                  at: Optional[datetime] = None) -> None:
+    """
+    Schreibt ein Ereignis in alle betroffenen Scores: Woche, Monat und
+    Saison global, der Monat zusätzlich in der Region des Users.
+    """
+    day = (at or datetime.utcnow()).date()
+    periods = [(p.kind, p.key, SCOPE_ALL) for p in (week_for(day), month_for(day), season_for(day))]
+    if region_id:
+        periods.append((KIND_MONTH, month_for(day).key, region_id))
+    deltas = [(m, v) for m, v in ((METRIC_CO2, co2_kg), (METRIC_XP, xp),
+                                  (METRIC_CHALLENGES, challenges)) if v]
+    conn.executemany(
+        """
+        INSERT INTO leaderboard_scores (kind, period_key, scope, metric, user_id, score)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (kind, period_key, scope, metric, user_id) DO UPDATE SET
+            score = ROUND(score + excluded.score, 2)
+        """,
+        [(kind, key, scope, metric, user_id, value)
+         for kind, key, scope in periods for metric, value in deltas]
+    )
+
+
+def rebuild_leaderboard_scores(conn: sqlite3.Connection) -> None:
+    """leaderboard_scores aus Abschlüssen und Empfehlungen neu aufbauen."""
+    conn.execute("DELETE FROM leaderboard_scores")
+    conn.execute(
+        f"""
+        WITH events AS (
+            SELECT uc.user_id, u.region_id, date(uc.completed_at) AS day,
+                   COALESCE(c.co2_impact_kg_year, 0) AS co2_kg,
+                   COALESCE(NULLIF(uc.xp_earned, 0), c.xp_reward, 0) AS xp,
+                   1 AS challenges
+            FROM user_challenges uc
+            JOIN users u ON u.id = uc.user_id
+            JOIN challenges c ON c.id = uc.challenge_id
+            WHERE uc.status = 'completed' AND uc.completed_at IS NOT NULL
+            UNION ALL
+            SELECT r.id, r.region_id, date(u.created_at), 0, {REFERRAL_XP}, 0
+            FROM users u
+            JOIN users r ON r.id = u.referred_by
+            WHERE u.created_at IS NOT NULL
+        ),
+        periods AS (
+            SELECT '{KIND_WEEK}' AS kind, {_WEEK_KEY_SQL} AS period_key, '{SCOPE_ALL}' AS scope, * FROM events
+            UNION ALL
+            SELECT '{KIND_MONTH}', {_MONTH_KEY_SQL}, '{SCOPE_ALL}', * FROM events
+            UNION ALL
+            SELECT '{KIND_SEASON}', {_SEASON_KEY_SQL}, '{SCOPE_ALL}', * FROM events
+            UNION ALL
+            SELECT '{KIND_MONTH}', {_MONTH_KEY_SQL}, region_id, * FROM events WHERE region_id IS NOT NULL
+        ),
+        scores AS (
+            SELECT kind, period_key, scope, '{METRIC_CO2}' AS metric, user_id, co2_kg AS value FROM periods
+            UNION ALL
+            SELECT kind, period_key, scope, '{METRIC_XP}', user_id, xp FROM periods
+            UNION ALL
+            SELECT kind, period_key, scope, '{METRIC_CHALLENGES}', user_id, challenges FROM periods
+        )
+        INSERT INTO leaderboard_scores (kind, period_key, scope, metric, user_id, score)
+        SELECT kind, period_key, scope, metric, user_id, ROUND(SUM(value), 2)
+        FROM scores
+        GROUP BY kind, period_key, scope, metric, user_id
+        HAVING SUM(value) != 0
+        """
+    )
+
+
+# ============================================
+# SNAPSHOTS
+# ============================================
+
+def find_snapshot(conn: sqlite3.Connection, period: Period, metric: str) -> Optional[dict]:
+    return conn.execute(
+        """
+        SELECT * FROM leaderboard_snapshots
+        WHERE kind = ? AND period_key = ? AND metric = ?
+        """,
+        (period.kind, period.key, metric)
+    ).fetchone()
+
+
+def snapshot_period(conn: sqlite3.Connection, period: Period, metric: str) -> Optional[int]:
+    """
+    Friert die globale Rangliste der Periode für eine Metrik ein. Gibt die
+    Snapshot-ID zurück, None wenn es ihn schon gibt.
+    """
+    snapshot = conn.execute(
+        """
+        INSERT INTO leaderboard_snapshots (kind, period_key, metric, start_date, end_date)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT DO NOTHING
+        RETURNING id
+        """,
+        (period.kind, period.key, metric, period.start.isoformat(), period.end.isoformat())
+    ).fetchone()
+    if not snapshot:
+        return None
+
+    conn.execute(
+        """
+        INSERT INTO leaderboard_snapshot_entries (snapshot_id, rank, user_id, score)
+        SELECT ?, ROW_NUMBER() OVER (ORDER BY score DESC, user_id), user_id, score
+        FROM leaderboard_scores
+        WHERE kind = ? AND period_key = ? AND scope = ? AND metric = ? AND score > 0
+        """,
+        (snapshot['id'], period.kind, period.key, SCOPE_ALL, metric)
+    )
+    conn.execute(
+        """
+        UPDATE leaderboard_snapshots SET
+            participants = (SELECT COUNT(*) FROM leaderboard_snapshot_entries WHERE snapshot_id = :id),
+            total_score = (SELECT COALESCE(SUM(score), 0) FROM leaderboard_snapshot_entries WHERE snapshot_id = :id)
+        WHERE id = :id
+        """,
+        {"id": snapshot['id']}
+    )
+    return snapshot['id']
+
+
+def periods_to_close(conn: sqlite3.Connection, today: date) -> Iterator[Period]:
+    """
+    Abgelaufene Wochen und Saisons, denen für eine der Metriken der Snapshot
+    fehlt, ab dem ersten Abschluss (idx_user_challenges_completed) bis gestern.
+    """
+    first = conn.execute(
+        """
+        SELECT MIN(completed_at) AS first FROM user_challenges
+        WHERE status = 'completed' AND completed_at IS NOT NULL
+        """
+    ).fetchone()['first']
+    if not first:
+        return
+    frozen: dict[tuple[str, str], set[str]] = {}
+    for r in conn.execute("SELECT kind, period_key, metric FROM leaderboard_snapshots"):
+        frozen.setdefault((r['kind'], r['period_key']), set()).add(r['metric'])
+    first_day = date.fromisoformat(first[:10])
+    for period in (week_for(first_day), season_for(first_day)):
+        while period.end < today:
+            if not set(METRICS) <= frozen.get((period.kind, period.key), set()):
+                yield period
+            period = next_period(period)
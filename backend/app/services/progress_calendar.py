@@ -0,0 +1,139 @@
+# services/progress_calendar.py
+"""
+Provolution Progress Calendar
+Erledigte Tage einer Challenge-Teilnahme als Bitmap (user_challenges.log_bitmap).
+
+Bit i steht für den Tag started_at + i (Byte i // 8, Bit i % 8, also
+little-endian). Eine 365-Tage-Challenge braucht 46 Bytes; Fortschritt,
+Streaks und Kalender kommen ohne die challenge_logs-Zeilen aus.
+
+Loggbar sind nur Tage der Challenge (0 bis duration_days - 1) bis heute,
+das begrenzt die Bitmap auf die Länge der Challenge (log_day).
+
+Die Bitmap wird beim Loggen in derselben Transaktion gesetzt. Teilnahmen
+von vor der Einführung (log_bitmap IS NULL) werden beim ersten Zugriff
+einmal aus challenge_logs aufgebaut und gespeichert.
+"""
+
+from datetime import date
+from typing import Iterable, Optional
+import sqlite3
+
+
+# Clients dürfen dem Serverdatum um einen Tag voraus sein (Zeitzonen)
+MAX_DAYS_AHEAD = 1
+
+
+def start_date(started_at: str) -> date:
+    """Tag 0 der Bitmap aus user_challenges.started_at (ISO-Timestamp)."""
+    return date.fromisoformat(started_at[:10])
+
+
+def day_index(started_at: str, day: date) -> int:
+    """Bit-Position eines Kalendertags (negativ = vor dem Start)."""
+    return (day - start_date(started_at)).days
+
+
+def log_day(started_at: str, day: date, duration_days: int,
+            today: Optional[date] = None) -> Optional[int]:
+    """
+    Bit-Position eines loggbaren Tags; None, wenn er vor dem Start, in der
+    Zukunft oder nach dem letzten Tag der Challenge liegt.
+    """
+    if (day - (today or date.today())).days > MAX_DAYS_AHEAD:
+        return None
+    index = day_index(started_at, day)
+    return index if 0 <= index < duration_days else None
+
+
+def _as_int(bitmap: Optional[bytes]) -> int:
+    return int.from_bytes(bitmap or b"", "little")
+
+
+def _as_bytes(bits: int) -> bytes:
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def from_days(days: Iterable[int]) -> bytes:
+    bits = 0
+    for day in days:
+        bits |= 1 << day
+    return _as_bytes(bits)
+
+
+def set_days(bitmap: Optional[bytes], days: Iterable[int]) -> bytes:
+    """Bitmap mit zusätzlich gesetzten Tagen (wächst bei Bedarf)."""
+    bits = _as_int(bitmap)
+    for day in days:
+        bits |= 1 << day
+    return _as_bytes(bits)
+
+
+def is_set(bitmap: Optional[bytes], day: int) -> bool:
+    return day >= 0 and bool(_as_int(bitmap) >> day & 1)
+
+
+def count_days(bitmap: Optional[bytes]) -> int:
+    return _as_int(bitmap).bit_count()
+
+
+def longest_streak(bitmap: Optional[bytes]) -> int:
+    """Längste Folge erledigter Tage."""
+    bits = _as_int(bitmap)
+    length = 0
+    while bits:
+        bits &= bits >> 1
+        length += 1
+    return length
+
+
+def current_streak(bitmap: Optional[bytes], today: int) -> int:
+    """
+    Erledigte Tage in Folge bis heute; ist heute noch offen, zählt die
+    Serie bis gestern (sie ist noch nicht gerissen).
+    """
+    bits = _as_int(bitmap)
+    end = today if bits >> today & 1 else today - 1
+    if end < 0:
+        return 0
+    # Bits bis einschließlich `end`, invertiert: die Serie endet am höchsten 0-Bit
+    window = bits & ((1 << (end + 1)) - 1)
+    gaps = ~window & ((1 << (end + 1)) - 1)
+    return end + 1 - gaps.bit_length()
+
+
+def rebuild_bitmap(conn: sqlite3.Connection, user_challenge_id: int, started_at: str) -> bytes:
+    """Bitmap aus challenge_logs aufbauen und speichern."""
+    rows = conn.execute(
+        """
+        SELECT log_date FROM challenge_logs
+        WHERE user_challenge_id = ? AND completed = 1
+        """,
+        (user_challenge_id,)
+    ).fetchall()
+    days = (day_index(started_at, date.fromisoformat(r['log_date'])) for r in rows)
+    bitmap = from_days(d for d in days if d >= 0)
+    conn.execute(
+        "UPDATE user_challenges SET log_bitmap = ? WHERE id = ?",
+        (bitmap, user_challenge_id)
+    )
+    return bitmap
+
+
+def load_bitmaps(conn: sqlite3.Connection, user_challenge_ids: list[int]) -> dict[int, bytes]:
+    """
+    Aktuelle Bitmaps (innerhalb der Schreibtransaktion gelesen), fehlende
+    werden aus challenge_logs aufgebaut.
+    """
+    if not user_challenge_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in user_challenge_ids)
+    rows = conn.execute(
+        f"SELECT id, started_at, log_bitmap FROM user_challenges WHERE id IN ({placeholders})",
+        user_challenge_ids
+    ).fetchall()
+    return {
+        r['id']: r['log_bitmap'] if r['log_bitmap'] is not None
+        else rebuild_bitmap(conn, r['id'], r['started_at'])
+        for r in rows
+    }
@@ -0,0 +1,82 @@
+# services/referrals.py
+"""
+Provolution Referral Tree
+Closure-Tabelle des Empfehlungsbaums: referral_paths enthält für jeden User
+eine Zeile je Vorfahr (wer ihn direkt oder über Zwischenstufen geworben
+hat) mit der Tiefe (1 = direkt geworben).
+
+- record_referral_paths läuft bei der Registrierung in derselben
+  Transaktion: die Pfade des Werbers plus eine Stufe, höchstens
+  MAX_REFERRAL_DEPTH Zeilen pro neuem User
+- Reichweite eines Users je Stufe ist ein Bereich des Primärschlüssels
+  (ancestor_id, depth, descendant_id), ohne rekursive CTE pro Request
+- Die CO₂-Wirkung des Netzwerks (Challenge CO-2 "Recruiter",
+  Impact-Typ multiplier) ist die Summe von users.total_co2_saved_kg der
+  Geworbenen
+- rebuild_referral_paths baut die Tabelle aus users.referred_by neu auf
+  (Migration 014, Bulk-Load)
+
+Stufen tiefer als MAX_REFERRAL_DEPTH werden nicht erfasst; das begrenzt
+die Tabelle auf MAX_REFERRAL_DEPTH Zeilen pro User, auch bei langen Ketten.
+"""
+
+import sqlite3
+
+
+MAX_REFERRAL_DEPTH = 10
+
+
+def record_referral_paths(conn: sqlite3.Connection, user_id: int, referrer_id: int) -> None:
+    """Hängt einen neu geworbenen User unter seinen Werber in den Baum."""
+    conn.execute(
+        """
+        INSERT INTO referral_paths (ancestor_id, depth, descendant_id)
+        SELECT :referrer_id, 1, :user_id
+        UNION ALL
+        SELECT ancestor_id, depth + 1, :user_id
+        FROM referral_paths
+        WHERE descendant_id = :referrer_id AND depth < :max_depth
+        """,
+        {"user_id": user_id, "referrer_id": referrer_id, "max_depth": MAX_REFERRAL_DEPTH}
+    )
+
+
+def rebuild_referral_paths(conn: sqlite3.Connection) -> None:
+    """referral_paths aus users.referred_by neu aufbauen."""
+    conn.execute("DELETE FROM referral_paths")
+    conn.execute(
+        f"""
+        WITH RECURSIVE paths(ancestor_id, depth, descendant_id) AS (
+            SELECT referred_by, 1, id FROM users WHERE referred_by IS NOT NULL
+            UNION ALL
+            SELECT u.referred_by, p.depth + 1, p.descendant_id
+            FROM paths p
+            JOIN users u ON u.id = p.ancestor_id
+            WHERE u.referred_by IS NOT NULL AND p.depth < {MAX_REFERRAL_DEPTH}
+        )
+        INSERT INTO referral_paths (ancestor_id, depth, descendant_id)
+        SELECT ancestor_id, depth, descendant_id FROM paths
+        """
+    )
+
+
+def referral_levels(conn: sqlite3.Connection, user_id: int,
+                    max_depth: int = MAX_REFERRAL_DEPTH) -> list[dict]:
+    """
+    Geworbene je Stufe bis max_depth: Anzahl und ihre CO₂-Einsparung.
+    Stufen ohne Geworbene fehlen.
+    """
+    return conn.execute(
+        """
+        SELECT
+            p.depth,
+            COUNT(*) AS users,
+            ROUND(COALESCE(SUM(u.total_co2_saved_kg), 0), 2) AS co2_saved_kg
+        FROM referral_paths p
+        JOIN users u ON u.id = p.descendant_id
+        WHERE p.ancestor_id = ? AND p.depth <= ?
+        GROUP BY p.depth
+        ORDER BY p.depth
+        """,
+        (user_id, max_depth)
+    ).fetchall()
@@ -0,0 +1,218 @@
+# services/regions.py
+"""
+Provolution Regions
+Bundesländer als feste Regionen (Tabelle regions) mit PLZ-Leitbereichen
+(region_postal_codes) und laufend gepflegten Monats-Aggregaten für den
+Regionsvergleich (die regionalen Ranglisten je Metrik: leaderboard_scores.py).
+
+- resolve_region: PLZ (längster passender Präfix) vor Freitext; Name,
+  Kürzel (BY, DE-BY) und gängige Varianten (NRW, Baden-Wuerttemberg)
+  werden unabhängig von Schreibweise erkannt
+- region_user_scores: CO₂-Score je (Region, Monat, User)
+- region_scores: Summe, Teilnehmer und Abschlüsse je (Region, Monat)
+
+record_region_completion läuft in derselben Transaktion wie der Abschluss
+(über user_stats.record_challenge_completed); rebuild_region_scores baut
+beide Tabellen aus user_challenges neu auf (Migration, Bulk-Load, Drift).
+
+Die PLZ-Leitbereiche sind zweistellig und grob: einige Leitzonen
+überschreiten Landesgrenzen. Genauere (längere) Präfixe können ergänzt
+werden, der längste passende gewinnt.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+import re
+import sqlite3
+import unicodedata
+
+
+@dataclass(frozen=True)
+class Region:
+    """Ein Bundesland (id = Kürzel nach ISO 3166-2:DE)."""
+    id: str
+    name: str
+    postal_prefixes: tuple[str, ...]
+    aliases: tuple[str, ...] = ()
+
+
+REGIONS: tuple[Region, ...] = (
+    Region("NW", "Nordrhein-Westfalen", ("32", "33", "40", "41", "42", "44", "45", "46", "47", "48", "50", "51", "52", "53", "57", "58", "59"), ("NRW",)),
+    Region("BY", "Bayern", ("80", "81", "82", "83", "84", "85", "86", "87", "90", "91", "92", "93", "94", "95", "96", "97"), ("Bavaria",)),
+    Region("BW", "Baden-Württemberg", ("68", "69", "70", "71", "72", "73", "74", "75", "76", "77", "78", "79", "88", "89"), ("BaWü",)),
+    Region("NI", "Niedersachsen", ("26", "27", "29", "30", "31", "37", "38", "49"), ("Lower Saxony",)),
+    Region("HE", "Hessen", ("34", "35", "36", "60", "61", "63", "64", "65"), ("Hesse",)),
+    Region("BE", "Berlin", ("10", "12", "13")),
+    Region("SN", "Sachsen", ("01", "02", "04", "08", "09"), ("Saxony",)),
+    Region("RP", "Rheinland-Pfalz", ("54", "55", "56", "67"), ("Rhineland-Palatinate",)),
+    Region("SH", "Schleswig-Holstein", ("23", "24", "25")),
+    Region("HH", "Hamburg", ("20", "21", "22")),
+    Region("BB", "Brandenburg", ("03", "14", "15", "16")),
+    Region("TH", "Thüringen", ("07", "98", "99"), ("Thuringia",)),
+    Region("ST", "Sachsen-Anhalt", ("06", "39"), ("Saxony-Anhalt",)),
+    Region("MV", "Mecklenburg-Vorpommern", ("17", "18", "19"), ("Meck-Pomm",)),
+    Region("SL", "Saarland", ("66",)),
+    Region("HB", "Bremen", ("28",)),
+)
+
+REGIONS_BY_ID: dict[str, Region] = {r.id: r for r in REGIONS}
+
+_POSTAL_PREFIXES: dict[str, Region] = {
+    prefix: r for r in REGIONS for prefix in r.postal_prefixes
+}
+_PREFIX_LENGTHS = sorted({len(p) for p in _POSTAL_PREFIXES}, reverse=True)
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+
+def _keys(text: str) -> set[str]:
+    """Vergleichsschlüssel: klein, ohne Satzzeichen, Umlaute als ae bzw. a."""
+    text = text.strip().casefold()
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return {re.sub(r"[^a-z0-9]", "", t) for t in (text.translate(_UMLAUTS), folded)}
+
+
+_NAMES: dict[str, Region] = {
+    key: r
+    for r in REGIONS
+    for text in (r.id, f"DE-{r.id}", r.name, *r.aliases)
+    for key in _keys(text)
+}
+
+
+def region_for_name(name: Optional[str]) -> Optional[Region]:
+    """Region zu Name, Kürzel oder Variante; None wenn unbekannt."""
+    if not name:
+        return None
+    for key in _keys(name):
+        if key in _NAMES:
+            return _NAMES[key]
+    return None
+
+
+def region_for_postal_code(postal_code: Optional[str]) -> Optional[Region]:
+    """Region zum längsten passenden PLZ-Präfix (nur fünfstellige PLZ)."""
+    digits = (postal_code or "").strip()
+    if not re.fullmatch(r"\d{5}", digits):
+        return None
+    for length in _PREFIX_LENGTHS:
+        region = _POSTAL_PREFIXES.get(digits[:length])
+        if region:
+            return region
+    return None
+
+
+def resolve_region(region: Optional[str], postal_code: Optional[str]) -> Optional[Region]:
+    """Region eines Users: die PLZ ist eindeutiger als die Freitext-Angabe."""
+    return region_for_postal_code(postal_code) or region_for_name(region)
+
+
+def period_for(day: date) -> str:
+    """Aggregat-Periode (Kalendermonat, 'YYYY-MM')."""
+    return day.strftime("%Y-%m")
+
+
+def seed_regions(conn: sqlite3.Connection) -> None:
+    """regions und region_postal_codes aus REGIONS befüllen (idempotent)."""
+    conn.executemany(
+        "INSERT OR IGNORE INTO regions (id, name) VALUES (?, ?)",
+        [(r.id, r.name) for r in REGIONS]
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO region_postal_codes (prefix, region_id) VALUES (?, ?)",
+        [(prefix, r.id) for r in REGIONS for prefix in r.postal_prefixes]
+    )
+
+
+# ============================================
+# AGGREGATE
+# ============================================
+
+def record_region_completion(conn: sqlite3.Connection, region_id: str, user_id: int,
+                             co2_kg: float, completed_at: Optional[datetime] = None) -> None:
+    """Zählt einen Challenge-Abschluss in die Aggregate der Region."""
+    period = period_for((completed_at or datetime.utcnow()).date())
+    # completions = 1 heißt: erster Abschluss des Users in diesem Monat
+    row = conn.execute(
+        """
+        INSERT INTO region_user_scores (region_id, period, user_id, score, completions)
+        VALUES (?, ?, ?, ?, 1)
+        ON CONFLICT (region_id, period, user_id) DO UPDATE SET
+            score = score + excluded.score,
+            completions = completions + 1
+        RETURNING completions
+        """,
+        (region_id, period, user_id, co2_kg)
+    ).fetchone()
+    conn.execute(
+        """
+        INSERT INTO region_scores (region_id, period, total_co2_kg, participants, completions)
+        VALUES (?, ?, ?, 1, 1)
+        ON CONFLICT (region_id, period) DO UPDATE SET
+            total_co2_kg = total_co2_kg + excluded.total_co2_kg,
+            participants = participants + ?,
+            completions = completions + 1
+        """,
+        (region_id, period, co2_kg, 1 if row['completions'] == 1 else 0)
+    )
+
+
+def revert_region_completion(conn: sqlite3.Connection, region_id: str, user_id: int,
+                             co2_kg: float, completed_at: datetime) -> None:
+    """Nimmt einen gezählten Abschluss zurück (abgelehnte Stichprobe)."""
+    period = period_for(completed_at.date())
+    row = conn.execute(
+        """
+        UPDATE region_user_scores SET
+            score = score - ?,
+            completions = completions - 1
+        WHERE region_id = ? AND period = ? AND user_id = ? AND completions > 0
+        RETURNING completions
+        """,
+        (co2_kg, region_id, period, user_id)
+    ).fetchone()
+    if not row:
+        return
+    if row['completions'] == 0:
+        conn.execute(
+            "DELETE FROM region_user_scores WHERE region_id = ? AND period = ? AND user_id = ?",
+            (region_id, period, user_id)
+        )
+    conn.execute(
+        """
+        UPDATE region_scores SET
+            total_co2_kg = total_co2_kg - ?,
+            participants = participants - ?,
+            completions = completions - 1
+        WHERE region_id = ? AND period = ?
+        """,
+        (co2_kg, 1 if row['completions'] == 0 else 0, region_id, period)
+    )
+
+
+def rebuild_region_scores(conn: sqlite3.Connection) -> None:
+    """Beide Aggregat-Tabellen aus den abgeschlossenen Challenges neu aufbauen."""
+    conn.execute("DELETE FROM region_scores")
+    conn.execute("DELETE FROM region_user_scores")
+    conn.execute(
+        """
+        INSERT INTO region_user_scores (region_id, period, user_id, score, completions)
+        SELECT u.region_id, substr(uc.completed_at, 1, 7), u.id,
+               SUM(COALESCE(c.co2_impact_kg_year, 0)), COUNT(*)
+        FROM user_challenges uc
+        JOIN users u ON u.id = uc.user_id
+        JOIN challenges c ON c.id = uc.challenge_id
+        WHERE uc.status = 'completed' AND uc.completed_at IS NOT NULL
+          AND u.region_id IS NOT NULL
+        GROUP BY u.region_id, substr(uc.completed_at, 1, 7), u.id
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO region_scores (region_id, period, total_co2_kg, participants, completions)
+        SELECT region_id, period, SUM(score), COUNT(*), SUM(completions)
+        FROM region_user_scores
+        GROUP BY region_id, period
+        """
+    )
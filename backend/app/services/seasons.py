@@ -0,0 +1,108 @@
+# services/seasons.py
+"""
+Provolution Seasons
+Perioden der Leaderboards: Wochen, Monate und Saisons (3 Monate,
+Spezifikation Abschnitt 5).
+
+- Saisons folgen den meteorologischen Jahreszeiten: Frühling (März–Mai),
+  Sommer, Herbst, Winter (Dezember–Februar); Schlüssel "2026-herbst"
+- Wochen laufen Montag bis Sonntag; Schlüssel nach ISO, "2026-W42"
+- Monate: Schlüssel "2026-10"
+
+Scores je Periode und eingefrorene Ranglisten abgelaufener Perioden: siehe
+leaderboard_scores.py.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional
+import re
+
+
+KIND_WEEK = "week"
+KIND_MONTH = "month"
+KIND_SEASON = "season"
+
+
+@dataclass(frozen=True)
+class Period:
+    """Abgeschlossene oder laufende Leaderboard-Periode (end inklusive)."""
+    kind: str
+    key: str
+    start: date
+    end: date
+
+
+@dataclass(frozen=True)
+class Season(Period):
+    name: str
+    theme: str
+
+
+# Startmonat, Schlüssel, Name, Thema
+_SEASONS = (
+    (3, "fruehling", "Frühling", "Mobilität"),
+    (6, "sommer", "Sommer", "Energie"),
+    (9, "herbst", "Herbst", "Konsum"),
+    (12, "winter", "Winter", "Heizen"),
+)
+
+
+def _season(year: int, index: int) -> Season:
+    month, slug, name, theme = _SEASONS[index]
+    start = date(year, month, 1)
+    if index + 1 < len(_SEASONS):
+        next_start = date(year, _SEASONS[index + 1][0], 1)
+    else:
+        next_start = date(year + 1, _SEASONS[0][0], 1)
+    return Season(KIND_SEASON, f"{year}-{slug}", start, next_start - timedelta(days=1),
+                  f"{name} {year}", theme)
+
+
+def season_for(day: date) -> Season:
+    """Saison, in die der Tag fällt (Januar/Februar: Winter des Vorjahres)."""
+    if day.month < _SEASONS[0][0]:
+        return _season(day.year - 1, len(_SEASONS) - 1)
+    index = max(i for i, s in enumerate(_SEASONS) if s[0] <= day.month)
+    return _season(day.year, index)
+
+
+def season_by_key(key: str) -> Optional[Season]:
+    match = re.fullmatch(r"(\d{4})-([a-z]+)", key)
+    if not match:
+        return None
+    for index, s in enumerate(_SEASONS):
+        if s[1] == match.group(2):
+            return _season(int(match.group(1)), index)
+    return None
+
+
+def week_for(day: date) -> Period:
+    start = day - timedelta(days=day.weekday())
+    year, week, _ = start.isocalendar()
+    return Period(KIND_WEEK, f"{year}-W{week:02d}", start, start + timedelta(days=6))
+
+
+def week_by_key(key: str) -> Optional[Period]:
+    match = re.fullmatch(r"(\d{4})-W(\d{2})", key)
+    if not match:
+        return None
+    try:
+        return week_for(date.fromisocalendar(int(match.group(1)), int(match.group(2)), 1))
+    except ValueError:
+        return None
+
+
+def month_for(day: date) -> Period:
+    start = day.replace(day=1)
+    next_start = (start + timedelta(days=31)).replace(day=1)
+    return Period(KIND_MONTH, start.strftime("%Y-%m"), start, next_start - timedelta(days=1))
+
+
+_PERIOD_FOR = {KIND_WEEK: week_for, KIND_MONTH: month_for, KIND_SEASON: season_for}
+
+
+def next_period(period: Period) -> Period:
+    """Die auf period folgende Periode derselben Art."""
+    return _PERIOD_FOR[period.kind](period.end + timedelta(days=1))
+
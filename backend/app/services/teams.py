@@ -0,0 +1,147 @@
+# services/teams.py
+"""
+Provolution Teams
+Team-Summen (teams.total_xp, total_co2_saved, member_count) werden bei jedem
+Ereignis fortgeschrieben statt beim Lesen über alle Mitglieder summiert.
+
+- Jeder User ist in höchstens einem Team (idx_team_members_user)
+- team_members.xp_contributed / co2_contributed: seit dem Beitritt
+  verdiente XP und CO₂-Einsparung; beim Austritt werden sie wieder vom Team
+  abgezogen, die Team-Summen sind also immer die Summe der Mitglieder
+- record_team_contribution läuft in derselben Transaktion wie die
+  XP-Vergabe bzw. der Challenge-Abschluss (siehe user_stats.py)
+
+Ranglisten lesen nur teams (Indexe auf total_xp und total_co2_saved) und
+kosten damit unabhängig von der Teamgröße gleich viel.
+"""
+
+from datetime import datetime
+from typing import Optional
+import sqlite3
+
+
+ROLE_CAPTAIN = "captain"
+ROLE_MEMBER = "member"
+
+# Sortierspalte je Ranglisten-Metrik
+TEAM_METRICS = {
+    "xp": "total_xp",
+    "co2_kg": "total_co2_saved",
+}
+
+
+def record_team_contribution(conn: sqlite3.Connection, user_id: int,
+                             xp: int = 0, co2_kg: float = 0,
+                             earned_at: Optional[datetime] = None) -> Optional[int]:
+    """
+    Schreibt verdiente XP / CO₂ dem Team des Users gut (negativ: zieht sie
+    ab). Mit earned_at nur, wenn der User damals schon Mitglied war.
+    Gibt die Team-ID zurück (None, wenn der User in keinem Team ist).
+    """
+    if not xp and not co2_kg:
+        return None
+    member = conn.execute(
+        """
+        UPDATE team_members SET
+            xp_contributed = xp_contributed + ?,
+            co2_contributed = co2_contributed + ?
+        WHERE user_id = ? AND (? IS NULL OR datetime(joined_at) <= datetime(?))
+        RETURNING team_id
+        """,
+        (xp, co2_kg, user_id, earned_at and earned_at.isoformat(),
+         earned_at and earned_at.isoformat())
+    ).fetchone()
+    if not member:
+        return None
+    conn.execute(
+        """
+        UPDATE teams SET
+            total_xp = total_xp + ?,
+            total_co2_saved = ROUND(total_co2_saved + ?, 2)
+        WHERE id = ?
+        """,
+        (xp, co2_kg, member['team_id'])
+    )
+    return member['team_id']
+
+
+def add_member(conn: sqlite3.Connection, team_id: int, user_id: int,
+               role: str = ROLE_MEMBER) -> bool:
+    """
+    Nimmt den User ins Team auf. False, wenn das Team nicht existiert oder
+    der User schon in einem Team ist (dann ohne Änderung).
+    """
+    team = conn.execute(
+        "UPDATE teams SET member_count = member_count + 1 WHERE id = ? RETURNING id",
+        (team_id,)
+    ).fetchone()
+    if not team:
+        return False
+    member = conn.execute(
+        """
+        INSERT INTO team_members (team_id, user_id, role)
+        VALUES (?, ?, ?)
+        ON CONFLICT (user_id) DO NOTHING
+        RETURNING id
+        """,
+        (team_id, user_id, role)
+    ).fetchone()
+    if not member:
+        conn.execute(
+            "UPDATE teams SET member_count = member_count - 1 WHERE id = ?",
+            (team_id,)
+        )
+        return False
+    return True
+
+
+def remove_member(conn: sqlite3.Connection, team_id: int, user_id: int) -> Optional[dict]:
+    """
+    Entfernt den User aus dem Team und zieht seine Beiträge ab. Verlässt der
+    Captain das Team, übernimmt das dienstälteste Mitglied; das letzte
+    Mitglied löst das Team auf. Gibt die gelöschte Mitgliedschaft zurück
+    (None, wenn der User nicht in diesem Team war).
+    """
+    member = conn.execute(
+        """
+        DELETE FROM team_members WHERE team_id = ? AND user_id = ?
+        RETURNING role, xp_contributed, co2_contributed
+        """,
+        (team_id, user_id)
+    ).fetchone()
+    if not member:
+        return None
+    team = conn.execute(
+        """
+        UPDATE teams SET
+            member_count = member_count - 1,
+            total_xp = total_xp - ?,
+            total_co2_saved = ROUND(total_co2_saved - ?, 2)
+        WHERE id = ?
+        RETURNING member_count
+        """,
+        (member['xp_contributed'], member['co2_contributed'], team_id)
+    ).fetchone()
+    if team['member_count'] <= 0:
+        conn.execute("DELETE FROM teams WHERE id = ?", (team_id,))
+    elif member['role'] == ROLE_CAPTAIN:
+        conn.execute(
+            """
+            UPDATE team_members SET role = ?
+            WHERE id = (
+                SELECT id FROM team_members WHERE team_id = ?
+                ORDER BY joined_at, id LIMIT 1
+            )
+            """,
+            (ROLE_CAPTAIN, team_id)
+        )
+    return member
+
+
+def team_of_user(conn: sqlite3.Connection, user_id: int) -> Optional[dict]:
+    """Mitgliedschaft des Users (team_id, role) oder None."""
+    return conn.execute(
+        "SELECT team_id, role FROM team_members WHERE user_id = ?",
+        (user_id,)
+    ).fetchone()
+
@@ -0,0 +1,123 @@
+# services/trust.py
+"""
+Provolution Trust Levels
+Berechnet users.trust_level nach dem Trust-Level-System (Spec §7.2):
+
+| Level | Anforderung                                   | Stichproben |
+|-------|-----------------------------------------------|-------------|
+| 1     | neu                                           | 20%         |
+| 2     | 30+ Tage, 5+ Challenges                       | 10%         |
+| 3     | 90+ Tage, 15+ Challenges                      | 5%          |
+| 4     | Level 3, 6+ Monate, 80%+ verifiziert          | 2%          |
+| 5     | Level 4, 1+ Jahr, Community-Rolle             | 0%          |
+
+- Verifiziert: Anteil der Abschlüsse mit verification_status 'verified'
+  an allen Abschlüssen inkl. bei Stichproben abgelehnter
+- Community-Rolle: Team-Captain oder mindestens COMMUNITY_MIN_REFERRALS
+  geworbene User (users.referrals_count)
+- Jede abgelehnte Stichprobe senkt das Level um eine Stufe (mindestens 1)
+- Mit users.trust_level_pinned = 1 bleibt ein manuell gesetztes Level
+  unverändert (Staff, erste Reviewer)
+
+Die Regeln stehen einmal als SQL (_TRUST_LEVEL_SQL). update_trust_level
+wendet sie nach Ereignissen (Abschluss, Stichproben-Entscheidung,
+Empfehlung) für einen User in derselben Transaktion an,
+recompute_trust_levels nachts für alle User blockweise über die ID
+(recompute_trust_levels.py), denn das Kontoalter ändert sich ohne Ereignis.
+Geänderte User bekommen ein neues cache_version. Das Level steht damit in
+der users-Zeile, die get_current_user ohnehin lädt: CurrentUser.trust_level
+und require_trust_level brauchen keine weitere Abfrage.
+"""
+
+from datetime import datetime
+from typing import Optional
+import sqlite3
+
+
+TRUST_SPOT_CHECK_RATES = {1: 0.20, 2: 0.10, 3: 0.05, 4: 0.02, 5: 0.0}
+
+# challenges.spot_check_rate gilt für einen User auf diesem Level
+BASE_TRUST_LEVEL = 2
+
+COMMUNITY_MIN_REFERRALS = 3
+VERIFIED_SHARE = 0.8
+
+# Eingaben je User für IDs in [:first, :last]; :now ist der Stichtag
+_TRUST_LEVEL_SQL = f"""
+    WITH checks AS MATERIALIZED (
+        SELECT user_id,
+               SUM(status = 'completed' AND verification_status = 'verified') AS verified,
+               SUM(verification_status = 'rejected') AS rejected
+        FROM user_challenges
+        WHERE user_id BETWEEN :first AND :last
+          AND verification_status IN ('verified', 'rejected')
+        GROUP BY user_id
+    ),
+    captains AS MATERIALIZED (
+        SELECT DISTINCT user_id FROM team_members
+        WHERE role = 'captain' AND user_id BETWEEN :first AND :last
+    ),
+    inputs AS (
+        SELECT u.id AS user_id,
+               julianday(:now) - julianday(u.created_at) AS age_days,
+               u.challenges_completed AS completions,
+               COALESCE(ch.verified, 0) AS verified,
+               COALESCE(ch.rejected, 0) AS rejected,
+               (ca.user_id IS NOT NULL OR u.referrals_count >= {COMMUNITY_MIN_REFERRALS}) AS community
+        FROM users u
+        LEFT JOIN checks ch ON ch.user_id = u.id
+        LEFT JOIN captains ca ON ca.user_id = u.id
+        WHERE u.id BETWEEN :first AND :last AND NOT u.trust_level_pinned
+    ),
+    computed AS (
+        SELECT user_id, MAX(1,
+            CASE
+                WHEN age_days >= 90 AND completions >= 15 THEN
+                    CASE
+                        WHEN age_days >= 182
+                         AND verified >= {VERIFIED_SHARE} * (completions + rejected) THEN
+                            CASE WHEN age_days >= 365 AND community THEN 5 ELSE 4 END
+                        ELSE 3
+                    END
+                WHEN age_days >= 30 AND completions >= 5 THEN 2
+                ELSE 1
+            END - rejected
+        ) AS trust_level
+        FROM inputs
+    )
+    UPDATE users AS u SET
+        trust_level = c.trust_level,
+        cache_version = u.cache_version + 1
+    FROM computed c
+    WHERE c.user_id = u.id AND u.trust_level IS NOT c.trust_level
+    RETURNING id, trust_level
+"""
+
+
+def spot_check_rate(challenge_rate: Optional[float], trust_level: int) -> float:
+    """
+    Stichprobenrate eines Abschlusses: die Rate der Challenge, skaliert mit
+    dem Trust-Level des Users (Level 1 doppelt, Level 5 nie).
+    """
+    level = min(max(trust_level or 1, 1), 5)
+    scale = TRUST_SPOT_CHECK_RATES[level] / TRUST_SPOT_CHECK_RATES[BASE_TRUST_LEVEL]
+    return min(1.0, (challenge_rate or 0) * scale)
+
+
+def update_trust_level(conn: sqlite3.Connection, user_id: int,
+                       now: Optional[datetime] = None) -> Optional[int]:
+    """Berechnet das Level eines Users neu. Gibt es zurück, wenn es sich geändert hat."""
+    row = conn.execute(
+        _TRUST_LEVEL_SQL,
+        {"first": user_id, "last": user_id, "now": (now or datetime.utcnow()).isoformat()}
+    ).fetchone()
+    return row['trust_level'] if row else None
+
+
+def recompute_trust_levels(conn: sqlite3.Connection, first_id: int, last_id: int,
+                           now: Optional[datetime] = None) -> int:
+    """Berechnet die Level im ID-Bereich neu (ein Statement). Gibt die Zahl der Änderungen zurück."""
+    return len(conn.execute(
+        _TRUST_LEVEL_SQL,
+        {"first": first_id, "last": last_id, "now": (now or datetime.utcnow()).isoformat()}
+    ).fetchall())
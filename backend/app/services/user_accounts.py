@@ -0,0 +1,131 @@
+# services/user_accounts.py
+"""
+Provolution User Accounts
+Auflösung von OAuth-Logins auf User und kollisionsfreie Codes.
+
+Ein Google-Login ist höchstens zwei Statements:
+
+1. Ein Upsert, der die Identität über die UNIQUE-Indexe auf google_id und
+   email auflöst: bekannter Google-User → last_active aktualisieren,
+   bestehendes Konto mit gleicher E-Mail → Google verknüpfen (nur wenn
+   Google die E-Mail als verifiziert meldet und das Konto noch keine
+   andere google_id hat), sonst neuer User
+   (INSERT … ON CONFLICT … RETURNING *).
+2. Nur für neue User: Username und Referral-Code aus der vergebenen ID
+   setzen (UPDATE … RETURNING *).
+
+Referral-Codes sind eine Permutation der User-ID (bijektiv modulo 36^9),
+Usernames enthalten die ID mit einem Punkt, den lokale Usernames nicht
+enthalten dürfen. Beides ist damit ohne Lookup-Schleife eindeutig.
+"""
+
+from datetime import datetime
+import re
+import sqlite3
+
+
+REFERRAL_CODE_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# 9 Zeichen: ältere Codes (zufällig 8, Hex 12, synthetisch 10) kollidieren nicht
+REFERRAL_CODE_LENGTH = 9
+_CODE_SPACE = len(REFERRAL_CODE_ALPHABET) ** REFERRAL_CODE_LENGTH
+_CODE_MULTIPLIER = 62767505111981  # ≈ 36^9 / φ, teilerfremd zu 36^9 → bijektiv
+_CODE_OFFSET = 27606858466422
+
+USERNAME_BASE_LENGTH = 20
+
+
+def _base36(value: int, width: int = 0) -> str:
+    digits = []
+    while value:
+        value, rem = divmod(value, len(REFERRAL_CODE_ALPHABET))
+        digits.append(REFERRAL_CODE_ALPHABET[rem])
+    return "".join(reversed(digits)).rjust(width, "0") or "0"
+
+
+def referral_code_for_id(user_id: int) -> str:
+    """Eindeutiger, nicht fortlaufend aussehender Referral-Code für eine User-ID."""
+    return _base36((user_id * _CODE_MULTIPLIER + _CODE_OFFSET) % _CODE_SPACE, REFERRAL_CODE_LENGTH)
+
+
+def oauth_username(email: str, user_id: int) -> str:
+    """Username aus dem E-Mail-Namen plus ID, z.B. 'anna_m.2n9'."""
+    base = email.split("@")[0].lower()
+    base = re.sub(r"[^a-z0-9_]", "", base)[:USERNAME_BASE_LENGTH] or "user"
+    return f"{base}.{_base36(user_id).lower()}"
+
+
+def assign_referral_code(conn: sqlite3.Connection, user_id: int) -> str:
+    """Setzt den Referral-Code eines neu angelegten Users."""
+    code = referral_code_for_id(user_id)
+    conn.execute("UPDATE users SET referral_code = ? WHERE id = ?", (code, user_id))
+    return code
+
+
+def upsert_google_user(conn: sqlite3.Connection, google_info: dict) -> tuple[dict, bool]:
+    """
+    Löst einen verifizierten Google-Login auf einen User auf.
+
+    Args:
+        conn: Connection aus get_db() (dict rows)
+        google_info: Ergebnis von verify_google_id_token
+
+    Returns:
+        (user row, is_new_user); (None, False), wenn die E-Mail zu einem
+        anderen Konto gehört und nicht verifiziert oder das Konto schon mit
+        einer anderen Google-Identität verknüpft ist
+    """
+    now = datetime.utcnow().isoformat()
+    # Platzhalter bis zur ID-Vergabe; '.' kommt in lokalen Usernames nicht vor
+    placeholder = f"google.{google_info['google_id']}"
+
+    user = conn.execute(
+        """
+        INSERT INTO users (
+            username, email, password_hash, google_id, auth_provider,
+            display_name, avatar_emoji, avatar_url,
+            created_at, updated_at, last_login, last_active
+        ) VALUES (?, ?, '', ?, 'google', ?, '🌱', ?, ?, ?, ?, ?)
+        ON CONFLICT(google_id) DO UPDATE SET
+            last_login = excluded.last_login,
+            last_active = excluded.last_active
+        ON CONFLICT(email) DO UPDATE SET
+            google_id = excluded.google_id,
+            auth_provider = 'google',
+            avatar_url = COALESCE(users.avatar_url, excluded.avatar_url),
+            updated_at = excluded.updated_at,
+            last_login = excluded.last_login,
+            last_active = excluded.last_active
+        WHERE ? AND users.google_id IS NULL
+        RETURNING *
+        """,
+        (
+            placeholder,
+            google_info['email'],
+            google_info['google_id'],
+            google_info.get('name') or google_info['email'].split('@')[0],
+            google_info.get('picture') or None,
+            now, now, now, now,
+            bool(google_info.get('email_verified'))
+        )
+    ).fetchone()
+
+    if user is None:
+        # Sonst könnte eine unverifizierte Adresse oder eine zweite
+        # Google-Identität ein fremdes Konto übernehmen
+        return None, False
+    if user['username'] != placeholder:
+        return user, False
+
+    user = conn.execute(
+        """
+        UPDATE users SET username = ?, referral_code = ?
+        WHERE id = ?
+        RETURNING *
+        """,
+        (
+            oauth_username(google_info['email'], user['id']),
+            referral_code_for_id(user['id']),
+            user['id']
+        )
+    ).fetchone()
+    return user, True
@@ -0,0 +1,228 @@
+# services/user_stats.py
+"""
+Provolution User Stats
+Gepflegte Zähler in der users-Tabelle statt COUNT(*) bei jedem Profilaufruf.
+
+- challenges_completed / total_co2_saved_kg: abgeschlossene Challenges und
+  deren CO₂-Einsparung (challenges.co2_impact_kg_year)
+- badges_earned: Zeilen in user_badges
+- referrals_count: User mit referred_by = id
+
+Die record_*-Funktionen laufen in derselben Transaktion wie die Änderung,
+die sie zählen (Abschlüsse zusätzlich in die Regions- und Team-Summen und
+die Leaderboard-Scores, siehe regions.py, teams.py und leaderboard_scores.py;
+bei Stichproben abgelehnte Abschlüsse nimmt revert_challenge_completed
+zurück). find_drift / repair_drift vergleichen die Spalten mit den
+Aggregaten der Quelltabellen, bereichsweise über die User-ID, und setzen
+abweichende Werte in einem UPDATE … FROM zurück (verify_user_stats.py).
+"""
+
+from datetime import datetime
+from typing import Optional
+import sqlite3
+
+from ..models.user import UserStats
+from .leaderboard_scores import record_scores
+from .regions import record_region_completion, revert_region_completion
+from .teams import record_team_contribution
+
+
+STAT_COLUMNS = ("challenges_completed", "badges_earned", "referrals_count", "total_co2_saved_kg")
+
+# Rundung beim Schreiben (DECIMAL(10,2)) ist keine Drift
+CO2_TOLERANCE_KG = 0.01
+
+# Ist-Werte je User aus den Quelltabellen, für User-IDs in [:first, :last]
+_ACTUAL_STATS_CTE = """
+    WITH completed AS MATERIALIZED (
+        SELECT uc.user_id,
+               COUNT(*) AS challenges_completed,
+               ROUND(SUM(COALESCE(c.co2_impact_kg_year, 0)), 2) AS total_co2_saved_kg
+        FROM user_challenges uc
+        JOIN challenges c ON c.id = uc.challenge_id
+        WHERE uc.status = 'completed' AND uc.user_id BETWEEN :first AND :last
+        GROUP BY uc.user_id
+    ),
+    badges AS MATERIALIZED (
+        SELECT user_id, COUNT(*) AS badges_earned
+        FROM user_badges
+        WHERE user_id BETWEEN :first AND :last
+        GROUP BY user_id
+    ),
+    referrals AS MATERIALIZED (
+        SELECT referred_by AS user_id, COUNT(*) AS referrals_count
+        FROM users
+        WHERE referred_by BETWEEN :first AND :last
+        GROUP BY referred_by
+    ),
+    actual AS (
+        SELECT u.id AS user_id,
+               COALESCE(cp.challenges_completed, 0) AS challenges_completed,
+               COALESCE(b.badges_earned, 0) AS badges_earned,
+               COALESCE(r.referrals_count, 0) AS referrals_count,
+               COALESCE(cp.total_co2_saved_kg, 0) AS total_co2_saved_kg
+        FROM users u
+        LEFT JOIN completed cp ON cp.user_id = u.id
+        LEFT JOIN badges b ON b.user_id = u.id
+        LEFT JOIN referrals r ON r.user_id = u.id
+        WHERE u.id BETWEEN :first AND :last
+    )
+"""
+
+_DRIFT_CONDITION = """
+    (u.challenges_completed != a.challenges_completed
+     OR u.badges_earned != a.badges_earned
+     OR u.referrals_count != a.referrals_count
+     OR ABS(COALESCE(u.total_co2_saved_kg, 0) - a.total_co2_saved_kg) >= :tolerance)
+"""
+
+
+def stats_for_user(user: dict) -> UserStats:
+    """UserStats aus einer users-Zeile (SELECT *), ohne weitere Abfrage."""
+    return UserStats(
+        challenges_completed=user.get('challenges_completed') or 0,
+        total_co2_saved_kg=user.get('total_co2_saved_kg') or 0,
+        badges_earned=user.get('badges_earned') or 0,
+        referrals_count=user.get('referrals_count') or 0
+    )
+
+
+# ============================================
+# PFLEGE BEIM SCHREIBEN
+# ============================================
+
+def record_challenge_completed(conn: sqlite3.Connection, user_id: int, challenge_id: str,
+                               xp: int = 0) -> None:
+    """
+    Zählt eine abgeschlossene Challenge samt CO₂-Einsparung, auch für Region,
+    Team und Leaderboards (xp = dabei vergebene XP).
+    """
+    challenge = conn.execute(
+        "SELECT COALESCE(co2_impact_kg_year, 0) AS co2 FROM challenges WHERE id = ?",
+        (challenge_id,)
+    ).fetchone()
+    co2 = challenge['co2'] if challenge else 0
+    user = conn.execute(
+        """
+        UPDATE users SET
+            challenges_completed = challenges_completed + 1,
+            total_co2_saved_kg = ROUND(COALESCE(total_co2_saved_kg, 0) + ?, 2)
+        WHERE id = ?
+        RETURNING region_id
+        """,
+        (co2, user_id)
+    ).fetchone()
+    region_id = user['region_id'] if user else None
+    if region_id:
+        record_region_completion(conn, region_id, user_id, co2)
+    record_team_contribution(conn, user_id, xp, co2)
+    record_scores(conn, user_id, region_id, co2_kg=co2, xp=xp, challenges=1)
+
+
+def revert_challenge_completed(conn: sqlite3.Connection, user_id: int, challenge_id: str,
+                               xp: int, completed_at: datetime, region_id: Optional[str]) -> None:
+    """
+    Gegenstück zu record_challenge_completed für einen aberkannten Abschluss:
+    zieht Zähler, CO₂ und XP beim User, in Region, Team und den
+    Leaderboard-Scores der Perioden des Abschlusses wieder ab. region_id ist
+    die Region des Users beim Abschluss (verification_queue), nicht die
+    aktuelle.
+    """
+    challenge = conn.execute(
+        "SELECT COALESCE(co2_impact_kg_year, 0) AS co2 FROM challenges WHERE id = ?",
+        (challenge_id,)
+    ).fetchone()
+    co2 = challenge['co2'] if challenge else 0
+    conn.execute(
+        """
+        UPDATE users SET
+            challenges_completed = MAX(challenges_completed - 1, 0),
+            total_co2_saved_kg = MAX(ROUND(COALESCE(total_co2_saved_kg, 0) - ?, 2), 0),
+            total_xp = MAX(total_xp - ?, 0)
+        WHERE id = ?
+        """,
+        (co2, xp, user_id)
+    )
+    if region_id:
+        revert_region_completion(conn, region_id, user_id, co2, completed_at)
+    record_team_contribution(conn, user_id, -xp, -co2, earned_at=completed_at)
+    record_scores(conn, user_id, region_id, co2_kg=-co2, xp=-xp, challenges=-1, at=completed_at)
+
+
+def record_badges_earned(conn: sqlite3.Connection, user_id: int, count: int = 1) -> None:
+    """Zählt neu vergebene Badges (count = tatsächlich eingefügte Zeilen)."""
+    if count:
+        conn.execute(
+            "UPDATE users SET badges_earned = badges_earned + ? WHERE id = ?",
+            (count, user_id)
+        )
+
+
+def record_referral(conn: sqlite3.Connection, referrer_id: int) -> None:
+    """Zählt einen über den Referral-Code registrierten User."""
+    conn.execute(
+        "UPDATE users SET referrals_count = referrals_count + 1 WHERE id = ?",
+        (referrer_id,)
+    )
+
+
+# ============================================
+# DRIFT-ERKENNUNG UND REPARATUR
+# ============================================
+
+def find_drift(conn: sqlite3.Connection, first_id: int, last_id: int,
+               limit: Optional[int] = None) -> list[dict]:
+    """
+    User im ID-Bereich [first_id, last_id], deren Zähler von den
+    Quelltabellen abweichen, mit gespeicherten und tatsächlichen Werten.
+    """
+    rows = conn.execute(
+        f"""
+        {_ACTUAL_STATS_CTE}
+        SELECT u.id AS user_id,
+               u.challenges_completed, a.challenges_completed AS actual_challenges_completed,
+               u.badges_earned, a.badges_earned AS actual_badges_earned,
+               u.referrals_count, a.referrals_count AS actual_referrals_count,
+               u.total_co2_saved_kg, a.total_co2_saved_kg AS actual_total_co2_saved_kg
+        FROM users u
+        JOIN actual a ON a.user_id = u.id
+        WHERE {_DRIFT_CONDITION}
+        ORDER BY u.id
+        LIMIT :limit
+        """,
+        {"first": first_id, "last": last_id, "tolerance": CO2_TOLERANCE_KG,
+         "limit": -1 if limit is None else limit}
+    ).fetchall()
+    return rows
+
+
+def repair_drift(conn: sqlite3.Connection, first_id: int, last_id: int) -> list[int]:
+    """
+    Setzt abweichende Zähler im ID-Bereich auf die Ist-Werte (ein Statement)
+    und markiert die gecachten Dashboards der User als veraltet.
+    Gibt die IDs der reparierten User zurück.
+    """
+    rows = conn.execute(
+        f"""
+        {_ACTUAL_STATS_CTE}
+        UPDATE users AS u SET
+            challenges_completed = a.challenges_completed,
+            badges_earned = a.badges_earned,
+            referrals_count = a.referrals_count,
+            total_co2_saved_kg = a.total_co2_saved_kg,
+            cache_version = u.cache_version + 1
+        FROM actual a
+        WHERE a.user_id = u.id AND {_DRIFT_CONDITION}
+        RETURNING id
+        """,
+        {"first": first_id, "last": last_id, "tolerance": CO2_TOLERANCE_KG}
+    ).fetchall()
+    return sorted(row['id'] for row in rows)
+
+
+def user_id_range(conn: sqlite3.Connection) -> tuple[int, int]:
+    """Kleinste und größte User-ID, (0, -1) bei leerer Tabelle."""
+    row = conn.execute("SELECT MIN(id) AS first, MAX(id) AS last FROM users").fetchone()
+    if row['first'] is None:
+        return 0, -1
+    return row['first'], row['last']
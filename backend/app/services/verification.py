@@ -0,0 +1,227 @@
+# services/verification.py
+"""
+Provolution Verification
+Stichproben-Prüfung abgeschlossener Challenges (Spec §7).
+
+- Beim Abschluss entscheidet is_sampled deterministisch aus der ID der
+  Teilnahme, ob sie geprüft wird. Die Rate ist challenges.spot_check_rate,
+  skaliert mit dem Trust-Level des Users (trust.spot_check_rate). Gezogene
+  Abschlüsse bekommen verification_status 'spot_check' und eine Zeile in
+  verification_queue, alle anderen gelten sofort als 'verified'. Dieselbe
+  Teilnahme wird also immer gleich gezogen, auch bei Wiederholung. Die
+  Queue merkt sich die Region des Users beim Abschluss, denn dort wurde er
+  gezählt, auch wenn der User später umzieht
+- verification_queue ist nach available_at indiziert: frei ab Einreihung,
+  nach dem Claim ab Ablauf des Leases. claim_spot_checks holt die ältesten
+  freien Einträge und vergibt den Lease in einem UPDATE … RETURNING; ein
+  Reviewer bekommt nie seine eigenen Abschlüsse
+- decide_spot_checks wendet eine Liste von Entscheidungen in einer
+  Transaktion an. Nur Einträge mit gültigem Lease des Reviewers zählen;
+  abgelehnte Abschlüsse werden 'rejected', ihre XP, Zähler und Scores
+  zurückgenommen (user_stats.revert_challenge_completed) und die XP-Korrektur
+  in xp_transactions gebucht; danach werden die Trust-Level der
+  betroffenen User neu berechnet
+
+Entschiedene Einträge verlassen die Queue, das Ergebnis steht in
+user_challenges (verification_status, verified_at, verified_by).
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+import hashlib
+import os
+import sqlite3
+
+from .trust import update_trust_level
+from .user_stats import revert_challenge_completed
+
+
+VERIFICATION_VERIFIED = "verified"
+VERIFICATION_REJECTED = "rejected"
+VERIFICATION_SPOT_CHECK = "spot_check"
+
+LEASE_SECONDS = 600
+
+# Ohne Salt wäre aus der ID vorhersagbar, welche Abschlüsse geprüft werden
+SPOT_CHECK_SALT = os.environ.get("SPOT_CHECK_SALT", "")
+
+
+def is_sampled(user_challenge_id: int, rate: Optional[float]) -> bool:
+    """Ob die Teilnahme in die Stichprobe fällt (gleichverteilt, deterministisch)."""
+    if not rate or rate <= 0:
+        return False
+    digest = hashlib.blake2b(
+        f"{SPOT_CHECK_SALT}:{user_challenge_id}".encode("utf-8"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big") < rate * 2 ** 64
+
+
+def verification_status_for(user_challenge_id: int, rate: Optional[float]) -> str:
+    """verification_status eines Abschlusses: Stichprobe oder sofort verifiziert."""
+    return VERIFICATION_SPOT_CHECK if is_sampled(user_challenge_id, rate) else VERIFICATION_VERIFIED
+
+
+def enqueue_spot_check(conn: sqlite3.Connection, user_challenge_id: int, user_id: int,
+                       challenge_id: str, now: Optional[datetime] = None) -> None:
+    """Reiht einen gezogenen Abschluss samt aktueller Region des Users ein (idempotent)."""
+    at = (now or datetime.utcnow()).isoformat()
+    conn.execute(
+        """
+        INSERT INTO verification_queue (
+            user_challenge_id, user_id, challenge_id, region_id, enqueued_at, available_at
+        )
+        SELECT ?, id, ?, region_id, ?, ? FROM users WHERE id = ?
+        ON CONFLICT DO NOTHING
+        """,
+        (user_challenge_id, challenge_id, at, at, user_id)
+    )
+
+
+def queue_stats(conn: sqlite3.Connection, now: Optional[datetime] = None) -> dict:
+    """Einträge gesamt und davon frei (nicht oder nicht mehr geleast)."""
+    return conn.execute(
+        """
+        SELECT COUNT(*) AS queued,
+               COUNT(*) FILTER (WHERE available_at <= ?) AS claimable
+        FROM verification_queue
+        """,
+        ((now or datetime.utcnow()).isoformat(),)
+    ).fetchone()
+
+
+def claim_spot_checks(conn: sqlite3.Connection, reviewer_id: int, limit: int,
+                      lease_seconds: int = LEASE_SECONDS,
+                      now: Optional[datetime] = None) -> list[dict]:
+    """
+    Least die ältesten freien Einträge (ohne eigene Abschlüsse) für
+    lease_seconds und gibt sie samt Teilnahme, Challenge und User zurück.
+    Abgelaufene Leases sind wieder frei.
+    """
+    now = now or datetime.utcnow()
+    expires = now + timedelta(seconds=lease_seconds)
+    claimed = conn.execute(
+        """
+        UPDATE verification_queue SET
+            lease_owner = :reviewer_id,
+            available_at = :expires,
+            claims = claims + 1
+        WHERE user_challenge_id IN (
+            SELECT user_challenge_id FROM verification_queue
+            WHERE available_at <= :now AND user_id != :reviewer_id
+            ORDER BY available_at
+            LIMIT :limit
+        )
+        RETURNING user_challenge_id
+        """,
+        {"reviewer_id": reviewer_id, "expires": expires.isoformat(),
+         "now": now.isoformat(), "limit": limit}
+    ).fetchall()
+    if not claimed:
+        return []
+
+    ids = [row['user_challenge_id'] for row in claimed]
+    placeholders = ", ".join("?" for _ in ids)
+    items = conn.execute(
+        f"""
+        SELECT q.user_challenge_id, q.challenge_id, q.enqueued_at, q.available_at AS lease_expires_at,
+               c.name AS challenge_name, c.verification_method,
+               uc.started_at, uc.completed_at, uc.days_completed,
+               u.id AS user_id, u.username, u.display_name, u.avatar_emoji
+        FROM verification_queue q
+        JOIN user_challenges uc ON uc.id = q.user_challenge_id
+        JOIN challenges c ON c.id = q.challenge_id
+        JOIN users u ON u.id = q.user_id
+        WHERE q.user_challenge_id IN ({placeholders})
+        ORDER BY q.enqueued_at, q.user_challenge_id
+        """,
+        ids
+    ).fetchall()
+    proofs: dict[int, list[str]] = {}
+    for row in conn.execute(
+        f"""
+        SELECT user_challenge_id, proof_url FROM challenge_logs
+        WHERE user_challenge_id IN ({placeholders}) AND proof_url IS NOT NULL
+        ORDER BY user_challenge_id, log_date
+        """,
+        ids
+    ):
+        proofs.setdefault(row['user_challenge_id'], []).append(row['proof_url'])
+    for item in items:
+        item['proofs'] = proofs.get(item['user_challenge_id'], [])
+    return items
+
+
+def decide_spot_checks(conn: sqlite3.Connection, reviewer_id: int,
+                       decisions: dict[int, bool],
+                       now: Optional[datetime] = None) -> tuple[set[int], list[dict]]:
+    """
+    Wendet Entscheidungen (user_challenge_id -> akzeptiert) an, soweit der
+    Reviewer den Eintrag gerade geleast hat. Gibt die angewandten IDs und
+    die zurückgenommenen Abschlüsse (user_id, user_challenge_id, xp) zurück.
+    """
+    now = now or datetime.utcnow()
+    at = now.isoformat()
+    ids = list(decisions)
+    placeholders = ", ".join("?" for _ in ids)
+    dequeued = {
+        row['user_challenge_id']: row
+        for row in conn.execute(
+            f"""
+            DELETE FROM verification_queue
+            WHERE user_challenge_id IN ({placeholders})
+              AND lease_owner = ? AND available_at > ?
+            RETURNING user_challenge_id, user_id, region_id
+            """,
+            (*ids, reviewer_id, at)
+        ).fetchall()
+    }
+    applied = set(dequeued)
+    accepted = [uc_id for uc_id in applied if decisions[uc_id]]
+    rejected = [uc_id for uc_id in applied if not decisions[uc_id]]
+
+    conn.executemany(
+        """
+        UPDATE user_challenges SET verification_status = ?, verified_at = ?, verified_by = ?
+        WHERE id = ?
+        """,
+        [(VERIFICATION_VERIFIED, at, reviewer_id, uc_id) for uc_id in accepted]
+    )
+
+    reverted = []
+    if rejected:
+        placeholders = ", ".join("?" for _ in rejected)
+        reverted = conn.execute(
+            f"""
+            SELECT uc.id AS user_challenge_id, uc.user_id, uc.challenge_id, uc.completed_at,
+                   COALESCE(NULLIF(uc.xp_earned, 0), c.xp_reward, 0) AS xp,
+                   c.name
+            FROM user_challenges uc
+            JOIN challenges c ON c.id = uc.challenge_id
+            WHERE uc.id IN ({placeholders}) AND uc.status = 'completed'
+            """,
+            rejected
+        ).fetchall()
+        conn.executemany(
+            """
+            UPDATE user_challenges SET
+                status = 'rejected', verification_status = ?, verified_at = ?, verified_by = ?
+            WHERE id = ? AND status = 'completed'
+            """,
+            [(VERIFICATION_REJECTED, at, reviewer_id, uc_id) for uc_id in rejected]
+        )
+        for row in reverted:
+            completed_at = datetime.fromisoformat(row['completed_at']) if row['completed_at'] else now
+            revert_challenge_completed(conn, row['user_id'], row['challenge_id'], row['xp'], completed_at,
+                                       dequeued[row['user_challenge_id']]['region_id'])
+        conn.executemany(
+            """
+            INSERT INTO xp_transactions (user_id, amount, type, reference_type, reference_id, description, created_at)
+            VALUES (?, ?, 'spot_check', 'user_challenge', ?, ?, ?)
+            """,
+            [(row['user_id'], -row['xp'], str(row['user_challenge_id']),
+              f"Stichprobe abgelehnt: {row['name']}", at)
+             for row in reverted if row['xp']]
+        )
+    for user_id in {row['user_id'] for row in dequeued.values()}:
+        update_trust_level(conn, user_id, now)
+    return applied, reverted
@@ -0,0 +1,120 @@
+# singleflight.py - Request Coalescing
+"""
+Provolution Gamification - Single-Flight
+Runs an expensive computation once per key while concurrent callers for the
+same key wait for its result instead of starting their own.
+
+- `do(key, fn)` for sync code (threadpool endpoints), `do_async(key, fn)` for
+  coroutines (middleware). Both share one table of in-flight calls, so a
+  thread and a coroutine asking for the same key also coalesce. Async
+  followers wait on a future and never block the event loop.
+- Both return `(value, shared)`; `shared` is True for followers.
+- If the leader raises, every follower of that flight gets the same
+  exception. If the leader is cancelled, followers start a new flight.
+- `in_flight(key)` lets callers serve a stale copy instead of waiting
+  (stale-while-revalidate, see app/cache.py).
+
+Keys should include the version of the data (e.g. the ETag), so a request
+made after a write never joins a flight that started before it.
+"""
+
+from typing import Any, Awaitable, Callable, Hashable, Optional
+import asyncio
+import threading
+
+
+class _Call:
+    """One in-flight computation and the callers waiting for it."""
+    __slots__ = ("done", "finished", "value", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.finished = False
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    """Table of in-flight calls by key (thread-safe)."""
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """Run fn unless a call for key is running; then wait for that one."""
+        while True:
+            call, leader = self._join(key)
+            if leader:
+                try:
+                    value = fn()
+                except BaseException as e:
+                    self._finish(key, call, None, e)
+                    raise
+                self._finish(key, call, value, None)
+                return value, False
+
+            call.done.wait()
+            if not isinstance(call.error, asyncio.CancelledError):
+                return self._result(call), True
+
+    async def do_async(self, key: Hashable,
+                       fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """Like do() for coroutines; followers await instead of blocking."""
+        while True:
+            call, leader = self._join(key)
+            if leader:
+                try:
+                    value = await fn()
+                except BaseException as e:
+                    self._finish(key, call, None, e)
+                    raise
+                self._finish(key, call, value, None)
+                return value, False
+
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            with self._lock:
+                if call.finished:
+                    future.set_result(None)
+                else:
+                    call.waiters.append((loop, future))
+            await future
+            if not isinstance(call.error, asyncio.CancelledError):
+                return self._result(call), True
+
+    def _join(self, key: Hashable) -> tuple[_Call, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def _finish(self, key: Hashable, call: _Call,
+                value: Any, error: Optional[BaseException]) -> None:
+        call.value, call.error = value, error
+        with self._lock:
+            del self._calls[key]
+            call.finished = True
+            waiters, call.waiters = call.waiters, []
+        call.done.set()
+        for loop, future in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, future)
+
+    @staticmethod
+    def _result(call: _Call) -> Any:
+        if call.error is not None:
+            raise call.error
+        return call.value
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serialization benchmark: default FastAPI response path vs. FastJSONResponse
+
+Compares, for the challenge list and leaderboard payloads:
+  before - response_model validation + jsonable serialization + JSONResponse
+  after  - FastJSONResponse(model), which skips re-validation
+
+Usage (from backend/):
+    python benchmarks/bench_serialization.py [--items 100] [--rounds 2000]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models import (
+    BadgeInfo,
+    ChallengeBrief,
+    ChallengeListResponse,
+    ImpactInfo,
+    LeaderboardEntry,
+    LeaderboardPeriod,
+    LeaderboardResponse,
+    MyRank,
+    UserBriefResponse,
+)
+from app.responses import FastJSONResponse
+
+
+def build_challenge_list(n: int) -> ChallengeListResponse:
+    categories = ["energie", "mobilitaet", "community", "politik", "onboarding"]
+    return ChallengeListResponse(
+        challenges=[
+            ChallengeBrief(
+                id=f"EN-{i}",
+                name=f"Challenge {i}",
+                name_emoji=f"⚡ Challenge {i}",
+                description="Schalte alle Geräte im Standby konsequent aus. " * 4,
+                category=categories[i % len(categories)],
+                difficulty="medium",
+                duration_days=30,
+                xp_reward=500,
+                badge=BadgeInfo(name="Strom-Ninja", icon="⚡", tier="silver"),
+                impact=ImpactInfo(co2_kg_year=120.5, savings_euro_year=80.0, type="direct"),
+                participants_count=i * 13,
+                user_status="active" if i % 3 == 0 else None,
+            )
+            for i in range(n)
+        ],
+        total=n,
+        offset=0,
+        limit=n,
+    )
+
+
+def build_leaderboard(n: int) -> LeaderboardResponse:
+    return LeaderboardResponse(
+        period=LeaderboardPeriod(start=date(2026, 1, 19), end=date(2026, 1, 25)),
+        rankings=[
+            LeaderboardEntry(
+                rank=i + 1,
+                user=UserBriefResponse(
+                    id=i, username=f"user_{i}", display_name=f"User {i}", avatar_emoji="🌱"
+                ),
+                score=1000.0 - i,
+                metric="co2_kg",
+            )
+            for i in range(n)
+        ],
+        my_rank=MyRank(rank=42, score=125.0, users_above=41, users_below=158),
+    )
+
+
+def response_field(model_cls):
+    """Response field as FastAPI builds it for `response_model=model_cls`."""
+    return create_model_field(
+        name=f"Response_{model_cls.__name__}", type_=model_cls, mode="serialization"
+    )
+
+
+def render_default(field, model) -> bytes:
+    content = asyncio.run(serialize_response(field=field, response_content=model))
+    return JSONResponse(content).body
+
+
+def render_fast(model) -> bytes:
+    return FastJSONResponse(model).body
+
+
+def measure(fn, rounds: int) -> float:
+    """Return calls per second."""
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return rounds / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100, help="Entries per payload")
+    parser.add_argument("--rounds", type=int, default=2000, help="Iterations per case")
+    args = parser.parse_args()
+
+    cases = [
+        ("challenges", ChallengeListResponse, build_challenge_list(args.items)),
+        ("leaderboard", LeaderboardResponse, build_leaderboard(args.items)),
+    ]
+
+    print(f"{'payload':<12} {'bytes':>8} {'before/s':>10} {'after/s':>10} {'speedup':>8}")
+    for name, model_cls, model in cases:
+        field = response_field(model_cls)
+        before = measure(lambda: render_default(field, model), args.rounds)
+        after = measure(lambda: render_fast(model), args.rounds)
+        size = len(render_fast(model))
+        print(f"{name:<12} {size:>8} {before:>10.0f} {after:>10.0f} {after / before:>7.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
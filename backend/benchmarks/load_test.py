@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API load test
+
+Drives the API either in-process (httpx ASGITransport, no network) or over
+HTTP against a running server, with configurable concurrency, and reports
+p50/p95/p99 latency and throughput per endpoint. Results are written as
+JSON to benchmarks/results/ and can be compared against an earlier run.
+
+Usage (from backend/):
+    # seed + in-process run
+    python benchmarks/load_test.py --db /tmp/bench.db --seed-users 100000
+
+    # against a running server (seeded with benchmarks/seed.py)
+    python benchmarks/load_test.py --mode http --base-url http://localhost:8000
+
+    # compare with an earlier result
+    python benchmarks/load_test.py --db /tmp/bench.db --compare benchmarks/results/<file>.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, date
+from pathlib import Path
+from typing import Callable, Optional
+
+import httpx
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from seed import BENCH_EMAIL_DOMAIN, BENCH_PASSWORD, REGIONS, create_benchmark_database
+
+RESULTS_DIR = BENCH_DIR / "results"
+
+
+@dataclass
+class Context:
+    """Data the endpoint definitions draw from."""
+    rng: random.Random
+    tokens: list[str]
+    challenge_ids: list[str]
+    bust_cache: bool = False
+    counter: int = 0
+
+    def token(self) -> str:
+        return self.rng.choice(self.tokens)
+
+    def suffix(self, path: str) -> str:
+        if not self.bust_cache:
+            return path
+        self.counter += 1
+        return f"{path}{'&' if '?' in path else '?'}_bench={self.counter}"
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    path: Callable[[Context], str]
+    auth: bool = False
+    body: Optional[Callable[[Context], dict]] = None
+
+
+ENDPOINTS = [
+    Endpoint("challenges", "GET", lambda c: "/v1/challenges?limit=20"),
+    Endpoint("challenges_auth", "GET", lambda c: "/v1/challenges?limit=20", auth=True),
+    Endpoint("challenge_detail", "GET", lambda c: f"/v1/challenges/{c.rng.choice(c.challenge_ids)}"),
+    Endpoint("leaderboard_weekly", "GET", lambda c: "/v1/leaderboards/weekly?limit=10"),
+    Endpoint("leaderboard_monthly_auth", "GET", lambda c: "/v1/leaderboards/monthly?limit=10", auth=True),
+    Endpoint("leaderboard_regional", "GET", lambda c: f"/v1/leaderboards/regional/{c.rng.choice(REGIONS)}"),
+    Endpoint("badges", "GET", lambda c: "/v1/badges"),
+    Endpoint("footprint_factors", "GET", lambda c: "/v1/footprint/factors"),
+    Endpoint("users_me", "GET", lambda c: "/v1/users/me", auth=True),
+    Endpoint("badges_my", "GET", lambda c: "/v1/badges/my", auth=True),
+]
+
+
+@dataclass
+class EndpointResult:
+    name: str
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: dict = field(default_factory=dict)
+    wall_seconds: float = 0.0
+
+    def summary(self) -> dict:
+        lat = sorted(self.latencies_ms)
+        return {
+            "requests": len(lat) + self.errors,
+            "errors": self.errors,
+            "status_codes": self.status_codes,
+            "throughput_rps": round(len(lat) / self.wall_seconds, 1) if self.wall_seconds else 0.0,
+            "p50_ms": percentile(lat, 50),
+            "p95_ms": percentile(lat, 95),
+            "p99_ms": percentile(lat, 99),
+            "max_ms": round(lat[-1], 2) if lat else None,
+        }
+
+
+def percentile(sorted_values: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return round(sorted_values[min(rank, len(sorted_values)) - 1], 2)
+
+
+async def run_endpoint(client: httpx.AsyncClient, endpoint: Endpoint, ctx: Context,
+                       requests: int, concurrency: int) -> EndpointResult:
+    result = EndpointResult(endpoint.name)
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            headers = {"Accept-Encoding": "gzip"}
+            if endpoint.auth:
+                headers["Authorization"] = f"Bearer {ctx.token()}"
+            path = ctx.suffix(endpoint.path(ctx))
+            body = endpoint.body(ctx) if endpoint.body else None
+
+            start = time.perf_counter()
+            try:
+                response = await client.request(endpoint.method, path, headers=headers, json=body)
+            except httpx.HTTPError:
+                result.errors += 1
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+
+            code = str(response.status_code)
+            result.status_codes[code] = result.status_codes.get(code, 0) + 1
+            if response.status_code >= 400:
+                result.errors += 1
+            else:
+                result.latencies_ms.append(elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.wall_seconds = time.perf_counter() - start
+    return result
+
+
+async def login_users(client: httpx.AsyncClient, count: int, rng: random.Random) -> list[str]:
+    """Log in seeded users to get bearer tokens (works in both modes)."""
+    rankings = (await client.get("/v1/leaderboards/monthly?limit=100")).json().get("rankings", [])
+    user_ids = [entry["user"]["id"] for entry in rankings]
+    if not user_ids:
+        user_ids = list(range(1, 1000))
+
+    tokens = []
+    for user_id in rng.sample(user_ids, min(count, len(user_ids))):
+        response = await client.post("/v1/auth/login", json={
+            "email": f"bench_{user_id}@{BENCH_EMAIL_DOMAIN}",
+            "password": BENCH_PASSWORD,
+        })
+        if response.status_code == 200:
+            tokens.append(response.json()["token"])
+    if not tokens:
+        raise RuntimeError("Could not log in any seeded user - was the database seeded with benchmarks/seed.py?")
+    return tokens
+
+
+def build_client(args) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.mode == "http":
+        return httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30.0)
+
+    os.environ["DATABASE_PATH"] = str(Path(args.db).resolve())
+    # A single client would hit the per-IP/per-user limits within seconds
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    from app.main import app
+    # Server errors are counted, not raised
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=30.0)
+
+
+async def run(args) -> tuple[str, dict]:
+    rng = random.Random(args.seed)
+    selected = [e for e in ENDPOINTS if not args.endpoints or e.name in args.endpoints]
+
+    async with build_client(args) as client:
+        api_version = (await client.get("/")).json().get("version")
+        challenges = (await client.get("/v1/challenges?limit=100")).json()["challenges"]
+        ctx = Context(
+            rng=rng,
+            tokens=await login_users(client, args.users_logged_in, rng),
+            challenge_ids=[c["id"] for c in challenges],
+            bust_cache=args.bust_cache,
+        )
+
+        results = {}
+        for endpoint in selected:
+            # Warm-up, not measured
+            await run_endpoint(client, endpoint, ctx, min(args.concurrency, args.requests), args.concurrency)
+            result = await run_endpoint(client, endpoint, ctx, args.requests, args.concurrency)
+            results[endpoint.name] = result.summary()
+            s = results[endpoint.name]
+            print(f"  {endpoint.name:<26} {s['throughput_rps']:>9.1f} rps  "
+                  f"p50 {s['p50_ms']:>8} ms  p95 {s['p95_ms']:>8} ms  p99 {s['p99_ms']:>8} ms  "
+                  f"errors {s['errors']}")
+    return api_version, results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True,
+            stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    print(f"\nComparison with {baseline_path.name} "
+          f"(revision {baseline.get('revision')}, {baseline.get('label') or '-'}):")
+    print(f"  {'endpoint':<26} {'rps':>16} {'p95 ms':>20} {'p99 ms':>20}")
+    for name, cur in current["endpoints"].items():
+        old = baseline.get("endpoints", {}).get(name)
+        if not old:
+            continue
+
+        def delta(key, higher_is_better):
+            a, b = old.get(key), cur.get(key)
+            if not a or b is None:
+                return f"{b!s:>20}"
+            change = (b - a) / a * 100
+            mark = "+" if (change >= 0) == higher_is_better else "!"
+            return f"{a:>7} → {b:<7} {mark}{abs(change):>3.0f}%"
+
+        print(f"  {name:<26} {delta('throughput_rps', True)} "
+              f"{delta('p95_ms', False)} {delta('p99_ms', False)}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Provolution API load test")
+    parser.add_argument("--mode", choices=["inprocess", "http"], default="inprocess")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Server URL for --mode http")
+    parser.add_argument("--db", help="SQLite database for --mode inprocess")
+    parser.add_argument("--seed-users", type=int, default=0,
+                        help="(Re)create --db with this many synthetic users first")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--endpoints", nargs="*", help="Subset of endpoint names")
+    parser.add_argument("--users-logged-in", type=int, default=20)
+    parser.add_argument("--bust-cache", action="store_true",
+                        help="Add a unique query parameter so the HTTP response cache is bypassed")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", default="", help="Free-form label stored with the result")
+    parser.add_argument("--output", default=str(RESULTS_DIR), help="Directory for result JSON")
+    parser.add_argument("--compare", help="Earlier result JSON to compare against")
+    args = parser.parse_args()
+
+    if args.mode == "inprocess":
+        if not args.db:
+            parser.error("--db is required for --mode inprocess")
+        if args.seed_users:
+            print(f"Seeding {args.seed_users} users into {args.db} ...")
+            counts = create_benchmark_database(Path(args.db), args.seed_users, args.seed)
+            print("  " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+
+    print(f"Running {args.mode} load test: concurrency={args.concurrency}, "
+          f"requests/endpoint={args.requests}")
+    api_version, endpoints = asyncio.run(run(args))
+
+    result = {
+        "label": args.label,
+        "revision": git_revision(),
+        "api_version": api_version,
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "mode": args.mode,
+        "concurrency": args.concurrency,
+        "requests_per_endpoint": args.requests,
+        "bust_cache": args.bust_cache,
+        "endpoints": endpoints,
+    }
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    out_file = output_dir / (
+        f"{date.today().isoformat()}_{result['revision'] or 'unknown'}_{args.mode}"
+        f"{'_' + args.label if args.label else ''}.json"
+    )
+    out_file.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\n✓ Results saved: {out_file}")
+
+    if args.compare:
+        compare(result, Path(args.compare))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark database seeder
+
+Thin wrapper around generate_synthetic_data.py: creates an API-compatible
+SQLite database and fills it with synthetic users (power-law activity,
+regional clustering, daily logs, XP transactions, referrals, footprints).
+
+All seeded users are called bench_<id> and share the password
+BENCH_PASSWORD so the load test can log in over HTTP without hashing 100k
+bcrypt passwords.
+
+Usage (from backend/):
+    python benchmarks/seed.py --db /tmp/bench.db --users 100000
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from generate_synthetic_data import REGION_WEIGHTS, create_synthetic_database
+
+BENCH_PASSWORD = "Benchmark123"
+BENCH_EMAIL_DOMAIN = "bench.provolution.org"
+BENCH_USER_PREFIX = "bench"
+
+REGIONS = list(REGION_WEIGHTS)
+
+
+def create_benchmark_database(db_path: Path, users: int, rng_seed: int = 42, reset: bool = True) -> dict:
+    """Create a fresh schema at db_path and seed it; returns row counts."""
+    return create_synthetic_database(
+        Path(db_path), users, rng_seed, reset=reset,
+        password=BENCH_PASSWORD,
+        email_domain=BENCH_EMAIL_DOMAIN,
+        user_prefix=BENCH_USER_PREFIX,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Seed a synthetic benchmark database")
+    parser.add_argument("--db", required=True, help="Path of the SQLite file to create")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (reproducible data)")
+    args = parser.parse_args()
+
+    counts = create_benchmark_database(Path(args.db), args.users, args.seed)
+    print(f"✓ Seeded {args.db}: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PROVOLUTION LEADERBOARD PERIOD CLOSER
+Friert die Endstände abgelaufener Wochen und Saisons in Snapshots ein
+(leaderboard_snapshots / leaderboard_snapshot_entries). Historische
+Ranglisten werden danach nur noch aus den Snapshots gelesen.
+
+Täglich nach Mitternacht (UTC) laufen lassen, z.B. als Render Cron Job.
+Bereits eingefrorene Perioden werden übersprungen; beim ersten Lauf werden
+alle Perioden seit dem ersten Challenge-Abschluss nachgeholt. Jede Periode
+ist eine eigene kurze Transaktion (ein INSERT … SELECT je Metrik).
+
+Usage:
+    python close_leaderboard_periods.py [--db PATH] [--today YYYY-MM-DD]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+# Fix für Windows Console Encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+
+def close_periods(today: date) -> list:
+    """Snapshots (alle Metriken) für alle abgelaufenen Perioden ohne Snapshot."""
+    from app.database import get_db
+    from app.services.leaderboard_scores import METRICS, periods_to_close, snapshot_period
+
+    with get_db() as conn:
+        pending = list(periods_to_close(conn, today))
+
+    closed = []
+    for period in pending:
+        with get_db() as conn:
+            frozen = [snapshot_period(conn, period, metric) for metric in METRICS]
+        if any(snapshot_id is not None for snapshot_id in frozen):
+            closed.append(period)
+    return closed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Friert abgelaufene Leaderboard-Perioden ein')
+    parser.add_argument('--db', help='Pfad der SQLite-Datei (Standard: DATABASE_PATH bzw. App-Datenbank)')
+    parser.add_argument('--today', type=date.fromisoformat, default=datetime.utcnow().date(),
+                        help='Stichtag (Standard: heute, UTC); Perioden, die davor enden, werden eingefroren')
+    args = parser.parse_args()
+
+    if args.db:
+        os.environ["DATABASE_PATH"] = str(Path(args.db))
+
+    print("=" * 50)
+    print("PROVOLUTION LEADERBOARD PERIOD CLOSER")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    closed = close_periods(args.today)
+    seconds = round(time.perf_counter() - start, 1)
+
+    weeks = [p.key for p in closed if p.kind == "week"]
+    seasons = [p.key for p in closed if p.kind == "season"]
+    print(f"\n  Wochen eingefroren: {len(weeks)}" + (f" ({weeks[0]} … {weeks[-1]})" if weeks else ""))
+    print(f"  Saisons eingefroren: {len(seasons)}" + (f" ({', '.join(seasons)})" if seasons else ""))
+    print(f"  Dauer: {seconds}s")
+    print("=" * 50)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PROVOLUTION GAMIFICATION SYNTHETIC DATA GENERATOR
+Erzeugt eine API-kompatible Datenbank mit realistisch verteilten Testdaten
+für Skalierungstests (Leaderboards, Zähler, Indexe).
+
+- Aktivität pro User folgt einem Power Law (Pareto): die meisten User machen
+  wenig, wenige sehr viel
+- Regionale Cluster über users.region_id: Bundesländer nach Einwohnerzahl
+  gewichtet, je Region ein Engagement-Faktor und passende PLZ-Bereiche;
+  die Regions-Aggregate der Leaderboards werden nach dem Laden aufgebaut
+- Challenge-Popularität nach Zipf, Referrals per Preferential Attachment
+  innerhalb der Region
+- Tages-Logs, XP-Transaktionen, Referrals und CO₂-Fußabdrücke passend zu den
+  Teilnahmen; total_xp / level und die Zähler in users sind konsistent
+
+Bulk-Load: Journal und fsync aus, Sekundär-Indexe werden vor dem Laden
+entfernt und danach neu aufgebaut, Inserts laufen per executemany in einer
+einzigen Transaktion. Eine Datenbank mit ~10 Mio. Zeilen entsteht so in
+wenigen Minuten.
+
+Usage:
+    python generate_synthetic_data.py --db /tmp/scale.db --users 1000000
+"""
+
+import argparse
+import math
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from init_database import CHALLENGES_PATH, SCRIPT_DIR, verify_database
+
+# Fix für Windows Console Encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+BACKEND_DIR = Path(SCRIPT_DIR)
+sys.path.insert(0, str(BACKEND_DIR))
+
+DEFAULT_PASSWORD = "Synthetic123"
+DEFAULT_EMAIL_DOMAIN = "synthetic.provolution.org"
+DEFAULT_USER_PREFIX = "synth"
+
+# Einwohner-Gewichte der Bundesländer (PLZ-Leitbereiche aus app/services/regions.py)
+REGION_WEIGHTS = {
+    "NW": 18, "BY": 13, "BW": 11, "NI": 8, "HE": 6, "BE": 4, "SN": 4, "RP": 4,
+    "SH": 3, "HH": 2, "BB": 2.5, "TH": 2, "ST": 2, "MV": 1.6, "SL": 1, "HB": 0.7,
+}
+
+AVATARS = ["🌱", "🌳", "🌍", "⚡", "🚲", "☀️", "💧", "🐝"]
+
+# Verteilungsparameter
+PARETO_ALPHA = 1.2            # Aktivität: P(k) ~ k^-(alpha+1)
+INACTIVE_SHARE = 0.35         # registriert, aber nie einer Challenge beigetreten
+ZIPF_EXPONENT = 1.1           # Challenge-Popularität nach Rang
+REFERRED_SHARE = 0.15         # über einen Referral-Code registriert
+REFERRAL_XP = 100             # Bonus für den Werbenden (siehe /auth/register)
+FOOTPRINT_BASE_SHARE = 0.25   # Anteil mit Fußabdruck, steigt mit Aktivität
+
+# Sekundär-Indexe dieser Tabellen werden für den Bulk-Load entfernt
+BULK_TABLES = (
+    "users", "user_challenges", "challenge_logs", "xp_transactions",
+    "referrals", "user_footprint", "footprint_history",
+)
+
+BATCH_ROWS = 50000
+
+DIETS = (["vegan", "vegetarian", "flexitarian", "mixed", "meat_heavy"], [3, 9, 28, 48, 12])
+HEATING = (["gas", "oil", "district", "heatpump", "wood", "electric"], [48, 20, 14, 12, 4, 2])
+CAR_FUELS = (["petrol", "diesel", "hybrid", "electric"], [55, 28, 10, 7])
+
+
+def level_for_xp(xp: int) -> int:
+    return 1 + xp // 1000
+
+
+# ============================================
+# SCHEMA
+# ============================================
+
+def apply_schema(db_path: Path) -> None:
+    """Erstellt das API-Schema und wendet schema_update.sql und migrations/ an."""
+    os.environ["DATABASE_PATH"] = str(db_path)
+    import app.database as database
+
+    database.DB_PATH = db_path
+    database.initialize_database()
+
+    conn = sqlite3.connect(db_path)
+    sql_files = [BACKEND_DIR / "schema_update.sql"]
+    sql_files += sorted((BACKEND_DIR / "migrations").glob("*.sql"))
+    for sql_file in sql_files:
+        for statement in sql_file.read_text(encoding="utf-8").split(";"):
+            lines = [l for l in statement.splitlines() if not l.strip().startswith("--")]
+            statement = "\n".join(lines).strip()
+            if not statement:
+                continue
+            try:
+                conn.execute(statement)
+            except sqlite3.OperationalError as e:
+                # Spalten/Tabellen, die initialize_database schon angelegt hat
+                if "duplicate column" not in str(e) and "already exists" not in str(e):
+                    raise
+    conn.commit()
+    conn.close()
+
+
+def tune_for_bulk_load(conn: sqlite3.Connection) -> None:
+    """Kein Journal, kein fsync, großer Page-Cache. Nur für Wegwerf-Datenbanken!"""
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA locking_mode = EXCLUSIVE")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -262144")  # 256 MB
+
+
+def drop_secondary_indexes(conn: sqlite3.Connection) -> list[str]:
+    """Entfernt Sekundär-Indexe der Bulk-Tabellen; gibt ihr CREATE-SQL zurück."""
+    placeholders = ", ".join("?" for _ in BULK_TABLES)
+    rows = conn.execute(
+        f"""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+        """,
+        BULK_TABLES
+    ).fetchall()
+    for name, _ in rows:
+        conn.execute(f'DROP INDEX "{name}"')
+    return [sql for _, sql in rows]
+
+
+# ============================================
+# GENERATOR
+# ============================================
+
+class SyntheticDataGenerator:
+    """Erzeugt User samt Aktivität und schreibt sie gepuffert in die Datenbank."""
+
+    def __init__(self, conn: sqlite3.Connection, rng: random.Random, now: datetime,
+                 password_hash: str, email_domain: str, user_prefix: str, days: int):
+        self.conn = conn
+        self.rng = rng
+        self.now = now
+        self.today = now.date()
+        self.password_hash = password_hash
+        self.email_domain = email_domain
+        self.user_prefix = user_prefix
+        self.days = days
+
+        self.challenges = conn.execute(
+            "SELECT id, duration_days, co2_impact_kg_year, xp_reward FROM challenges WHERE is_active = 1 ORDER BY id"
+        ).fetchall()
+        if not self.challenges:
+            raise RuntimeError("Keine Challenges in der Datenbank - ist challenges.json vorhanden?")
+        # Zipf-Popularität in zufälliger Rangfolge (reproduzierbar über rng)
+        ranked = self.challenges[:]
+        rng.shuffle(ranked)
+        self.challenges = ranked
+        self.challenge_weights = list(_cumulative(
+            [1 / (rank ** ZIPF_EXPONENT) for rank in range(1, len(ranked) + 1)]
+        ))
+
+        from app.services.regions import REGIONS_BY_ID
+
+        self.regions = REGIONS_BY_ID
+        self.region_names = list(REGION_WEIGHTS)
+        self.region_weights = list(_cumulative([REGION_WEIGHTS[r] for r in self.region_names]))
+        # Engagement-Faktor je Region (lognormal um 1)
+        self.region_factor = {r: rng.lognormvariate(0, 0.25) for r in self.region_names}
+        # Preferential Attachment: jeder User ein Los, plus eins pro geworbenem User
+        self.referral_pool: dict[str, list[int]] = {r: [] for r in self.region_names}
+        self.referral_bonus: dict[int, int] = {}
+
+        self.next_user_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM users").fetchone()[0] + 1
+        self.next_uc_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM user_challenges").fetchone()[0] + 1
+
+        self.day_strings: dict[int, str] = {}
+        self.buffers = {table: [] for table in INSERTS}
+        self.counts = {table: 0 for table in INSERTS}
+        self.pending_rows = 0
+
+    # ---------- buffering ----------
+
+    def _add(self, table: str, row: tuple) -> None:
+        self.buffers[table].append(row)
+        self.pending_rows += 1
+
+    def flush(self) -> None:
+        for table, rows in self.buffers.items():
+            if rows:
+                self.conn.executemany(INSERTS[table], rows)
+                self.counts[table] += len(rows)
+                rows.clear()
+        self.pending_rows = 0
+
+    # ---------- distributions ----------
+
+    def _pick_challenges(self, count: int) -> list[tuple]:
+        """Zipf-gewichtete Auswahl ohne Zurücklegen."""
+        if count >= len(self.challenges) // 2:
+            return self.rng.sample(self.challenges, count)
+        picked = {}
+        while len(picked) < count:
+            c = self.rng.choices(self.challenges, cum_weights=self.challenge_weights)[0]
+            picked[c[0]] = c
+        return list(picked.values())
+
+    def _day_str(self, ordinal: int) -> str:
+        day = self.day_strings.get(ordinal)
+        if day is None:
+            day = self.day_strings[ordinal] = date.fromordinal(ordinal).isoformat()
+        return day
+
+    def _timestamp(self, earliest: datetime) -> datetime:
+        span = max(0.0, (self.now - earliest).total_seconds())
+        return earliest + timedelta(seconds=self.rng.random() * span)
+
+    # ---------- entities ----------
+
+    def add_user(self) -> None:
+        rng = self.rng
+        uid = self.next_user_id
+        self.next_user_id += 1
+
+        region = rng.choices(self.region_names, cum_weights=self.region_weights)[0]
+        postal_code = rng.choice(self.regions[region].postal_prefixes) + f"{rng.randint(0, 999):03d}"
+        # Wachstum: jüngere Registrierungen häufiger
+        created = self.now - timedelta(days=self.days * rng.random() ** 1.5, seconds=rng.randint(0, 86399))
+
+        activity = rng.paretovariate(PARETO_ALPHA) * self.region_factor[region]
+        joined = 0 if rng.random() < INACTIVE_SHARE else min(len(self.challenges), int(activity))
+        completion_rate = min(0.9, 0.25 + 0.05 * joined)
+        consistency = min(0.95, 0.3 + 0.1 * activity)
+
+        total_xp = 0
+        total_co2 = 0.0
+        challenges_completed = 0
+        streak_days = 0
+        last_activity = created
+
+        for challenge_id, duration, co2, xp_reward in self._pick_challenges(joined):
+            uc_id = self.next_uc_id
+            self.next_uc_id += 1
+            started = self._timestamp(created)
+            elapsed = min(duration, (self.now - started).days)
+            completed = elapsed >= duration and rng.random() < completion_rate
+
+            if completed:
+                days_done = duration
+                completed_at = (started + timedelta(days=duration)).isoformat()
+                status = "completed"
+                xp = xp_reward
+                total_xp += xp
+                total_co2 += co2 or 0
+                challenges_completed += 1
+                self._add("xp_transactions", (
+                    uid, xp, "challenge", "challenge", challenge_id,
+                    f"Challenge {challenge_id} abgeschlossen", completed_at,
+                ))
+            else:
+                days_done = elapsed if rng.random() < consistency else rng.randint(0, elapsed)
+                completed_at = None
+                status = "active" if rng.random() < 0.85 else "abandoned"
+                xp = 0
+                if status == "active" and days_done and days_done == elapsed:
+                    streak_days = max(streak_days, days_done)
+
+            self._add("user_challenges", (
+                uc_id, uid, challenge_id, status, started.isoformat(), completed_at,
+                int(days_done / duration * 100) if duration else 0, days_done,
+                "verified" if completed and rng.random() < 0.7 else "pending", xp,
+                ((1 << days_done) - 1).to_bytes((days_done + 7) // 8, "little"),
+            ))
+            first_day = started.date().toordinal()
+            logs = self.buffers["challenge_logs"]
+            for day in range(first_day, first_day + days_done):
+                log_day = self._day_str(day)
+                logs.append((uc_id, log_day, log_day))
+            self.pending_rows += days_done
+            if days_done:
+                last_activity = max(last_activity, started + timedelta(days=days_done - 1))
+
+        referred_by = None
+        pool = self.referral_pool[region]
+        if pool and rng.random() < REFERRED_SHARE:
+            referred_by = rng.choice(pool)
+            pool.append(referred_by)
+            self.referral_bonus[referred_by] = self.referral_bonus.get(referred_by, 0) + REFERRAL_XP
+            self._add("referrals", (referred_by, uid, "completed", created.isoformat(), REFERRAL_XP, created.isoformat()))
+            self._add("xp_transactions", (
+                referred_by, REFERRAL_XP, "referral", "user", str(uid),
+                "Freund eingeladen", created.isoformat(),
+            ))
+        pool.append(uid)
+
+        baseline = None
+        if rng.random() < FOOTPRINT_BASE_SHARE + 0.1 * min(joined, 4):
+            baseline = self._add_footprint(uid, created)
+
+        self._add("users", (
+            uid, f"{self.user_prefix}_{uid}", f"{self.user_prefix}_{uid}@{self.email_domain}",
+            self.password_hash, f"{self.user_prefix.title()} User {uid}", rng.choice(AVATARS),
+            total_xp, level_for_xp(total_xp), streak_days,
+            last_activity.date().isoformat() if streak_days else None,
+            self.regions[region].name, region, postal_code, baseline,
+            f"{self.user_prefix[0].upper()}{uid:09d}", referred_by,
+            round(total_co2, 2), challenges_completed, created.isoformat(), last_activity.isoformat(),
+        ))
+
+    def _add_footprint(self, uid: int, created: datetime) -> float:
+        """Fußabdruck aus den Faktoren des FootprintCalculators, mit Rauschen."""
+        from app.services.footprint_calculator import DEFAULTS, EMISSION_FACTORS as F
+
+        rng = self.rng
+        housing_type = rng.choices(["apartment", "house", "shared"], weights=[55, 38, 7])[0]
+        size = int(rng.lognormvariate(math.log(95 if housing_type == "house" else 70), 0.35))
+        members = rng.choices([1, 2, 3, 4, 5], weights=[41, 34, 12, 9, 4])[0]
+        heating = rng.choices(*HEATING)[0]
+        heating_kwh = int(size * DEFAULTS["heating_kwh_per_sqm"] * rng.lognormvariate(0, 0.2))
+        electricity_kwh = int(members * DEFAULTS["electricity_kwh_per_person"] * rng.lognormvariate(0, 0.2))
+        green = rng.random() < 0.3
+        housing = (
+            heating_kwh * F["heating"][heating]
+            + electricity_kwh * F["electricity"]["green" if green else "mix"]
+        ) / members
+
+        has_car = rng.random() < 0.75
+        fuel = rng.choices(*CAR_FUELS)[0] if has_car else None
+        car_km = int(rng.lognormvariate(math.log(11000), 0.5)) if has_car else 0
+        pt_km = int(rng.lognormvariate(math.log(2500), 0.8))
+        bike_km = int(rng.lognormvariate(math.log(600), 1.0))
+        short_flights = min(10, int(rng.paretovariate(2.5)) - 1)
+        long_flights = 1 if rng.random() < 0.15 else 0
+        mobility = (
+            car_km * (F["car"][fuel] if fuel else 0)
+            + pt_km * F["public_transport"]
+            + short_flights * F["flight"]["short"]
+            + long_flights * F["flight"]["long"]
+        )
+
+        diet = rng.choices(*DIETS)[0]
+        waste = rng.choices(["low", "medium", "high"], weights=[30, 50, 20])[0]
+        nutrition = F["diet"][diet] * {"low": 0.95, "medium": 1.0, "high": 1.1}[waste]
+
+        shopping = rng.choices(["minimal", "moderate", "frequent"], weights=[20, 55, 25])[0]
+        digital = rng.choices(["low", "medium", "high"], weights=[25, 50, 25])[0]
+        consumption = F["consumption"][shopping] + F["digital"][digital]
+
+        parts = [round(v, 1) for v in (housing, mobility, nutrition, consumption)]
+        total = round(sum(parts), 1)
+        calculated = self._timestamp(created)
+
+        self._add("user_footprint", (
+            uid, housing_type, size, members, heating, heating_kwh, electricity_kwh, green,
+            has_car, fuel, car_km, pt_km, bike_km, short_flights, long_flights,
+            diet, rng.random() < 0.4, waste, shopping, rng.random() < 0.3, digital,
+            total, *parts, calculated.isoformat(), created.isoformat(), calculated.isoformat(),
+        ))
+
+        # Verlauf: Erstberechnung plus ggf. Updates, der letzte Eintrag = aktueller Stand
+        updates = min(4, int(rng.paretovariate(1.5)) - 1)
+        history_at = [self._timestamp(created) for _ in range(updates)] + [calculated]
+        history_at.sort()
+        for i, recorded in enumerate(history_at):
+            drift = 1.0 if i == len(history_at) - 1 else rng.uniform(1.0, 1.25)
+            self._add("footprint_history", (
+                uid, recorded.isoformat(), round(total * drift, 1),
+                *(round(p * drift, 1) for p in parts),
+                "initial" if i == 0 else "update",
+            ))
+        return total
+
+    def finish(self) -> None:
+        """Referral-Boni und -Zähler der Werbenden nachtragen (die waren schon geschrieben)."""
+        self.flush()
+        self.conn.executemany(
+            """
+            UPDATE users
+            SET total_xp = total_xp + ?, level = 1 + (total_xp + ?) / 1000,
+                referrals_count = referrals_count + ?
+            WHERE id = ?
+            """,
+            [(bonus, bonus, bonus // REFERRAL_XP, uid) for uid, bonus in self.referral_bonus.items()]
+        )
+
+
+INSERTS = {
+    "users": """
+        INSERT INTO users (
+            id, username, email, password_hash, display_name, avatar_emoji,
+            total_xp, level, streak_days, streak_last_activity,
+            region, region_id, postal_code, co2_footprint_baseline, referral_code, referred_by,
+            total_co2_saved_kg, challenges_completed, created_at, last_active
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "user_challenges": """
+        INSERT INTO user_challenges (
+            id, user_id, challenge_id, status, started_at, completed_at,
+            progress_percent, days_completed, verification_status, xp_earned, log_bitmap
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "challenge_logs": """
+        INSERT INTO challenge_logs (user_challenge_id, log_date, completed, created_at)
+        VALUES (?, ?, 1, ?)
+    """,
+    "xp_transactions": """
+        INSERT INTO xp_transactions (user_id, amount, type, reference_type, reference_id, description, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+    "referrals": """
+        INSERT INTO referrals (referrer_id, referred_id, status, completed_at, referrer_xp_earned, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """,
+    "user_footprint": """
+        INSERT INTO user_footprint (
+            user_id, housing_type, housing_size_sqm, household_members,
+            heating_type, heating_consumption_kwh, electricity_kwh, green_electricity,
+            has_car, car_fuel_type, car_km_year, public_transport_km_year,
+            bike_km_year, flights_short_haul, flights_long_haul,
+            diet_type, regional_seasonal, food_waste_level,
+            shopping_frequency, secondhand_preference, digital_consumption,
+            co2_total_kg_year, co2_housing_kg, co2_mobility_kg,
+            co2_nutrition_kg, co2_consumption_kg,
+            last_calculated, created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "footprint_history": """
+        INSERT INTO footprint_history (
+            user_id, recorded_at, co2_total_kg_year, co2_housing_kg, co2_mobility_kg,
+            co2_nutrition_kg, co2_consumption_kg, trigger_type
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+}
+
+
+def _cumulative(values):
+    total = 0.0
+    for v in values:
+        total += v
+        yield total
+
+
+def generate(db_path: Path, users: int, rng_seed: int = 42, now: datetime = None,
+             password: str = DEFAULT_PASSWORD, email_domain: str = DEFAULT_EMAIL_DOMAIN,
+             user_prefix: str = DEFAULT_USER_PREFIX, days: int = 365, progress: bool = False) -> dict:
+    """
+    Füllt eine bestehende Datenbank (Schema via apply_schema) mit `users`
+    synthetischen Usern. Gibt die Zeilenzahlen pro Tabelle zurück.
+    """
+    from app.auth.password import hash_password
+    from app.services.leaderboard_scores import rebuild_leaderboard_scores
+    from app.services.referrals import rebuild_referral_paths
+    from app.services.trust import recompute_trust_levels
+    from app.services.regions import rebuild_region_scores
+
+    start = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    tune_for_bulk_load(conn)
+
+    # Ein gemeinsamer Hash: bcrypt für Millionen User wäre unbezahlbar
+    generator = SyntheticDataGenerator(
+        conn, random.Random(rng_seed), now or datetime.utcnow(),
+        hash_password(password), email_domain, user_prefix, days
+    )
+
+    conn.execute("BEGIN")
+    index_sql = drop_secondary_indexes(conn)
+    report_every = 100000
+    for i in range(1, users + 1):
+        generator.add_user()
+        if generator.pending_rows >= BATCH_ROWS:
+            generator.flush()
+        if progress and i % report_every == 0:
+            print(f"  {i:>10,} User  ({time.perf_counter() - start:.0f}s)")
+    generator.finish()
+
+    if progress:
+        print(f"  Indexe neu aufbauen ({len(index_sql)}) ...")
+    for sql in index_sql:
+        conn.execute(sql)
+    rebuild_region_scores(conn)
+    rebuild_leaderboard_scores(conn)
+    rebuild_referral_paths(conn)
+    first_id, last_id = conn.execute("SELECT MIN(id), MAX(id) FROM users").fetchone()
+    recompute_trust_levels(conn, first_id or 0, last_id or -1, generator.now)
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+    counts = dict(generator.counts)
+    counts["total_rows"] = sum(generator.counts.values())
+    counts["seconds"] = round(time.perf_counter() - start, 1)
+    return counts
+
+
+def create_synthetic_database(db_path: Path, users: int, rng_seed: int = 42, reset: bool = True,
+                              **kwargs) -> dict:
+    """Legt das Schema unter db_path neu an und füllt es."""
+    db_path = Path(db_path)
+    if reset and db_path.exists():
+        db_path.unlink()
+    apply_schema(db_path)
+    return generate(db_path, users, rng_seed, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Erzeugt synthetische Testdaten für Skalierungstests')
+    parser.add_argument('--db', required=True, help='Pfad der SQLite-Datei')
+    parser.add_argument('--users', type=int, default=100000, help='Anzahl User')
+    parser.add_argument('--days', type=int, default=365, help='Zeitraum der Registrierungen in Tagen')
+    parser.add_argument('--seed', type=int, default=42, help='Zufalls-Seed (reproduzierbare Daten)')
+    parser.add_argument('--password', default=DEFAULT_PASSWORD, help='Gemeinsames Passwort aller User')
+    parser.add_argument('--append', action='store_true', help='Bestehende Datenbank ergänzen statt neu anlegen')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("PROVOLUTION SYNTHETIC DATA GENERATOR")
+    print("=" * 50)
+    print()
+
+    if not os.path.exists(CHALLENGES_PATH):
+        print(f"FEHLER: Challenges nicht gefunden: {CHALLENGES_PATH}")
+        return 1
+
+    print(f"Erzeuge {args.users:,} User in {args.db} ...")
+    counts = create_synthetic_database(
+        Path(args.db), args.users, args.seed, reset=not args.append,
+        password=args.password, days=args.days, progress=True
+    )
+
+    conn = sqlite3.connect(args.db)
+    verify_database(conn.cursor())
+    conn.close()
+
+    print()
+    print("=" * 50)
+    for table, count in counts.items():
+        print(f"  {table}: {count:,}" if table != "seconds" else f"  Dauer: {count}s")
+    print(f"✓ Passwort aller User: {args.password}")
+    print("=" * 50)
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,8 @@
+-- Migration: Add content versions for HTTP response caching
+-- Run this on existing database to enable ETag-based caching (app/cache.py)
+
+CREATE TABLE IF NOT EXISTS content_versions (
+    resource VARCHAR(50) PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,11 @@
+-- Migration: Columns and unique index for the Google login upsert
+-- app/services/user_accounts.py uses ON CONFLICT(google_id), which needs a
+-- UNIQUE index. SQLite cannot ADD COLUMN ... UNIQUE (see 001), so databases
+-- created by init_database.py get the columns here and the index separately.
+-- Each statement fails harmlessly if the column already exists.
+
+ALTER TABLE users ADD COLUMN google_id VARCHAR(255);
+ALTER TABLE users ADD COLUMN auth_provider VARCHAR(20) DEFAULT 'local';
+ALTER TABLE users ADD COLUMN avatar_url VARCHAR(500);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_google_id_unique ON users(google_id);
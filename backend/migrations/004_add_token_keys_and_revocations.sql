@@ -0,0 +1,16 @@
+-- Migration: Persisted JWT signing keys and token revocation list
+-- Tokens stay valid across restarts and workers (app/auth/signing_keys.py);
+-- revoked refresh tokens / logouts are tracked until they expire
+-- (app/auth/revocation.py). created_at / expires_at are unix timestamps.
+
+CREATE TABLE IF NOT EXISTS signing_keys (
+    kid VARCHAR(32) PRIMARY KEY,
+    secret TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti VARCHAR(64) PRIMARY KEY,
+    expires_at INTEGER NOT NULL,
+    revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,5 @@
+-- Migration: Per-user cache version for GET /users/me/dashboard
+-- Write paths bump it (app/cache.py: bump_user_version) so cached dashboards
+-- are invalidated without a lookup. Fails harmlessly if the column exists.
+
+ALTER TABLE users ADD COLUMN cache_version INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,28 @@
+-- Migration: Maintained user stats (app/services/user_stats.py)
+-- Profile, login and dashboard read these columns instead of counting on
+-- every request. The write paths keep them current and
+-- verify_user_stats.py finds and repairs drift. ALTERs fail harmlessly if
+-- the column exists (total_co2_saved_kg may come from schema_update.sql).
+
+ALTER TABLE users ADD COLUMN challenges_completed INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE users ADD COLUMN badges_earned INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE users ADD COLUMN referrals_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE users ADD COLUMN total_co2_saved_kg REAL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_users_referred_by ON users(referred_by);
+
+-- Backfill (same as: python verify_user_stats.py --repair)
+UPDATE users SET
+    challenges_completed = (
+        SELECT COUNT(*) FROM user_challenges
+        WHERE user_id = users.id AND status = 'completed'
+    ),
+    total_co2_saved_kg = (
+        SELECT ROUND(COALESCE(SUM(c.co2_impact_kg_year), 0), 2)
+        FROM user_challenges uc
+        JOIN challenges c ON c.id = uc.challenge_id
+        WHERE uc.user_id = users.id AND uc.status = 'completed'
+    ),
+    badges_earned = (SELECT COUNT(*) FROM user_badges WHERE user_id = users.id),
+    referrals_count = (SELECT COUNT(*) FROM users r WHERE r.referred_by = users.id),
+    cache_version = cache_version + 1;
@@ -0,0 +1,26 @@
+-- Migration: One log per user challenge and day
+-- Log writes are a single INSERT ... ON CONFLICT DO NOTHING against this
+-- index (double taps no longer create duplicates). idempotency_key lets
+-- clients resend a log and get the original answer. Duplicates from before
+-- are removed (oldest row kept) and days_completed is recounted once,
+-- afterwards it is maintained incrementally. The ALTER fails harmlessly if
+-- the column exists.
+
+ALTER TABLE challenge_logs ADD COLUMN idempotency_key VARCHAR(64);
+
+DELETE FROM challenge_logs
+WHERE id NOT IN (
+    SELECT MIN(id) FROM challenge_logs GROUP BY user_challenge_id, log_date
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_challenge_logs_day
+    ON challenge_logs(user_challenge_id, log_date);
+
+UPDATE user_challenges SET days_completed = counts.days
+FROM (
+    SELECT user_challenge_id, SUM(completed = 1) AS days
+    FROM challenge_logs
+    GROUP BY user_challenge_id
+) AS counts
+WHERE counts.user_challenge_id = user_challenges.id
+  AND user_challenges.days_completed IS NOT counts.days;
@@ -0,0 +1,6 @@
+-- Migration: Progress calendar bitmap per participation
+-- Bit i = day started_at + i completed (app/services/progress_calendar.py).
+-- Existing participations keep NULL and are built from challenge_logs on
+-- first access. Fails harmlessly if the column exists.
+
+ALTER TABLE user_challenges ADD COLUMN log_bitmap BLOB;
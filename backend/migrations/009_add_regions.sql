@@ -0,0 +1,111 @@
+-- Migration: Regions and regional leaderboard aggregates
+-- Bundeslaender with their postal code prefixes (app/services/regions.py),
+-- users.region_id resolved from postal code or region name, and monthly
+-- CO2 aggregates per region and user. Safe to re-run except for the ALTER,
+-- which fails harmlessly if the column exists.
+
+CREATE TABLE IF NOT EXISTS regions (
+    id VARCHAR(2) PRIMARY KEY,
+    name VARCHAR(50) UNIQUE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS region_postal_codes (
+    prefix VARCHAR(5) PRIMARY KEY,
+    region_id VARCHAR(2) NOT NULL REFERENCES regions(id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS region_user_scores (
+    region_id VARCHAR(2) NOT NULL REFERENCES regions(id),
+    period VARCHAR(7) NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    score REAL NOT NULL DEFAULT 0,
+    completions INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (region_id, period, user_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS region_scores (
+    region_id VARCHAR(2) NOT NULL REFERENCES regions(id),
+    period VARCHAR(7) NOT NULL,
+    total_co2_kg REAL NOT NULL DEFAULT 0,
+    participants INTEGER NOT NULL DEFAULT 0,
+    completions INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (region_id, period)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_region_user_scores_rank ON region_user_scores(region_id, period, score DESC);
+
+INSERT OR IGNORE INTO regions (id, name) VALUES
+    ('NW', 'Nordrhein-Westfalen'),
+    ('BY', 'Bayern'),
+    ('BW', 'Baden-Württemberg'),
+    ('NI', 'Niedersachsen'),
+    ('HE', 'Hessen'),
+    ('BE', 'Berlin'),
+    ('SN', 'Sachsen'),
+    ('RP', 'Rheinland-Pfalz'),
+    ('SH', 'Schleswig-Holstein'),
+    ('HH', 'Hamburg'),
+    ('BB', 'Brandenburg'),
+    ('TH', 'Thüringen'),
+    ('ST', 'Sachsen-Anhalt'),
+    ('MV', 'Mecklenburg-Vorpommern'),
+    ('SL', 'Saarland'),
+    ('HB', 'Bremen');
+
+INSERT OR IGNORE INTO region_postal_codes (prefix, region_id) VALUES
+    ('32', 'NW'), ('33', 'NW'), ('40', 'NW'), ('41', 'NW'), ('42', 'NW'), ('44', 'NW'), ('45', 'NW'), ('46', 'NW'), ('47', 'NW'), ('48', 'NW'), ('50', 'NW'), ('51', 'NW'), ('52', 'NW'), ('53', 'NW'), ('57', 'NW'), ('58', 'NW'), ('59', 'NW'),
+    ('80', 'BY'), ('81', 'BY'), ('82', 'BY'), ('83', 'BY'), ('84', 'BY'), ('85', 'BY'), ('86', 'BY'), ('87', 'BY'), ('90', 'BY'), ('91', 'BY'), ('92', 'BY'), ('93', 'BY'), ('94', 'BY'), ('95', 'BY'), ('96', 'BY'), ('97', 'BY'),
+    ('68', 'BW'), ('69', 'BW'), ('70', 'BW'), ('71', 'BW'), ('72', 'BW'), ('73', 'BW'), ('74', 'BW'), ('75', 'BW'), ('76', 'BW'), ('77', 'BW'), ('78', 'BW'), ('79', 'BW'), ('88', 'BW'), ('89', 'BW'),
+    ('26', 'NI'), ('27', 'NI'), ('29', 'NI'), ('30', 'NI'), ('31', 'NI'), ('37', 'NI'), ('38', 'NI'), ('49', 'NI'),
+    ('34', 'HE'), ('35', 'HE'), ('36', 'HE'), ('60', 'HE'), ('61', 'HE'), ('63', 'HE'), ('64', 'HE'), ('65', 'HE'),
+    ('10', 'BE'), ('12', 'BE'), ('13', 'BE'),
+    ('01', 'SN'), ('02', 'SN'), ('04', 'SN'), ('08', 'SN'), ('09', 'SN'),
+    ('54', 'RP'), ('55', 'RP'), ('56', 'RP'), ('67', 'RP'),
+    ('23', 'SH'), ('24', 'SH'), ('25', 'SH'),
+    ('20', 'HH'), ('21', 'HH'), ('22', 'HH'),
+    ('03', 'BB'), ('14', 'BB'), ('15', 'BB'), ('16', 'BB'),
+    ('07', 'TH'), ('98', 'TH'), ('99', 'TH'),
+    ('06', 'ST'), ('39', 'ST'),
+    ('17', 'MV'), ('18', 'MV'), ('19', 'MV'),
+    ('66', 'SL'),
+    ('28', 'HB');
+
+ALTER TABLE users ADD COLUMN region_id VARCHAR(2) REFERENCES regions(id);
+
+CREATE INDEX IF NOT EXISTS idx_users_region_id ON users(region_id);
+
+-- Postal code first, then the free-text region (name, code or NRW)
+UPDATE users SET region_id = (
+    SELECT p.region_id FROM region_postal_codes p
+    WHERE p.prefix = substr(trim(users.postal_code), 1, 2)
+)
+WHERE region_id IS NULL AND length(trim(postal_code)) = 5;
+
+UPDATE users SET region_id = (
+    SELECT r.id FROM regions r
+    WHERE lower(trim(users.region)) IN (lower(r.name), lower(r.id), lower('DE-' || r.id))
+       OR (r.id = 'NW' AND lower(trim(users.region)) = 'nrw')
+)
+WHERE region_id IS NULL AND region IS NOT NULL;
+
+UPDATE users SET region = (SELECT name FROM regions WHERE id = users.region_id)
+WHERE region_id IS NOT NULL;
+
+-- Aggregates from completed challenges (same as regions.rebuild_region_scores)
+DELETE FROM region_scores;
+DELETE FROM region_user_scores;
+
+INSERT INTO region_user_scores (region_id, period, user_id, score, completions)
+SELECT u.region_id, substr(uc.completed_at, 1, 7), u.id,
+       SUM(COALESCE(c.co2_impact_kg_year, 0)), COUNT(*)
+FROM user_challenges uc
+JOIN users u ON u.id = uc.user_id
+JOIN challenges c ON c.id = uc.challenge_id
+WHERE uc.status = 'completed' AND uc.completed_at IS NOT NULL
+  AND u.region_id IS NOT NULL
+GROUP BY u.region_id, substr(uc.completed_at, 1, 7), u.id;
+
+INSERT INTO region_scores (region_id, period, total_co2_kg, participants, completions)
+SELECT region_id, period, SUM(score), COUNT(*), SUM(completions)
+FROM region_user_scores
+GROUP BY region_id, period;
@@ -0,0 +1,23 @@
+-- Migration: Teams with incrementally maintained totals
+-- team_members keeps each member's XP and CO2 earned since joining and the
+-- team totals are the sum of those (app/services/teams.py). One team per
+-- user. The ALTERs fail harmlessly if the columns exist.
+
+ALTER TABLE team_members ADD COLUMN xp_contributed INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE team_members ADD COLUMN co2_contributed REAL NOT NULL DEFAULT 0;
+
+-- Keep the first membership per user
+DELETE FROM team_members
+WHERE id NOT IN (SELECT MIN(id) FROM team_members GROUP BY user_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_team_members_user ON team_members(user_id);
+CREATE INDEX IF NOT EXISTS idx_team_members_team ON team_members(team_id, xp_contributed DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_teams_name ON teams(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_teams_total_xp ON teams(total_xp DESC);
+CREATE INDEX IF NOT EXISTS idx_teams_total_co2 ON teams(total_co2_saved DESC);
+
+-- Totals from the (possibly deduplicated) memberships
+UPDATE teams SET
+    member_count = (SELECT COUNT(*) FROM team_members WHERE team_id = teams.id),
+    total_xp = COALESCE((SELECT SUM(xp_contributed) FROM team_members WHERE team_id = teams.id), 0),
+    total_co2_saved = COALESCE((SELECT ROUND(SUM(co2_contributed), 2) FROM team_members WHERE team_id = teams.id), 0);
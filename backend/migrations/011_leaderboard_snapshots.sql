@@ -0,0 +1,28 @@
+-- Migration: Frozen leaderboards of finished weeks and seasons
+-- Filled by close_leaderboard_periods.py (app/services/seasons.py). The
+-- partial index serves the per-period aggregation over completed challenges.
+
+CREATE TABLE IF NOT EXISTS leaderboard_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind VARCHAR(10) NOT NULL,
+    period_key VARCHAR(20) NOT NULL,
+    metric VARCHAR(20) NOT NULL DEFAULT 'co2_kg',
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    participants INTEGER NOT NULL DEFAULT 0,
+    total_score REAL NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (kind, period_key, metric)
+);
+
+CREATE TABLE IF NOT EXISTS leaderboard_snapshot_entries (
+    snapshot_id INTEGER NOT NULL REFERENCES leaderboard_snapshots(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (snapshot_id, rank, user_id)
+) WITHOUT ROWID;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_snapshot_entries_user ON leaderboard_snapshot_entries(snapshot_id, user_id);
+
+CREATE INDEX IF NOT EXISTS idx_user_challenges_completed ON user_challenges(completed_at) WHERE status = 'completed';
@@ -0,0 +1,68 @@
+-- Migration: Per-metric leaderboard score index
+-- Scores per period (week, month, season), scope (all or region id), metric
+-- (co2_kg, xp, challenges) and user, maintained on every completion and
+-- referral (app/services/leaderboard_scores.py). The backfill below does
+-- the same as rebuild_leaderboard_scores and is safe to re-run.
+
+CREATE TABLE IF NOT EXISTS leaderboard_scores (
+    kind VARCHAR(10) NOT NULL,
+    period_key VARCHAR(20) NOT NULL,
+    scope VARCHAR(10) NOT NULL,
+    metric VARCHAR(20) NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    score REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, period_key, scope, metric, user_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_leaderboard_scores_rank ON leaderboard_scores(kind, period_key, scope, metric, score DESC);
+
+DELETE FROM leaderboard_scores;
+
+WITH events AS (
+    SELECT uc.user_id, u.region_id, date(uc.completed_at) AS day,
+           COALESCE(c.co2_impact_kg_year, 0) AS co2_kg,
+           COALESCE(NULLIF(uc.xp_earned, 0), c.xp_reward, 0) AS xp,
+           1 AS challenges
+    FROM user_challenges uc
+    JOIN users u ON u.id = uc.user_id
+    JOIN challenges c ON c.id = uc.challenge_id
+    WHERE uc.status = 'completed' AND uc.completed_at IS NOT NULL
+    UNION ALL
+    SELECT r.id, r.region_id, date(u.created_at), 0, 100, 0
+    FROM users u
+    JOIN users r ON r.id = u.referred_by
+    WHERE u.created_at IS NOT NULL
+),
+periods AS (
+    SELECT 'week' AS kind,
+           strftime('%Y', date(day, 'weekday 0', '-3 days')) || '-W' ||
+           printf('%02d', (CAST(strftime('%j', date(day, 'weekday 0', '-3 days')) AS INTEGER) - 1) / 7 + 1) AS period_key,
+           'all' AS scope, * FROM events
+    UNION ALL
+    SELECT 'month', substr(day, 1, 7), 'all', * FROM events
+    UNION ALL
+    SELECT 'season',
+           CASE
+               WHEN CAST(substr(day, 6, 2) AS INTEGER) < 3
+                   THEN (CAST(substr(day, 1, 4) AS INTEGER) - 1) || '-winter'
+               WHEN CAST(substr(day, 6, 2) AS INTEGER) < 6 THEN substr(day, 1, 4) || '-fruehling'
+               WHEN CAST(substr(day, 6, 2) AS INTEGER) < 9 THEN substr(day, 1, 4) || '-sommer'
+               WHEN CAST(substr(day, 6, 2) AS INTEGER) < 12 THEN substr(day, 1, 4) || '-herbst'
+               ELSE substr(day, 1, 4) || '-winter'
+           END,
+           'all', * FROM events
+    UNION ALL
+    SELECT 'month', substr(day, 1, 7), region_id, * FROM events WHERE region_id IS NOT NULL
+),
+scores AS (
+    SELECT kind, period_key, scope, 'co2_kg' AS metric, user_id, co2_kg AS value FROM periods
+    UNION ALL
+    SELECT kind, period_key, scope, 'xp', user_id, xp FROM periods
+    UNION ALL
+    SELECT kind, period_key, scope, 'challenges', user_id, challenges FROM periods
+)
+INSERT INTO leaderboard_scores (kind, period_key, scope, metric, user_id, score)
+SELECT kind, period_key, scope, metric, user_id, ROUND(SUM(value), 2)
+FROM scores
+GROUP BY kind, period_key, scope, metric, user_id
+HAVING SUM(value) != 0;
@@ -0,0 +1,14 @@
+-- Migration: Follow graph for friend leaderboards
+-- follows(follower_id, followee_id) is directed. Following is a primary key
+-- range and followers a range on idx_follows_followee, so neither side
+-- scans the table (app/services/follows.py).
+
+CREATE TABLE IF NOT EXISTS follows (
+    follower_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    followee_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (follower_id, followee_id),
+    CHECK (follower_id != followee_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_follows_followee ON follows(followee_id, created_at);
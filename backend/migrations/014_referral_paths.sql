@@ -0,0 +1,28 @@
+-- Migration: Referral tree as closure table
+-- referral_paths holds one row per (ancestor, descendant) pair of the
+-- referral tree with its depth (1 = referred directly), up to depth 10
+-- (MAX_REFERRAL_DEPTH in app/services/referrals.py). Reach per level is a
+-- primary key range, registration adds at most 10 rows.
+
+CREATE TABLE IF NOT EXISTS referral_paths (
+    ancestor_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    depth INTEGER NOT NULL,
+    descendant_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    PRIMARY KEY (ancestor_id, depth, descendant_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_referral_paths_descendant ON referral_paths(descendant_id, depth);
+
+-- Backfill from users.referred_by
+DELETE FROM referral_paths;
+
+WITH RECURSIVE paths(ancestor_id, depth, descendant_id) AS (
+    SELECT referred_by, 1, id FROM users WHERE referred_by IS NOT NULL
+    UNION ALL
+    SELECT u.referred_by, p.depth + 1, p.descendant_id
+    FROM paths p
+    JOIN users u ON u.id = p.ancestor_id
+    WHERE u.referred_by IS NOT NULL AND p.depth < 10
+)
+INSERT INTO referral_paths (ancestor_id, depth, descendant_id)
+SELECT ancestor_id, depth, descendant_id FROM paths;
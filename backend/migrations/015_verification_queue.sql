@@ -0,0 +1,24 @@
+-- Migration: Spot-check review queue
+-- Completions drawn for a spot check wait in verification_queue until a
+-- reviewer decides them. available_at is the enqueue time, after a claim
+-- the end of the lease, so claiming the oldest free entries is a range on
+-- idx_verification_queue_available (app/services/verification.py).
+-- Completions already marked 'spot_check' are queued by the backfill below.
+
+CREATE TABLE IF NOT EXISTS verification_queue (
+    user_challenge_id INTEGER PRIMARY KEY REFERENCES user_challenges(id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    challenge_id VARCHAR(10) NOT NULL REFERENCES challenges(id),
+    enqueued_at TIMESTAMP NOT NULL,
+    available_at TIMESTAMP NOT NULL,
+    lease_owner INTEGER REFERENCES users(id),
+    claims INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_verification_queue_available ON verification_queue(available_at);
+
+INSERT INTO verification_queue (user_challenge_id, user_id, challenge_id, enqueued_at, available_at)
+SELECT id, user_id, challenge_id, completed_at, completed_at
+FROM user_challenges
+WHERE status = 'completed' AND verification_status = 'spot_check' AND completed_at IS NOT NULL
+ON CONFLICT DO NOTHING;
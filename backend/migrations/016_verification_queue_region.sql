@@ -0,0 +1,12 @@
+-- Migration: Region of a queued spot check
+-- A rejected spot check is taken back out of the region the completion was
+-- counted for, which is the user's region at completion time, not the
+-- current one (app/services/verification.py). enqueue_spot_check stores it
+-- from now on; queued entries get the user's current region as the best
+-- available guess.
+
+ALTER TABLE verification_queue ADD COLUMN region_id VARCHAR(2) REFERENCES regions(id);
+
+UPDATE verification_queue
+SET region_id = (SELECT region_id FROM users WHERE users.id = verification_queue.user_id)
+WHERE region_id IS NULL;
@@ -0,0 +1,10 @@
+-- Migration: Computed trust levels (app/services/trust.py)
+-- users.trust_level is now computed from account age, completions,
+-- verified share, rejected spot checks and community role. Pinned users
+-- keep a manually assigned level. Afterwards compute all levels with
+-- python recompute_trust_levels.py (also run it nightly).
+
+ALTER TABLE users ADD COLUMN trust_level_pinned INTEGER NOT NULL DEFAULT 0;
+
+-- Keep levels that were assigned by hand so far
+UPDATE users SET trust_level_pinned = 1 WHERE trust_level > 1;
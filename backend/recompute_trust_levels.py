@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PROVOLUTION TRUST LEVEL RECOMPUTE
+Berechnet users.trust_level für alle User neu (app/services/trust.py).
+Ereignisse aktualisieren das Level sofort; das Kontoalter ändert sich aber
+ohne Ereignis, genauso Team-Rollen. Deshalb täglich laufen lassen, z.B. als
+Render Cron Job nach close_leaderboard_periods.py.
+
+Läuft in Blöcken über die User-ID; jeder Block ist eine kurze Transaktion
+(ein UPDATE … FROM), so dass die API währenddessen weiter schreiben kann.
+User mit trust_level_pinned werden übersprungen.
+
+Usage:
+    python recompute_trust_levels.py [--db PATH] [--batch-size 50000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Fix für Windows Console Encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+DEFAULT_BATCH_SIZE = 50000
+
+
+def recompute(batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """Berechnet alle Level blockweise neu. Gibt Zählungen zurück."""
+    from app.database import get_db
+    from app.services.trust import recompute_trust_levels
+    from app.services.user_stats import user_id_range
+
+    with get_db() as conn:
+        first, last = user_id_range(conn)
+
+    now = datetime.utcnow()
+    result = {"checked_up_to": last, "changed": 0}
+    for block_start in range(first, last + 1, batch_size):
+        block_end = min(block_start + batch_size - 1, last)
+        with get_db() as conn:
+            result["changed"] += recompute_trust_levels(conn, block_start, block_end, now)
+
+    with get_db() as conn:
+        result["levels"] = {
+            row['trust_level']: row['users']
+            for row in conn.execute(
+                "SELECT trust_level, COUNT(*) AS users FROM users GROUP BY trust_level ORDER BY trust_level"
+            )
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Berechnet die Trust-Level aller User neu')
+    parser.add_argument('--db', help='Pfad der SQLite-Datei (Standard: DATABASE_PATH bzw. App-Datenbank)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='User-IDs pro Transaktion')
+    args = parser.parse_args()
+
+    if args.db:
+        os.environ["DATABASE_PATH"] = str(Path(args.db))
+
+    print("=" * 50)
+    print("PROVOLUTION TRUST LEVEL RECOMPUTE")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    result = recompute(args.batch_size)
+    seconds = round(time.perf_counter() - start, 1)
+
+    print(f"\n  Geprüft bis User-ID: {result['checked_up_to']}")
+    print(f"  Geändert: {result['changed']:,}")
+    for level, users in result["levels"].items():
+        print(f"  Level {level}: {users:,} User")
+    print(f"  Dauer: {seconds}s")
+    print("=" * 50)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,98 @@
+# tests/conftest.py
+"""
+Shared fixtures: every test runs against a fresh copy of a database built
+once per session (initialize_database plus schema_update.sql, as in the
+README) and gets a TestClient for the app. Rate limiting is off unless a
+test adds its own middleware instance.
+"""
+
+from pathlib import Path
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="provolution-tests-"))
+os.environ["DATABASE_PATH"] = str(_TMP_DIR / "test.db")
+os.environ["RATE_LIMIT_ENABLED"] = "0"
+os.environ.setdefault("JWT_SECRET", "test-secret")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import cache, database
+from app.auth.signing_keys import key_ring
+
+
+def _apply_schema_update(path: Path) -> None:
+    """schema_update.sql statement by statement; columns that exist are skipped."""
+    conn = sqlite3.connect(path)
+    script = (BACKEND_DIR / "schema_update.sql").read_text(encoding="utf-8")
+    for statement in script.split(";"):
+        sql = "\n".join(
+            line for line in statement.splitlines() if not line.strip().startswith("--")
+        ).strip()
+        if not sql:
+            continue
+        try:
+            conn.execute(sql)
+        except sqlite3.OperationalError as e:
+            if "duplicate column" not in str(e):
+                raise
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def template_db() -> Path:
+    database.initialize_database()
+    _apply_schema_update(database.DB_PATH)
+    key_ring.signing_key()  # every copy shares the signing key
+    template = _TMP_DIR / "template.db"
+    shutil.copyfile(database.DB_PATH, template)
+    return template
+
+
+@pytest.fixture
+def db(template_db):
+    """Fresh database; in-process caches are reset with it."""
+    shutil.copyfile(template_db, database.DB_PATH)
+    key_ring.invalidate()
+    cache.response_store.clear()
+    with cache._versions_lock:
+        cache._versions.clear()
+        cache._versions_loaded_at = 0.0
+    yield database.DB_PATH
+
+
+@pytest.fixture
+def client(db):
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def register(client):
+    """Registers a user and returns (user_id, auth headers)."""
+    counter = iter(range(1, 10000))
+
+    def _register(username: str = None, **fields):
+        n = next(counter)
+        username = username or f"user{n}"
+        response = client.post("/v1/auth/register", json={
+            "email": f"{username}@example.org",
+            "password": "Passwort123!",
+            "username": username,
+            "display_name": username.title(),
+            **fields,
+        })
+        assert response.status_code == 200, response.text
+        body = response.json()
+        return body["user"]["id"], {"Authorization": f"Bearer {body['token']}"}
+
+    return _register
@@ -0,0 +1,107 @@
+# tests/test_auth_tokens.py
+"""Refresh-token rotation and reuse, revocation, and signing-key rotation."""
+
+import jwt
+import pytest
+
+from app.auth import revocation, signing_keys
+from app.auth.jwt_handler import decode_token
+from app.auth.revocation import RevocationList
+from app.auth.signing_keys import key_ring
+
+
+def _register_tokens(client) -> dict:
+    response = client.post("/v1/auth/register", json={
+        "email": "tokens@example.org",
+        "password": "Passwort123!",
+        "username": "tokens",
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _refresh(client, refresh_token: str):
+    return client.post("/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def _me(client, token: str):
+    return client.get("/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+
+
+def test_refresh_rotates_and_revokes_the_old_token(client):
+    first = _register_tokens(client)
+    response = _refresh(client, first["refresh_token"])
+    assert response.status_code == 200, response.text
+    second = response.json()
+
+    old, new = decode_token(first["refresh_token"]), decode_token(second["refresh_token"])
+    assert new["jti"] != old["jti"]
+    assert new["fam"] == old["fam"]
+    assert revocation.revocation_list.is_revoked(old["jti"])
+    assert not revocation.revocation_list.is_revoked(new["jti"], new["fam"])
+    assert _me(client, second["token"]).status_code == 200
+
+
+def test_reused_refresh_token_revokes_the_family(client):
+    first = _register_tokens(client)
+    second = _refresh(client, first["refresh_token"]).json()
+
+    replay = _refresh(client, first["refresh_token"])
+    assert replay.status_code == 401
+    assert replay.json()["detail"]["error"]["code"] == "TOKEN_REUSED"
+
+    # The legitimate holder's newer token is gone with the family
+    later = _refresh(client, second["refresh_token"])
+    assert later.status_code == 401
+    assert later.json()["detail"]["error"]["code"] == "TOKEN_REVOKED"
+
+
+def test_logout_revokes_access_token_and_family(client):
+    tokens = _register_tokens(client)
+    assert _me(client, tokens["token"]).status_code == 200
+
+    response = client.post(
+        "/v1/auth/logout",
+        headers={"Authorization": f"Bearer {tokens['token']}"},
+        json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
+    assert _me(client, tokens["token"]).status_code == 401
+    assert _refresh(client, tokens["refresh_token"]).status_code == 401
+
+
+def test_revocations_reach_other_workers(db, monkeypatch):
+    monkeypatch.setattr(revocation, "SYNC_INTERVAL", 0.0)
+    worker_a, worker_b = RevocationList(), RevocationList()
+    assert not worker_b.is_revoked("jti-1")
+
+    assert worker_a.revoke("jti-1", 2 ** 31)
+    assert not worker_a.revoke("jti-1", 2 ** 31)  # already revoked
+    assert worker_b.is_revoked("jti-1")
+    assert not worker_b.is_revoked("jti-2")
+
+
+def test_tokens_survive_key_rotation(client):
+    tokens = _register_tokens(client)
+    old_kid = jwt.get_unverified_header(tokens["token"])["kid"]
+
+    new_key = key_ring.rotate()
+    assert new_key.kid != old_kid
+    assert _me(client, tokens["token"]).status_code == 200
+    refreshed = _refresh(client, tokens["refresh_token"]).json()
+    assert jwt.get_unverified_header(refreshed["token"])["kid"] == new_key.kid
+
+    # Another worker with an empty cache verifies both generations from the table
+    other_worker = signing_keys.KeyRing()
+    assert other_worker.verification_key(old_kid) is not None
+    assert other_worker.signing_key().kid == new_key.kid
+
+
+def test_jwt_secret_is_required_in_production(db, monkeypatch, capsys):
+    monkeypatch.delenv("JWT_SECRET")
+    signing_keys.check_pepper()
+    assert "JWT_SECRET is not set" in capsys.readouterr().out
+
+    monkeypatch.setenv("RENDER", "1")
+    with pytest.raises(RuntimeError):
+        signing_keys.KeyRing().load()
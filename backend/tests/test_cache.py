@@ -0,0 +1,48 @@
+# tests/test_cache.py
+"""ETag / 304 handling and content version invalidation (app/cache.py)."""
+
+import pytest
+
+from app import cache
+from app.cache import RESOURCE_BADGES, bump_content_version, get_content_version
+from app.database import get_db
+
+
+def test_challenge_list_etag_and_304(client):
+    first = client.get("/v1/challenges")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert "public" in first.headers["cache-control"]
+
+    again = client.get("/v1/challenges", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+
+
+def test_write_changes_etag(client, register):
+    _, headers = register()
+    before = client.get("/v1/challenges").headers["etag"]
+
+    joined = client.post("/v1/challenges/EN-1/join", headers=headers)
+    assert joined.status_code == 200, joined.text
+
+    response = client.get("/v1/challenges", headers={"If-None-Match": before})
+    assert response.status_code == 200
+    assert response.headers["etag"] != before
+
+
+def test_version_visible_after_commit_only(db, monkeypatch):
+    monkeypatch.setattr(cache, "VERSION_CACHE_TTL", 3600.0)
+    assert get_content_version(RESOURCE_BADGES) == 0
+
+    with pytest.raises(RuntimeError):
+        with get_db() as conn:
+            bump_content_version(conn, RESOURCE_BADGES)
+            assert get_content_version(RESOURCE_BADGES) == 0
+            raise RuntimeError("rollback")
+    assert get_content_version(RESOURCE_BADGES) == 0
+
+    with get_db() as conn:
+        bump_content_version(conn, RESOURCE_BADGES)
+        assert get_content_version(RESOURCE_BADGES) == 0
+    assert get_content_version(RESOURCE_BADGES) == 1
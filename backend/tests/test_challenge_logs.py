@@ -0,0 +1,164 @@
+# tests/test_challenge_logs.py
+"""Daily and batch logging: progress, date bounds, idempotent replay, completion."""
+
+from datetime import date, datetime, timedelta
+import sqlite3
+
+from app import database
+from app.database import get_db
+from app.routers import challenges
+
+
+def _join(client, headers, challenge_id: str, days_ago: int = 0) -> None:
+    """Joins a challenge and moves its start days_ago days into the past."""
+    response = client.post(f"/v1/challenges/{challenge_id}/join", headers=headers)
+    assert response.status_code == 200, response.text
+    if days_ago:
+        started = (datetime.utcnow() - timedelta(days=days_ago)).isoformat()
+        with get_db() as conn:
+            conn.execute(
+                "UPDATE user_challenges SET started_at = ? WHERE challenge_id = ? AND status = 'active'",
+                (started, challenge_id)
+            )
+
+
+def _batch(client, headers, entries: list[dict]):
+    response = client.post("/v1/challenges/logs:batch", headers=headers, json={"entries": entries})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_batch_rejects_future_and_out_of_range_days(client, register):
+    _, headers = register()
+    _join(client, headers, "ON-1")
+    _join(client, headers, "ON-3", days_ago=10)
+
+    body = _batch(client, headers, [
+        {"challenge_id": "ON-1", "log_date": (date.today() + timedelta(days=400)).isoformat()},
+        {"challenge_id": "ON-3", "log_date": (date.today() - timedelta(days=5)).isoformat()},
+    ])
+    assert [r["error"] for r in body["results"]] == ["INVALID_LOG_DATE", "INVALID_LOG_DATE"]
+    assert body["logged"] == 0
+    assert body["xp_earned"] == 0
+    assert body["challenges"] == []
+
+
+def test_batch_completes_and_replays(client, register):
+    user_id, headers = register()
+    _join(client, headers, "ON-3", days_ago=5)
+    start = date.today() - timedelta(days=5)
+    entries = [
+        {"challenge_id": "ON-3", "log_date": (start + timedelta(days=i)).isoformat(), "idempotency_key": f"k{i}"}
+        for i in range(3)
+    ]
+
+    first = _batch(client, headers, entries)
+    assert first["logged"] == 3
+    assert first["challenges"][0]["completed"] is True
+    assert first["xp_earned"] == 100
+
+    again = _batch(client, headers, entries)
+    assert again["logged"] == 0
+    assert all(r["logged"] and r["replayed"] for r in again["results"])
+    assert again["xp_earned"] == 0
+
+    with get_db() as conn:
+        user = conn.execute("SELECT total_xp, challenges_completed FROM users WHERE id = ?", (user_id,)).fetchone()
+        logs = conn.execute("SELECT COUNT(*) AS n FROM challenge_logs").fetchone()["n"]
+    assert user == {"total_xp": 100, "challenges_completed": 1}
+    assert logs == 3
+
+    # Same day without the stored key is a conflict, not a replay
+    conflict = _batch(client, headers, [{"challenge_id": "ON-3", "log_date": start.isoformat()}])
+    assert conflict["results"][0]["error"] == "ALREADY_LOGGED"
+
+
+def test_daily_log_date_bounds(client, register):
+    _, headers = register()
+    _join(client, headers, "ON-3", days_ago=10)
+
+    def log(day: date):
+        return client.post("/v1/challenges/ON-3/log", headers=headers, json={"log_date": day.isoformat()})
+
+    for day in (date(9999, 12, 31), date.today() - timedelta(days=11), date.today() - timedelta(days=7)):
+        response = log(day)
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"]["code"] == "INVALID_LOG_DATE"
+
+    assert log(date.today() - timedelta(days=8)).status_code == 200
+    calendar = client.get("/v1/challenges/ON-3/calendar", headers=headers).json()
+    assert calendar["days_completed"] == 1
+    assert calendar["bitmap"] == "BA=="  # day 2
+
+
+def test_batch_advances_progress_per_challenge(client, register):
+    user_id, headers = register()
+    _join(client, headers, "ON-2", days_ago=5)
+    _join(client, headers, "ON-3", days_ago=5)
+    start = date.today() - timedelta(days=5)
+
+    body = _batch(client, headers, [
+        {"challenge_id": "ON-2", "log_date": (start + timedelta(days=i)).isoformat()} for i in (0, 2, 3)
+    ] + [
+        {"challenge_id": "ON-3", "log_date": (start + timedelta(days=i)).isoformat()} for i in range(3)
+    ])
+    assert all(r["logged"] for r in body["results"])
+    assert body["logged"] == 6
+    assert body["xp_earned"] == 100
+    assert [
+        (p["challenge_id"], p["days_completed"], p["progress_percent"], p["completed"]) for p in body["challenges"]
+    ] == [("ON-2", 3, 42, False), ("ON-3", 3, 100, True)]
+
+    calendar = client.get("/v1/challenges/ON-2/calendar", headers=headers).json()
+    assert calendar["days_completed"] == 3
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT challenge_id, status, days_completed FROM user_challenges WHERE user_id = ? ORDER BY challenge_id",
+            (user_id,)
+        ).fetchall()
+    assert rows == [
+        {"challenge_id": "ON-2", "status": "active", "days_completed": 3},
+        {"challenge_id": "ON-3", "status": "completed", "days_completed": 3},
+    ]
+
+
+def test_batch_is_not_overtaken_by_a_concurrent_log(client, register, monkeypatch):
+    user_id, headers = register()
+    _join(client, headers, "ON-3", days_ago=5)
+    start = date.today() - timedelta(days=5)
+    entries = [{"challenge_id": "ON-3", "log_date": (start + timedelta(days=i)).isoformat()} for i in range(3)]
+    batch_log_result = challenges.BatchLogResult
+    interleaved = []
+
+    def result_with_concurrent_write(*args, **kwargs):
+        # A single-day log for the batch's last day arrives after the prefetch
+        if not interleaved:
+            other = sqlite3.connect(database.DB_PATH, timeout=0.1)
+            try:
+                other.execute(
+                    """
+                    INSERT INTO challenge_logs (user_challenge_id, log_date, completed, created_at)
+                    SELECT id, ?, 1, ? FROM user_challenges WHERE user_id = ?
+                    """,
+                    (entries[-1]["log_date"], datetime.utcnow().isoformat(), user_id)
+                )
+                other.execute("UPDATE user_challenges SET days_completed = days_completed + 1 WHERE user_id = ?",
+                              (user_id,))
+                other.commit()
+                interleaved.append(True)
+            except sqlite3.OperationalError:  # database is locked
+                interleaved.append(False)
+            finally:
+                other.close()
+        return batch_log_result(*args, **kwargs)
+
+    monkeypatch.setattr(challenges, "BatchLogResult", result_with_concurrent_write)
+    body = _batch(client, headers, entries)
+
+    with get_db() as conn:
+        uc = conn.execute("SELECT status, days_completed FROM user_challenges WHERE user_id = ?",
+                          (user_id,)).fetchone()
+        logs = conn.execute("SELECT COUNT(*) AS n FROM challenge_logs").fetchone()["n"]
+    # Every counted day has exactly one log
+    assert uc == {"status": "completed", "days_completed": logs}
+    assert body["logged"] == 3 - interleaved.count(True)
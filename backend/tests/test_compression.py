@@ -0,0 +1,75 @@
+# tests/test_compression.py
+"""gzip negotiation, buffering of chunked bodies and event streams (app/compression.py)."""
+
+import asyncio
+import gzip
+
+from app.compression import CompressionMiddleware, CompressionStats
+
+
+def _run(app, accept_encoding: str = "gzip") -> tuple[dict, list[dict]]:
+    """Calls an ASGI app through the middleware; returns start message and body messages."""
+    sent = []
+    scope = {
+        "type": "http", "method": "GET", "path": "/test",
+        "headers": [(b"accept-encoding", accept_encoding.encode("latin-1"))],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = CompressionMiddleware(app, minimum_size=100, stats=CompressionStats(), max_buffer_size=10_000)
+    asyncio.run(middleware(scope, receive, send))
+    return sent[0], sent[1:]
+
+
+def _chunked_app(content_type: bytes, chunks: list[bytes]):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", content_type)]})
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+
+def test_uncached_json_route_is_compressed(client):
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json()["paths"]
+
+    stats = client.get("/health/compression").json()
+    assert stats["routes"]["/openapi.json"]["compressed"] >= 1
+
+
+def test_chunked_body_is_buffered_and_compressed():
+    chunks = [b'{"items": [' + b'"x",' * 200, b'"y"]}']
+    start, body = _run(_chunked_app(b"application/json", chunks))
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert len(body) == 1 and body[0]["more_body"] is False
+    assert gzip.decompress(body[0]["body"]) == b"".join(chunks)
+
+
+def test_event_stream_passes_through():
+    chunks = [b"data: 1\n\n" * 50, b"data: 2\n\n" * 50]
+    start, body = _run(_chunked_app(b"text/event-stream", chunks))
+    assert b"content-encoding" not in dict(start["headers"])
+    assert [m["body"] for m in body] == chunks
+
+
+def test_oversized_body_passes_through_unchanged():
+    chunks = [b"a" * 6000, b"b" * 6000, b"c" * 10]
+    start, body = _run(_chunked_app(b"application/json", chunks))
+    assert b"content-encoding" not in dict(start["headers"])
+    assert b"".join(m["body"] for m in body) == b"".join(chunks)
+    assert body[-1]["more_body"] is False
+
+
+def test_small_body_is_not_compressed():
+    start, body = _run(_chunked_app(b"application/json", [b'{"a": 1}']))
+    assert b"content-encoding" not in dict(start["headers"])
+    assert body[0]["body"] == b'{"a": 1}'
@@ -0,0 +1,92 @@
+# tests/test_follows.py
+"""Follows and the per-user cached friend leaderboard."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import threading
+
+from app.database import get_db
+from app.services import follows
+from app.services.seasons import week_for
+
+
+def test_follow_invalidates_only_the_followers_friend_board(client, register):
+    anna_id, anna = register("anna")
+    ben_id, ben = register("ben")
+
+    weekly = client.get("/v1/leaderboards/weekly").headers["etag"]
+    board = client.get("/v1/leaderboards/friends", headers=anna)
+    assert board.status_code == 200
+    assert [e["user"]["id"] for e in board.json()["rankings"]] == [anna_id]
+    anna_etag = board.headers["etag"]
+    ben_etag = client.get("/v1/leaderboards/friends", headers=ben).headers["etag"]
+
+    again = client.get("/v1/leaderboards/friends", headers={**anna, "If-None-Match": anna_etag})
+    assert again.status_code == 304
+
+    assert client.post(f"/v1/users/{ben_id}/follow", headers=anna).status_code == 200
+
+    board = client.get("/v1/leaderboards/friends", headers={**anna, "If-None-Match": anna_etag})
+    assert board.status_code == 200
+    assert {e["user"]["id"] for e in board.json()["rankings"]} == {anna_id, ben_id}
+    assert client.get("/v1/leaderboards/friends", headers={**ben, "If-None-Match": ben_etag}).status_code == 304
+    assert client.get("/v1/leaderboards/weekly", headers={"If-None-Match": weekly}).status_code == 304
+
+    assert client.delete(f"/v1/users/{ben_id}/follow", headers=anna).status_code == 200
+    board = client.get("/v1/leaderboards/friends", headers=anna)
+    assert [e["user"]["id"] for e in board.json()["rankings"]] == [anna_id]
+
+
+def test_friend_board_variants_are_cached_separately(client, register):
+    _, anna = register("anna")
+    weekly = client.get("/v1/leaderboards/friends", headers=anna)
+    monthly = client.get("/v1/leaderboards/friends?period=monthly&metric=xp", headers=anna)
+    assert weekly.headers["etag"] != monthly.headers["etag"]
+    assert monthly.json()["metric"] == "xp"
+
+
+def test_friend_board_ranks_ties_by_position(client, register):
+    ben_id, _ = register("ben")
+    anna_id, anna = register("anna")
+    cleo_id, _ = register("cleo")
+    for user_id in (ben_id, cleo_id):
+        assert client.post(f"/v1/users/{user_id}/follow", headers=anna).status_code == 200
+    week = week_for(date.today())
+    with get_db() as conn:
+        conn.executemany(
+            """
+            INSERT INTO leaderboard_scores (kind, period_key, scope, metric, user_id, score)
+            VALUES (?, ?, 'all', 'co2_kg', ?, ?)
+            """,
+            [(week.kind, week.key, user_id, score) for user_id, score in
+             ((anna_id, 5), (ben_id, 5), (cleo_id, 8))]
+        )
+
+    body = client.get("/v1/leaderboards/friends", headers=anna, params={"metric": "co2_kg"}).json()
+    assert [(e["rank"], e["user"]["id"]) for e in body["rankings"]] == [(1, cleo_id), (2, ben_id), (3, anna_id)]
+    assert body["my_rank"] == {"rank": 3, "score": 5, "users_above": 2, "users_below": 0}
+
+
+def test_follow_limit_holds_under_concurrent_follows(client, register, monkeypatch):
+    monkeypatch.setattr(follows, "MAX_FOLLOWING", 3)
+    anna_id, anna = register("anna")
+    targets = [register()[0] for _ in range(8)]
+
+    barrier = threading.Barrier(len(targets))
+
+    def follow_one(followee_id: int):
+        with get_db() as conn:
+            barrier.wait()
+            return follows.follow(conn, anna_id, followee_id)
+
+    with ThreadPoolExecutor(len(targets)) as pool:
+        results = list(pool.map(follow_one, targets))
+    assert sorted(results, key=bool) == [None] * 5 + [True] * 3
+    with get_db() as conn:
+        assert follows.following_count(conn, anna_id) == 3
+
+    followed = targets[results.index(True)]
+    assert client.post(f"/v1/users/{followed}/follow", headers=anna).status_code == 200
+    response = client.post(f"/v1/users/{targets[results.index(None)]}/follow", headers=anna)
+    assert response.status_code == 409
+    assert response.json()["detail"]["error"]["code"] == "FOLLOW_LIMIT"
@@ -0,0 +1,99 @@
+# tests/test_google_jwks.py
+"""Google ID token verifier (app/auth/google_jwks.py): key cache and verification."""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import urllib.error
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+import jwt
+import pytest
+
+from app.auth import google_jwks
+from app.auth.google_jwks import GoogleTokenError, GoogleTokenVerifier, KeySet, StaticKeySource
+
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+JWKS = {"keys": [{**jwt.algorithms.RSAAlgorithm.to_jwk(PRIVATE_KEY.public_key(), as_dict=True), "kid": "k1"}]}
+AUDIENCE = "client-id"
+
+
+class CountingSource:
+    """Returns JWKS after a short delay, or raises once `fail` is set."""
+
+    def __init__(self):
+        self.fetches = 0
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def fetch(self) -> KeySet:
+        with self._lock:
+            self.fetches += 1
+        time.sleep(0.05)
+        if self.fail:
+            raise urllib.error.URLError("network down")
+        return KeySet(JWKS, max_age=3600)
+
+
+def test_cold_start_fetches_once():
+    source = CountingSource()
+    verifier = GoogleTokenVerifier(source=source)
+    with ThreadPoolExecutor(8) as pool:
+        keys = list(pool.map(lambda _: verifier.get_key("k1"), range(8)))
+    assert source.fetches == 1
+    assert all(key is keys[0] for key in keys)
+
+
+def test_unknown_kid_refresh_failure_is_token_error(monkeypatch):
+    source = CountingSource()
+    verifier = GoogleTokenVerifier(source=source)
+    verifier.get_key("k1")
+
+    monkeypatch.setattr(google_jwks, "MIN_FORCED_REFRESH", 0)
+    source.fail = True
+    with pytest.raises(GoogleTokenError):
+        verifier.get_key("rotated")
+    # Known keys keep working
+    assert verifier.get_key("k1") is not None
+
+
+def test_cold_start_failure_is_token_error():
+    source = CountingSource()
+    source.fail = True
+    with pytest.raises(GoogleTokenError):
+        GoogleTokenVerifier(source=source).get_key("k1")
+
+
+def _id_token(key=PRIVATE_KEY, kid: str = "k1", **claims) -> str:
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": AUDIENCE,
+        "sub": "1234567890",
+        "email": "user@example.org",
+        "email_verified": True,
+        "iat": now,
+        "exp": now + 3600,
+        **claims,
+    }
+    return jwt.encode(payload, key, algorithm="RS256", headers={"kid": kid})
+
+
+def test_verify_checks_signature_and_claims():
+    verifier = GoogleTokenVerifier(audience=AUDIENCE, source=StaticKeySource(JWKS))
+    assert verifier.verify(_id_token())["sub"] == "1234567890"
+
+    other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    rejected = [
+        _id_token(key=other_key),
+        _id_token(aud="someone-else"),
+        _id_token(iss="https://evil.example.org"),
+        _id_token(exp=int(time.time()) - 3600),
+        _id_token(kid="unknown"),
+        _id_token()[:-4] + "AAAA",
+        jwt.encode({"sub": "1", "aud": AUDIENCE}, "s" * 32, algorithm="HS256", headers={"kid": "k1"}),
+        "not-a-token",
+    ]
+    for token in rejected:
+        with pytest.raises(GoogleTokenError):
+            verifier.verify(token)
@@ -0,0 +1,130 @@
+# tests/test_leaderboards.py
+"""Around-me windows and my_rank against a full ranking, ties, and frozen period snapshots."""
+
+from datetime import date, datetime, timedelta
+
+from app.database import get_db
+from app.services.leaderboard_scores import METRICS, find_snapshot, rebuild_leaderboard_scores, snapshot_period
+from app.services.seasons import week_for
+from close_leaderboard_periods import close_periods
+
+
+def _set_scores(scores: dict[int, float], metric: str) -> None:
+    week = week_for(date.today())
+    with get_db() as conn:
+        conn.execute("DELETE FROM leaderboard_scores WHERE metric = ?", (metric,))
+        conn.executemany(
+            """
+            INSERT INTO leaderboard_scores (kind, period_key, scope, metric, user_id, score)
+            VALUES (?, ?, 'all', ?, ?, ?)
+            """,
+            [(week.kind, week.key, metric, user_id, score) for user_id, score in scores.items()]
+        )
+
+
+def test_around_me_matches_full_ranking(client, register):
+    users = [register() for _ in range(9)]
+    # Ties, a user without score and one with score 0
+    values = [30, 50, 50, 10, 50, 20, 30, None, 0]
+    radius = 2
+
+    for metric in METRICS:
+        _set_scores({user_id: v for (user_id, _), v in zip(users, values) if v is not None}, metric)
+        ranking = sorted(
+            ((v, user_id) for (user_id, _), v in zip(users, values) if v),
+            key=lambda e: (-e[0], e[1])
+        )
+        positions = {user_id: rank for rank, (_, user_id) in enumerate(ranking, start=1)}
+
+        for user_id, headers in users:
+            response = client.get(
+                "/v1/leaderboards/weekly/around-me", headers=headers,
+                params={"metric": metric, "radius": radius}
+            )
+            assert response.status_code == 200, response.text
+            window = [(e["rank"], e["user"]["id"]) for e in response.json()["rankings"]]
+
+            if user_id in positions:
+                me = positions[user_id]
+                expected = [(rank, uid) for uid, rank in positions.items() if abs(rank - me) <= radius]
+            else:
+                # Unranked: the bottom of the ranking leads up to you
+                expected = [(rank, uid) for uid, rank in positions.items() if rank > len(ranking) - radius]
+            assert window == sorted(expected), (metric, user_id)
+
+            my_rank = response.json()["my_rank"]
+            rank = positions.get(user_id, len(ranking) + 1)
+            assert (my_rank["rank"], my_rank["users_above"], my_rank["users_below"]) == (
+                rank, rank - 1, max(0, len(ranking) - rank)
+            ), (metric, user_id)
+
+
+def test_tied_users_get_consecutive_ranks_everywhere(client, register):
+    users = [register() for _ in range(3)]
+    _set_scores({user_id: 40 for user_id, _ in users}, "xp")
+
+    top = client.get("/v1/leaderboards/weekly", headers=users[1][1], params={"metric": "xp"}).json()
+    assert [(e["rank"], e["user"]["id"]) for e in top["rankings"]] == [
+        (i, user_id) for i, (user_id, _) in enumerate(users, 1)
+    ]
+    assert top["my_rank"]["rank"] == 2
+
+    for rank, (user_id, headers) in enumerate(users, 1):
+        body = client.get("/v1/leaderboards/weekly/around-me", headers=headers,
+                          params={"metric": "xp", "radius": 1}).json()
+        mine = next(e["rank"] for e in body["rankings"] if e["user"]["id"] == user_id)
+        assert mine == body["my_rank"]["rank"] == rank
+
+
+def test_past_week_is_served_from_snapshot(client, register):
+    user_id, headers = register()
+    assert client.post("/v1/challenges/ON-1/join", headers=headers).status_code == 200
+    response = client.post("/v1/challenges/ON-1/log", headers=headers, json={"log_date": date.today().isoformat()})
+    assert response.status_code == 200, response.text
+
+    # Move the completion two weeks back
+    completed = datetime.utcnow() - timedelta(days=14)
+    past_week = week_for(completed.date())
+    with get_db() as conn:
+        conn.execute("UPDATE user_challenges SET completed_at = ?", (completed.isoformat(),))
+        conn.execute("DELETE FROM leaderboard_scores")
+        rebuild_leaderboard_scores(conn)
+
+    assert client.get(f"/v1/leaderboards/weekly/{past_week.key}").status_code == 404
+    closed = close_periods(date.today())
+    assert past_week in closed
+    assert close_periods(date.today()) == []  # already frozen
+
+    with get_db() as conn:
+        snapshot = find_snapshot(conn, past_week, "xp")
+        # Later changes to the live scores do not reach the snapshot
+        conn.execute("DELETE FROM leaderboard_scores")
+    assert snapshot["participants"] == 1
+
+    body = client.get(f"/v1/leaderboards/weekly/{past_week.key}", params={"metric": "xp"}).json()
+    assert [(e["rank"], e["user"]["id"], e["score"]) for e in body["rankings"]] == [
+        (1, user_id, snapshot["total_score"])
+    ]
+
+
+def test_snapshot_ranks_ties_by_position(client, register):
+    users = [register() for _ in range(3)]
+    past_week = week_for(date.today() - timedelta(days=14))
+    with get_db() as conn:
+        conn.executemany(
+            """
+            INSERT INTO leaderboard_scores (kind, period_key, scope, metric, user_id, score)
+            VALUES (?, ?, 'all', 'xp', ?, ?)
+            """,
+            [(past_week.kind, past_week.key, user_id, score)
+             for (user_id, _), score in zip(users, (20, 50, 50))]
+        )
+        assert snapshot_period(conn, past_week, "xp") is not None
+        assert snapshot_period(conn, past_week, "xp") is None  # frozen once
+
+    body = client.get(f"/v1/leaderboards/weekly/{past_week.key}", headers=users[2][1],
+                      params={"metric": "xp"}).json()
+    assert [(e["rank"], e["user"]["id"]) for e in body["rankings"]] == [
+        (1, users[1][0]), (2, users[2][0]), (3, users[0][0])
+    ]
+    assert body["my_rank"] == {"rank": 2, "score": 50, "users_above": 1, "users_below": 1}
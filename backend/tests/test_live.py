@@ -0,0 +1,140 @@
+# tests/test_live.py
+"""Live leaderboards (app/live.py): diffing, fan-out, slow subscribers and cleanup."""
+
+from datetime import date
+import asyncio
+import json
+import sqlite3
+
+from app import cache, database, live
+from app.cache import RESOURCE_LEADERBOARDS, get_content_version
+from app.live import LiveBoard, LiveLeaderboards, diff_rankings
+from app.models import LeaderboardSnapshot
+from app.models.leaderboard import LeaderboardEntry, LeaderboardPeriod
+from app.models.user import UserBriefResponse
+
+
+def _snapshot(scores: dict[int, float], version: int = 1, start: date = date(2024, 3, 4)) -> LeaderboardSnapshot:
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return LeaderboardSnapshot(
+        period=LeaderboardPeriod(start=start, end=date.fromordinal(start.toordinal() + 6)),
+        rankings=[
+            LeaderboardEntry(rank=i, user=UserBriefResponse(id=user_id, username=f"user{user_id}"), score=score)
+            for i, (user_id, score) in enumerate(ranked, 1)
+        ],
+        version=version,
+    )
+
+
+def _event(raw: bytes) -> tuple[str, dict]:
+    lines = dict(line.split(": ", 1) for line in raw.decode("utf-8").strip().split("\n"))
+    return lines["event"], json.loads(lines["data"])
+
+
+def test_diff_reports_moves_new_entries_and_removals():
+    previous = _snapshot({1: 50, 2: 40, 3: 30, 4: 10})
+    current = _snapshot({1: 50, 2: 60, 5: 35, 4: 10}, version=2)
+
+    delta = diff_rankings(previous, current)
+    assert delta.version == 2
+    assert [(c.user.id, c.rank, c.score, c.previous_rank) for c in delta.changes] == [
+        (2, 1, 60, 2), (1, 2, 50, 1), (5, 3, 35, None)
+    ]
+    assert delta.removed == [3]
+
+
+def test_refresh_sends_one_event_to_every_subscriber():
+    states = iter([
+        _snapshot({1: 10}),
+        _snapshot({1: 10}),
+        _snapshot({1: 10, 2: 20}, version=2),
+        _snapshot({1: 10}, version=3, start=date(2024, 3, 11)),
+    ])
+    board = LiveBoard(lambda: next(states))
+
+    async def main():
+        queues = [asyncio.Queue(8) for _ in range(3)]
+        board.subscribers.update(queues)
+        for _ in range(4):
+            await board.refresh()
+        return [[q.get_nowait() for _ in range(q.qsize())] for q in queues]
+
+    received = asyncio.run(main())
+    # Nothing for the first state or an unchanged one, one delta, then a
+    # snapshot for the new period; all subscribers get the same bytes
+    assert all(events == received[0] for events in received)
+    assert received[0][0] is received[1][0]
+    assert [_event(e)[0] for e in received[0]] == ["delta", "snapshot"]
+    assert _event(received[0][0])[1]["changes"][0]["user"]["id"] == 2
+    assert _event(received[0][1])[1]["period"]["start"] == "2024-03-11"
+
+
+def test_slow_subscriber_is_dropped_and_its_stream_ends():
+    states = iter([_snapshot({1: 10}), _snapshot({1: 20}, version=2)])
+    board = LiveBoard(lambda: next(states))
+
+    async def main():
+        slow, fast = asyncio.Queue(1), asyncio.Queue(1)
+        board.subscribers.update({slow, fast})
+        await board.refresh()
+        slow.put_nowait(b"unread")
+        await board.refresh()
+        return slow, fast
+
+    slow, fast = asyncio.run(main())
+    assert board.subscribers == {fast}
+    assert (slow.qsize(), slow.get_nowait()) == (1, None)
+    assert _event(fast.get_nowait())[0] == "delta"
+
+
+def _bump_from_other_worker() -> None:
+    """Bump the leaderboards version without this worker's after-commit hook."""
+    conn = sqlite3.connect(database.DB_PATH)
+    with conn:
+        conn.execute("UPDATE content_versions SET version = version + 1 WHERE resource = ?",
+                     (RESOURCE_LEADERBOARDS,))
+    conn.close()
+
+
+def test_hub_recomputes_once_per_version_and_cleans_up(db, monkeypatch):
+    monkeypatch.setattr(live, "POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(live, "COALESCE_INTERVAL", 0.0)
+    monkeypatch.setattr(cache, "VERSION_CACHE_TTL", 3600.0)
+    with database.get_db() as conn:
+        cache.bump_content_version(conn, RESOURCE_LEADERBOARDS)
+    assert get_content_version(RESOURCE_LEADERBOARDS) == 1
+    _bump_from_other_worker()  # this worker's copy now lags behind
+
+    computed = []
+
+    def compute() -> LeaderboardSnapshot:
+        with database.get_db() as conn:
+            version = cache.read_content_version(conn, RESOURCE_LEADERBOARDS)
+        computed.append(version)
+        return _snapshot({1: 10 * version}, version=version)
+
+    hub = LiveLeaderboards()
+
+    async def main():
+        first, second = hub.stream(("week", "xp"), compute), hub.stream(("week", "xp"), compute)
+        snapshots = [await anext(first), await anext(second)]
+        assert hub.subscriber_count() == 2
+
+        # Several polls pass without a change: nothing is recomputed
+        await asyncio.sleep(0.1)
+        assert computed == [2]
+
+        _bump_from_other_worker()
+        deltas = [await asyncio.wait_for(anext(s), 2) for s in (first, second)]
+        await first.aclose()
+        assert hub.subscriber_count() == 1
+        await second.aclose()
+        await asyncio.wait_for(hub._task, 1)
+        return snapshots, deltas
+
+    snapshots, deltas = asyncio.run(main())
+    assert snapshots[0] is snapshots[1]
+    assert _event(snapshots[0]) == ("snapshot", _event(snapshots[1])[1])
+    assert [_event(d)[1]["version"] for d in deltas] == [3, 3]
+    assert computed == [2, 3]
+    assert hub.subscriber_count() == 0 and not hub._boards
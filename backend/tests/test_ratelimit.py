@@ -0,0 +1,54 @@
+# tests/test_ratelimit.py
+"""Token buckets and client identification (app/ratelimit.py)."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.ratelimit import MemoryBucketStore, RateLimit, RateLimitMiddleware, _forwarded_client_ip
+
+
+def _client(monkeypatch, limit: int = 2, trusted_proxies: int = 1) -> TestClient:
+    monkeypatch.setenv("RATE_LIMIT_TRUST_FORWARDED", "1")
+    monkeypatch.setenv("RATE_LIMIT_TRUSTED_PROXIES", str(trusted_proxies))
+    app = FastAPI()
+
+    @app.post("/v1/auth/login")
+    def login():
+        return {"success": True}
+
+    rules = [RateLimit("auth-login", r"/v1/auth/login", ("POST",), limit=limit, per_user=False)]
+    app.add_middleware(RateLimitMiddleware, rules=rules, store=MemoryBucketStore(), enabled=True)
+    return TestClient(app)
+
+
+def test_forwarded_client_ip():
+    assert _forwarded_client_ip("1.1.1.1") == "1.1.1.1"
+    assert _forwarded_client_ip("6.6.6.6, 1.1.1.1") == "1.1.1.1"
+    assert _forwarded_client_ip("6.6.6.6, 1.1.1.1, 10.0.0.2", trusted_proxies=2) == "1.1.1.1"
+    assert _forwarded_client_ip("1.1.1.1", trusted_proxies=2) is None
+
+
+def test_limit_and_headers(monkeypatch):
+    client = _client(monkeypatch)
+    headers = {"X-Forwarded-For": "1.1.1.1"}
+    first = client.post("/v1/auth/login", headers=headers)
+    assert first.status_code == 200
+    assert first.headers["x-ratelimit-limit"] == "2"
+    assert client.post("/v1/auth/login", headers=headers).status_code == 200
+
+    rejected = client.post("/v1/auth/login", headers=headers)
+    assert rejected.status_code == 429
+    assert rejected.json()["error"]["code"] == "RATE_LIMITED"
+    assert int(rejected.headers["retry-after"]) >= 1
+
+
+def test_spoofed_forwarded_entries_share_a_bucket(monkeypatch):
+    client = _client(monkeypatch)
+    statuses = [
+        client.post("/v1/auth/login", headers={"X-Forwarded-For": f"10.0.0.{i}, 1.1.1.1"}).status_code
+        for i in range(4)
+    ]
+    assert statuses == [200, 200, 429, 429]
+
+    other = client.post("/v1/auth/login", headers={"X-Forwarded-For": "2.2.2.2"})
+    assert other.status_code == 200
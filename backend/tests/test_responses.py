@@ -0,0 +1,69 @@
+# tests/test_responses.py
+"""FastJSONResponse and dumps render the same bytes as FastAPI's JSONResponse."""
+
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+import pytest
+
+from app import responses
+from app.models.badge import EarnedBadge
+from app.models.leaderboard import LeaderboardEntry, LeaderboardPeriod, LeaderboardResponse, MyRank
+from app.models.user import UserBriefResponse
+from app.responses import FastJSONResponse
+
+
+def _leaderboard() -> LeaderboardResponse:
+    return LeaderboardResponse(
+        period=LeaderboardPeriod(start=date(2024, 3, 4), end=date(2024, 3, 10)),
+        metric="co2_kg",
+        rankings=[
+            LeaderboardEntry(rank=1, user=UserBriefResponse(id=1, username="jürgen", display_name="Jürgen Größ"),
+                             score=50.0),
+            LeaderboardEntry(rank=2, user=UserBriefResponse(id=2, username="anna", avatar_emoji="🚲"),
+                             score=12.75),
+        ],
+        my_rank=MyRank(rank=2, score=12.75, users_above=1, users_below=0),
+    )
+
+
+def _badges() -> list[EarnedBadge]:
+    return [
+        EarnedBadge(id="first-ride", name="Erste Fahrt", icon="🚲", description=None,
+                    earned_at=datetime(2024, 3, 4, 7, 30, 15, 123456), challenge_id="MO-2"),
+        EarnedBadge(id="grüner-daumen", name="Grüner Daumen", icon="🌱", tier="gold",
+                    description="Drei Challenges in Folge abgeschlossen",
+                    earned_at=datetime(2024, 3, 4, 7, 30, tzinfo=timezone.utc)),
+        EarnedBadge(id="öko-quiz", name="Öko-Quiz", icon="🧠", requirement="Quiz lösen",
+                    earned_at=datetime(2024, 3, 4, tzinfo=timezone(timedelta(hours=1)))),
+    ]
+
+
+def _standard(content) -> bytes:
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+@pytest.mark.parametrize("model", [_leaderboard(), *_badges()])
+def test_models_render_like_json_response(model):
+    assert FastJSONResponse(model).body == _standard(model)
+
+
+@pytest.mark.parametrize("with_orjson", [True, False])
+def test_plain_content_renders_like_json_response(monkeypatch, with_orjson):
+    if not with_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+    content = {
+        "success": True,
+        "message": "Glückwunsch! Challenge „Öko-Quiz“ abgeschlossen 🌱",
+        "display_name": None,
+        "logged_at": datetime(2024, 3, 4, 21, 15, 0, 500),
+        "synced_at": datetime(2024, 3, 4, 21, 15, tzinfo=timezone.utc),
+        "log_date": date(2024, 3, 4),
+        "xp": 100,
+        "co2_kg": 2.5,
+        "badges": _badges(),
+        "my_rank": MyRank(rank=1, score=0.0, users_above=0, users_below=3),
+    }
+    assert FastJSONResponse(content).body == _standard(content)
+    assert responses.dumps(content) == _standard(content)
@@ -0,0 +1,174 @@
+# tests/test_singleflight.py
+"""Request coalescing (app/singleflight.py) and the cache's stale-while-revalidate path."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app import cache
+from app.cache import CachePolicy, ResponseCacheMiddleware, ResponseStore
+from app.singleflight import SingleFlight
+
+
+async def _until(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.001)
+
+
+def _waiters(flights: SingleFlight, key) -> int:
+    call = flights._calls.get(key)
+    return len(call.waiters) if call is not None else 0
+
+
+def test_leader_error_reaches_sync_followers():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+    error = ValueError("boom")
+
+    def compute():
+        calls.append(1)
+        release.wait(2)
+        raise error
+
+    results = []
+
+    def run():
+        try:
+            flights.do("key", compute)
+        except ValueError as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 2
+    while not calls and time.monotonic() < deadline:
+        time.sleep(0.001)
+    time.sleep(0.05)  # let the followers reach the wait
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert calls == [1]
+    assert results == [error] * 4
+    assert not flights.in_flight("key")
+
+
+def test_leader_error_reaches_async_followers():
+    flights = SingleFlight()
+    release = asyncio.Event()
+    error = ValueError("boom")
+
+    async def compute():
+        await release.wait()
+        raise error
+
+    async def main():
+        leader = asyncio.create_task(flights.do_async("key", compute))
+        await _until(lambda: flights.in_flight("key"))
+        followers = [asyncio.create_task(flights.do_async("key", compute)) for _ in range(3)]
+        await _until(lambda: _waiters(flights, "key") == 3)
+        release.set()
+        return await asyncio.gather(leader, *followers, return_exceptions=True)
+
+    assert asyncio.run(main()) == [error] * 4
+    assert not flights.in_flight("key")
+
+
+def test_cancelled_leader_hands_over_to_a_follower():
+    flights = SingleFlight()
+    started = []
+
+    async def compute():
+        started.append(1)
+        # The first leader is cancelled while it waits
+        await asyncio.sleep(10 if len(started) == 1 else 0.01)
+        return "fresh"
+
+    async def main():
+        leader = asyncio.create_task(flights.do_async("key", compute))
+        await _until(lambda: flights.in_flight("key"))
+        followers = [asyncio.create_task(flights.do_async("key", compute)) for _ in range(3)]
+        await _until(lambda: _waiters(flights, "key") == 3)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    results = asyncio.run(main())
+    assert len(started) == 2
+    assert sorted(results) == [("fresh", False), ("fresh", True), ("fresh", True)]
+    assert not flights.in_flight("key")
+
+
+def _board_app(monkeypatch, stale_while_revalidate: int):
+    """Cached test endpoint whose render of version 2 blocks until `release` is set."""
+    version = {"value": 1}
+    monkeypatch.setattr(cache, "get_content_version", lambda resource: version["value"])
+    release = asyncio.Event()
+    renders = []
+
+    async def endpoint(request):
+        renders.append(version["value"])
+        if version["value"] == 2:
+            await release.wait()
+        return PlainTextResponse(f"v{version['value']}")
+
+    app = Starlette(routes=[Route("/board", endpoint)])
+    policy = CachePolicy(r"/board", cache.RESOURCE_LEADERBOARDS, max_age=30,
+                         stale_while_revalidate=stale_while_revalidate)
+    app.add_middleware(ResponseCacheMiddleware, policies=[policy], store=ResponseStore())
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    return client, version, release, renders
+
+
+def test_stale_body_is_served_while_the_new_version_renders(monkeypatch):
+    client, version, release, renders = _board_app(monkeypatch, stale_while_revalidate=120)
+
+    async def main():
+        async with client:
+            first = await client.get("/board")
+            version["value"] = 2
+            renderer = asyncio.create_task(client.get("/board"))
+            await _until(lambda: len(renders) == 2)
+
+            # The v2 render is in flight: the v1 body is served without waiting
+            stale = await client.get("/board")
+            release.set()
+            fresh = await renderer
+            after = await client.get("/board")
+        return first, stale, fresh, after
+
+    first, stale, fresh, after = asyncio.run(main())
+    assert (first.text, stale.text, fresh.text, after.text) == ("v1", "v1", "v2", "v2")
+    assert stale.headers["etag"] == first.headers["etag"] != fresh.headers["etag"]
+    assert renders == [1, 2]
+
+
+def test_stale_body_too_old_waits_for_the_flight(monkeypatch):
+    client, version, release, renders = _board_app(monkeypatch, stale_while_revalidate=0)
+
+    async def main():
+        async with client:
+            await client.get("/board")
+            version["value"] = 2
+            renderer = asyncio.create_task(client.get("/board"))
+            await _until(lambda: len(renders) == 2)
+            follower = asyncio.create_task(client.get("/board"))
+            await asyncio.sleep(0.05)
+            assert not follower.done()
+            release.set()
+            return await renderer, await follower
+
+    fresh, follower = asyncio.run(main())
+    assert (fresh.text, follower.text) == ("v2", "v2")
+    assert renders == [1, 2]
@@ -0,0 +1,96 @@
+# tests/test_teams.py
+"""Team totals maintained on write stay the sum of the members' contributions."""
+
+from datetime import date, datetime, timedelta
+
+from app.database import get_db
+
+
+def _complete(client, headers, challenge_id: str, days: int) -> None:
+    assert client.post(f"/v1/challenges/{challenge_id}/join", headers=headers).status_code == 200
+    start = date.today() - timedelta(days=days)
+    with get_db() as conn:
+        conn.execute(
+            "UPDATE user_challenges SET started_at = ? WHERE challenge_id = ? AND status = 'active'",
+            (datetime.combine(start, datetime.min.time()).isoformat(), challenge_id)
+        )
+    for i in range(days):
+        response = client.post(f"/v1/challenges/{challenge_id}/log", headers=headers,
+                               json={"log_date": (start + timedelta(days=i)).isoformat()})
+        assert response.status_code == 200, response.text
+    assert response.json()["xp_earned"] > 0
+
+
+def _team(team_id: int) -> dict:
+    """Stored totals next to the same totals summed over the members."""
+    with get_db() as conn:
+        return conn.execute(
+            """
+            SELECT t.total_xp, t.total_co2_saved, t.member_count,
+                   COALESCE(SUM(m.xp_contributed), 0) AS sum_xp,
+                   ROUND(COALESCE(SUM(m.co2_contributed), 0), 2) AS sum_co2,
+                   COUNT(m.id) AS members
+            FROM teams t
+            LEFT JOIN team_members m ON m.team_id = t.id
+            WHERE t.id = ?
+            GROUP BY t.id
+            """,
+            (team_id,)
+        ).fetchone()
+
+
+def _assert_in_step(team_id: int, xp: int, co2: float, members: int) -> None:
+    team = _team(team_id)
+    assert (team["total_xp"], team["total_co2_saved"], team["member_count"]) == (xp, co2, members)
+    assert (team["sum_xp"], team["sum_co2"], team["members"]) == (xp, co2, members)
+
+
+def test_team_totals_follow_join_complete_and_leave(client, register):
+    _, captain = register()
+    member_id, member = register()
+    _, guest = register()
+
+    assert client.post("/v1/teams", headers=captain, json={"name": "Radler"}).status_code == 200
+    with get_db() as conn:
+        team_id = conn.execute("SELECT id FROM teams WHERE name = 'Radler'").fetchone()["id"]
+    _assert_in_step(team_id, 0, 0, 1)
+
+    _complete(client, captain, "MO-2", 7)  # 250 XP, 2600 kg
+    _assert_in_step(team_id, 250, 2600, 1)
+
+    # Earned before joining: not the team's
+    _complete(client, member, "ON-3", 3)
+    assert client.post(f"/v1/teams/{team_id}/join", headers=member).status_code == 200
+    _assert_in_step(team_id, 250, 2600, 2)
+    _complete(client, member, "EN-1", 14)  # 150 XP, 100 kg
+    _assert_in_step(team_id, 400, 2700, 2)
+
+    assert client.post(f"/v1/teams/{team_id}/join", headers=guest).status_code == 200
+    _complete(client, guest, "ON-3", 3)  # 100 XP, 0 kg
+    _assert_in_step(team_id, 500, 2700, 3)
+    assert client.post(f"/v1/teams/{team_id}/leave", headers=guest).status_code == 200
+    _assert_in_step(team_id, 400, 2700, 2)
+
+    # The captain leaves: contributions go, the member takes over
+    assert client.post(f"/v1/teams/{team_id}/leave", headers=captain).status_code == 200
+    _assert_in_step(team_id, 150, 100, 1)
+    with get_db() as conn:
+        roles = conn.execute("SELECT user_id, role FROM team_members").fetchall()
+    assert roles == [{"user_id": member_id, "role": "captain"}]
+
+    # The last member dissolves the team
+    assert client.post(f"/v1/teams/{team_id}/leave", headers=member).status_code == 200
+    assert _team(team_id) is None
+
+
+def test_own_team_is_ranked_by_position(client, register):
+    captains = [register()[1] for _ in range(3)]
+    for i, headers in enumerate(captains):
+        assert client.post("/v1/teams", headers=headers, json={"name": f"Team {i}"}).status_code == 200
+    with get_db() as conn:
+        ids = [r["id"] for r in conn.execute("SELECT id FROM teams ORDER BY id").fetchall()]
+        conn.executemany("UPDATE teams SET total_xp = ? WHERE id = ?", [(40, ids[0]), (40, ids[1]), (90, ids[2])])
+
+    body = client.get("/v1/leaderboards/teams", headers=captains[1], params={"metric": "xp"}).json()
+    assert [(e["rank"], e["team"]["id"]) for e in body["rankings"]] == [(1, ids[2]), (2, ids[0]), (3, ids[1])]
+    assert body["my_team"] == {"rank": 3, "score": 40, "users_above": 2, "users_below": 0}
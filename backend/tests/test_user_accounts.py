@@ -0,0 +1,71 @@
+# tests/test_user_accounts.py
+"""Google login resolution (app/services/user_accounts.py)."""
+
+from app.database import get_db
+from app.services.user_accounts import upsert_google_user
+
+
+def _google_info(email: str, verified: bool, google_id: str = "g-123") -> dict:
+    return {
+        "google_id": google_id,
+        "email": email,
+        "name": "Anna",
+        "picture": "",
+        "email_verified": verified,
+    }
+
+
+def test_new_google_user(db):
+    with get_db() as conn:
+        user, is_new = upsert_google_user(conn, _google_info("new@example.org", True))
+    assert is_new
+    assert user["auth_provider"] == "google"
+    assert "." in user["username"] and user["referral_code"]
+
+
+def test_unverified_email_does_not_link_existing_account(register):
+    user_id, _ = register("anna")
+    with get_db() as conn:
+        user, is_new = upsert_google_user(conn, _google_info("anna@example.org", False))
+        row = conn.execute("SELECT google_id, auth_provider FROM users WHERE id = ?", (user_id,)).fetchone()
+    assert user is None and not is_new
+    assert row == {"google_id": None, "auth_provider": "local"}
+
+
+def test_verified_email_links_existing_account(register):
+    user_id, _ = register("anna")
+    with get_db() as conn:
+        user, is_new = upsert_google_user(conn, _google_info("anna@example.org", True))
+    assert not is_new
+    assert user["id"] == user_id
+    assert user["google_id"] == "g-123"
+    assert user["auth_provider"] == "google"
+
+    # Later logins resolve through google_id, whatever the claim says
+    with get_db() as conn:
+        again, _ = upsert_google_user(conn, _google_info("anna@example.org", False))
+    assert again["id"] == user_id
+
+
+def test_account_linked_to_another_google_id_is_not_taken_over(register):
+    user_id, _ = register("anna")
+    with get_db() as conn:
+        upsert_google_user(conn, _google_info("anna@example.org", True))
+        user, is_new = upsert_google_user(conn, _google_info("anna@example.org", True, google_id="g-456"))
+        row = conn.execute("SELECT google_id FROM users WHERE id = ?", (user_id,)).fetchone()
+    assert user is None and not is_new
+    assert row == {"google_id": "g-123"}
+
+
+def test_google_login_reports_why_linking_was_refused(client, register, monkeypatch):
+    from app.routers import auth
+    register("anna")
+    with get_db() as conn:
+        upsert_google_user(conn, _google_info("anna@example.org", True))
+
+    for verified, code in ((False, "EMAIL_NOT_VERIFIED"), (True, "GOOGLE_ACCOUNT_MISMATCH")):
+        info = _google_info("anna@example.org", verified, google_id="g-456")
+        monkeypatch.setattr(auth, "verify_google_id_token", lambda credential, info=info: info)
+        response = client.post("/v1/auth/google", json={"credential": "token"})
+        assert response.status_code == 403
+        assert response.json()["detail"]["error"]["code"] == code
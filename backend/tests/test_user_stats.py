@@ -0,0 +1,76 @@
+# tests/test_user_stats.py
+"""Stat counters maintained on write, and the drift check and repair."""
+
+from datetime import date, datetime, timedelta
+
+from app.database import get_db
+from app.services.user_stats import STAT_COLUMNS, find_drift, repair_drift, user_id_range
+from verify_user_stats import verify
+
+
+def _complete(client, headers, challenge_id: str = "ON-3", days: int = 3) -> None:
+    assert client.post(f"/v1/challenges/{challenge_id}/join", headers=headers).status_code == 200
+    start = date.today() - timedelta(days=days)
+    with get_db() as conn:
+        conn.execute(
+            "UPDATE user_challenges SET started_at = ? WHERE challenge_id = ? AND status = 'active'",
+            (datetime.combine(start, datetime.min.time()).isoformat(), challenge_id)
+        )
+    for i in range(days):
+        response = client.post(f"/v1/challenges/{challenge_id}/log", headers=headers,
+                               json={"log_date": (start + timedelta(days=i)).isoformat()})
+        assert response.status_code == 200, response.text
+    assert response.json()["xp_earned"] > 0
+
+
+def _stats() -> dict[int, dict]:
+    with get_db() as conn:
+        rows = conn.execute(f"SELECT id, cache_version, {', '.join(STAT_COLUMNS)} FROM users").fetchall()
+    return {row.pop("id"): row for row in rows}
+
+
+def test_repair_rewrites_only_drifted_users(client, register):
+    referrer_id, referrer_headers = register()
+    with get_db() as conn:
+        code = conn.execute("SELECT referral_code FROM users WHERE id = ?", (referrer_id,)).fetchone()["referral_code"]
+    drifted_id, drifted_headers = register(referral_code=code)
+    _complete(client, referrer_headers)
+    _complete(client, drifted_headers, "MO-2", days=7)
+    register()
+
+    # Counters maintained on write agree with a full recompute
+    with get_db() as conn:
+        first, last = user_id_range(conn)
+        assert find_drift(conn, first, last) == []
+    before = _stats()
+    assert before[referrer_id]["referrals_count"] == 1
+    assert before[drifted_id]["challenges_completed"] == 1
+
+    with get_db() as conn:
+        conn.execute(
+            """
+            UPDATE users SET challenges_completed = 7, badges_earned = 3, referrals_count = 2,
+                             total_co2_saved_kg = 0
+            WHERE id = ?
+            """,
+            (drifted_id,)
+        )
+        drift = find_drift(conn, first, last)
+    assert [row["user_id"] for row in drift] == [drifted_id]
+    assert {c: drift[0][f"actual_{c}"] for c in STAT_COLUMNS} == {
+        c: before[drifted_id][c] for c in STAT_COLUMNS
+    }
+
+    # The nightly job, in blocks smaller than the user table
+    assert verify(batch_size=2)["drifted"] == 1
+    result = verify(repair=True, batch_size=2)
+    assert (result["repaired"], result["examples"]) == (1, [drifted_id])
+    with get_db() as conn:
+        assert repair_drift(conn, first, last) == []
+        assert find_drift(conn, first, last) == []
+    after = _stats()
+    assert {c: after[drifted_id][c] for c in STAT_COLUMNS} == {c: before[drifted_id][c] for c in STAT_COLUMNS}
+    assert after[drifted_id]["cache_version"] == before[drifted_id]["cache_version"] + 1
+    assert {uid: row for uid, row in after.items() if uid != drifted_id} == {
+        uid: row for uid, row in before.items() if uid != drifted_id
+    }
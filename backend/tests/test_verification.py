@@ -0,0 +1,138 @@
+# tests/test_verification.py
+"""Spot checks: claims and leases, accept, and rejection reverting a completion."""
+
+from datetime import date, datetime, timedelta
+
+from app.database import get_db
+from app.services.verification import LEASE_SECONDS, claim_spot_checks, decide_spot_checks
+
+
+def _complete_spot_checked(client, headers, challenge_id: str = "ON-3") -> int:
+    """Completes a challenge that is always drawn for a spot check."""
+    with get_db() as conn:
+        conn.execute("UPDATE challenges SET spot_check_rate = 1.0 WHERE id = ?", (challenge_id,))
+    assert client.post(f"/v1/challenges/{challenge_id}/join", headers=headers).status_code == 200
+    start = date.today() - timedelta(days=3)
+    with get_db() as conn:
+        conn.execute(
+            "UPDATE user_challenges SET started_at = ? WHERE challenge_id = ? AND status = 'active'",
+            (datetime.combine(start, datetime.min.time()).isoformat(), challenge_id)
+        )
+    response = client.post("/v1/challenges/logs:batch", headers=headers, json={"entries": [
+        {"challenge_id": challenge_id, "log_date": (start + timedelta(days=i)).isoformat()}
+        for i in range(3)
+    ]})
+    assert response.json()["challenges"][0]["completed"] is True
+    with get_db() as conn:
+        return conn.execute(
+            "SELECT id FROM user_challenges WHERE challenge_id = ? AND verification_status = 'spot_check'",
+            (challenge_id,)
+        ).fetchone()["id"]
+
+
+def _reviewer(register) -> tuple[int, dict]:
+    reviewer_id, headers = register("reviewer")
+    with get_db() as conn:
+        conn.execute("UPDATE users SET trust_level = 3, trust_level_pinned = 1 WHERE id = ?", (reviewer_id,))
+    return reviewer_id, headers
+
+
+def _reject(client, headers, uc_id: int) -> dict:
+    claimed = client.post("/v1/verification/claims", headers=headers, json={"limit": 10})
+    assert [i["user_challenge_id"] for i in claimed.json()["items"]] == [uc_id]
+    response = client.post("/v1/verification/decisions", headers=headers, json={
+        "decisions": [{"user_challenge_id": uc_id, "outcome": "reject"}]
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_reject_reverts_region_of_completion(client, register):
+    user_id, headers = register("mover", postal_code="80331")
+    uc_id = _complete_spot_checked(client, headers)
+    _, reviewer_headers = _reviewer(register)
+
+    # Moving after the completion must not shift the reversal to Berlin
+    with get_db() as conn:
+        conn.execute("UPDATE users SET region_id = 'BE' WHERE id = ?", (user_id,))
+    assert _reject(client, reviewer_headers, uc_id)["rejected"] == 1
+
+    with get_db() as conn:
+        regions = conn.execute("SELECT region_id, completions FROM region_scores ORDER BY region_id").fetchall()
+        region_users = conn.execute("SELECT COUNT(*) AS n FROM region_user_scores").fetchone()["n"]
+        regional = conn.execute(
+            "SELECT scope, score FROM leaderboard_scores WHERE scope != 'all' AND metric = 'challenges'"
+        ).fetchall()
+    assert regions == [{"region_id": "BY", "completions": 0}]
+    assert region_users == 0
+    assert regional == [{"scope": "BY", "score": 0}]
+
+
+def test_claim_lease_and_expiry(client, register):
+    owner_id, headers = register()
+    uc_id = _complete_spot_checked(client, headers)
+    first_id, _ = register()
+    second_id, _ = register()
+    t = datetime.utcnow() + timedelta(seconds=1)
+
+    with get_db() as conn:
+        assert claim_spot_checks(conn, owner_id, 10, now=t) == []  # never your own
+        assert [i["user_challenge_id"] for i in claim_spot_checks(conn, first_id, 10, now=t)] == [uc_id]
+        assert claim_spot_checks(conn, second_id, 10, now=t + timedelta(seconds=1)) == []
+
+    # An expired lease goes back to the queue, and the old holder can no longer decide
+    expired = t + timedelta(seconds=LEASE_SECONDS + 1)
+    with get_db() as conn:
+        items = claim_spot_checks(conn, second_id, 10, now=expired)
+        assert [i["user_challenge_id"] for i in items] == [uc_id]
+        assert decide_spot_checks(conn, first_id, {uc_id: False}, now=expired) == (set(), [])
+        assert conn.execute("SELECT claims FROM verification_queue").fetchone()["claims"] == 2
+
+    with get_db() as conn:
+        applied, reverted = decide_spot_checks(conn, second_id, {uc_id: True}, now=expired)
+        status = conn.execute(
+            "SELECT status, verification_status, verified_by FROM user_challenges WHERE id = ?", (uc_id,)
+        ).fetchone()
+        queued = conn.execute("SELECT COUNT(*) AS n FROM verification_queue").fetchone()["n"]
+    assert (applied, reverted) == ({uc_id}, [])
+    assert status == {"status": "completed", "verification_status": "verified", "verified_by": second_id}
+    assert queued == 0
+
+
+def test_reject_reverts_completion(client, register):
+    user_id, headers = register()
+    with get_db() as conn:
+        before = conn.execute(
+            "SELECT total_xp, challenges_completed, total_co2_saved_kg FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
+    uc_id = _complete_spot_checked(client, headers)
+    _, reviewer_headers = _reviewer(register)
+
+    body = _reject(client, reviewer_headers, uc_id)
+    assert body["rejected"] == 1
+    assert body["xp_reverted"] == 100
+    assert body["results"] == [{"user_challenge_id": uc_id, "applied": True, "error": None}]
+
+    with get_db() as conn:
+        after = conn.execute(
+            "SELECT total_xp, challenges_completed, total_co2_saved_kg FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
+        status = conn.execute("SELECT status, verification_status FROM user_challenges WHERE id = ?",
+                              (uc_id,)).fetchone()
+        scores = conn.execute(
+            "SELECT DISTINCT score FROM leaderboard_scores WHERE user_id = ?", (user_id,)
+        ).fetchall()
+        correction = conn.execute(
+            "SELECT amount FROM xp_transactions WHERE user_id = ? AND type = 'spot_check'", (user_id,)
+        ).fetchone()
+    assert after == before
+    assert status == {"status": "rejected", "verification_status": "rejected"}
+    assert scores == [{"score": 0}]
+    assert correction == {"amount": -100}
+
+    # Deciding again is not applied twice
+    again = client.post("/v1/verification/decisions", headers=reviewer_headers, json={
+        "decisions": [{"user_challenge_id": uc_id, "outcome": "reject"}]
+    }).json()
+    assert again["results"][0]["error"] == "NOT_CLAIMED"
+    assert again["xp_reverted"] == 0
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PROVOLUTION USER STATS VERIFIER
+Vergleicht die gepflegten Zähler in users (challenges_completed,
+badges_earned, referrals_count, total_co2_saved_kg) mit den Quelltabellen
+und repariert Abweichungen auf Wunsch.
+
+Läuft in Blöcken über die User-ID; jeder Block ist eine kurze Transaktion
+(ein Aggregat pro Quelltabelle, ein UPDATE … FROM), so dass die API
+währenddessen weiter schreiben kann.
+
+Usage:
+    python verify_user_stats.py [--db PATH] [--repair] [--batch-size 50000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Fix für Windows Console Encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+DEFAULT_BATCH_SIZE = 50000
+SHOW_EXAMPLES = 10
+
+
+def verify(repair: bool = False, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """Prüft (und repariert) alle User blockweise. Gibt Zählungen zurück."""
+    from app.database import get_db
+    from app.services.user_stats import find_drift, repair_drift, user_id_range
+
+    with get_db() as conn:
+        first, last = user_id_range(conn)
+
+    result = {"checked_up_to": last, "drifted": 0, "repaired": 0}
+    examples = []
+    for block_start in range(first, last + 1, batch_size):
+        block_end = min(block_start + batch_size - 1, last)
+        with get_db() as conn:
+            if repair:
+                repaired = repair_drift(conn, block_start, block_end)
+                result["drifted"] += len(repaired)
+                result["repaired"] += len(repaired)
+                examples.extend(repaired[:SHOW_EXAMPLES - len(examples)])
+            else:
+                drift = find_drift(conn, block_start, block_end)
+                result["drifted"] += len(drift)
+                examples.extend(drift[:SHOW_EXAMPLES - len(examples)])
+
+    result["examples"] = examples
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prüft und repariert die gepflegten User-Zähler')
+    parser.add_argument('--db', help='Pfad der SQLite-Datei (Standard: DATABASE_PATH bzw. App-Datenbank)')
+    parser.add_argument('--repair', action='store_true', help='Abweichungen korrigieren')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='User-IDs pro Transaktion')
+    args = parser.parse_args()
+
+    if args.db:
+        os.environ["DATABASE_PATH"] = str(Path(args.db))
+
+    print("=" * 50)
+    print("PROVOLUTION USER STATS VERIFIER")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    result = verify(args.repair, args.batch_size)
+    seconds = round(time.perf_counter() - start, 1)
+
+    from app.services.user_stats import STAT_COLUMNS
+    print(f"\n  Geprüft bis User-ID: {result['checked_up_to']}")
+    if args.repair:
+        print(f"  Repariert: {result['repaired']:,}")
+        if result["examples"]:
+            print(f"  z.B. User {', '.join(str(uid) for uid in result['examples'])}")
+    else:
+        print(f"  Abweichungen: {result['drifted']:,}")
+        for row in result["examples"]:
+            changes = [
+                f"{column} {row[column]} → {row['actual_' + column]}"
+                for column in STAT_COLUMNS
+                if row[column] != row['actual_' + column]
+            ]
+            print(f"  User {row['user_id']}: {', '.join(changes)}")
+        if result["drifted"]:
+            print("\n  Mit --repair korrigieren.")
+    print(f"  Dauer: {seconds}s")
+    print("=" * 50)
+
+    return 1 if result["drifted"] and not args.repair else 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -191,6 +191,13 @@ const UserAPI = {
         return apiRequest('/users/me');
     },
 
+    /**
+     * Get profile, active challenges, badges, footprint and ranks in one request
+     */
+    async getDashboard() {
+        return apiRequest('/users/me/dashboard');
+    },
+
     /**
      * Update user profile
      */
@@ -206,6 +213,35 @@ const UserAPI = {
      */
     async getStats(userId) {
         return apiRequest(`/users/${userId}/stats`);
+    },
+
+    /**
+     * Follow / unfollow a user (both are idempotent)
+     */
+    async follow(userId) {
+        return apiRequest(`/users/${userId}/follow`, { method: 'POST' });
+    },
+
+    async unfollow(userId) {
+        return apiRequest(`/users/${userId}/follow`, { method: 'DELETE' });
+    },
+
+    /**
+     * Users I follow / who follow me, newest first
+     */
+    async following(limit = 50, offset = 0) {
+        return apiRequest(`/users/me/following?limit=${limit}&offset=${offset}`);
+    },
+
+    async followers(limit = 50, offset = 0) {
+        return apiRequest(`/users/me/followers?limit=${limit}&offset=${offset}`);
+    },
+
+    /**
+     * Referral network per level with its CO2 impact
+     */
+    async referrals(userId = 'me', maxDepth = 10) {
+        return apiRequest(`/users/${userId}/referrals?max_depth=${maxDepth}`);
     }
 };
 
@@ -255,6 +291,17 @@ const ChallengesAPI = {
         });
     },
 
+    /**
+     * Log many days at once, e.g. after being offline
+     * entries: [{ challenge_id, log_date, completed, notes }]
+     */
+    async logBatch(entries) {
+        return apiRequest('/challenges/logs:batch', {
+            method: 'POST',
+            body: JSON.stringify({ entries })
+        });
+    },
+
     /**
      * Get user's progress on a challenge
      */
@@ -262,6 +309,14 @@ const ChallengesAPI = {
         return apiRequest(`/challenges/${challengeId}/progress`);
     },
 
+    /**
+     * Get completed days of a challenge as a bitmap
+     * (base64, bit i = start_date + i days)
+     */
+    async getCalendar(challengeId) {
+        return apiRequest(`/challenges/${challengeId}/calendar`);
+    },
+
     /**
      * Get user's active challenges
      */
@@ -295,24 +350,145 @@ const ChallengesAPI = {
 
 const LeaderboardsAPI = {
     /**
-     * Get weekly leaderboard
+     * Get weekly leaderboard (metric: 'co2_kg', 'xp' or 'challenges')
      */
-    async weekly(limit = 10) {
-        return apiRequest(`/leaderboards/weekly?limit=${limit}`);
+    async weekly(limit = 10, metric = 'co2_kg') {
+        return apiRequest(`/leaderboards/weekly?limit=${limit}&metric=${metric}`);
+    },
+
+    /**
+     * Get the entries around me (board: 'weekly', 'monthly' or 'regional/<region>')
+     */
+    async aroundMe(board = 'weekly', radius = 5, metric = 'co2_kg') {
+        return apiRequest(`/leaderboards/${board}/around-me?radius=${radius}&metric=${metric}`);
+    },
+
+    /**
+     * Open a live stream of the top 50 (board: 'weekly', 'monthly' or 'regional/<region>').
+     * Calls onSnapshot(leaderboard) on connect and onDelta({changes, removed}) on every change;
+     * returns the EventSource (call close() when done).
+     */
+    stream(board = 'weekly', metric = 'co2_kg', { onSnapshot, onDelta } = {}) {
+        const source = new EventSource(`${API_BASE_URL}/leaderboards/${board}/stream?metric=${metric}`);
+        source.addEventListener('snapshot', (e) => onSnapshot?.(JSON.parse(e.data)));
+        source.addEventListener('delta', (e) => onDelta?.(JSON.parse(e.data)));
+        return source;
+    },
+
+    /**
+     * Get a finished week (ISO key, e.g. '2026-W41')
+     */
+    async pastWeek(week, limit = 10, metric = 'co2_kg') {
+        return apiRequest(`/leaderboards/weekly/${week}?limit=${limit}&metric=${metric}`);
     },
 
     /**
      * Get monthly leaderboard
      */
-    async monthly(limit = 10) {
-        return apiRequest(`/leaderboards/monthly?limit=${limit}`);
+    async monthly(limit = 10, metric = 'co2_kg') {
+        return apiRequest(`/leaderboards/monthly?limit=${limit}&metric=${metric}`);
     },
 
     /**
      * Get regional leaderboard
      */
-    async regional(region, limit = 10) {
-        return apiRequest(`/leaderboards/regional/${region}?limit=${limit}`);
+    async regional(region, limit = 10, metric = 'co2_kg') {
+        return apiRequest(`/leaderboards/regional/${encodeURIComponent(region)}?limit=${limit}&metric=${metric}`);
+    },
+
+    /**
+     * Get all regions ranked by CO2 saved this month
+     */
+    async regions() {
+        return apiRequest('/leaderboards/regions');
+    },
+
+    /**
+     * Get team leaderboard (metric: 'xp' or 'co2_kg')
+     */
+    async teams(metric = 'xp', limit = 10) {
+        return apiRequest(`/leaderboards/teams?metric=${metric}&limit=${limit}`);
+    },
+
+    /**
+     * Get current and finished seasons
+     */
+    async seasons() {
+        return apiRequest('/leaderboards/seasons');
+    },
+
+    /**
+     * Get a season leaderboard ('current' or e.g. '2026-sommer')
+     */
+    async season(season = 'current', limit = 10, metric = 'co2_kg') {
+        return apiRequest(`/leaderboards/seasons/${season}?limit=${limit}&metric=${metric}`);
+    },
+
+    /**
+     * Me and the users I follow (period: 'weekly' or 'monthly')
+     */
+    async friends(period = 'weekly', metric = 'co2_kg') {
+        return apiRequest(`/leaderboards/friends?period=${period}&metric=${metric}`);
+    }
+};
+
+// ============================================
+// TEAMS API
+// ============================================
+
+const TeamsAPI = {
+    /**
+     * Create a team (you become its captain)
+     */
+    async create(name, description) {
+        return apiRequest('/teams', {
+            method: 'POST',
+            body: JSON.stringify({ name, description })
+        });
+    },
+
+    /**
+     * Get team details and top members
+     */
+    async get(teamId, limit = 20) {
+        return apiRequest(`/teams/${teamId}?limit=${limit}`);
+    },
+
+    /**
+     * Update team name/description (captain only)
+     */
+    async update(teamId, updates) {
+        return apiRequest(`/teams/${teamId}`, {
+            method: 'PUT',
+            body: JSON.stringify(updates)
+        });
+    },
+
+    /**
+     * Dissolve a team (captain only)
+     */
+    async remove(teamId) {
+        return apiRequest(`/teams/${teamId}`, {
+            method: 'DELETE'
+        });
+    },
+
+    /**
+     * Join a team
+     */
+    async join(teamId) {
+        return apiRequest(`/teams/${teamId}/join`, {
+            method: 'POST'
+        });
+    },
+
+    /**
+     * Leave a team
+     */
+    async leave(teamId) {
+        return apiRequest(`/teams/${teamId}/leave`, {
+            method: 'POST'
+        });
     }
 };
 
@@ -399,6 +575,39 @@ const FootprintAPI = {
     }
 };
 
+// ============================================
+// VERIFICATION API (trust level 3+)
+// ============================================
+
+const VerificationAPI = {
+    /**
+     * Spot checks waiting for review
+     */
+    async queue() {
+        return apiRequest('/verification/queue');
+    },
+
+    /**
+     * Lease a batch of spot checks
+     */
+    async claim(limit = 10, leaseSeconds = 600) {
+        return apiRequest('/verification/claims', {
+            method: 'POST',
+            body: JSON.stringify({ limit, lease_seconds: leaseSeconds })
+        });
+    },
+
+    /**
+     * Accept / reject claimed spot checks: [{user_challenge_id, outcome}]
+     */
+    async decide(decisions) {
+        return apiRequest('/verification/decisions', {
+            method: 'POST',
+            body: JSON.stringify({ decisions })
+        });
+    }
+};
+
 // ============================================
 // EXPORT
 // ============================================
@@ -408,9 +617,11 @@ window.ProvolutionAPI = {
     user: UserAPI,
     challenges: ChallengesAPI,
     leaderboards: LeaderboardsAPI,
+    teams: TeamsAPI,
     badges: BadgesAPI,
     rewards: RewardsAPI,
     footprint: FootprintAPI,
+    verification: VerificationAPI,
     isAuthenticated,
     getToken,
     setToken,
@@ -8,6 +8,8 @@ class LeaderboardUI {
         this.container = document.getElementById(containerId);
         this.currentView = 'weekly';
         this.leaderboardData = null;
+        this.liveRankings = null;
+        this.stream = null;
         
         this.init();
     }
@@ -30,12 +32,44 @@ class LeaderboardUI {
                     this.leaderboardData = await ProvolutionAPI.leaderboards.weekly(20);
             }
             this.render();
+            this.openStream();
         } catch (error) {
             console.error('Failed to load leaderboard:', error);
             this.showError();
         }
     }
     
+    /**
+     * Follow the current board live: the stream sends the top 50, we show
+     * the first 20 and keep the rest so climbers from below can move in.
+     */
+    openStream() {
+        this.stream?.close();
+        this.stream = ProvolutionAPI.leaderboards.stream(this.currentView, 'co2_kg', {
+            onSnapshot: (board) => {
+                this.liveRankings = board.rankings;
+                this.renderLive();
+            },
+            onDelta: (delta) => this.applyDelta(delta)
+        });
+    }
+    
+    applyDelta({ changes, removed }) {
+        if (!this.liveRankings) return;
+        const gone = new Set([...removed, ...changes.map(c => c.user.id)]);
+        this.liveRankings = this.liveRankings
+            .filter(entry => !gone.has(entry.user.id))
+            .concat(changes.map(({ previous_rank, ...entry }) => entry))
+            .sort((a, b) => a.rank - b.rank);
+        this.renderLive();
+    }
+    
+    renderLive() {
+        if (!this.leaderboardData) return;
+        this.leaderboardData.rankings = this.liveRankings.slice(0, 20);
+        this.render();
+    }
+    
     setupEventListeners() {
         this.container.addEventListener('click', (e) => {
             if (e.target.classList.contains('leaderboard-tab')) {
@@ -46,6 +80,8 @@ class LeaderboardUI {
     
     setView(view) {
         this.currentView = view;
+        this.stream?.close();
+        this.liveRankings = null;
         
         this.container.querySelectorAll('.leaderboard-tab').forEach(tab => {
             tab.classList.toggle('active', tab.dataset.view === view);